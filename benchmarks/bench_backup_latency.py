@@ -0,0 +1,120 @@
+"""
+Benchmark: latencia de las rutas de tasks mientras se hace un backup online.
+
+Llena una base de datos temporal con tareas y mide p50/p99 de una mezcla de
+lecturas (GET /tasks/{id}) y escrituras (PATCH /tasks/{id}/status) en tres
+escenarios: sin backup, con backup sin pausas entre pasos y con el backup
+throttled (pausa entre pasos).
+
+Uso:
+    python -m benchmarks.bench_backup_latency --tasks 50000 --requests 3000 --pages 256 --pause-ms 5
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.main import app
+from src.api.backup import backup_database
+from src.api.database import (
+    Base,
+    create_read_engine,
+    create_write_engine,
+    get_read_sessionmaker,
+    get_write_sessionmaker,
+)
+from src.api.models.task import Task
+from src.api.sqlite_profiles import get_profile
+
+STATUSES = ("backlog", "doing", "done")
+
+
+async def run_load(client: AsyncClient, n_tasks: int, total: int, concurrency: int) -> list[float]:
+    """Lanza `total` requests mixtas (80% lecturas) y devuelve latencias (ms)."""
+    latencies = []
+    queue = iter(range(total))
+    rng = random.Random(0)
+
+    async def worker() -> None:
+        for _ in queue:
+            task_id = rng.randint(1, n_tasks)
+            start = time.perf_counter()
+            if rng.random() < 0.8:
+                response = await client.get(f"/tasks/{task_id}")
+            else:
+                response = await client.patch(f"/tasks/{task_id}/status", params={"new_status": rng.choice(STATUSES)})
+            latencies.append((time.perf_counter() - start) * 1000)
+            assert response.status_code == 200, response.text
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=50_000)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--pages", type=int, default=256)
+    parser.add_argument("--pause-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    profile = get_profile("balanced")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        url = f"sqlite+aiosqlite:///{path}"
+        write_engine = create_write_engine(url, profile)
+        async with write_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(insert(Task), [
+                {"name": f"Task {i}", "description": "x" * 200, "status": STATUSES[i % 3], "completed": False}
+                for i in range(args.tasks)
+            ])
+        read_engine = create_read_engine(url, profile, pool_size=4)
+        write_maker = async_sessionmaker(write_engine, class_=AsyncSession, expire_on_commit=False)
+        read_maker = async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+        app.dependency_overrides[get_write_sessionmaker] = lambda: write_maker
+        app.dependency_overrides[get_read_sessionmaker] = lambda: read_maker
+
+        scenarios = {
+            "sin backup": None,
+            "backup sin pausa": 0.0,
+            f"backup pausa {args.pause_ms:g} ms": args.pause_ms / 1000,
+        }
+        print(f"{args.requests} requests (80% GET, 20% PATCH), concurrencia {args.concurrency}")
+        print(f"{'escenario':<22}{'p50 ms':>10}{'p99 ms':>10}{'backup ms':>12}")
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://bench") as client:
+            for label, pause in scenarios.items():
+                backups = []
+                done = asyncio.Event()
+
+                async def backup_loop() -> None:
+                    while not done.is_set():
+                        result = await backup_database(path, os.path.join(tmp, "snapshot.db"), args.pages, pause)
+                        backups.append(result.duration_ms)
+
+                backup_task = asyncio.create_task(backup_loop()) if pause is not None else None
+                latencies = sorted(await run_load(client, args.tasks, args.requests, args.concurrency))
+                done.set()
+                if backup_task is not None:
+                    await backup_task
+
+                p99 = latencies[int(len(latencies) * 0.99) - 1]
+                backup_ms = f"{statistics.mean(backups):.0f}" if backups else "-"
+                print(f"{label:<22}{statistics.median(latencies):>10.2f}{p99:>10.2f}{backup_ms:>12}")
+
+        app.dependency_overrides.clear()
+        await read_engine.dispose()
+        await write_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
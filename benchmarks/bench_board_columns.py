@@ -0,0 +1,125 @@
+"""
+Benchmark: primera carga del tablero según el historial de la columna done.
+
+Para cada tamaño llena una base de datos temporal con tareas (el 90 % en
+done, 1 subtask por tarea) y mide la primera carga de las tres columnas con
+`--limit` tareas por columna:
+
+- all: todas las tareas activas con sus subtasks (lo que pedía el cliente
+  con GET /tasks página a página).
+- window: `row_number() OVER (PARTITION BY status ORDER BY created_at, id)`
+  filtrado por `rn <= limit + 1`.
+- union: una consulta `LIMIT` por columna unidas con UNION ALL
+  (`routes.board.board_query`, lo que hace GET /board).
+
+window y union devuelven las mismas filas. Las variantes se ejecutan
+intercaladas durante varias rondas y se informa la mediana.
+
+Uso:
+    python -m benchmarks.bench_board_columns --tasks 10000 100000 --limit 50 --rounds 5
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.api.database import create_read_engine, create_write_engine
+from src.api.migrations.runner import migrate
+from src.api.models.subtask import Subtask
+from src.api.models.task import Task
+from src.api.reads import select_tasks, with_subtasks
+from src.api.routes.board import board_query
+from src.api.sqlite_profiles import get_profile
+
+
+async def seed(engine, n_tasks: int) -> None:
+    """Inserta `n_tasks` tareas (90 % done) con una subtask cada una."""
+    start = datetime(2024, 1, 1)
+    async with engine.begin() as conn:
+        ids = (await conn.execute(insert(Task).returning(Task.id), [
+            {"name": f"Task {i}", "description": "x" * 120,
+             "status": "done" if i % 10 else ("backlog", "doing")[i // 10 % 2],
+             "completed": bool(i % 10), "created_at": start + timedelta(seconds=i)}
+            for i in range(n_tasks)
+        ])).scalars().all()
+        await conn.execute(insert(Subtask), [
+            {"task_id": task_id, "name": "Sub", "position": 0, "created_at": start} for task_id in ids
+        ])
+
+
+def window_query(limit: int):
+    """Primeras `limit + 1` tareas de cada status con una función ventana."""
+    ranked = (
+        select_tasks()
+        .add_columns(func.row_number().over(
+            partition_by=Task.status, order_by=(Task.created_at, Task.id)
+        ).label("rn"))
+        .where(Task.deleted_at.is_(None))
+        .subquery()
+    )
+    return select(ranked).where(ranked.c.rn <= limit + 1)
+
+
+async def load(maker: async_sessionmaker, query) -> int:
+    """Lee las tareas de `query` con sus subtasks; devuelve cuántas."""
+    async with maker() as session:
+        rows = (await session.execute(query)).all()
+        return len(await with_subtasks(session, rows))
+
+
+async def run_size(n_tasks: int, limit: int, rounds: int) -> dict[str, tuple[float, int]]:
+    """Mediana (ms) y tareas leídas de cada variante."""
+    profile = get_profile("balanced")
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        write_engine = create_write_engine(url, profile)
+        await migrate(write_engine)
+        await seed(write_engine, n_tasks)
+        read_engine = create_read_engine(url, profile, pool_size=1)
+        maker = async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+
+        variants = {
+            "all": select_tasks().where(Task.deleted_at.is_(None)).order_by(Task.created_at, Task.id),
+            "window": window_query(limit),
+            "union": board_query(limit),
+        }
+        counts = {label: await load(maker, query) for label, query in variants.items()}
+        assert counts["window"] == counts["union"], "window y union no leen las mismas tareas"
+
+        timings = {label: [] for label in variants}
+        for _ in range(rounds):
+            for label, query in variants.items():
+                start = time.perf_counter()
+                await load(maker, query)
+                timings[label].append((time.perf_counter() - start) * 1000)
+
+        await read_engine.dispose()
+        await write_engine.dispose()
+        return {label: (statistics.median(timings[label]), counts[label]) for label in variants}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"Primera carga del tablero ({args.limit} por columna), mediana de {args.rounds} rondas")
+    print(f"{'tareas':<10}{'all ms':>10}{'window ms':>11}{'union ms':>10}{'leídas':>8}")
+    for n_tasks in args.tasks:
+        results = await run_size(n_tasks, args.limit, args.rounds)
+        print(
+            f"{n_tasks:<10}{results['all'][0]:>10.1f}{results['window'][0]:>11.1f}"
+            f"{results['union'][0]:>10.2f}{results['union'][1]:>8}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,124 @@
+"""
+Benchmark: tablero completo por el camino ORM frente al documento JSON de SQLite.
+
+Para cada tamaño llena una base de datos temporal con tareas (3 subtasks
+por tarea, una de ellas eliminada) y mide el tiempo de construir los bytes
+de la respuesta del tablero completo:
+
+- orm: select + selectinload de subtasks activas, `TaskResponse.model_validate`
+  por tarea y serialización de la lista (lo que hacía GET /tasks).
+- json: una consulta con `json_object`/`json_group_array`
+  (`json_documents.board_json_query`, lo que hace GET /tasks/board).
+
+Ambos caminos producen los mismos bytes (se comprueba antes de medir). Las
+variantes se ejecutan intercaladas durante varias rondas y se informa la
+mediana.
+
+Uso:
+    python -m benchmarks.bench_board_json --tasks 10000 100000 --rounds 5
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import selectinload
+
+from src.api.database import create_read_engine, create_write_engine
+from src.api.json_documents import board_json_query, fetch_json_array
+from src.api.migrations.runner import migrate
+from src.api.models.subtask import Subtask
+from src.api.models.task import Task
+from src.api.schemas.tasks import TaskResponse
+from src.api.sqlite_profiles import get_profile
+
+STATUSES = ("backlog", "doing", "done")
+TASK_LIST = TypeAdapter(List[TaskResponse])
+
+
+async def seed(engine, n_tasks: int) -> None:
+    """Inserta `n_tasks` tareas con 3 subtasks cada una (una eliminada)."""
+    start = datetime(2024, 1, 1)
+    async with engine.begin() as conn:
+        ids = (await conn.execute(insert(Task).returning(Task.id), [
+            {"name": f"Task {i}", "description": "x" * 120, "status": STATUSES[i % 3],
+             "completed": i % 3 == 2, "created_at": start + timedelta(seconds=i, microseconds=i % 7)}
+            for i in range(n_tasks)
+        ])).scalars().all()
+        await conn.execute(insert(Subtask), [
+            {"task_id": task_id, "name": f"Sub {j}", "position": j, "completed": j == 0,
+             "created_at": start, "deleted_at": start if j == 2 else None}
+            for task_id in ids
+            for j in range(3)
+        ])
+
+
+async def orm_board(maker: async_sessionmaker) -> bytes:
+    """Tablero por el camino ORM + Pydantic."""
+    async with maker() as session:
+        result = await session.execute(
+            select(Task)
+            .options(selectinload(Task.subtasks.and_(Subtask.deleted_at.is_(None))))
+            .where(Task.deleted_at.is_(None))
+            .order_by(Task.created_at, Task.id)
+        )
+        return TASK_LIST.dump_json([TaskResponse.model_validate(task) for task in result.scalars()])
+
+
+async def json_board(maker: async_sessionmaker) -> bytes:
+    """Tablero construido por SQLite."""
+    async with maker() as session:
+        return await fetch_json_array(session, board_json_query(select().where(Task.deleted_at.is_(None))))
+
+
+async def run_size(n_tasks: int, rounds: int) -> dict[str, tuple[float, int]]:
+    """Mediana (ms) y tamaño (bytes) de cada camino para `n_tasks` tareas."""
+    profile = get_profile("balanced")
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        write_engine = create_write_engine(url, profile)
+        await migrate(write_engine)
+        await seed(write_engine, n_tasks)
+        read_engine = create_read_engine(url, profile, pool_size=1)
+        maker = async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+
+        variants = {"orm": orm_board, "json": json_board}
+        documents = {label: await fn(maker) for label, fn in variants.items()}
+        assert documents["orm"] == documents["json"], "Los documentos no coinciden"
+
+        timings = {label: [] for label in variants}
+        for _ in range(rounds):
+            for label, fn in variants.items():
+                start = time.perf_counter()
+                await fn(maker)
+                timings[label].append((time.perf_counter() - start) * 1000)
+
+        await read_engine.dispose()
+        await write_engine.dispose()
+        return {label: (statistics.median(timings[label]), len(documents[label])) for label in variants}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"Tablero completo, mediana de {args.rounds} rondas")
+    print(f"{'tareas':<10}{'orm ms':>12}{'json ms':>12}{'speedup':>10}{'MB':>8}")
+    for n_tasks in args.tasks:
+        results = await run_size(n_tasks, args.rounds)
+        orm_ms, size = results["orm"]
+        json_ms, _ = results["json"]
+        print(f"{n_tasks:<10}{orm_ms:>12.1f}{json_ms:>12.1f}{orm_ms / json_ms:>9.1f}x{size / 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
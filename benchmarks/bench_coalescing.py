@@ -0,0 +1,103 @@
+"""
+Benchmark: ráfagas de lecturas idénticas con y sin coalescing.
+
+Simula al equipo abriendo el tablero a la vez: ráfagas de `--concurrency`
+GET /tasks/?limit=50 iguales lanzadas juntas contra una base de datos
+temporal con `--tasks` tareas (3 subtasks por tarea). Por variante se
+informa la mediana del tiempo por ráfaga, las requests por segundo y los
+SELECT ejecutados por ráfaga.
+
+- off: sin coalescing, cada request hace su consulta y su serialización.
+- on: `CoalescingMiddleware` (coalescing.py), la ráfaga comparte una.
+
+Las variantes se ejecutan intercaladas durante varias rondas.
+
+Uso:
+    python -m benchmarks.bench_coalescing --tasks 10000 --concurrency 8 32 --rounds 5
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from benchmarks.bench_read_layer import seed
+from src.main import app
+from src.api.coalescing import start_coalescing, stop_coalescing
+from src.api.database import create_read_engine, create_write_engine, get_read_sessionmaker, get_write_sessionmaker
+from src.api.migrations.runner import migrate
+from src.api.sqlite_profiles import get_profile
+
+PATH = "/tasks/?limit=50"
+
+
+async def burst(client: AsyncClient, concurrency: int) -> float:
+    """Lanza `concurrency` GETs iguales a la vez y devuelve el tiempo total (ms)."""
+    start = time.perf_counter()
+    responses = await asyncio.gather(*(client.get(PATH) for _ in range(concurrency)))
+    elapsed = (time.perf_counter() - start) * 1000
+    assert {response.status_code for response in responses} == {200}
+    return elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[8, 32])
+    parser.add_argument("--bursts", type=int, default=20, help="Ráfagas por variante y ronda")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    profile = get_profile("balanced")
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        write_engine = create_write_engine(url, profile)
+        await migrate(write_engine)
+        await seed(write_engine, args.tasks)
+        read_engine = create_read_engine(url, profile, pool_size=8)
+        read_maker = async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+        write_maker = async_sessionmaker(write_engine, class_=AsyncSession, expire_on_commit=False)
+        app.dependency_overrides[get_read_sessionmaker] = lambda: read_maker
+        app.dependency_overrides[get_write_sessionmaker] = lambda: write_maker
+
+        selects = []
+
+        def count(conn, cursor, statement, *rest):
+            if statement.lstrip().upper().startswith("SELECT"):
+                selects.append(None)
+
+        event.listen(read_engine.sync_engine, "before_cursor_execute", count)
+
+        print(f"GET {PATH} en ráfagas, {args.tasks} tareas, mediana de {args.rounds} rondas")
+        print(f"{'ráfaga':<8}{'variante':<10}{'ms/ráfaga':>11}{'req/s':>10}{'SELECT/ráfaga':>15}")
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+            for concurrency in args.concurrency:
+                timings = {"off": [], "on": []}
+                queries = {"off": [], "on": []}
+                for _ in range(args.rounds):
+                    for variant in timings:
+                        if variant == "on":
+                            start_coalescing()
+                        await burst(client, concurrency)  # warm-up
+                        selects.clear()
+                        elapsed = [await burst(client, concurrency) for _ in range(args.bursts)]
+                        timings[variant].append(statistics.median(elapsed))
+                        queries[variant].append(len(selects) / args.bursts)
+                        stop_coalescing()
+                for variant, values in timings.items():
+                    ms = statistics.median(values)
+                    print(f"{concurrency:<8}{variant:<10}{ms:>11.2f}{concurrency / ms * 1000:>10.0f}"
+                          f"{statistics.median(queries[variant]):>15.1f}")
+
+        app.dependency_overrides.clear()
+        await read_engine.dispose()
+        await write_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,97 @@
+"""
+Benchmark: polling de listados con y sin GET condicional.
+
+Llena una base de datos temporal con `--tasks` tareas (3 subtasks por
+tarea) y mide, por request, el polling de un cliente cuando nada ha
+cambiado:
+
+- full: GET sin `If-None-Match` (consulta, serialización y cuerpo completo).
+- 304: GET con el ETag de la respuesta anterior (etags.py).
+
+Rutas: /tasks/?limit=50, /projects/ y /tasks/{id}/subtasks/. Las variantes
+se ejecutan intercaladas durante varias rondas y se informa la mediana (µs
+por request) y los bytes de cuerpo por request.
+
+Uso:
+    python -m benchmarks.bench_etags --tasks 10000 --requests 500 --rounds 5
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from benchmarks.bench_read_layer import seed
+from src.main import app
+from src.api.database import create_read_engine, create_write_engine, get_read_sessionmaker, get_write_sessionmaker
+from src.api.etags import start_etags, stop_etags
+from src.api.migrations.runner import migrate
+from src.api.models.project import Project
+from src.api.sqlite_profiles import get_profile
+
+PATHS = ("/tasks/?limit=50", "/projects/", "/tasks/1/subtasks/")
+
+
+async def poll(client: AsyncClient, path: str, requests: int, etag: str | None) -> tuple[float, int]:
+    """µs por request y bytes de cuerpo por request de `requests` GETs a `path`."""
+    headers = {"If-None-Match": etag} if etag else {}
+    size = 0
+    start = time.perf_counter()
+    for _ in range(requests):
+        response = await client.get(path, headers=headers)
+        assert response.status_code == (304 if etag else 200)
+        size += len(response.content)
+    return (time.perf_counter() - start) * 1e6 / requests, size // requests
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=500, help="Requests por ruta, variante y ronda")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    profile = get_profile("balanced")
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        write_engine = create_write_engine(url, profile)
+        await migrate(write_engine)
+        await seed(write_engine, args.tasks)
+        async with write_engine.begin() as conn:
+            await conn.execute(insert(Project), [
+                {"name": f"Proyecto {i}", "color": "#000000"} for i in range(20)
+            ])
+        read_engine = create_read_engine(url, profile, pool_size=4)
+        read_maker = async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+        write_maker = async_sessionmaker(write_engine, class_=AsyncSession, expire_on_commit=False)
+        app.dependency_overrides[get_read_sessionmaker] = lambda: read_maker
+        app.dependency_overrides[get_write_sessionmaker] = lambda: write_maker
+        start_etags()
+
+        print(f"Polling sin cambios, {args.tasks} tareas, mediana de {args.rounds} rondas")
+        print(f"{'ruta':<22}{'full µs':>10}{'304 µs':>10}{'speedup':>9}{'bytes full':>12}")
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+            for path in PATHS:
+                etag = (await client.get(path)).headers["etag"]
+                timings = {"full": [], "304": []}
+                sizes = {}
+                for _ in range(args.rounds):
+                    for variant, if_none_match in (("full", None), ("304", etag)):
+                        elapsed, sizes[variant] = await poll(client, path, args.requests, if_none_match)
+                        timings[variant].append(elapsed)
+                full_us, cached_us = (statistics.median(timings[variant]) for variant in ("full", "304"))
+                print(f"{path:<22}{full_us:>10.0f}{cached_us:>10.0f}{full_us / cached_us:>8.1f}x{sizes['full']:>12}")
+
+        stop_etags()
+        app.dependency_overrides.clear()
+        await read_engine.dispose()
+        await write_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
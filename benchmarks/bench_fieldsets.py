@@ -0,0 +1,113 @@
+"""
+Benchmark: tareas completas frente a campos sueltos con resumen de subtasks.
+
+Para cada número de subtasks por tarea llena una base de datos temporal con
+`--tasks` tareas y mide leer y serializar todas las tareas activas por la
+capa Core (lo que hace GET /tasks con `limit` suficiente):
+
+- full: todas las columnas y la lista de subtasks (`TaskResponse`).
+- card: `fields=id,name,status,project_id,completed` e
+  `include=subtask_summary` (`{total, completed}` de un GROUP BY).
+
+Se informa la mediana del tiempo y el tamaño del JSON. Las variantes se
+ejecutan intercaladas durante varias rondas.
+
+Uso:
+    python -m benchmarks.bench_fieldsets --tasks 5000 --subtasks 3 10 30 --rounds 5
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.api.database import create_read_engine, create_write_engine
+from src.api.migrations.runner import migrate
+from src.api.models.subtask import Subtask
+from src.api.models.task import Task
+from src.api.reads import select_tasks, task_documents
+from src.api.schemas.tasks import TaskFieldset, task_response_schema
+from src.api.serialization import dump_response
+from src.api.sqlite_profiles import get_profile
+
+STATUSES = ("backlog", "doing", "done")
+FIELDSETS = {
+    "full": TaskFieldset(),
+    "card": TaskFieldset(fields="id,name,status,project_id,completed", include="subtask_summary"),
+}
+
+
+async def seed(engine, n_tasks: int, n_subtasks: int) -> None:
+    """Inserta `n_tasks` tareas con `n_subtasks` subtasks cada una."""
+    start = datetime(2024, 1, 1)
+    async with engine.begin() as conn:
+        ids = (await conn.execute(insert(Task).returning(Task.id), [
+            {"name": f"Task {i}", "description": "x" * 120, "status": STATUSES[i % 3],
+             "completed": i % 3 == 2, "created_at": start + timedelta(seconds=i)}
+            for i in range(n_tasks)
+        ])).scalars().all()
+        await conn.execute(insert(Subtask), [
+            {"task_id": task_id, "name": f"Sub {j}", "position": j, "completed": j % 2 == 0,
+             "created_at": start}
+            for task_id in ids
+            for j in range(n_subtasks)
+        ])
+
+
+async def listing(maker: async_sessionmaker, fieldset: TaskFieldset) -> bytes:
+    """Todas las tareas activas con `fieldset`, serializadas."""
+    async with maker() as session:
+        rows = (await session.execute(
+            select_tasks(fieldset.fields).where(Task.deleted_at.is_(None)).order_by(Task.created_at, Task.id)
+        )).all()
+        documents = await task_documents(session, rows, fieldset.include)
+        return dump_response(List[task_response_schema(fieldset)], documents)
+
+
+async def run_size(n_tasks: int, n_subtasks: int, rounds: int) -> dict[str, tuple[float, int]]:
+    """Mediana (ms) y tamaño (bytes) de cada variante."""
+    profile = get_profile("balanced")
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        write_engine = create_write_engine(url, profile)
+        await migrate(write_engine)
+        await seed(write_engine, n_tasks, n_subtasks)
+        read_engine = create_read_engine(url, profile, pool_size=1)
+        maker = async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+
+        sizes = {label: len(await listing(maker, fieldset)) for label, fieldset in FIELDSETS.items()}
+        timings = {label: [] for label in FIELDSETS}
+        for _ in range(rounds):
+            for label, fieldset in FIELDSETS.items():
+                start = time.perf_counter()
+                await listing(maker, fieldset)
+                timings[label].append((time.perf_counter() - start) * 1000)
+
+        await read_engine.dispose()
+        await write_engine.dispose()
+        return {label: (statistics.median(timings[label]), sizes[label]) for label in FIELDSETS}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=5_000)
+    parser.add_argument("--subtasks", type=int, nargs="+", default=[3, 10, 30])
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{args.tasks} tareas, mediana de {args.rounds} rondas")
+    print(f"{'subtasks':<10}{'full ms':>10}{'card ms':>10}{'full KB':>10}{'card KB':>10}")
+    for n_subtasks in args.subtasks:
+        results = await run_size(args.tasks, n_subtasks, args.rounds)
+        (full_ms, full_size), (card_ms, card_size) = results["full"], results["card"]
+        print(f"{n_subtasks:<10}{full_ms:>10.1f}{card_ms:>10.1f}{full_size / 1e3:>10.0f}{card_size / 1e3:>10.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,160 @@
+"""
+Benchmark: planes de consulta y latencias antes/después de los índices.
+
+Genera una base de datos temporal con N tareas (y sus subtasks), ejecuta las
+consultas que emiten los routers sin índices secundarios, aplica los índices
+declarados en los modelos y repite las mismas consultas.
+
+Uso:
+    python -m benchmarks.bench_indexes --tasks 200000 --repeat 20
+"""
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, UTC
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.dialects import sqlite as sqlite_dialect
+
+from src.api.database import Base
+from src.api.models.task import Task
+from src.api.models.subtask import Subtask
+
+STATUSES = ("backlog", "doing", "done")
+
+
+def build_database(path: str, n_tasks: int, subtasks_per_task: int) -> None:
+    """Crea el esquema SIN índices secundarios y lo llena con datos sintéticos."""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        for table in (Task.__table__, Subtask.__table__):
+            for index in table.indexes:
+                index.drop(conn)
+    engine.dispose()
+
+    rng = random.Random(42)
+    now = datetime.now(UTC).replace(tzinfo=None)
+    conn = sqlite3.connect(path)
+    tasks = []
+    subtasks = []
+    subtask_id = 1
+    for task_id in range(1, n_tasks + 1):
+        created = (now - timedelta(minutes=n_tasks - task_id)).isoformat(sep=" ")
+        deleted = created if rng.random() < 0.3 else None
+        tasks.append((
+            task_id, f"Task {task_id}", None, rng.choice(STATUSES), False,
+            rng.randint(1, 50), created, None, None, deleted,
+        ))
+        for position in range(1, subtasks_per_task + 1):
+            subtasks.append((
+                subtask_id, task_id, f"Subtask {subtask_id}", rng.random() < 0.5,
+                position, created, None, deleted,
+            ))
+            subtask_id += 1
+
+    conn.executemany(
+        "INSERT INTO tasks (id, name, description, status, completed, project_id, "
+        "created_at, updated_at, completed_at, deleted_at) VALUES (?,?,?,?,?,?,?,?,?,?)",
+        tasks,
+    )
+    conn.executemany(
+        "INSERT INTO subtasks (id, task_id, name, completed, position, created_at, "
+        "completed_at, deleted_at) VALUES (?,?,?,?,?,?,?,?)",
+        subtasks,
+    )
+    conn.commit()
+    conn.close()
+
+
+def board_queries(task_id: int) -> dict:
+    """Consultas equivalentes a las que ejecutan los routers."""
+    return {
+        "tasks activas por status": select(Task).where(
+            Task.deleted_at.is_(None), Task.status == "doing"
+        ),
+        "tasks activas por proyecto": select(Task).where(
+            Task.deleted_at.is_(None), Task.project_id == 7, Task.status == "backlog"
+        ),
+        "selectinload subtasks": select(Subtask).where(
+            Subtask.task_id.in_(range(task_id, task_id + 100))
+        ),
+        "max(position) en create_subtask": (
+            select(Subtask.position)
+            .where(Subtask.task_id == task_id, Subtask.deleted_at.is_(None))
+            .order_by(Subtask.position.desc())
+            .limit(1)
+        ),
+        "subtasks activas (auto-complete)": select(Subtask).where(
+            Subtask.task_id == task_id, Subtask.deleted_at.is_(None)
+        ),
+    }
+
+
+def compile_sql(statement) -> str:
+    """Compila una sentencia con valores literales para EXPLAIN QUERY PLAN."""
+    return str(statement.compile(
+        dialect=sqlite_dialect.dialect(),
+        compile_kwargs={"literal_binds": True},
+    ))
+
+
+def run_queries(path: str, n_tasks: int, repeat: int) -> dict:
+    """Ejecuta cada consulta `repeat` veces y devuelve plan y latencia mediana."""
+    conn = sqlite3.connect(path)
+    results = {}
+    task_id = n_tasks // 2
+    for label, statement in board_queries(task_id).items():
+        sql = compile_sql(statement)
+        plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            conn.execute(sql).fetchall()
+            timings.append((time.perf_counter() - start) * 1000)
+        results[label] = (plan, statistics.median(timings))
+    conn.close()
+    return results
+
+
+def apply_indexes(path: str) -> None:
+    """Crea los índices declarados en los modelos (igual que la migración)."""
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        for table in (Task.__table__, Subtask.__table__):
+            for index in table.indexes:
+                index.create(conn)
+        conn.exec_driver_sql("ANALYZE")
+    engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=200_000)
+    parser.add_argument("--subtasks", type=int, default=3, help="Subtasks por tarea")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        print(f"Generando {args.tasks} tareas x {args.subtasks} subtasks...")
+        build_database(path, args.tasks, args.subtasks)
+
+        before = run_queries(path, args.tasks, args.repeat)
+        apply_indexes(path)
+        after = run_queries(path, args.tasks, args.repeat)
+
+    for label in before:
+        plan_before, ms_before = before[label]
+        plan_after, ms_after = after[label]
+        print(f"\n== {label}")
+        print(f"  antes:   {ms_before:9.3f} ms  | {' / '.join(plan_before)}")
+        print(f"  después: {ms_after:9.3f} ms  | {' / '.join(plan_after)}")
+
+
+if __name__ == "__main__":
+    main()
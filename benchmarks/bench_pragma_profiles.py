@@ -0,0 +1,105 @@
+"""
+Benchmark: throughput mixto lectura/escritura por perfil de PRAGMAs.
+
+Para cada perfil (y para la configuración por defecto de SQLite, sin
+PRAGMAs) crea una base de datos temporal, la llena con tareas y lanza
+varios workers concurrentes que mezclan lecturas del tablero y updates
+de status durante un tiempo fijo.
+
+Uso:
+    python -m benchmarks.bench_pragma_profiles --seconds 5 --workers 8 --write-ratio 0.2
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, UTC
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from src.api.database import Base
+from src.api.models.task import Task
+from src.api.sqlite_profiles import PROFILES, install_pragmas
+
+STATUSES = ("backlog", "doing", "done")
+
+
+async def seed(engine: AsyncEngine, n_tasks: int) -> None:
+    """Crea el esquema y lo llena con `n_tasks` tareas."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        now = datetime.now(UTC)
+        await conn.execute(insert(Task), [
+            {"name": f"Task {i}", "status": STATUSES[i % 3], "completed": False, "created_at": now}
+            for i in range(n_tasks)
+        ])
+
+
+async def worker(engine: AsyncEngine, n_tasks: int, write_ratio: float, deadline: float,
+                 counters: dict, rng: random.Random) -> None:
+    """Ejecuta operaciones mixtas hasta `deadline`."""
+    while time.perf_counter() < deadline:
+        try:
+            if rng.random() < write_ratio:
+                async with engine.begin() as conn:
+                    await conn.execute(
+                        update(Task)
+                        .where(Task.id == rng.randint(1, n_tasks))
+                        .values(status=rng.choice(STATUSES), updated_at=datetime.now(UTC))
+                    )
+                counters["writes"] += 1
+            else:
+                async with engine.connect() as conn:
+                    result = await conn.execute(
+                        select(Task)
+                        .where(Task.deleted_at.is_(None), Task.status == rng.choice(STATUSES))
+                        .limit(100)
+                    )
+                    result.fetchall()
+                counters["reads"] += 1
+        except Exception:
+            counters["errors"] += 1
+
+
+async def run_profile(name: str, args: argparse.Namespace) -> dict:
+    """Ejecuta el workload sobre una base de datos nueva con el perfil dado."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}",
+            pool_size=args.workers,
+        )
+        if name in PROFILES:
+            install_pragmas(engine, PROFILES[name])
+        await seed(engine, args.tasks)
+
+        counters = {"reads": 0, "writes": 0, "errors": 0}
+        deadline = time.perf_counter() + args.seconds
+        await asyncio.gather(*(
+            worker(engine, args.tasks, args.write_ratio, deadline, counters, random.Random(i))
+            for i in range(args.workers)
+        ))
+        await engine.dispose()
+    return counters
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    args = parser.parse_args()
+
+    print(f"{'perfil':<12}{'lecturas/s':>12}{'escrituras/s':>14}{'total/s':>10}{'errores':>9}")
+    for name in ("default", *PROFILES):
+        counters = await run_profile(name, args)
+        reads = counters["reads"] / args.seconds
+        writes = counters["writes"] / args.seconds
+        print(f"{name:<12}{reads:>12.0f}{writes:>14.0f}{reads + writes:>10.0f}{counters['errors']:>9}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,144 @@
+"""
+Benchmark: listado de tareas por el camino ORM frente a la capa Core (`reads`).
+
+Para cada tamaño llena una base de datos temporal con tareas (3 subtasks
+por tarea, una de ellas eliminada) y mide leer todas las tareas activas con
+sus subtasks activas y serializarlas como `List[TaskResponse]`:
+
+- orm: select + selectinload, `TaskResponse.model_validate` por tarea y
+  serialización (lo que hacía GET /tasks).
+- core: `select_tasks` + `with_subtasks` (filas Core agrupadas en dicts) y
+  una validación + serialización con el mismo `TypeAdapter` (lo que hace
+  GET /tasks con su `response_model`).
+
+Se informa la mediana del tiempo por fila (µs) y el pico de memoria
+(tracemalloc, en una pasada aparte para no distorsionar los tiempos). Las
+variantes se ejecutan intercaladas durante varias rondas.
+
+Uso:
+    python -m benchmarks.bench_read_layer --tasks 1000 10000 50000 --rounds 5
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import selectinload
+
+from src.api.database import create_read_engine, create_write_engine
+from src.api.migrations.runner import migrate
+from src.api.models.subtask import Subtask
+from src.api.models.task import Task
+from src.api.reads import select_tasks, with_subtasks
+from src.api.schemas.tasks import TaskResponse
+from src.api.sqlite_profiles import get_profile
+
+STATUSES = ("backlog", "doing", "done")
+TASK_LIST = TypeAdapter(List[TaskResponse])
+
+
+async def seed(engine, n_tasks: int) -> None:
+    """Inserta `n_tasks` tareas con 3 subtasks cada una (una eliminada)."""
+    start = datetime(2024, 1, 1)
+    async with engine.begin() as conn:
+        ids = (await conn.execute(insert(Task).returning(Task.id), [
+            {"name": f"Task {i}", "description": "x" * 120, "status": STATUSES[i % 3],
+             "completed": i % 3 == 2, "created_at": start + timedelta(seconds=i)}
+            for i in range(n_tasks)
+        ])).scalars().all()
+        await conn.execute(insert(Subtask), [
+            {"task_id": task_id, "name": f"Sub {j}", "position": j, "completed": j == 0,
+             "created_at": start, "deleted_at": start if j == 2 else None}
+            for task_id in ids
+            for j in range(3)
+        ])
+
+
+async def orm_listing(maker: async_sessionmaker) -> bytes:
+    """Listado por el camino ORM + Pydantic."""
+    async with maker() as session:
+        result = await session.execute(
+            select(Task)
+            .options(selectinload(Task.subtasks.and_(Subtask.deleted_at.is_(None))))
+            .where(Task.deleted_at.is_(None))
+            .order_by(Task.created_at, Task.id)
+        )
+        return TASK_LIST.dump_json([TaskResponse.model_validate(task) for task in result.scalars()])
+
+
+async def core_listing(maker: async_sessionmaker) -> bytes:
+    """Listado por la capa Core."""
+    async with maker() as session:
+        rows = (await session.execute(
+            select_tasks().where(Task.deleted_at.is_(None)).order_by(Task.created_at, Task.id)
+        )).all()
+        documents = await with_subtasks(session, rows)
+        return TASK_LIST.dump_json(TASK_LIST.validate_python(documents))
+
+
+async def peak_memory(fn, maker: async_sessionmaker) -> int:
+    """Pico de memoria (bytes) de una pasada de `fn`."""
+    tracemalloc.start()
+    try:
+        await fn(maker)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+async def run_size(n_tasks: int, rounds: int) -> dict[str, tuple[float, int]]:
+    """Mediana (µs por tarea) y pico de memoria (bytes) de cada camino."""
+    profile = get_profile("balanced")
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        write_engine = create_write_engine(url, profile)
+        await migrate(write_engine)
+        await seed(write_engine, n_tasks)
+        read_engine = create_read_engine(url, profile, pool_size=1)
+        maker = async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+
+        variants = {"orm": orm_listing, "core": core_listing}
+        documents = {label: await fn(maker) for label, fn in variants.items()}
+        assert documents["orm"] == documents["core"], "Los listados no coinciden"
+
+        timings = {label: [] for label in variants}
+        for _ in range(rounds):
+            for label, fn in variants.items():
+                start = time.perf_counter()
+                await fn(maker)
+                timings[label].append((time.perf_counter() - start) * 1e6 / n_tasks)
+        peaks = {label: await peak_memory(fn, maker) for label, fn in variants.items()}
+
+        await read_engine.dispose()
+        await write_engine.dispose()
+        return {label: (statistics.median(timings[label]), peaks[label]) for label in variants}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"Listado de tareas, mediana de {args.rounds} rondas")
+    print(f"{'tareas':<10}{'orm µs/t':>10}{'core µs/t':>11}{'speedup':>9}{'orm MB':>9}{'core MB':>9}")
+    for n_tasks in args.tasks:
+        results = await run_size(n_tasks, args.rounds)
+        orm_us, orm_peak = results["orm"]
+        core_us, core_peak = results["core"]
+        print(
+            f"{n_tasks:<10}{orm_us:>10.1f}{core_us:>11.1f}{orm_us / core_us:>8.1f}x"
+            f"{orm_peak / 1e6:>9.1f}{core_peak / 1e6:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,146 @@
+"""
+Benchmark: lecturas calientes desde SQLite frente al modelo en memoria.
+
+Para cada tamaño llena una base de datos temporal con tareas (3 subtasks
+por tarea, una de ellas eliminada), carga el modelo de lectura
+(`read_model.py`) y mide, por request, el trabajo de cada ruta hasta los
+bytes de la respuesta:
+
+- page: GET /tasks?status=doing&limit=50 (primera página de una columna).
+- task: GET /tasks/{id} de una tarea al azar.
+- subtasks: GET /tasks/{id}/subtasks de una tarea al azar.
+
+`sqlite` es el camino de las rutas con el modelo deshabilitado (Core +
+`task_documents`); `memory` el del modelo. Se informa la mediana (µs por
+request), el tiempo de carga del modelo y su memoria según `memory()`. Las
+variantes se ejecutan intercaladas durante varias rondas.
+
+Uso:
+    python -m benchmarks.bench_read_model --tasks 1000 10000 50000 --rounds 5
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from benchmarks.bench_read_layer import seed
+from src.api.database import create_read_engine, create_write_engine
+from src.api.migrations.runner import migrate
+from src.api.models.subtask import Subtask
+from src.api.models.task import Task
+from src.api.pagination import PaginatedResponse, paginate
+from src.api.read_model import ReadModel
+from src.api.reads import as_dicts, select_subtasks, select_tasks, task_documents
+from src.api.schemas.subtasks import SubtaskResponse
+from src.api.schemas.tasks import TaskListFilters, TaskResponse
+from src.api.serialization import dump_response
+from src.api.sqlite_profiles import get_profile
+
+PAGE_SIZE = 50
+FILTERS = TaskListFilters(status="doing")
+TASK_PAGE = PaginatedResponse[TaskResponse]
+SUBTASK_PAGE = PaginatedResponse[SubtaskResponse]
+
+
+async def sqlite_page(db: AsyncSession, model: ReadModel, task_id: int) -> bytes:
+    query = select_tasks().where(Task.status == "doing", Task.deleted_at.is_(None))
+    page = await paginate(db, query, keys=(Task.created_at, Task.id),
+                          key=lambda task: (task.created_at, task.id), limit=PAGE_SIZE)
+    return dump_response(TASK_PAGE, page.envelope(await task_documents(db, page.rows)))
+
+
+async def memory_page(db: AsyncSession, model: ReadModel, task_id: int) -> bytes:
+    page = model.task_page(FILTERS, PAGE_SIZE)
+    return dump_response(TASK_PAGE, page.envelope([task.document() for task in page.rows]))
+
+
+async def sqlite_task(db: AsyncSession, model: ReadModel, task_id: int) -> bytes:
+    rows = (await db.execute(select_tasks().where(Task.id == task_id, Task.deleted_at.is_(None)))).all()
+    return dump_response(TaskResponse, (await task_documents(db, rows))[0])
+
+
+async def memory_task(db: AsyncSession, model: ReadModel, task_id: int) -> bytes:
+    return dump_response(TaskResponse, model.get_task(task_id).document())
+
+
+async def sqlite_subtasks(db: AsyncSession, model: ReadModel, task_id: int) -> bytes:
+    await db.execute(select(Task.id).where(Task.id == task_id, Task.deleted_at.is_(None)))
+    query = select_subtasks().where(Subtask.task_id == task_id, Subtask.deleted_at.is_(None))
+    page = await paginate(db, query, keys=(Subtask.position, Subtask.id),
+                          key=lambda subtask: (subtask.position, subtask.id), limit=PAGE_SIZE)
+    return dump_response(SUBTASK_PAGE, page.envelope(as_dicts(page.rows)))
+
+
+async def memory_subtasks(db: AsyncSession, model: ReadModel, task_id: int) -> bytes:
+    page = model.subtask_page(task_id, PAGE_SIZE)
+    return dump_response(SUBTASK_PAGE, page.envelope(page.rows))
+
+
+ROUTES = {
+    "page": (sqlite_page, memory_page),
+    "task": (sqlite_task, memory_task),
+    "subtasks": (sqlite_subtasks, memory_subtasks),
+}
+
+
+async def run_size(n_tasks: int, rounds: int, requests: int) -> tuple[dict, ReadModel]:
+    """Mediana (µs por request) de cada ruta y variante, y el modelo cargado."""
+    profile = get_profile("balanced")
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        write_engine = create_write_engine(url, profile)
+        await migrate(write_engine)
+        await seed(write_engine, n_tasks)
+        read_engine = create_read_engine(url, profile, pool_size=1)
+        maker = async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+        model = ReadModel()
+        await model.load(maker)
+
+        rng = random.Random(0)
+        task_ids = [rng.randint(1, n_tasks) for _ in range(requests)]
+        timings = {(route, variant): [] for route in ROUTES for variant in ("sqlite", "memory")}
+        async with maker() as db:
+            for route, (from_sqlite, from_memory) in ROUTES.items():
+                assert await from_sqlite(db, model, 1) == await from_memory(db, model, 1), route
+            for _ in range(rounds):
+                for route, variants in ROUTES.items():
+                    for variant, fn in zip(("sqlite", "memory"), variants):
+                        start = time.perf_counter()
+                        for task_id in task_ids:
+                            await fn(db, model, task_id)
+                        timings[route, variant].append((time.perf_counter() - start) * 1e6 / requests)
+
+        await read_engine.dispose()
+        await write_engine.dispose()
+        return {key: statistics.median(values) for key, values in timings.items()}, model
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=200, help="Requests por ruta y ronda")
+    args = parser.parse_args()
+
+    print(f"Lecturas calientes, mediana de {args.rounds} rondas (µs por request)")
+    print(f"{'tareas':<10}{'ruta':<10}{'sqlite':>10}{'memory':>10}{'speedup':>9}")
+    for n_tasks in args.tasks:
+        results, model = await run_size(n_tasks, args.rounds, args.requests)
+        for route in ROUTES:
+            sqlite_us, memory_us = results[route, "sqlite"], results[route, "memory"]
+            print(f"{n_tasks:<10}{route:<10}{sqlite_us:>10.1f}{memory_us:>10.1f}{sqlite_us / memory_us:>8.1f}x")
+        memory = model.memory()
+        print(
+            f"{'':<10}modelo: carga {model.stats.load_ms:.0f} ms, "
+            f"{memory['total_bytes'] / 1e6:.1f} MB ({memory['total_bytes'] / n_tasks:.0f} B/tarea)"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
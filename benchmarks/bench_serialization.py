@@ -0,0 +1,113 @@
+"""
+Benchmark: coste de serialización por tarea, antes y después de `json_response`.
+
+Sin base de datos: se construyen en memoria `N` tareas ORM (3 subtasks cada
+una) y se mide solo el paso de objetos a bytes JSON de `List[TaskResponse]`:
+
+- before: `TaskResponse.model_validate` por tarea en la ruta y después la
+  validación + serialización de FastAPI con el `response_model` de la ruta
+  (`fastapi.routing.serialize_response`, el camino real de FastAPI).
+- after: `serialization.dump_response` (una validación con el `TypeAdapter`
+  cacheado y `dump_json`).
+
+Ambos caminos producen los mismos bytes (se comprueba antes de medir). Las
+variantes se ejecutan intercaladas durante varias rondas y se informa la
+mediana en µs por tarea.
+
+Uso:
+    python -m benchmarks.bench_serialization --tasks 100 1000 10000 --rounds 7
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute, serialize_response
+
+from src.api.models.subtask import Subtask
+from src.api.models.task import Task
+from src.api.schemas.tasks import TaskResponse
+from src.api.serialization import dump_response
+
+STATUSES = ("backlog", "doing", "done")
+
+
+def build_tasks(n_tasks: int) -> list[Task]:
+    """`n_tasks` tareas ORM transitorias con 3 subtasks cada una."""
+    start = datetime(2024, 1, 1)
+    return [
+        Task(
+            id=i + 1, name=f"Task {i}", description="x" * 120, status=STATUSES[i % 3],
+            completed=i % 3 == 2, created_at=start + timedelta(seconds=i, microseconds=i % 7),
+            subtasks=[
+                Subtask(id=i * 3 + j + 1, task_id=i + 1, name=f"Sub {j}", position=j,
+                        completed=j == 0, created_at=start)
+                for j in range(3)
+            ],
+        )
+        for i in range(n_tasks)
+    ]
+
+
+def response_field():
+    """El `response_field` que FastAPI crea para `response_model=List[TaskResponse]`."""
+    app = FastAPI()
+
+    @app.get("/tasks", response_model=List[TaskResponse])
+    async def tasks():  # pragma: no cover - solo se usa su response_field
+        return []
+
+    route = next(route for route in app.routes if isinstance(route, APIRoute) and route.path == "/tasks")
+    return route.response_field
+
+
+async def before(tasks: list[Task], field) -> bytes:
+    """model_validate en la ruta + response_model de FastAPI."""
+    content = [TaskResponse.model_validate(task) for task in tasks]
+    return await serialize_response(field=field, response_content=content, dump_json=True)
+
+
+async def after(tasks: list[Task], field) -> bytes:
+    """Una validación y `dump_json` con el adapter cacheado."""
+    return dump_response(List[TaskResponse], tasks)
+
+
+async def run_size(n_tasks: int, rounds: int) -> dict[str, float]:
+    """Mediana (µs por tarea) de cada camino para `n_tasks` tareas."""
+    tasks = build_tasks(n_tasks)
+    field = response_field()
+    variants = {"before": before, "after": after}
+
+    documents = {label: await fn(tasks, field) for label, fn in variants.items()}
+    assert documents["before"] == documents["after"], "Los documentos no coinciden"
+
+    timings = {label: [] for label in variants}
+    for _ in range(rounds):
+        for label, fn in variants.items():
+            start = time.perf_counter()
+            await fn(tasks, field)
+            timings[label].append((time.perf_counter() - start) * 1e6 / n_tasks)
+    return {label: statistics.median(timings[label]) for label in variants}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, nargs="+", default=[100, 1_000, 10_000])
+    parser.add_argument("--rounds", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"Serialización de List[TaskResponse], mediana de {args.rounds} rondas")
+    print(f"{'tareas':<10}{'before µs/t':>13}{'after µs/t':>12}{'speedup':>10}")
+    for n_tasks in args.tasks:
+        results = await run_size(n_tasks, args.rounds)
+        print(
+            f"{n_tasks:<10}{results['before']:>13.2f}{results['after']:>12.2f}"
+            f"{results['before'] / results['after']:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,167 @@
+"""
+Benchmark: overhead por request de la sesión de base de datos a alto QPS.
+
+Compara dos dependencies de sesión para rutas de lectura:
+
+- legacy: sesión transaccional que hace commit al final de cada request
+  (comportamiento anterior de `get_db`).
+- read: pool de lectores en autocommit, sin commit ni rollback.
+
+Se mide tanto a nivel HTTP (ASGITransport) como abriendo sesiones
+directamente, que aísla el coste de la sesión del resto de la request.
+
+Las variantes se ejecutan intercaladas durante varias rondas y se informa
+la mediana, para reducir el ruido del entorno.
+
+Uso:
+    python -m benchmarks.bench_session_overhead --requests 5000 --concurrency 32 --rounds 5
+"""
+import argparse
+import asyncio
+import contextlib
+import os
+import statistics
+import tempfile
+import time
+
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.main import app
+from src.api.database import (
+    Base,
+    create_read_engine,
+    create_write_engine,
+    get_read_db,
+    get_read_sessionmaker,
+    get_write_sessionmaker,
+)
+from src.api.models.project import Project
+from src.api.sqlite_profiles import get_profile, install_pragmas
+
+
+async def run_load(client: AsyncClient, method: str, path: str, total: int, concurrency: int,
+                   body: dict | None = None) -> list[float]:
+    """Lanza `total` requests con `concurrency` en vuelo y devuelve latencias (ms)."""
+    latencies = []
+    queue = iter(range(total))
+
+    async def worker() -> None:
+        for _ in queue:
+            start = time.perf_counter()
+            response = await client.request(method, path, json=body)
+            latencies.append((time.perf_counter() - start) * 1000)
+            assert response.status_code < 400, response.text
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+async def run_sessions(get_db, total: int, concurrency: int) -> list[float]:
+    """Abre `total` sesiones vía la dependency `get_db` y devuelve latencias (ms)."""
+    latencies = []
+    queue = iter(range(total))
+
+    async def worker() -> None:
+        for _ in queue:
+            start = time.perf_counter()
+            dependency = get_db()
+            session = await anext(dependency)
+            (await session.execute(select(Project).where(Project.id == 1))).scalar_one()
+            with contextlib.suppress(StopAsyncIteration):
+                await anext(dependency)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+def report(label: str, rounds: list[tuple[float, list[float]]]) -> None:
+    """Imprime la mediana entre rondas de throughput, p50 y p99."""
+    throughput = statistics.median(len(lat) / elapsed for elapsed, lat in rounds)
+    p50 = statistics.median(statistics.median(lat) for _, lat in rounds)
+    p99 = statistics.median(sorted(lat)[int(len(lat) * 0.99) - 1] for _, lat in rounds)
+    print(f"{label:<28}{throughput:>10.0f} req/s{p50:>10.2f} ms p50{p99:>10.2f} ms p99")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    profile = get_profile("balanced")
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        write_engine = create_write_engine(url, profile)
+        async with write_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        write_maker = async_sessionmaker(write_engine, class_=AsyncSession, expire_on_commit=False)
+
+        # Engine "legacy": pool transaccional por defecto (pysqlite), sin solo-lectura
+        legacy_engine = create_async_engine(url, pool_size=8, max_overflow=0)
+        install_pragmas(legacy_engine, profile)
+        legacy_maker = async_sessionmaker(legacy_engine, class_=AsyncSession, expire_on_commit=False)
+        read_engine = create_read_engine(url, profile, pool_size=8)
+        read_maker = async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+
+        async def legacy_get_db():
+            async with legacy_maker() as session:
+                try:
+                    yield session
+                    await session.commit()
+                except Exception:
+                    await session.rollback()
+                    raise
+                finally:
+                    await session.close()
+
+        app.dependency_overrides[get_write_sessionmaker] = lambda: write_maker
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://bench") as client:
+            await client.post("/projects/", json={"name": "Bench", "color": "#000000"})
+
+            print(f"GET /projects/1 x {args.requests} (concurrencia {args.concurrency}, "
+                  f"mediana de {args.rounds} rondas)")
+            variants = {
+                "legacy (commit en lecturas)": {get_read_db: legacy_get_db},
+                "lector autocommit": {get_read_sessionmaker: lambda: read_maker},
+            }
+            results = {label: [] for label in variants}
+            for _ in range(args.rounds):
+                for label, overrides in variants.items():
+                    app.dependency_overrides.update(overrides)
+                    await run_load(client, "GET", "/projects/1", 200, args.concurrency)  # warm-up
+                    start = time.perf_counter()
+                    latencies = await run_load(client, "GET", "/projects/1", args.requests, args.concurrency)
+                    results[label].append((time.perf_counter() - start, latencies))
+                    for key in overrides:
+                        app.dependency_overrides.pop(key)
+            for label, rounds in results.items():
+                report(label, rounds)
+
+        print(f"\nSesión directa x {args.requests} (concurrencia {args.concurrency}, "
+              f"mediana de {args.rounds} rondas)")
+        session_variants = {
+            "legacy (commit en lecturas)": legacy_get_db,
+            "lector autocommit": lambda: get_read_db(read_maker),
+        }
+        results = {label: [] for label in session_variants}
+        for _ in range(args.rounds):
+            for label, get_db in session_variants.items():
+                await run_sessions(get_db, 200, args.concurrency)  # warm-up
+                start = time.perf_counter()
+                latencies = await run_sessions(get_db, args.requests, args.concurrency)
+                results[label].append((time.perf_counter() - start, latencies))
+        for label, rounds in results.items():
+            report(label, rounds)
+
+        app.dependency_overrides.clear()
+        for engine in (write_engine, legacy_engine, read_engine):
+            await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,118 @@
+"""
+Benchmark: throughput de escritura según el número de proyectos activos.
+
+Para 1, 2, 4 y 8 proyectos activos lanza workers concurrentes que crean
+tareas (POST /tasks/) repartidas entre esos proyectos durante un tiempo
+fijo, con el almacenamiento en modo `single` (un único app.db) y en modo
+`sharded` (un fichero por proyecto). En modo single el throughput no
+depende del número de proyectos: todas las escrituras esperan al mismo
+lock. En modo sharded debería crecer con los proyectos activos.
+
+Los modos se alternan en cada ronda y se informa de la mediana.
+
+Uso:
+    python -m benchmarks.bench_shard_writes --seconds 3 --workers 16 --rounds 3 --profile durable
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.main import app
+from src.api.database import (
+    create_read_engine,
+    create_write_engine,
+    get_read_sessionmaker,
+    get_write_sessionmaker,
+)
+from src.api.migrations.runner import migrate
+from src.api.sharding import start_sharding, stop_sharding
+from src.api.sqlite_profiles import PROFILES, get_profile
+
+MODES = ("single", "sharded")
+
+
+async def run_writes(client: AsyncClient, project_ids: list[int], seconds: float, workers: int) -> int:
+    """Crea tareas repartidas entre `project_ids` durante `seconds` y devuelve cuántas."""
+    created = 0
+    deadline = time.perf_counter() + seconds
+
+    async def worker(index: int) -> None:
+        nonlocal created
+        i = index
+        while time.perf_counter() < deadline:
+            project_id = project_ids[i % len(project_ids)]
+            response = await client.post("/tasks/", json={"name": f"Task {i}", "project_id": project_id})
+            assert response.status_code == 201, response.text
+            created += 1
+            i += workers
+
+    await asyncio.gather(*(worker(i) for i in range(workers)))
+    return created
+
+
+async def run_mode(mode: str, projects: int, args: argparse.Namespace) -> float:
+    """Throughput (tareas/s) de un modo con `projects` proyectos activos."""
+    profile = get_profile(args.profile)
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite+aiosqlite:///{os.path.join(tmp, 'app.db')}"
+        write_engine = create_write_engine(url, profile)
+        read_engine = create_read_engine(url, profile, pool_size=4)
+        await migrate(write_engine)
+        if mode == "sharded":
+            start_sharding(write_engine, read_engine, os.path.join(tmp, "shards"), profile)
+        else:
+            write_maker = async_sessionmaker(write_engine, class_=AsyncSession, expire_on_commit=False)
+            read_maker = async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+            app.dependency_overrides[get_write_sessionmaker] = lambda: write_maker
+            app.dependency_overrides[get_read_sessionmaker] = lambda: read_maker
+
+        try:
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+                project_ids = []
+                for i in range(projects):
+                    response = await client.post("/projects/", json={"name": f"Project {i}", "color": "#000000"})
+                    project_ids.append(response.json()["id"])
+                # Calentamiento: abre los ficheros de shard y sus engines
+                for project_id in project_ids:
+                    await client.post("/tasks/", json={"name": "Warmup", "project_id": project_id})
+
+                start = time.perf_counter()
+                created = await run_writes(client, project_ids, args.seconds, args.workers)
+                return created / (time.perf_counter() - start)
+        finally:
+            app.dependency_overrides.clear()
+            await stop_sharding()
+            await read_engine.dispose()
+            await write_engine.dispose()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--projects", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--profile", choices=list(PROFILES), default="durable")
+    args = parser.parse_args()
+
+    print(f"POST /tasks/ durante {args.seconds:g} s, {args.workers} workers, perfil {args.profile}, "
+          f"mediana de {args.rounds} rondas")
+    print(f"{'proyectos':<12}" + "".join(f"{mode + ' ops/s':>16}" for mode in MODES) + f"{'speedup':>10}")
+    for projects in args.projects:
+        results = {mode: [] for mode in MODES}
+        for _ in range(args.rounds):
+            for mode in MODES:
+                results[mode].append(await run_mode(mode, projects, args))
+        medians = {mode: statistics.median(values) for mode, values in results.items()}
+        speedup = medians["sharded"] / medians["single"]
+        print(f"{projects:<12}" + "".join(f"{medians[mode]:>16.0f}" for mode in MODES) + f"{speedup:>9.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,145 @@
+"""
+Benchmark: listado completo materializado frente a NDJSON en streaming.
+
+Para cada tamaño llena una base de datos temporal con tareas (3 subtasks
+por tarea, una de ellas eliminada) y mide, para todas las tareas activas:
+
+- list: `select_tasks` + `with_subtasks` sobre todas las filas y un único
+  `dump_response(List[TaskResponse])` (el listado como una lista JSON).
+- ndjson: `stream_task_documents` + `ndjson_response`, consumiendo el cuerpo
+  de la respuesta lote a lote (lo que hace GET /tasks?stream=true).
+
+Se informa la mediana del tiempo total y del tiempo hasta el primer byte, y
+el pico de memoria (tracemalloc, en una pasada aparte). Las variantes se
+ejecutan intercaladas durante varias rondas.
+
+Uso:
+    python -m benchmarks.bench_streaming --tasks 10000 50000 100000 --rounds 3
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import List
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.api.database import create_read_engine, create_write_engine
+from src.api.migrations.runner import migrate
+from src.api.models.subtask import Subtask
+from src.api.models.task import Task
+from src.api.reads import select_tasks, stream_task_documents, with_subtasks
+from src.api.schemas.tasks import TaskResponse
+from src.api.serialization import dump_response
+from src.api.sqlite_profiles import get_profile
+from src.api.streaming import ndjson_response
+
+STATUSES = ("backlog", "doing", "done")
+
+
+async def seed(engine, n_tasks: int) -> None:
+    """Inserta `n_tasks` tareas con 3 subtasks cada una (una eliminada)."""
+    start = datetime(2024, 1, 1)
+    async with engine.begin() as conn:
+        ids = (await conn.execute(insert(Task).returning(Task.id), [
+            {"name": f"Task {i}", "description": "x" * 120, "status": STATUSES[i % 3],
+             "completed": i % 3 == 2, "created_at": start + timedelta(seconds=i)}
+            for i in range(n_tasks)
+        ])).scalars().all()
+        await conn.execute(insert(Subtask), [
+            {"task_id": task_id, "name": f"Sub {j}", "position": j, "completed": j == 0,
+             "created_at": start, "deleted_at": start if j == 2 else None}
+            for task_id in ids
+            for j in range(3)
+        ])
+
+
+def active_tasks():
+    """Tareas activas, en el orden de GET /tasks."""
+    return select_tasks().where(Task.deleted_at.is_(None)).order_by(Task.created_at, Task.id)
+
+
+async def full_list(maker: async_sessionmaker) -> tuple[float, int]:
+    """Listado materializado: (segundos hasta el primer byte, bytes)."""
+    start = time.perf_counter()
+    async with maker() as session:
+        rows = (await session.execute(active_tasks())).all()
+        content = dump_response(List[TaskResponse], await with_subtasks(session, rows))
+    return time.perf_counter() - start, len(content)
+
+
+async def ndjson(maker: async_sessionmaker) -> tuple[float, int]:
+    """Listado en streaming: (segundos hasta el primer byte, bytes)."""
+    start = time.perf_counter()
+    first_byte = None
+    size = 0
+    async with maker() as session:
+        response = ndjson_response(TaskResponse, stream_task_documents(session, active_tasks()))
+        async for chunk in response.body_iterator:
+            if first_byte is None:
+                first_byte = time.perf_counter() - start
+            size += len(chunk)
+    return first_byte, size
+
+
+async def peak_memory(fn, maker: async_sessionmaker) -> int:
+    """Pico de memoria (bytes) de una pasada de `fn`."""
+    tracemalloc.start()
+    try:
+        await fn(maker)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+async def run_size(n_tasks: int, rounds: int) -> dict[str, tuple[float, float, int]]:
+    """Mediana de (ms total, ms al primer byte) y pico de memoria de cada camino."""
+    profile = get_profile("balanced")
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        write_engine = create_write_engine(url, profile)
+        await migrate(write_engine)
+        await seed(write_engine, n_tasks)
+        read_engine = create_read_engine(url, profile, pool_size=1)
+        maker = async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+
+        variants = {"list": full_list, "ndjson": ndjson}
+        totals = {label: [] for label in variants}
+        first_bytes = {label: [] for label in variants}
+        for _ in range(rounds):
+            for label, fn in variants.items():
+                start = time.perf_counter()
+                first_byte, _ = await fn(maker)
+                totals[label].append((time.perf_counter() - start) * 1000)
+                first_bytes[label].append(first_byte * 1000)
+        peaks = {label: await peak_memory(fn, maker) for label, fn in variants.items()}
+
+        await read_engine.dispose()
+        await write_engine.dispose()
+        return {
+            label: (statistics.median(totals[label]), statistics.median(first_bytes[label]), peaks[label])
+            for label in variants
+        }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, nargs="+", default=[10_000, 50_000, 100_000])
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"Listado completo de tareas, mediana de {args.rounds} rondas")
+    print(f"{'tareas':<10}{'variante':<10}{'total ms':>10}{'1er byte ms':>13}{'pico MB':>10}")
+    for n_tasks in args.tasks:
+        results = await run_size(n_tasks, args.rounds)
+        for label, (total_ms, first_byte_ms, peak) in results.items():
+            print(f"{n_tasks:<10}{label:<10}{total_ms:>10.1f}{first_byte_ms:>13.1f}{peak / 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -181,7 +181,7 @@ test.describe('Edge Cases - API Errors', () => {
         route.fulfill({
           status: 200,
           contentType: 'application/json',
-          body: JSON.stringify(mockTasks),
+          body: JSON.stringify({ items: mockTasks, limit: 50, next_cursor: null }),
         });
       } else {
         route.continue();
@@ -215,7 +215,7 @@ test.describe('Edge Cases - API Errors', () => {
         route.fulfill({
           status: 200,
           contentType: 'application/json',
-          body: JSON.stringify(mockTasks),
+          body: JSON.stringify({ items: mockTasks, limit: 50, next_cursor: null }),
         });
       } else {
         route.continue();
@@ -253,7 +253,7 @@ test.describe('Edge Cases - Network', () => {
         route.fulfill({
           status: 200,
           contentType: 'application/json',
-          body: JSON.stringify([]),
+          body: JSON.stringify({ items: [], limit: 50, next_cursor: null }),
         });
       } else {
         route.continue();
@@ -9,7 +9,7 @@ test.describe('Estados de la UI', () => {
         route.fulfill({
           status: 200,
           contentType: 'application/json',
-          body: JSON.stringify([]),
+          body: JSON.stringify({ items: [], limit: 50, next_cursor: null }),
         });
       } else {
         route.continue();
@@ -31,7 +31,7 @@ test.describe('Estados de la UI', () => {
         route.fulfill({
           status: 200,
           contentType: 'application/json',
-          body: JSON.stringify([]),
+          body: JSON.stringify({ items: [], limit: 50, next_cursor: null }),
         });
       } else {
         route.continue();
@@ -78,7 +78,7 @@ test.describe('Estados de la UI', () => {
         route.fulfill({
           status: 200,
           contentType: 'application/json',
-          body: JSON.stringify(mockTasks),
+          body: JSON.stringify({ items: mockTasks, limit: 50, next_cursor: null }),
         });
       } else {
         route.continue();
@@ -105,7 +105,7 @@ test.describe('Estados de la UI', () => {
         route.fulfill({
           status: 200,
           contentType: 'application/json',
-          body: JSON.stringify(mockTasks),
+          body: JSON.stringify({ items: mockTasks, limit: 50, next_cursor: null }),
         });
       } else {
         route.continue();
@@ -31,6 +31,9 @@ const mockProjects = [
   { id: 2, name: 'Proyecto 2', description: 'Descripción Proyecto 2' },
 ];
 
+// Helper para el envoltorio paginado de los listados (una sola pagina)
+const page = (items: unknown[]) => ({ items, limit: 50, next_cursor: null });
+
 // Helper para mockear fetch con tasks y projects
 const mockFetchResponses = (tasks: unknown[] = [], projects: unknown[] = mockProjects) => {
   vi.spyOn(global, 'fetch').mockImplementation((url) => {
@@ -42,7 +45,7 @@ const mockFetchResponses = (tasks: unknown[] = [], projects: unknown[] = mockPro
     }
     return Promise.resolve({
       ok: true,
-      json: async () => tasks,
+      json: async () => page(tasks),
     } as Response);
   });
 };
@@ -147,7 +150,7 @@ describe('App', () => {
           statusChangeCalled = true;
           return Promise.resolve({ ok: true, json: async () => updatedTask } as Response);
         }
-        return Promise.resolve({ ok: true, json: async () => mockTasks } as Response);
+        return Promise.resolve({ ok: true, json: async () => page(mockTasks) } as Response);
       });
 
       render(<App />);
@@ -188,7 +191,7 @@ describe('App', () => {
         if (typeof url === 'string' && url.includes('/status')) {
           return Promise.resolve({ ok: false, status: 500 } as Response);
         }
-        return Promise.resolve({ ok: true, json: async () => mockTasks } as Response);
+        return Promise.resolve({ ok: true, json: async () => page(mockTasks) } as Response);
       });
 
       render(<App />);
@@ -253,7 +256,7 @@ describe('App', () => {
           deleteCalled = true;
           return Promise.resolve({ ok: true } as Response);
         }
-        return Promise.resolve({ ok: true, json: async () => mockTasks } as Response);
+        return Promise.resolve({ ok: true, json: async () => page(mockTasks) } as Response);
       });
 
       render(<App />);
@@ -303,7 +306,7 @@ describe('App', () => {
           postCalled = true;
           return Promise.resolve({ ok: true, json: async () => newTask } as Response);
         }
-        return Promise.resolve({ ok: true, json: async () => [] } as Response);
+        return Promise.resolve({ ok: true, json: async () => page([]) } as Response);
       });
 
       render(<App />);
@@ -336,7 +339,7 @@ describe('App', () => {
         if (options?.method === 'POST') {
           postCalled = true;
         }
-        return Promise.resolve({ ok: true, json: async () => [] } as Response);
+        return Promise.resolve({ ok: true, json: async () => page([]) } as Response);
       });
 
       render(<App />);
@@ -370,7 +373,7 @@ describe('App', () => {
         if (options?.method === 'POST') {
           return Promise.resolve({ ok: true, json: async () => newTask } as Response);
         }
-        return Promise.resolve({ ok: true, json: async () => [] } as Response);
+        return Promise.resolve({ ok: true, json: async () => page([]) } as Response);
       });
 
       render(<App />);
@@ -398,7 +401,7 @@ describe('App', () => {
         if (options?.method === 'POST') {
           return Promise.resolve({ ok: false, status: 400 } as Response);
         }
-        return Promise.resolve({ ok: true, json: async () => [] } as Response);
+        return Promise.resolve({ ok: true, json: async () => page([]) } as Response);
       });
 
       render(<App />);
@@ -430,7 +433,7 @@ describe('App', () => {
           toggleCalled = true;
           return Promise.resolve({ ok: true, json: async () => updatedTask } as Response);
         }
-        return Promise.resolve({ ok: true, json: async () => mockTasks } as Response);
+        return Promise.resolve({ ok: true, json: async () => page(mockTasks) } as Response);
       });
 
       render(<App />);
@@ -457,7 +460,7 @@ describe('App', () => {
         if (options?.method === 'PATCH') {
           return Promise.resolve({ ok: false, status: 500 } as Response);
         }
-        return Promise.resolve({ ok: true, json: async () => mockTasks } as Response);
+        return Promise.resolve({ ok: true, json: async () => page(mockTasks) } as Response);
       });
 
       render(<App />);
@@ -488,7 +491,7 @@ describe('App', () => {
           deleteCalled = true;
           return Promise.resolve({ ok: true } as Response);
         }
-        return Promise.resolve({ ok: true, json: async () => mockTasks } as Response);
+        return Promise.resolve({ ok: true, json: async () => page(mockTasks) } as Response);
       });
 
       render(<App />);
@@ -519,7 +522,7 @@ describe('App', () => {
         if (options?.method === 'DELETE') {
           return Promise.resolve({ ok: false, status: 500 } as Response);
         }
-        return Promise.resolve({ ok: true, json: async () => mockTasks } as Response);
+        return Promise.resolve({ ok: true, json: async () => page(mockTasks) } as Response);
       });
 
       render(<App />);
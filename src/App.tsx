@@ -19,6 +19,25 @@ interface Task {
   subtasks: Subtask[];
 }
 
+interface Page<T> {
+  items: T[];
+  next_cursor: string | null;
+}
+
+// Los listados de la API estan paginados por cursor: se piden todas las paginas
+async function fetchAllPages<T>(url: string, errorMessage: string): Promise<T[]> {
+  const items: T[] = [];
+  let next: string | null = url;
+  while (next) {
+    const response = await fetch(next);
+    if (!response.ok) throw new Error(errorMessage);
+    const page: Page<T> = await response.json();
+    items.push(...page.items);
+    next = page.next_cursor ? `${url}?cursor=${encodeURIComponent(page.next_cursor)}` : null;
+  }
+  return items;
+}
+
 function App() {
   const [tasks, setTasks] = useState<Task[]>([]);
   const [projects, setProjects] = useState<Project[]>([]);
@@ -33,9 +52,7 @@ function App() {
 
   const fetchTasks = useCallback(async () => {
     try {
-      const response = await fetch(`${API_URL}/tasks`);
-      if (!response.ok) throw new Error('Error al cargar tareas');
-      const data = await response.json();
+      const data = await fetchAllPages<Task>(`${API_URL}/tasks`, 'Error al cargar tareas');
       setTasks(data);
       setError(null);
     } catch (err) {
@@ -58,9 +75,10 @@ function App() {
 
   const fetchSubtasks = useCallback(async (taskId: number) => {
     try {
-      const response = await fetch(`${API_URL}/tasks/${taskId}/subtasks`);
-      if (!response.ok) throw new Error('Error al cargar subtareas');
-      const data = await response.json();
+      const data = await fetchAllPages<Subtask>(
+        `${API_URL}/tasks/${taskId}/subtasks`,
+        'Error al cargar subtareas'
+      );
       setSubtasks(data);
     } catch (err) {
       console.error('Error cargando subtareas:', err);
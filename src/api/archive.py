@@ -0,0 +1,216 @@
+"""
+Archivado de tareas terminadas hace tiempo (almacenamiento frío).
+
+Las tareas `done` sin actividad desde hace más de `older_than_days` días
+(último de `updated_at`, `completed_at`, `created_at`) se mueven, con todas
+sus subtasks, a `tasks_archive`/`subtasks_archive`. Así `tasks` y `subtasks`
+quedan dimensionadas al trabajo en curso y no al histórico.
+
+El archivado se hace en lotes de `batch_size` tareas, cada lote en su propia
+transacción (copiar al archivo y borrar de las tablas activas es atómico por
+lote), con una pausa entre lotes para ceder el lock de escritura.
+
+Las tareas eliminadas (soft delete) no se archivan: las purga la política de
+retención. Una tarea archivada se puede restaurar con su id original
+(`tasks` usa AUTOINCREMENT y no reutiliza ids).
+
+Uso:
+    python -m src.api.archive --older-than-days 90 --batch-size 200
+"""
+import argparse
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta, UTC
+from typing import Optional
+
+from sqlalchemy import delete, func, insert, literal, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from .config import get_settings
+from .migrations.runner import run_in_batches
+from .models.archive import SubtaskArchive, TaskArchive
+from .models.subtask import Subtask
+from .models.task import Task
+from .models.types import EpochMicros
+
+_TASK_COLUMNS = [column.name for column in Task.__table__.columns]
+_SUBTASK_COLUMNS = [column.name for column in Subtask.__table__.columns]
+
+
+@dataclass
+class ArchiveResult:
+    """Resultado de un archivado."""
+
+    cutoff: datetime
+    tasks: int = 0
+    subtasks: int = 0
+    batches: int = 0
+
+    def add_batch(self, tasks: int, subtasks: int) -> None:
+        """Acumula las filas movidas por un lote."""
+        self.tasks += tasks
+        self.subtasks += subtasks
+        self.batches += 1
+
+    def as_dict(self) -> dict:
+        """Representación serializable."""
+        return {
+            "cutoff": self.cutoff.isoformat(),
+            "tasks": self.tasks,
+            "subtasks": self.subtasks,
+            "batches": self.batches,
+        }
+
+
+def archive_cutoff(older_than_days: float, now: Optional[datetime] = None) -> datetime:
+    """Fecha límite: se archivan las tareas sin actividad desde antes de ella."""
+    return (now or datetime.now(UTC)) - timedelta(days=older_than_days)
+
+
+def _last_activity():
+    return func.coalesce(Task.updated_at, Task.completed_at, Task.created_at)
+
+
+async def archive_batch(conn: AsyncConnection, cutoff: datetime, batch_size: int) -> tuple[int, int]:
+    """
+    Mueve al archivo un lote de tareas archivables y sus subtasks.
+
+    Debe ejecutarse dentro de una transacción: la copia y el borrado de las
+    tablas activas se confirman juntos.
+
+    Args:
+        conn: Conexión con una transacción abierta
+        cutoff: Fecha límite de actividad
+        batch_size: Tareas máximas del lote
+
+    Returns:
+        tuple: (tareas, subtasks) archivadas
+    """
+    ids = (await conn.execute(
+        select(Task.id)
+        .where(
+            Task.status == "done",
+            Task.deleted_at.is_(None),
+            _last_activity() < cutoff,
+        )
+        .order_by(Task.id)
+        .limit(batch_size)
+    )).scalars().all()
+    if not ids:
+        return 0, 0
+
+    archived_at = literal(datetime.now(UTC), EpochMicros())
+    tasks = Task.__table__
+    subtasks = Subtask.__table__
+    await conn.execute(
+        insert(TaskArchive.__table__).from_select(
+            [*_TASK_COLUMNS, "archived_at"],
+            select(*tasks.columns, archived_at).where(tasks.c.id.in_(ids)),
+        )
+    )
+    moved = await conn.execute(
+        insert(SubtaskArchive.__table__).from_select(
+            _SUBTASK_COLUMNS,
+            select(*subtasks.columns).where(subtasks.c.task_id.in_(ids)),
+        )
+    )
+    await conn.execute(delete(subtasks).where(subtasks.c.task_id.in_(ids)))
+    await conn.execute(delete(tasks).where(tasks.c.id.in_(ids)))
+    return len(ids), moved.rowcount
+
+
+async def archive_done_tasks(
+    engine: AsyncEngine,
+    older_than_days: float,
+    batch_size: int = 200,
+    pause: float = 0.05,
+) -> ArchiveResult:
+    """
+    Archiva en lotes todas las tareas terminadas sin actividad reciente.
+
+    Args:
+        engine: Engine de escritura
+        older_than_days: Días sin actividad para archivar una tarea
+        batch_size: Tareas por transacción
+        pause: Segundos a esperar entre lotes
+
+    Returns:
+        ArchiveResult: Tareas, subtasks y lotes archivados
+    """
+    result = ArchiveResult(cutoff=archive_cutoff(older_than_days))
+
+    async def _batch(conn: AsyncConnection) -> int:
+        tasks, subtasks = await archive_batch(conn, result.cutoff, batch_size)
+        if tasks:
+            result.add_batch(tasks, subtasks)
+        return tasks
+
+    await run_in_batches(engine, _batch, pause=pause)
+    return result
+
+
+async def restore_task(db: AsyncSession, task_id: int) -> bool:
+    """
+    Devuelve una tarea archivada (y sus subtasks) a las tablas activas.
+
+    La tarea conserva su id y su estado; `updated_at` pasa a ahora, de forma
+    que no se vuelve a archivar hasta que pase otra vez el periodo completo.
+
+    Args:
+        db: Sesión de escritura (la transacción la gestiona quien la abre)
+        task_id: ID de la tarea archivada
+
+    Returns:
+        bool: False si la tarea no está en el archivo
+    """
+    archived = TaskArchive.__table__
+    subtasks_archived = SubtaskArchive.__table__
+    now = literal(datetime.now(UTC), EpochMicros())
+    restored = await db.execute(
+        insert(Task.__table__).from_select(
+            _TASK_COLUMNS,
+            select(*(
+                now if name == "updated_at" else archived.c[name]
+                for name in _TASK_COLUMNS
+            )).where(archived.c.id == task_id),
+        )
+    )
+    if restored.rowcount == 0:
+        return False
+
+    await db.execute(
+        insert(Subtask.__table__).from_select(
+            _SUBTASK_COLUMNS,
+            select(*(subtasks_archived.c[name] for name in _SUBTASK_COLUMNS))
+            .where(subtasks_archived.c.task_id == task_id),
+        )
+    )
+    await db.execute(delete(subtasks_archived).where(subtasks_archived.c.task_id == task_id))
+    await db.execute(delete(archived).where(archived.c.id == task_id))
+    return True
+
+
+async def _cli(args: argparse.Namespace) -> None:
+    from .database import engine
+
+    try:
+        result = await archive_done_tasks(engine, args.older_than_days, args.batch_size, args.pause_ms / 1000)
+        print(
+            f"OK - {result.tasks} tareas y {result.subtasks} subtasks archivadas "
+            f"en {result.batches} lotes (sin actividad desde {result.cutoff:%Y-%m-%d})"
+        )
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Archiva las tareas terminadas sin actividad reciente")
+    parser.add_argument("--older-than-days", type=float, default=settings.archive_after_days, help="Días sin actividad")
+    parser.add_argument("--batch-size", type=int, default=settings.archive_batch_size, help="Tareas por transacción")
+    parser.add_argument("--pause-ms", type=float, default=settings.maintenance_step_pause_ms, help="Pausa entre lotes (ms)")
+    asyncio.run(_cli(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
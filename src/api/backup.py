@@ -0,0 +1,192 @@
+"""
+Backups online de la base de datos con la API de backup de SQLite.
+
+La copia se hace por pasos de `pages_per_step` páginas, con una pausa entre
+pasos para no competir por disco y CPU con las requests. La conexión origen
+mantiene abierta una transacción de lectura durante toda la copia: con WAL
+los escritores siguen trabajando y la copia es un snapshot consistente del
+momento en que empezó (sin ella, cada escritura de otra conexión reinicia el
+backup, que con escrituras continuas no terminaría nunca).
+
+La copia resultante queda en modo `journal_mode=DELETE`: es un único fichero
+autocontenido.
+
+Solo en modo `single`: en modo sharded `app.db` es solo el catálogo (las
+tareas están en los ficheros de shard) y una copia suya no sería un backup
+de la aplicación, así que se rechaza.
+
+Uso:
+    python -m src.api.backup backups/app-snapshot.db
+    python -m src.api.backup backups/app-snapshot.db.gz --gzip --pages 512 --pause-ms 2
+"""
+import argparse
+import asyncio
+import gzip
+import os
+import shutil
+import sqlite3
+import time
+import zlib
+from dataclasses import asdict, dataclass
+from typing import AsyncIterator, Optional
+
+from sqlalchemy.engine import make_url
+
+from .config import get_settings
+
+# Tamaño de los bloques leídos al comprimir/enviar una copia
+CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class BackupResult:
+    """Resultado de un backup."""
+
+    path: str
+    pages: int
+    steps: int
+    bytes: int
+    duration_ms: float
+
+    def as_dict(self) -> dict:
+        """Representación serializable."""
+        return asdict(self)
+
+
+def database_path(url: str) -> Optional[str]:
+    """Ruta del fichero SQLite de una URL, o None si la base de datos está en memoria."""
+    database = make_url(url).database
+    if not database or database == ":memory:" or "mode=memory" in database:
+        return None
+    return database
+
+
+def get_backup_source() -> Optional[str]:
+    """Dependency con la ruta de la base de datos de la aplicación (None si está en memoria)."""
+    return database_path(get_settings().database_url)
+
+
+def get_backup_dir() -> str:
+    """Dependency con el directorio donde se guardan los backups."""
+    return get_settings().backup_dir
+
+
+def _backup_sync(source: str, destination: str, pages_per_step: int, step_pause: float) -> BackupResult:
+    start = time.perf_counter()
+    steps = 0
+    pages = 0
+
+    def _progress(status: int, remaining: int, total: int) -> None:
+        nonlocal steps, pages
+        steps += 1
+        pages = total
+        if remaining:
+            time.sleep(step_pause)
+
+    tmp_destination = f"{destination}.partial"
+    src = sqlite3.connect(source, isolation_level=None)
+    dst = sqlite3.connect(tmp_destination, isolation_level=None)
+    try:
+        # Transacción de lectura: fija el snapshot que se va a copiar
+        src.execute("BEGIN")
+        src.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+        src.backup(dst, pages=pages_per_step, progress=_progress)
+        src.execute("COMMIT")
+        dst.execute("PRAGMA journal_mode=DELETE")
+    except BaseException:
+        dst.close()
+        os.remove(tmp_destination)
+        raise
+    finally:
+        dst.close()
+        src.close()
+    os.replace(tmp_destination, destination)
+
+    return BackupResult(
+        path=destination,
+        pages=pages,
+        steps=steps,
+        bytes=os.path.getsize(destination),
+        duration_ms=(time.perf_counter() - start) * 1000,
+    )
+
+
+async def backup_database(
+    source: str,
+    destination: str,
+    pages_per_step: int = 256,
+    step_pause: float = 0.005,
+) -> BackupResult:
+    """
+    Copia la base de datos `source` en `destination` sin detener la aplicación.
+
+    La copia se ejecuta en un thread: el event loop no se bloquea. Se escribe
+    primero en `<destination>.partial` y se renombra al terminar, así que
+    `destination` nunca contiene una copia a medias.
+
+    Args:
+        source: Ruta del fichero SQLite origen
+        destination: Ruta del fichero de backup
+        pages_per_step: Páginas copiadas por paso
+        step_pause: Segundos de pausa entre pasos
+
+    Returns:
+        BackupResult: Páginas, pasos, tamaño y duración de la copia
+    """
+    directory = os.path.dirname(destination)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    return await asyncio.to_thread(_backup_sync, source, destination, pages_per_step, step_pause)
+
+
+async def iter_file(path: str, compress: bool = False) -> AsyncIterator[bytes]:
+    """
+    Lee un fichero por bloques, opcionalmente comprimido en gzip.
+
+    La lectura y la compresión se ejecutan en un thread para no bloquear el
+    event loop con ficheros grandes.
+    """
+    compressor = zlib.compressobj(wbits=31) if compress else None  # 31 = formato gzip
+    with open(path, "rb") as file:
+        while True:
+            chunk = await asyncio.to_thread(file.read, CHUNK_SIZE)
+            if not chunk:
+                break
+            if compressor is not None:
+                chunk = await asyncio.to_thread(compressor.compress, chunk)
+            if chunk:
+                yield chunk
+    if compressor is not None:
+        yield compressor.flush()
+
+
+async def _cli(args: argparse.Namespace) -> None:
+    if get_settings().storage_mode == "sharded":
+        raise SystemExit("Backup no disponible con storage_mode=sharded (solo copiaría el catálogo)")
+    source = get_backup_source()
+    if source is None:
+        raise SystemExit("La base de datos está en memoria: no se puede hacer backup")
+
+    destination = args.destination[:-3] if args.gzip and args.destination.endswith(".gz") else args.destination
+    result = await backup_database(source, destination, args.pages, args.pause_ms / 1000)
+    print(f"OK - {result.pages} páginas copiadas en {result.steps} pasos ({result.duration_ms:.0f} ms)")
+
+    if args.gzip:
+        with open(destination, "rb") as raw, gzip.open(f"{destination}.gz", "wb") as compressed:
+            shutil.copyfileobj(raw, compressed, CHUNK_SIZE)
+        os.remove(destination)
+        destination = f"{destination}.gz"
+    print(f"Backup completado: {destination}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backup online de la base de datos")
+    parser.add_argument("destination", help="Fichero de destino")
+    parser.add_argument("--gzip", action="store_true", help="Comprimir la copia")
+    parser.add_argument("--pages", type=int, default=256, help="Páginas por paso")
+    parser.add_argument("--pause-ms", type=float, default=5.0, help="Pausa entre pasos (ms)")
+    asyncio.run(_cli(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Coalescing (single-flight) de lecturas idénticas concurrentes.
+
+Cuando un equipo abre el tablero a la vez, o el frontend vuelve a pedir
+GET /tasks/ tras cada toggle, llegan decenas de requests iguales al mismo
+tiempo. El middleware ejecuta solo la primera (la *líder*): las que llegan
+mientras está en curso esperan su respuesta y la reciben tal cual, sin otra
+consulta ni otra serialización.
+
+Dos requests son idénticas si coinciden la ruta, los query params (en
+cualquier orden), las cabeceras que cambian la respuesta (`KEY_HEADERS`) y la
+versión global de los datos (versions.py). Una escritura confirmada cambia
+la versión antes de responder, así que una lectura que llega después de
+ella nunca se une a una consulta anterior al commit.
+
+Solo se agrupan GETs de las rutas de `COALESCED_PREFIXES`, y nunca los
+listados en streaming (NDJSON). No es una caché: la respuesta se descarta
+en cuanto termina la request líder.
+"""
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Hashable, Optional, TypeVar
+from urllib.parse import parse_qsl
+
+from .streaming import NDJSON_MEDIA_TYPE
+from .versions import get_data_versions
+
+T = TypeVar("T")
+
+# Rutas de lectura que se agrupan
+COALESCED_PREFIXES = ("/tasks", "/projects", "/board")
+
+# Cabeceras de la request que forman parte de la clave (con If-None-Match
+# la respuesta puede ser un 304; CORS responde con el Origin de la request)
+KEY_HEADERS = (b"accept", b"if-none-match", b"origin")
+
+
+class _LeaderCancelled(Exception):
+    """La request líder se canceló (p. ej. el cliente cerró la conexión)."""
+
+
+@dataclass
+class CoalescingStats:
+    """Métricas: requests que ejecutaron la consulta (misses) y que se unieron a otra (hits)."""
+
+    hits: int = 0
+    misses: int = 0
+    bypassed: int = 0
+    leader_cancelled: int = 0
+
+    def as_dict(self) -> dict:
+        """Representación serializable con el ratio de aciertos."""
+        shared = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "leader_cancelled": self.leader_cancelled,
+            "hit_ratio": round(self.hits / shared, 4) if shared else 0.0,
+        }
+
+
+class SingleFlight:
+    """Ejecuciones en curso por clave: las llamadas concurrentes con la misma clave comparten una."""
+
+    def __init__(self):
+        self.stats = CoalescingStats()
+        self._flights: dict[Hashable, asyncio.Future] = {}
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    async def run(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Ejecuta `fn`, o espera el resultado de la ejecución en curso con la misma `key`.
+
+        Si la líder se cancela, quien esperaba ejecuta `fn` por su cuenta.
+        Las excepciones de la líder se propagan a todas.
+        """
+        flight = self._flights.get(key)
+        if flight is not None:
+            try:
+                result = await asyncio.shield(flight)
+            except _LeaderCancelled:
+                self.stats.leader_cancelled += 1
+            else:
+                self.stats.hits += 1
+                return result
+
+        self.stats.misses += 1
+        flight = asyncio.get_running_loop().create_future()
+        self._flights[key] = flight
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            flight.set_exception(_LeaderCancelled())
+            raise
+        except BaseException as exc:
+            flight.set_exception(exc)
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            # Sin nadie esperando, la excepción no debe avisar como "never retrieved"
+            if flight.done() and not flight.cancelled():
+                flight.exception()
+
+
+def request_key(scope: dict) -> Optional[tuple]:
+    """
+    Clave normalizada de una lectura agrupable, o None si no se agrupa.
+
+    Ruta, query params ordenados, `KEY_HEADERS` y versión de los datos.
+    """
+    if scope["type"] != "http" or scope["method"] != "GET":
+        return None
+    path = scope["path"]
+    if not path.startswith(COALESCED_PREFIXES):
+        return None
+    params = tuple(sorted(parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True)))
+    headers = dict(scope["headers"])
+    if NDJSON_MEDIA_TYPE.encode() in headers.get(b"accept", b"") or any(name == "stream" for name, _ in params):
+        return None
+    return (
+        path,
+        params,
+        tuple(headers.get(name) for name in KEY_HEADERS),
+        get_data_versions().version,
+    )
+
+
+class CoalescingMiddleware:
+    """
+    Middleware ASGI de single-flight para las lecturas (ver el docstring del módulo).
+
+    La líder se ejecuta con un `send` que guarda los mensajes de la
+    respuesta; al terminar, cada request del grupo los reenvía a su cliente.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        flights = get_single_flight()
+        key = request_key(scope) if flights is not None else None
+        if key is None:
+            if flights is not None and scope["type"] == "http" and scope["method"] == "GET":
+                flights.stats.bypassed += 1
+            await self.app(scope, receive, send)
+            return
+
+        async def respond() -> list[dict[str, Any]]:
+            messages = []
+
+            async def capture(message: dict[str, Any]) -> None:
+                messages.append(message)
+
+            await self.app(scope, receive, capture)
+            return messages
+
+        for message in await flights.run(key, respond):
+            await send(message)
+
+
+_single_flight: Optional[SingleFlight] = None
+
+
+def get_single_flight() -> Optional[SingleFlight]:
+    """Dependency con el single-flight activo, o None si está deshabilitado."""
+    return _single_flight
+
+
+def start_coalescing() -> SingleFlight:
+    """Activa el coalescing de lecturas en la aplicación."""
+    global _single_flight
+    _single_flight = SingleFlight()
+    return _single_flight
+
+
+def stop_coalescing() -> None:
+    """Desactiva el coalescing (las requests en curso terminan normalmente)."""
+    global _single_flight
+    _single_flight = None
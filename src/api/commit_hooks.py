@@ -0,0 +1,72 @@
+"""
+Callbacks que se ejecutan cuando una transacción de sesión se confirma.
+
+Varios componentes en memoria (el modelo de lectura, los contadores de
+versión) deben reflejar una escritura solo cuando es definitiva. `on_commit`
+registra un callback en la transacción activa de la sesión:
+
+- se ejecuta en el `after_commit` de la transacción externa (el commit de
+  un savepoint todavía no confirma nada);
+- se descarta si esa transacción, o el savepoint en el que se registró (cada
+  request del pipeline de escritura va en el suyo), hace rollback.
+
+Los callbacks se ejecutan en orden de registro y son síncronos: no deben
+hacer I/O.
+"""
+from typing import Callable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+# Clave en `Session.info` de los callbacks pendientes de commit
+_PENDING_KEY = "commit_hooks_pending"
+
+
+def on_commit(
+    session: AsyncSession | Session,
+    callback: Callable[[], None],
+    on_discard: Optional[Callable[[], None]] = None,
+) -> None:
+    """
+    Ejecuta `callback` cuando se confirme la transacción activa de `session`.
+
+    Args:
+        session: Sesión (async o sync) con la transacción de la escritura
+        callback: Se llama tras el commit de la transacción externa
+        on_discard: Se llama si la escritura se deshace en su lugar
+    """
+    if isinstance(session, AsyncSession):
+        session = session.sync_session
+    transaction = session.get_nested_transaction() or session.get_transaction()
+    session.info.setdefault(_PENDING_KEY, []).append((transaction, callback, on_discard))
+
+
+@event.listens_for(Session, "after_commit")
+def _run_pending(session: Session) -> None:
+    if session.in_nested_transaction():
+        return
+    for _, callback, _ in session.info.pop(_PENDING_KEY, ()):
+        callback()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending(session: Session, previous_transaction) -> None:
+    pending = session.info.get(_PENDING_KEY)
+    if not pending:
+        return
+
+    def rolled_back(transaction) -> bool:
+        while transaction is not None:
+            if transaction is previous_transaction:
+                return True
+            transaction = transaction.parent
+        return False
+
+    kept = []
+    for entry in pending:
+        if not rolled_back(entry[0]):
+            kept.append(entry)
+        elif entry[2] is not None:
+            entry[2]()
+    session.info[_PENDING_KEY] = kept
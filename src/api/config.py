@@ -0,0 +1,211 @@
+"""Configuración de la aplicación leída de variables de entorno."""
+import os
+from functools import lru_cache
+from typing import Literal, Optional
+from pydantic import BaseModel, Field, model_validator
+
+ENV_PREFIX = "APP_"
+
+
+class Settings(BaseModel):
+    """
+    Settings de la aplicación.
+
+    Cada campo se puede sobrescribir con la variable de entorno
+    `APP_<NOMBRE_EN_MAYUSCULAS>`, p. ej. `APP_SQLITE_PROFILE=throughput`.
+    """
+
+    database_url: str = Field(
+        default="sqlite+aiosqlite:///./app.db",
+        description="URL de conexión SQLAlchemy (driver async)",
+    )
+    sqlite_profile: Literal["durable", "balanced", "throughput"] = Field(
+        default="balanced",
+        description="Perfil de PRAGMAs aplicado a cada conexión SQLite",
+    )
+    read_pool_size: int = Field(
+        default=4,
+        ge=1,
+        description="Conexiones de solo lectura en el pool de lectores",
+    )
+    storage_mode: Literal["single", "sharded"] = Field(
+        default="single",
+        description=(
+            "single: todo en database_url; sharded: tasks/subtasks en un fichero por proyecto "
+            "(solo con una base de datos sin tareas: no migra las existentes)"
+        ),
+    )
+    shard_dir: str = Field(
+        default="./shards",
+        description="Directorio de los ficheros de shard (modo sharded)",
+    )
+    shard_read_pool_size: int = Field(
+        default=2,
+        ge=1,
+        description="Conexiones de solo lectura por shard (modo sharded)",
+    )
+    write_pipeline_enabled: bool = Field(
+        default=False,
+        description="Agrupa las escrituras en lotes con un único commit (group commit)",
+    )
+    write_batch_size: int = Field(
+        default=64,
+        ge=1,
+        description="Requests máximas por lote del pipeline de escritura",
+    )
+    write_batch_max_wait_ms: float = Field(
+        default=2.0,
+        ge=0,
+        description="Espera máxima (ms) para completar un lote antes de ejecutarlo",
+    )
+    read_model_enabled: bool = Field(
+        default=False,
+        description="Sirve las lecturas calientes de tasks/subtasks desde un modelo en memoria",
+    )
+    read_model_check_reads: bool = Field(
+        default=False,
+        description="Compara cada lectura del modelo en memoria con SQLite (responde con SQLite)",
+    )
+    read_coalescing_enabled: bool = Field(
+        default=True,
+        description="Las lecturas idénticas concurrentes comparten una consulta (single-flight)",
+    )
+    etags_enabled: bool = Field(
+        default=False,
+        description=(
+            "ETag e If-None-Match (304) en las lecturas; solo con un único proceso que escriba "
+            "(sin varios workers ni los CLIs de archive/retention/maintenance en paralelo)"
+        ),
+    )
+    maintenance_enabled: bool = Field(
+        default=True,
+        description="Arranca el scheduler de mantenimiento de SQLite en el lifespan",
+    )
+    maintenance_step_pause_ms: float = Field(
+        default=50.0,
+        ge=0,
+        description="Pausa (ms) entre pasos de un job de mantenimiento",
+    )
+    maintenance_optimize_interval_s: float = Field(
+        default=3600,
+        ge=0,
+        description="Intervalo (s) de PRAGMA optimize (0 = deshabilitado)",
+    )
+    maintenance_analyze_interval_s: float = Field(
+        default=86400,
+        ge=0,
+        description="Intervalo (s) de ANALYZE completo (0 = deshabilitado)",
+    )
+    maintenance_analysis_limit: int = Field(
+        default=1000,
+        ge=0,
+        description="Filas por índice que examinan optimize/ANALYZE (0 = sin límite)",
+    )
+    maintenance_wal_checkpoint_interval_s: float = Field(
+        default=60,
+        ge=0,
+        description="Intervalo (s) de comprobación del tamaño del WAL (0 = deshabilitado)",
+    )
+    maintenance_wal_checkpoint_threshold_mb: float = Field(
+        default=64,
+        ge=0,
+        description="Tamaño del WAL (MiB) a partir del cual se hace checkpoint TRUNCATE",
+    )
+    maintenance_checkpoint_busy_timeout_ms: int = Field(
+        default=10,
+        ge=0,
+        description="Espera máxima (ms) del checkpoint TRUNCATE a los lectores",
+    )
+    maintenance_incremental_vacuum_interval_s: float = Field(
+        default=600,
+        ge=0,
+        description="Intervalo (s) de incremental_vacuum (0 = deshabilitado)",
+    )
+    maintenance_incremental_vacuum_pages: int = Field(
+        default=128,
+        ge=1,
+        description="Páginas liberadas por paso de incremental_vacuum",
+    )
+    maintenance_incremental_vacuum_max_steps: int = Field(
+        default=64,
+        ge=1,
+        description="Pasos máximos de incremental_vacuum por ejecución",
+    )
+    maintenance_archive_interval_s: float = Field(
+        default=0,
+        ge=0,
+        description=(
+            "Intervalo (s) del archivado de tareas terminadas (0 = deshabilitado, por defecto: "
+            "las tareas archivadas dejan de aparecer en GET /tasks y /board)"
+        ),
+    )
+    archive_after_days: float = Field(
+        default=90,
+        gt=0,
+        description="Días sin actividad tras los que una tarea terminada se archiva",
+    )
+    archive_batch_size: int = Field(
+        default=200,
+        ge=1,
+        description="Tareas archivadas por transacción",
+    )
+    maintenance_retention_interval_s: float = Field(
+        default=0,
+        ge=0,
+        description=(
+            "Intervalo (s) de la purga de filas eliminadas (0 = deshabilitado, por defecto). "
+            "La purga es irreversible: las filas purgadas ya no se ven con show_deleted=true"
+        ),
+    )
+    retention_days: float = Field(
+        default=30,
+        ge=0,
+        description="Días que se conservan las tareas y subtasks eliminadas antes de purgarlas",
+    )
+    retention_batch_size: int = Field(
+        default=500,
+        ge=1,
+        description="Filas purgadas por transacción",
+    )
+    backup_dir: str = Field(
+        default="./db_backups",
+        description="Directorio donde POST /admin/backup guarda los snapshots",
+    )
+    backup_pages_per_step: int = Field(
+        default=256,
+        ge=1,
+        description="Páginas copiadas por paso de la API de backup de SQLite",
+    )
+    backup_step_pause_ms: float = Field(
+        default=5.0,
+        ge=0,
+        description="Pausa (ms) entre pasos del backup",
+    )
+    admin_token: Optional[str] = Field(
+        default=None,
+        description="Token para /admin/* (cabecera X-Admin-Token); sin token el router está deshabilitado",
+    )
+
+    @model_validator(mode="after")
+    def _check_storage_mode(self) -> "Settings":
+        if self.storage_mode == "sharded" and self.write_pipeline_enabled:
+            raise ValueError("write_pipeline_enabled is not supported with storage_mode=sharded")
+        if self.storage_mode == "sharded" and self.read_model_enabled:
+            raise ValueError("read_model_enabled is not supported with storage_mode=sharded")
+        return self
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """Construye los settings a partir de las variables de entorno."""
+        values = {
+            name: os.environ[ENV_PREFIX + name.upper()]
+            for name in cls.model_fields
+            if ENV_PREFIX + name.upper() in os.environ
+        }
+        return cls(**values)
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """Devuelve los settings de la aplicación (cacheados)."""
+    return Settings.from_env()
@@ -1,28 +1,141 @@
-"""Configuración de base de datos SQLite con SQLAlchemy 2.0 async."""
-from typing import AsyncGenerator
+"""
+Configuración de base de datos SQLite con SQLAlchemy 2.0 async.
+
+Expone dos caminos hacia la misma base de datos:
+
+- Escritor: engine con UNA sola conexión. Las transacciones de escritura se
+  serializan esperando en el pool, en lugar de competir por el lock de SQLite
+  y fallar con `database is locked`.
+- Lectores: pool de conexiones abiertas con `mode=ro` y `query_only`. Con WAL
+  las lecturas no esperan al escritor.
+"""
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator, Optional
+from fastapi import Depends
+from sqlalchemy import event
+from sqlalchemy.engine import URL, make_url
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
 from sqlalchemy.orm import DeclarativeBase
 
+from .config import get_settings
+from .sqlite_profiles import SqliteProfile, get_profile, install_pragmas
+from .write_pipeline import WritePipeline, get_write_pipeline
+
+settings = get_settings()
+
 # URL de conexión SQLite async
-DATABASE_URL = "sqlite+aiosqlite:///./app.db"
+DATABASE_URL = settings.database_url
 
-# Engine async
-engine = create_async_engine(
-    DATABASE_URL,
-    echo=False,  # Cambiar a True para debug SQL
-    future=True,
-)
+# Perfil de PRAGMAs activo (ver sqlite_profiles.py)
+sqlite_profile = get_profile(settings.sqlite_profile)
+
+
+def is_memory_database(url: str) -> bool:
+    """Indica si la URL apunta a una base de datos SQLite en memoria."""
+    database = make_url(url).database
+    return not database or database == ":memory:" or "mode=memory" in database
+
+
+def read_only_url(url: str) -> URL:
+    """Convierte una URL de fichero SQLite en su variante URI `mode=ro`."""
+    parsed = make_url(url)
+    return parsed.set(
+        database=f"file:{parsed.database}",
+        query={**parsed.query, "mode": "ro", "uri": "true"},
+    )
+
+
+def install_transaction_control(engine: AsyncEngine, begin: str = "BEGIN IMMEDIATE") -> None:
+    """
+    Delega el control de transacciones en SQLAlchemy en lugar de en pysqlite.
+
+    pysqlite no emite BEGIN antes de un SAVEPOINT, así que el RELEASE del
+    savepoint más externo hace commit de toda la transacción. Desactivando su
+    gestión implícita y emitiendo BEGIN explícitamente, los savepoints quedan
+    anidados dentro de la transacción de la sesión.
+
+    Con `BEGIN IMMEDIATE` el lock de escritura se adquiere al empezar la
+    transacción: si otro proceso lo tiene, se espera `busy_timeout` en ese
+    punto en lugar de fallar con `database is locked` al hacer commit.
+
+    Args:
+        engine: Engine async de SQLAlchemy
+        begin: Sentencia con la que se abre cada transacción
+    """
+    @event.listens_for(engine.sync_engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _emit_begin(conn):
+        # En AUTOCOMMIT SQLAlchemy no abre transacción real (p. ej. para
+        # PRAGMAs que no se pueden cambiar dentro de una transacción)
+        if conn.get_execution_options().get("isolation_level") != "AUTOCOMMIT":
+            conn.exec_driver_sql(begin)
 
-# Session factory
+
+def create_write_engine(url: str, profile: SqliteProfile) -> AsyncEngine:
+    """Crea el engine de escritura: una única conexión compartida."""
+    if is_memory_database(url):
+        write_engine = create_async_engine(url, echo=False)
+    else:
+        write_engine = create_async_engine(
+            url,
+            echo=False,  # Cambiar a True para debug SQL
+            pool_size=1,
+            max_overflow=0,
+        )
+    install_pragmas(write_engine, profile)
+    install_transaction_control(write_engine)
+    return write_engine
+
+
+def create_read_engine(url: str, profile: SqliteProfile, pool_size: int) -> AsyncEngine:
+    """
+    Crea el pool de lectores con conexiones de solo lectura.
+
+    Las conexiones trabajan en autocommit: cada SELECT es su propia
+    transacción de lectura implícita, así que no hay BEGIN/COMMIT que
+    enviar ni ROLLBACK al devolver la conexión al pool.
+    """
+    read_engine = create_async_engine(
+        read_only_url(url),
+        echo=False,
+        pool_size=pool_size,
+        max_overflow=0,
+        isolation_level="AUTOCOMMIT",
+        pool_reset_on_return=None,
+    )
+    install_pragmas(read_engine, profile, read_only=True)
+    return read_engine
+
+
+# Engine de escritura (también usado por migraciones y scripts)
+engine = create_write_engine(DATABASE_URL, sqlite_profile)
+
+# Pool de lectores. Una base de datos en memoria no se puede compartir entre
+# conexiones independientes, así que en ese caso se lee desde el escritor.
+if is_memory_database(DATABASE_URL):
+    read_engine = engine
+else:
+    read_engine = create_read_engine(DATABASE_URL, sqlite_profile, settings.read_pool_size)
+
+# Session factories
 async_session_maker = async_sessionmaker(
     engine,
     class_=AsyncSession,
     expire_on_commit=False,
 )
+read_session_maker = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
 
 
 class Base(DeclarativeBase):
@@ -30,33 +143,104 @@ class Base(DeclarativeBase):
     pass
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+# Session factories activas: el modo sharded (ver sharding.py) las sustituye
+_active_session_makers = (read_session_maker, async_session_maker)
+
+
+def use_session_makers(
+    read_maker: Optional[async_sessionmaker[AsyncSession]] = None,
+    write_maker: Optional[async_sessionmaker[AsyncSession]] = None,
+) -> None:
+    """Sustituye las session factories de la aplicación (sin argumentos: restaura las de app.db)."""
+    global _active_session_makers
+    _active_session_makers = (read_maker or read_session_maker, write_maker or async_session_maker)
+
+
+def get_read_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """Dependency con la session factory del pool de lectores (sobrescribible en tests)."""
+    return _active_session_makers[0]
+
+
+def get_write_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """Dependency con la session factory del escritor (sobrescribible en tests)."""
+    return _active_session_makers[1]
+
+
+@asynccontextmanager
+async def session_scope(
+    session_maker: async_sessionmaker[AsyncSession],
+) -> AsyncIterator[AsyncSession]:
+    """Abre una sesión, hace commit al salir y rollback si hay excepción."""
+    async with session_maker() as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+
+async def get_read_db(
+    session_maker: async_sessionmaker[AsyncSession] = Depends(get_read_sessionmaker),
+) -> AsyncGenerator[AsyncSession, None]:
     """
-    Dependency para obtener sesión de base de datos.
+    Dependency para obtener una sesión del pool de lectores.
+
+    Usar en rutas GET: la sesión no puede escribir, así que nunca se hace
+    commit (cualquier cambio pendiente en el identity map se descarta). Las
+    conexiones del pool de lectores están en autocommit: cerrar la sesión no
+    cuesta ningún round trip a SQLite.
 
     Yields:
-        AsyncSession: Sesión async de SQLAlchemy
+        AsyncSession: Sesión async de SQLAlchemy de solo lectura
 
     Example:
         @router.get("/items/")
-        async def get_items(db: AsyncSession = Depends(get_db)):
+        async def get_items(db: AsyncSession = Depends(get_read_db)):
             result = await db.execute(select(Item))
             return result.scalars().all()
     """
-    async with async_session_maker() as session:
-        try:
+    async with session_maker() as session:
+        yield session
+
+
+async def get_write_db(
+    session_maker: async_sessionmaker[AsyncSession] = Depends(get_write_sessionmaker),
+    pipeline: Optional[WritePipeline] = Depends(get_write_pipeline),
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency para obtener una sesión sobre el escritor único.
+
+    Usar en rutas que modifican datos, con `scope="function"` para que el
+    commit ocurra antes de enviar la respuesta. Hace commit al terminar la
+    request y rollback si se produce una excepción.
+
+    Si el pipeline de escritura está activo, la request se ejecuta dentro de
+    un savepoint de un lote compartido y espera al commit de ese lote.
+
+    Yields:
+        AsyncSession: Sesión async de SQLAlchemy
+
+    Example:
+        @router.post("/items/")
+        async def create_item(db: AsyncSession = Depends(get_write_db, scope="function")):
+            db.add(Item())
+    """
+    if pipeline is not None:
+        async with pipeline.transaction() as session:
             yield session
-            await session.commit()
-        except Exception:
-            await session.rollback()
-            raise
-        finally:
-            await session.close()
+        return
+
+    async with session_scope(session_maker) as session:
+        yield session
 
 
 async def init_db() -> None:
     """
-    Inicializa la base de datos creando todas las tablas.
+    Inicializa la base de datos aplicando las migraciones pendientes.
+
+    Si la versión y la huella del esquema coinciden con las registradas en
+    `schema_version`, no se ejecuta `create_all` ni ninguna reflexión de DDL.
 
     Se debe llamar en el evento startup de FastAPI.
 
@@ -66,5 +250,7 @@ async def init_db() -> None:
             await init_db()
             yield
     """
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    # Import diferido: las migraciones importan este módulo
+    from .migrations.runner import migrate
+
+    await migrate(engine)
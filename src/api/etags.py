@@ -0,0 +1,182 @@
+"""
+ETags y GET condicionales a partir de las versiones de los datos.
+
+Los clientes que hacen polling de /tasks/, /projects/ o del tablero
+reciben el cuerpo completo aunque nada haya cambiado. Las rutas de lectura
+declaran de qué datos depende su respuesta con una dependency:
+
+- `tables_etag(*tables)`: listados; versión de cada tabla (versions.py).
+- `task_etag`: una tarea y sus subtasks; versión por tarea.
+
+La dependency se resuelve antes que la sesión y que cualquier consulta: si
+`If-None-Match` coincide con el ETag actual responde 304 sin leer ni
+serializar nada. Si no, guarda el ETag en `request.state` y
+`ETagMiddleware` lo añade a la respuesta 200.
+
+El ETag incluye un token del proceso (`EPOCH`): los contadores empiezan en
+0 en cada arranque y un ETag anterior nunca debe coincidir. Se calcula antes
+de la lectura, así que nunca es más nuevo que los datos de la respuesta
+(como mucho el cliente vuelve a descargar un cuerpo que ya tenía).
+
+Un ETag valida la respuesta de una URL. Las variantes de una misma ruta
+con otros `fields=`/`include=` devuelven otro documento: esos parámetros
+forman parte del ETag (`_variant`), así que el ETag de una variante nunca
+valida otra. La respuesta lleva también `Vary: Accept` (JSON y NDJSON son
+la misma URL).
+
+`If-None-Match: *` coincide si el recurso existe. Los listados existen
+siempre y responden 304 directamente; en las rutas de una tarea o subtask
+la dependency no sabe si existe, así que la ruta se ejecuta y
+`ETagMiddleware` convierte su 200 en 304 (un 404 se queda como está).
+
+Los listados en streaming (NDJSON) no llevan ETag. Como el modelo de
+lectura, las versiones son del proceso: una escritura de otro proceso
+(otro worker, `python -m src.api.archive`, `python -m src.api.retention`,
+`python -m src.api.maintenance run ...`) no las cambia y los clientes
+seguirían recibiendo 304 con datos viejos. Por eso está deshabilitado por
+defecto; `etags_enabled` solo debe activarse cuando la API es el único
+proceso que escribe en la base de datos.
+"""
+import hashlib
+import secrets
+from typing import Any, Callable, Iterable, Optional
+
+from fastapi import Depends, Request
+
+from .exceptions import NotModifiedException
+from .streaming import stream_requested
+from .versions import get_data_versions
+
+# Token del proceso: cambia en cada arranque
+EPOCH = secrets.token_hex(4)
+
+# Tablas de las que dependen los documentos de tareas (con sus subtasks)
+TASK_DOCUMENT_TABLES = ("tasks", "subtasks")
+
+_enabled = False
+
+
+# Query params que eligen la representación de una tarea
+VARIANT_PARAMS = ("fields", "include")
+
+
+def _variant(request: Request) -> list[str]:
+    """Huella de `fields=`/`include=` (vacía sin ellos)."""
+    values = [(name, request.query_params.get(name)) for name in VARIANT_PARAMS]
+    if all(value is None for _, value in values):
+        return []
+    return [hashlib.blake2s(repr(values).encode(), digest_size=4).hexdigest()]
+
+
+def _format(request: Request, parts: Iterable[Any]) -> str:
+    return '"' + "-".join([EPOCH, *map(str, parts), *_variant(request)]) + '"'
+
+
+def _if_none_match(request: Request) -> set[str]:
+    """ETags de `If-None-Match` (sin el prefijo `W/`: comparación débil)."""
+    header = request.headers.get("if-none-match")
+    if header is None:
+        return set()
+    return {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+
+def _conditional(request: Request, etag: str, exists: bool) -> str:
+    """
+    Responde 304 si el cliente ya tiene `etag`; si no, lo deja para la respuesta.
+
+    `exists` indica si el recurso existe seguro (listados). Si no se sabe,
+    `*` lo resuelve `ETagMiddleware` con el status de la ruta.
+    """
+    tags = _if_none_match(request)
+    if etag in tags or ("*" in tags and exists):
+        raise NotModifiedException(etag)
+    request.state.etag = etag
+    request.state.etag_any = "*" in tags
+    return etag
+
+
+def tables_etag(*tables: str, streams: bool = True) -> Callable[..., Optional[str]]:
+    """
+    Dependency de una ruta cuya respuesta depende de `tables`.
+
+    Args:
+        tables: Tablas leídas por la ruta
+        streams: Si la ruta admite NDJSON (`stream_requested`); en streaming
+            no hay ETag
+    """
+    def dependency(request: Request) -> Optional[str]:
+        if not _enabled:
+            return None
+        versions = get_data_versions()
+        return _conditional(request, _format(request, (versions.get(table) for table in tables)), exists=True)
+
+    if not streams:
+        return dependency
+
+    def listing(request: Request, stream: bool = Depends(stream_requested)) -> Optional[str]:
+        return None if stream else dependency(request)
+
+    return listing
+
+
+def task_etag(request: Request, task_id: int) -> Optional[str]:
+    """Dependency de una ruta cuya respuesta es la tarea `task_id` o sus subtasks."""
+    if not _enabled:
+        return None
+    return _conditional(request, _format(request, ("t", *get_data_versions().task(task_id))), exists=False)
+
+
+def task_listing_etag(request: Request, task_id: int, stream: bool = Depends(stream_requested)) -> Optional[str]:
+    """`task_etag` para un listado con variante NDJSON (sin ETag en streaming)."""
+    return None if stream else task_etag(request, task_id)
+
+
+class ETagMiddleware:
+    """
+    Añade a las respuestas 200 el ETag que dejó la dependency en `request.state`.
+
+    Con `If-None-Match: *` en una ruta de la que no se sabía si el recurso
+    existía, un 200 se envía como 304 sin cuerpo.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http" or not _enabled:
+            await self.app(scope, receive, send)
+            return
+        # Mismo dict que `request.state` en la ruta
+        state = scope.setdefault("state", {})
+
+        not_modified = False
+
+        async def send_with_etag(message: dict[str, Any]) -> None:
+            nonlocal not_modified
+            etag = state.get("etag")
+            if message["type"] == "http.response.start" and message["status"] == 200 and etag:
+                headers = [(b"etag", etag.encode()), (b"vary", b"accept")]
+                if state.get("etag_any"):
+                    not_modified = True
+                    message = {**message, "status": 304, "headers": headers}
+                else:
+                    message = {**message, "headers": [*message.get("headers", []), *headers]}
+            elif message["type"] == "http.response.body" and not_modified:
+                if message.get("more_body", False):
+                    return
+                message = {**message, "body": b""}
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
+
+
+def start_etags() -> None:
+    """Activa los ETags y los GET condicionales."""
+    global _enabled
+    _enabled = True
+
+
+def stop_etags() -> None:
+    """Desactiva los ETags."""
+    global _enabled
+    _enabled = False
@@ -30,3 +30,13 @@ class InvalidOperationException(HTTPException):
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=message
         )
+
+
+class NotModifiedException(HTTPException):
+    """GET condicional: el cliente ya tiene la versión actual (304, sin cuerpo)."""
+
+    def __init__(self, etag: str):
+        super().__init__(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Vary": "Accept"}
+        )
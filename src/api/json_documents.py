@@ -0,0 +1,158 @@
+"""
+Documentos JSON construidos por SQLite (`json_object` / `json_group_array`).
+
+El camino ORM de un listado lanza dos consultas (tareas y `selectinload` de
+subtasks), instancia un objeto ORM por fila, lo valida con `TaskResponse` y
+FastAPI vuelve a serializar el resultado. Para el tablero completo, SQLite
+puede construir el documento JSON final en una sola consulta y la ruta
+devolver esos bytes tal cual.
+
+El documento es byte a byte el mismo que produce la serialización de
+`TaskResponse` (mismo orden de campos, mismas fechas ISO, mismo escapado de
+strings); `tests/api/test_json_documents.py` lo comprueba. Cualquier cambio
+en `TaskResponse` o `SubtaskResponseNested` debe reflejarse aquí.
+"""
+from typing import Any
+
+from sqlalchemy import BigInteger, Select, SmallInteger, case, func, select, true, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from .models.subtask import Subtask
+from .models.task import Task
+from .models.types import STATUS_VALUES
+from .schemas.tasks import TaskFieldset
+
+_MICROS = 1_000_000
+
+
+def _json_datetime(column) -> ColumnElement:
+    """
+    Fecha ISO de una columna `EpochMicros`, como la serializa Pydantic.
+
+    Pydantic omite la fracción si los microsegundos son 0 y si no escribe
+    siempre 6 dígitos. NULL se mantiene NULL (JSON `null`).
+    """
+    micros = type_coerce(column, BigInteger)
+    return func.strftime("%Y-%m-%dT%H:%M:%S", micros // _MICROS, "unixepoch").op("||")(
+        case(
+            (micros % _MICROS != 0, func.printf(".%06d", micros % _MICROS)),
+            else_="",
+        )
+    )
+
+
+def _json_bool(column) -> ColumnElement:
+    """Booleano JSON (`true`/`false`) a partir de una columna 0/1."""
+    return func.json(case((column == true(), "true"), else_="false"))
+
+
+def _json_status(column) -> ColumnElement:
+    """Status como string a partir de su código SMALLINT."""
+    return case(STATUS_VALUES, value=type_coerce(column, SmallInteger))
+
+
+def _json_object(fields: dict[str, Any]) -> ColumnElement:
+    """`json_object(k1, v1, k2, v2, ...)` en el orden de `fields`."""
+    arguments = []
+    for key, value in fields.items():
+        arguments.extend((key, value))
+    return func.json_object(*arguments)
+
+
+def _group_array(document: ColumnElement, query: Select, *order_by) -> Select:
+    """
+    `json_group_array` de `document` sobre las filas de `query`, en orden.
+
+    El orden se fija en una subconsulta (SQLite 3.40 no admite ORDER BY
+    dentro del agregado). `json()` conserva cada elemento como JSON y no como
+    string al leerlo de la subconsulta.
+    """
+    rows = query.add_columns(document.label("document")).order_by(*order_by).subquery()
+    return select(func.json_group_array(func.json(rows.c.document)))
+
+
+def subtask_json(subtask=Subtask) -> ColumnElement:
+    """Documento `SubtaskResponseNested` de una fila de subtasks."""
+    return _json_object({
+        "id": subtask.id,
+        "task_id": subtask.task_id,
+        "name": subtask.name,
+        "completed": _json_bool(subtask.completed),
+        "position": subtask.position,
+        "created_at": _json_datetime(subtask.created_at),
+        "completed_at": _json_datetime(subtask.completed_at),
+        "deleted_at": _json_datetime(subtask.deleted_at),
+    })
+
+
+def subtask_summary_json(task=Task) -> ColumnElement:
+    """Documento `SubtaskSummary` (`{total, completed}`) de las subtasks activas de una tarea."""
+    return func.json(
+        select(func.json_object(
+            "total", func.count(),
+            "completed", func.count().filter(Subtask.completed == true()),
+        ))
+        .where(Subtask.task_id == task.id, Subtask.deleted_at.is_(None))
+        .correlate(task)
+        .scalar_subquery()
+    )
+
+
+def task_json(task=Task, fieldset: TaskFieldset = TaskFieldset()) -> ColumnElement:
+    """
+    Documento `TaskResponse` de una fila de tasks, con sus subtasks activas.
+
+    Con `fieldset`, el documento de `task_response_schema(fieldset)`: solo
+    esos campos y relaciones, en el mismo orden.
+    """
+    fields = {
+        "name": task.name,
+        "description": task.description,
+        "project_id": task.project_id,
+        "status": _json_status(task.status),
+        "id": task.id,
+        "completed": _json_bool(task.completed),
+        "created_at": _json_datetime(task.created_at),
+        "updated_at": _json_datetime(task.updated_at),
+        "completed_at": _json_datetime(task.completed_at),
+        "deleted_at": _json_datetime(task.deleted_at),
+    }
+    document = {name: fields[name] for name in fieldset.fields}
+    if "subtasks" in fieldset.include:
+        subtasks = _group_array(
+            subtask_json(),
+            select().where(Subtask.task_id == task.id, Subtask.deleted_at.is_(None)).correlate(task),
+            Subtask.id,
+        ).scalar_subquery()
+        document["subtasks"] = func.json(subtasks)
+    if "subtask_summary" in fieldset.include:
+        document["subtask_summary"] = subtask_summary_json(task)
+    return _json_object(document)
+
+
+def board_json_query(tasks: Select, fieldset: TaskFieldset = TaskFieldset()) -> Select:
+    """
+    Consulta que devuelve el array JSON de `TaskResponse` de `tasks`.
+
+    Args:
+        tasks: `select()` sin columnas con los filtros de tareas (WHERE)
+        fieldset: Campos y relaciones de cada tarea (por defecto, todos)
+
+    Returns:
+        Select: Una fila con el documento, en orden `(created_at, id)`
+    """
+    return _group_array(task_json(fieldset=fieldset), tasks.select_from(Task), Task.created_at, Task.id)
+
+
+async def fetch_json_array(db: AsyncSession, query: Select) -> bytes:
+    """
+    Ejecuta una consulta de `json_group_array` y devuelve el array en bytes.
+
+    En modo sharded la consulta se ejecuta en cada shard y llega un array
+    por shard: se concatenan (en orden de shard, sin orden global).
+    """
+    arrays = [document for document in (await db.execute(query)).scalars() if document != "[]"]
+    if len(arrays) == 1:
+        return arrays[0].encode()
+    return ("[" + ",".join(document[1:-1] for document in arrays) + "]").encode()
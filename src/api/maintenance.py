@@ -0,0 +1,538 @@
+"""
+Mantenimiento periódico de la base de datos SQLite.
+
+El scheduler corre como tarea de fondo arrancada en el `lifespan` y ejecuta
+los jobs configurados cuando vence su intervalo:
+
+- optimize: `PRAGMA optimize` (re-ANALYZE de lo que el planner necesite).
+- analyze: `ANALYZE` tabla a tabla con `analysis_limit`.
+- wal_checkpoint: si el WAL supera el umbral, checkpoint PASSIVE y después
+  `wal_checkpoint(TRUNCATE)` para devolver el fichero a tamaño cero.
+- incremental_vacuum: devuelve al sistema las páginas libres en pasos
+  pequeños (requiere `auto_vacuum=INCREMENTAL`).
+- archive: mueve al archivo las tareas terminadas sin actividad reciente
+  (ver `archive.py`), un lote por paso. Deshabilitado salvo que se
+  configure `maintenance_archive_interval_s`.
+- retention: purga las filas eliminadas fuera del periodo de retención
+  (ver `retention.py`), un lote por paso. Borra datos de forma
+  irreversible: deshabilitado salvo que se configure
+  `maintenance_retention_interval_s`.
+
+Cada job se divide en pasos cortos: cada paso usa su propia conexión del
+escritor (el lock de escritura se libera entre pasos) y entre pasos se cede
+el turno durante `step_pause`, de forma que una request de escritura nunca
+espera más de lo que dura un paso.
+
+El checkpoint del WAL no escribe en la base de datos pero puede durar lo que
+tarde en copiar todo el WAL: se ejecuta en una conexión propia, fuera del
+pool del escritor (una sola conexión), para que las escrituras de la API no
+esperen a que termine.
+
+Uso (CLI, con la aplicación parada o en marcha):
+    python -m src.api.maintenance run analyze
+    python -m src.api.maintenance run archive     # también con el intervalo a 0
+    python -m src.api.maintenance enable-incremental-vacuum   # VACUUM completo, offline
+"""
+import argparse
+import asyncio
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, UTC
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from sqlalchemy import text
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from .archive import ArchiveResult, archive_batch, archive_cutoff
+from .config import Settings
+from .read_model import get_read_model
+from .retention import PURGE_ORDER, RetentionResult, purge_batch, retention_cutoff
+from .versions import bump_tables
+
+# Tablas que escribe un lote de archivado
+ARCHIVE_TABLES = ("tasks", "subtasks", "tasks_archive", "subtasks_archive")
+
+JobFn = Callable[["JobContext"], Awaitable[dict]]
+T = TypeVar("T")
+
+
+@dataclass
+class JobStats:
+    """Estadísticas de ejecución de un job."""
+
+    runs: int = 0
+    failures: int = 0
+    last_started_at: Optional[datetime] = None
+    last_duration_ms: float = 0.0
+    last_steps: int = 0
+    max_step_ms: float = 0.0
+    last_result: dict = field(default_factory=dict)
+    last_error: Optional[str] = None
+
+    def as_dict(self) -> dict:
+        """Representación serializable."""
+        return {
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_started_at": self.last_started_at.isoformat() if self.last_started_at else None,
+            "last_duration_ms": round(self.last_duration_ms, 3),
+            "last_steps": self.last_steps,
+            "max_step_ms": round(self.max_step_ms, 3),
+            "last_result": self.last_result,
+            "last_error": self.last_error,
+        }
+
+
+@dataclass
+class MaintenanceJob:
+    """Job de mantenimiento: se ejecuta cada `interval` segundos."""
+
+    name: str
+    interval: float
+    run: JobFn
+    stats: JobStats = field(default_factory=JobStats)
+
+
+class JobContext:
+    """
+    Ejecuta los pasos de un job sobre el engine de escritura.
+
+    Args:
+        engine: Engine de escritura
+        step_pause: Segundos de pausa tras cada paso
+        stats: Estadísticas del job en curso
+    """
+
+    def __init__(self, engine: AsyncEngine, step_pause: float, stats: JobStats):
+        self.engine = engine
+        self.step_pause = step_pause
+        self.stats = stats
+        self.steps = 0
+        self._unpooled: Optional[AsyncEngine] = None
+
+    async def step(
+        self,
+        *statements: str,
+        reset: tuple[str, ...] = (),
+        script: bool = False,
+        own_connection: bool = False,
+    ) -> list[Row]:
+        """
+        Ejecuta un paso: las sentencias en una conexión en autocommit.
+
+        Args:
+            statements: Sentencias a ejecutar en orden
+            reset: Sentencias que restauran el estado de la conexión al final
+                del paso (p. ej. un PRAGMA cambiado por el propio paso)
+            script: Ejecutar la última sentencia con `executescript`, que la
+                recorre hasta el final (necesario para `incremental_vacuum`,
+                que libera una página por cada paso del cursor)
+            own_connection: Abrir una conexión nueva, fuera del pool del
+                escritor, en lugar de ocupar la suya (pasos que no escriben)
+
+        Returns:
+            list[Row]: Filas devueltas por la última sentencia
+        """
+        start = time.perf_counter()
+        rows: list[Row] = []
+        engine = self._own_engine() if own_connection else self.engine
+        async with engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            *setup, last = statements
+            try:
+                for statement in setup:
+                    await conn.execute(text(statement))
+                if script:
+                    raw = await conn.get_raw_connection()
+                    await raw.driver_connection.executescript(last)
+                else:
+                    result = await conn.execute(text(last))
+                    rows = result.all() if result.returns_rows else []
+            finally:
+                for statement in reset:
+                    await conn.execute(text(statement))
+        await self._end_step(start)
+        return rows
+
+    def _own_engine(self) -> AsyncEngine:
+        """Engine sin pool sobre la misma base de datos (en memoria: el escritor)."""
+        if wal_path(self.engine) is None:
+            return self.engine
+        if self._unpooled is None:
+            self._unpooled = create_async_engine(self.engine.url, poolclass=NullPool)
+        return self._unpooled
+
+    async def close(self) -> None:
+        """Libera el engine de `own_connection`, si se creó."""
+        if self._unpooled is not None:
+            await self._unpooled.dispose()
+            self._unpooled = None
+
+    async def transaction(self, fn: Callable[[AsyncConnection], Awaitable[T]]) -> T:
+        """
+        Ejecuta un paso transaccional: `fn` dentro de una única transacción.
+
+        Para pasos que modifican datos con varias sentencias que deben
+        confirmarse juntas (p. ej. mover un lote de filas a otra tabla).
+        """
+        start = time.perf_counter()
+        async with self.engine.begin() as conn:
+            result = await fn(conn)
+        await self._end_step(start)
+        return result
+
+    async def _end_step(self, start: float) -> None:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.steps += 1
+        self.stats.max_step_ms = max(self.stats.max_step_ms, elapsed_ms)
+        await asyncio.sleep(self.step_pause)
+
+    async def pragma(self, name: str) -> Any:
+        """Lee el valor de un PRAGMA (sin pausa: no toma el lock de escritura)."""
+        async with self.engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            return (await conn.execute(text(f"PRAGMA {name}"))).scalar()
+
+
+def wal_path(engine: AsyncEngine) -> Optional[str]:
+    """Ruta del fichero WAL de la base de datos, o None si está en memoria."""
+    database = engine.url.database
+    if not database or database == ":memory:":
+        return None
+    return f"{database}-wal"
+
+
+def optimize_job(analysis_limit: int) -> JobFn:
+    """Job `PRAGMA optimize` acotado por `analysis_limit`."""
+    async def run(ctx: JobContext) -> dict:
+        await ctx.step(
+            f"PRAGMA analysis_limit={analysis_limit}",
+            "PRAGMA optimize",
+            reset=("PRAGMA analysis_limit=0",),
+        )
+        return {}
+    return run
+
+
+def analyze_job(analysis_limit: int) -> JobFn:
+    """Job `ANALYZE` por tabla, un paso por tabla."""
+    async def run(ctx: JobContext) -> dict:
+        rows = await ctx.step(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+        )
+        tables = [row.name for row in rows]
+        for table in tables:
+            await ctx.step(
+                f"PRAGMA analysis_limit={analysis_limit}",
+                f'ANALYZE "{table}"',
+                reset=("PRAGMA analysis_limit=0",),
+            )
+        return {"tables": len(tables)}
+    return run
+
+
+def wal_checkpoint_job(threshold_bytes: int, busy_timeout_ms: int) -> JobFn:
+    """
+    Job de checkpoint del WAL cuando supera `threshold_bytes`.
+
+    El checkpoint PASSIVE copia las páginas sin bloquear a lectores ni al
+    escritor. El TRUNCATE posterior apenas tiene trabajo, y se ejecuta con un
+    `busy_timeout` corto: si hay lectores en un snapshot antiguo se abandona
+    y se reintenta en la siguiente ejecución. Ambos usan una conexión propia:
+    la del escritor queda libre para la API mientras se copia el WAL.
+    """
+    async def run(ctx: JobContext) -> dict:
+        path = wal_path(ctx.engine)
+        wal_bytes = os.path.getsize(path) if path and os.path.exists(path) else 0
+        if wal_bytes < threshold_bytes:
+            return {"skipped": True, "wal_bytes": wal_bytes}
+
+        await ctx.step("PRAGMA wal_checkpoint(PASSIVE)", own_connection=True)
+        rows = await ctx.step(
+            f"PRAGMA busy_timeout={busy_timeout_ms}",
+            "PRAGMA wal_checkpoint(TRUNCATE)",
+            own_connection=True,
+        )
+        busy, log_frames, checkpointed = rows[0]
+        return {
+            "skipped": False,
+            "wal_bytes": wal_bytes,
+            "truncated": busy == 0,
+            "log_frames": log_frames,
+            "checkpointed_frames": checkpointed,
+        }
+    return run
+
+
+def incremental_vacuum_job(pages_per_step: int, max_steps: int) -> JobFn:
+    """Job `incremental_vacuum`: libera hasta `pages_per_step` páginas por paso."""
+    async def run(ctx: JobContext) -> dict:
+        if await ctx.pragma("auto_vacuum") != 2:  # 2 = INCREMENTAL
+            return {"skipped": True, "reason": "auto_vacuum is not INCREMENTAL"}
+
+        freelist_before = await ctx.pragma("freelist_count")
+        freelist = freelist_before
+        steps = 0
+        while freelist > 0 and steps < max_steps:
+            await ctx.step(f"PRAGMA incremental_vacuum({pages_per_step})", script=True)
+            freelist = await ctx.pragma("freelist_count")
+            steps += 1
+        return {
+            "skipped": False,
+            "pages_freed": freelist_before - freelist,
+            "freelist_count": freelist,
+        }
+    return run
+
+
+def archive_job(older_than_days: float, batch_size: int) -> JobFn:
+    """
+    Job de archivado: un lote de `batch_size` tareas por paso.
+
+    Al terminar quita del modelo de lectura en memoria (si está activo) las
+    tareas archivadas.
+    """
+    async def run(ctx: JobContext) -> dict:
+        result = ArchiveResult(cutoff=archive_cutoff(older_than_days))
+        while True:
+            tasks, subtasks = await ctx.transaction(
+                lambda conn: archive_batch(conn, result.cutoff, batch_size)
+            )
+            if not tasks:
+                read_model = get_read_model()
+                if read_model is not None and result.tasks:
+                    read_model.forget_archived(result.cutoff)
+                return result.as_dict()
+            bump_tables(ARCHIVE_TABLES)
+            result.add_batch(tasks, subtasks)
+    return run
+
+
+def retention_job(retention_days: float, batch_size: int) -> JobFn:
+    """Job de purga de filas eliminadas: un lote de `batch_size` filas por paso."""
+    async def run(ctx: JobContext) -> dict:
+        result = RetentionResult(cutoff=retention_cutoff(retention_days))
+        freelist_before = await ctx.pragma("freelist_count")
+        for model in PURGE_ORDER:
+            while True:
+                rows = await ctx.transaction(
+                    lambda conn: purge_batch(conn, model, result.cutoff, batch_size)
+                )
+                if not rows:
+                    break
+                bump_tables([model.__tablename__])
+                result.add_batch(model, rows)
+        result.pages_freed = max(0, await ctx.pragma("freelist_count") - freelist_before)
+        return result.as_dict()
+    return run
+
+
+def default_jobs(settings: Settings, enabled_only: bool = True) -> list[MaintenanceJob]:
+    """
+    Jobs configurados en los settings.
+
+    Args:
+        settings: Settings de la aplicación
+        enabled_only: Omitir los jobs con intervalo 0 (deshabilitados en el
+            scheduler); la ejecución manual del CLI los incluye
+    """
+    jobs = [
+        MaintenanceJob(
+            "optimize",
+            settings.maintenance_optimize_interval_s,
+            optimize_job(settings.maintenance_analysis_limit),
+        ),
+        MaintenanceJob(
+            "analyze",
+            settings.maintenance_analyze_interval_s,
+            analyze_job(settings.maintenance_analysis_limit),
+        ),
+        MaintenanceJob(
+            "wal_checkpoint",
+            settings.maintenance_wal_checkpoint_interval_s,
+            wal_checkpoint_job(
+                int(settings.maintenance_wal_checkpoint_threshold_mb * 1024 * 1024),
+                settings.maintenance_checkpoint_busy_timeout_ms,
+            ),
+        ),
+        MaintenanceJob(
+            "incremental_vacuum",
+            settings.maintenance_incremental_vacuum_interval_s,
+            incremental_vacuum_job(
+                settings.maintenance_incremental_vacuum_pages,
+                settings.maintenance_incremental_vacuum_max_steps,
+            ),
+        ),
+        MaintenanceJob(
+            "archive",
+            settings.maintenance_archive_interval_s,
+            archive_job(settings.archive_after_days, settings.archive_batch_size),
+        ),
+        MaintenanceJob(
+            "retention",
+            settings.maintenance_retention_interval_s,
+            retention_job(settings.retention_days, settings.retention_batch_size),
+        ),
+    ]
+    return [job for job in jobs if job.interval > 0 or not enabled_only]
+
+
+class MaintenanceScheduler:
+    """
+    Tarea de fondo que ejecuta los jobs de mantenimiento cuando vencen.
+
+    Args:
+        engine: Engine de escritura
+        jobs: Jobs a programar
+        step_pause: Segundos de pausa entre pasos de un job
+    """
+
+    def __init__(self, engine: AsyncEngine, jobs: list[MaintenanceJob], step_pause: float = 0.05):
+        self.engine = engine
+        self.jobs = {job.name: job for job in jobs}
+        self.step_pause = step_pause
+        self._next_run: dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Arranca el scheduler; cada job se ejecuta por primera vez tras su intervalo."""
+        if self.running:
+            return
+        now = asyncio.get_running_loop().time()
+        self._next_run = {name: now + job.interval for name, job in self.jobs.items()}
+        self._task = asyncio.create_task(self._run(), name="maintenance-scheduler")
+
+    async def stop(self) -> None:
+        """Detiene el scheduler (el paso en curso se cancela)."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def run_job(self, name: str) -> JobStats:
+        """
+        Ejecuta un job inmediatamente.
+
+        Raises:
+            KeyError: Si el job no existe
+        """
+        job = self.jobs[name]
+        async with self._lock:
+            stats = job.stats
+            ctx = JobContext(self.engine, self.step_pause, stats)
+            stats.runs += 1
+            stats.last_started_at = datetime.now(UTC)
+            start = time.perf_counter()
+            try:
+                stats.last_result = await job.run(ctx)
+                stats.last_error = None
+            except Exception as exc:
+                stats.failures += 1
+                stats.last_error = f"{type(exc).__name__}: {exc}"
+            finally:
+                await ctx.close()
+                stats.last_duration_ms = (time.perf_counter() - start) * 1000
+                stats.last_steps = ctx.steps
+        return stats
+
+    def as_dict(self) -> dict:
+        """Estadísticas de todos los jobs."""
+        return {
+            name: {"interval_s": job.interval, **job.stats.as_dict()}
+            for name, job in self.jobs.items()
+        }
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self.jobs:
+            name = min(self._next_run, key=self._next_run.get)
+            await asyncio.sleep(max(0.0, self._next_run[name] - loop.time()))
+            await self.run_job(name)
+            self._next_run[name] = loop.time() + self.jobs[name].interval
+
+
+_scheduler: Optional[MaintenanceScheduler] = None
+
+
+def get_maintenance_scheduler() -> Optional[MaintenanceScheduler]:
+    """Dependency con el scheduler activo, o None si está deshabilitado."""
+    return _scheduler
+
+
+def start_maintenance(engine: AsyncEngine, settings: Settings) -> MaintenanceScheduler:
+    """Crea y arranca el scheduler global de la aplicación."""
+    global _scheduler
+    _scheduler = MaintenanceScheduler(
+        engine,
+        default_jobs(settings),
+        step_pause=settings.maintenance_step_pause_ms / 1000,
+    )
+    _scheduler.start()
+    return _scheduler
+
+
+async def stop_maintenance() -> None:
+    """Detiene el scheduler global si está activo."""
+    global _scheduler
+    if _scheduler is not None:
+        await _scheduler.stop()
+        _scheduler = None
+
+
+async def enable_incremental_vacuum(engine: AsyncEngine) -> None:
+    """
+    Cambia una base de datos existente a `auto_vacuum=INCREMENTAL`.
+
+    Requiere un VACUUM completo, que bloquea la base de datos mientras la
+    reescribe: ejecutar con la aplicación parada.
+    """
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("PRAGMA auto_vacuum=INCREMENTAL"))
+        await conn.execute(text("VACUUM"))
+
+
+async def _cli(args: argparse.Namespace) -> None:
+    from .database import engine, settings
+
+    try:
+        if args.command == "enable-incremental-vacuum":
+            await enable_incremental_vacuum(engine)
+            print("OK - auto_vacuum=INCREMENTAL")
+            return
+
+        # Ejecución puntual: también los jobs sin intervalo programado
+        scheduler = MaintenanceScheduler(
+            engine,
+            default_jobs(settings, enabled_only=False),
+            step_pause=settings.maintenance_step_pause_ms / 1000,
+        )
+        stats = await scheduler.run_job(args.job)
+        print(stats.as_dict())
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mantenimiento de la base de datos")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    run = subparsers.add_parser("run", help="Ejecuta un job de mantenimiento")
+    run.add_argument("job", choices=[job.name for job in default_jobs(Settings(), enabled_only=False)])
+    subparsers.add_parser("enable-incremental-vacuum", help="Activa auto_vacuum=INCREMENTAL (VACUUM)")
+    asyncio.run(_cli(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+CLI de migraciones.
+
+Uso:
+    python -m src.api.migrations upgrade   # Aplica migraciones pendientes
+    python -m src.api.migrations status    # Muestra versión actual y pendientes
+"""
+import argparse
+import asyncio
+
+from ..database import engine
+from .runner import HEAD_VERSION, MIGRATIONS, get_current_state, migrate, schema_fingerprint
+
+
+async def upgrade() -> None:
+    """Aplica las migraciones pendientes."""
+    result = await migrate(engine)
+    if result.skipped:
+        print(f"INFO - Esquema al día (versión {result.version})")
+    elif result.created_schema:
+        print(f"OK - Esquema creado en versión {result.version}")
+    for name in result.applied:
+        print(f"OK - Migración aplicada: {name}")
+    if not result.skipped:
+        print(f"Migracion completada exitosamente (versión {result.version})")
+
+
+async def status() -> None:
+    """Muestra la versión actual y las migraciones pendientes."""
+    async with engine.connect() as conn:
+        version, fingerprint = await get_current_state(conn)
+    print(f"Versión actual: {version} (última: {HEAD_VERSION})")
+    print(f"Huella al día: {'sí' if fingerprint == schema_fingerprint() else 'no'}")
+    for migration in MIGRATIONS:
+        mark = "x" if migration.version <= version else " "
+        print(f"  [{mark}] {migration.version:03d} {migration.name}")
+
+
+async def _run(command) -> None:
+    try:
+        await command()
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Migraciones de base de datos")
+    parser.add_argument("command", choices=["upgrade", "status"])
+    args = parser.parse_args()
+
+    commands = {"upgrade": upgrade, "status": status}
+    asyncio.run(_run(commands[args.command]))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,11 @@
 """Migración: Agregar columna deleted_at a tasks y subtasks."""
 import asyncio
 from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession
-from ..database import async_session_maker
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from ..database import engine
 
 
-async def check_column_exists(db: AsyncSession, table_name: str, column_name: str) -> bool:
+async def check_column_exists(db: AsyncConnection, table_name: str, column_name: str) -> bool:
     """Verifica si una columna existe en una tabla."""
     query = text(f"PRAGMA table_info({table_name})")
     result = await db.execute(query)
@@ -13,9 +13,9 @@ async def check_column_exists(db: AsyncSession, table_name: str, column_name: st
     return any(col[1] == column_name for col in columns)
 
 
-async def add_deleted_at_column():
+async def upgrade(engine: AsyncEngine) -> None:
     """Agrega la columna deleted_at a las tablas tasks y subtasks."""
-    async with async_session_maker() as db:
+    async with engine.begin() as db:
         print("Verificando estructura de base de datos...")
 
         # Verificar y agregar columna en tasks
@@ -23,7 +23,6 @@ async def add_deleted_at_column():
         if not tasks_has_deleted_at:
             print("Agregando columna 'deleted_at' a tabla 'tasks'...")
             await db.execute(text("ALTER TABLE tasks ADD COLUMN deleted_at DATETIME NULL"))
-            await db.commit()
             print("OK - Columna 'deleted_at' agregada a 'tasks'")
         else:
             print("INFO - Columna 'deleted_at' ya existe en 'tasks'")
@@ -33,12 +32,15 @@ async def add_deleted_at_column():
         if not subtasks_has_deleted_at:
             print("Agregando columna 'deleted_at' a tabla 'subtasks'...")
             await db.execute(text("ALTER TABLE subtasks ADD COLUMN deleted_at DATETIME NULL"))
-            await db.commit()
             print("OK - Columna 'deleted_at' agregada a 'subtasks'")
         else:
             print("INFO - Columna 'deleted_at' ya existe en 'subtasks'")
 
-        print("Migracion completada exitosamente")
+
+async def add_deleted_at_column():
+    """Aplica la migración sobre la base de datos de la aplicación."""
+    await upgrade(engine)
+    print("Migracion completada exitosamente")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,110 @@
+"""
+Migraciones: índices de tasks y subtasks.
+
+Cada versión crea solo sus índices, tomando la definición del modelo (la
+única fuente de verdad). `create_missing_indexes` crea todos los que
+falten y es lo que ejecuta la CLI.
+
+Los índices `ix_tasks_active_status` e `ix_tasks_active_project_status`
+que creaba la versión 2 ya no están en los modelos: las versiones 8 y 9
+(filter_indexes.py) los sustituyen, así que la versión 2 ya no los crea.
+"""
+import asyncio
+from typing import Iterable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from ..database import engine
+from ..models.task import Task
+from ..models.subtask import Subtask
+
+# Versión 2: índices iniciales de las rutas de subtasks
+INDEXES = ("ix_subtasks_task_id", "ix_subtasks_active_task_position")
+
+# Versión 6: índices parciales de filas eliminadas (purga de retención)
+TOMBSTONE_INDEXES = ("ix_tasks_deleted_at", "ix_subtasks_deleted_at")
+
+# Versión 7: paginación keyset de GET /tasks
+PAGINATION_INDEXES = ("ix_tasks_active_created_at",)
+
+
+async def check_index_exists(conn: AsyncConnection, index_name: str) -> bool:
+    """Verifica si un índice existe en la base de datos."""
+    query = text("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = :name")
+    result = await conn.execute(query, {"name": index_name})
+    return result.first() is not None
+
+
+async def create_indexes(conn: AsyncConnection, names: Iterable[str]) -> list[str]:
+    """
+    Crea los índices `names`, declarados en los modelos, que aún no existan.
+
+    Los índices se toman de `__table_args__` de cada modelo, de forma que
+    el modelo es la única fuente de verdad de su definición.
+
+    Args:
+        conn: Conexión async dentro de una transacción
+        names: Nombres de los índices
+
+    Returns:
+        list[str]: Nombres de los índices creados
+    """
+    declared = {index.name: (table, index) for table in (Task.__table__, Subtask.__table__) for index in table.indexes}
+    created = []
+    for name in sorted(names):
+        table, index = declared[name]
+        if await check_index_exists(conn, index.name):
+            print(f"INFO - Índice '{index.name}' ya existe")
+            continue
+
+        print(f"Creando índice '{index.name}' en '{table.name}'...")
+        await conn.run_sync(index.create)
+        created.append(index.name)
+
+    # Actualizar estadísticas para que el planner use los nuevos índices
+    if created:
+        await conn.execute(text("ANALYZE"))
+
+    return created
+
+
+async def create_missing_indexes(conn: AsyncConnection) -> list[str]:
+    """Crea todos los índices de tasks y subtasks declarados en los modelos que falten."""
+    names = [index.name for table in (Task.__table__, Subtask.__table__) for index in table.indexes]
+    return await create_indexes(conn, names)
+
+
+async def _upgrade(engine: AsyncEngine, names: Iterable[str]) -> None:
+    print("Verificando índices de base de datos...")
+    async with engine.begin() as conn:
+        created = await create_indexes(conn, names)
+    print(f"OK - {len(created)} índices creados")
+
+
+async def upgrade(engine: AsyncEngine) -> None:
+    """Versión 2: índices de subtasks."""
+    await _upgrade(engine, INDEXES)
+
+
+async def upgrade_tombstones(engine: AsyncEngine) -> None:
+    """Versión 6: índices de filas eliminadas."""
+    await _upgrade(engine, TOMBSTONE_INDEXES)
+
+
+async def upgrade_pagination(engine: AsyncEngine) -> None:
+    """Versión 7: índice de la paginación keyset de tasks."""
+    await _upgrade(engine, PAGINATION_INDEXES)
+
+
+async def add_indexes():
+    """Crea todos los índices declarados que falten en la base de datos de la aplicación."""
+    print("Verificando índices de base de datos...")
+    async with engine.begin() as conn:
+        created = await create_missing_indexes(conn)
+    print(f"OK - {len(created)} índices creados")
+    print("Migracion completada exitosamente")
+
+
+if __name__ == "__main__":
+    print("Iniciando migracion: add_indexes")
+    asyncio.run(add_indexes())
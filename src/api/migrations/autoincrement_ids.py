@@ -0,0 +1,45 @@
+"""
+Migración: `AUTOINCREMENT` en tasks y subtasks.
+
+Sin `AUTOINCREMENT`, SQLite asigna a una fila nueva `max(id) + 1`: al archivar
+las tareas con los ids más altos, una tarea nueva podría recibir el id de una
+archivada y la tarea archivada ya no podría restaurarse con su id. Con
+`AUTOINCREMENT` el máximo id asignado se guarda en `sqlite_sequence` y no se
+reutiliza nunca.
+
+SQLite no permite añadirlo a una tabla existente: se reconstruyen con
+`rebuild.rebuild_table` (tabla temporal `<tabla>__autoinc`). Copiar las filas
+con su id deja `sqlite_sequence` en el máximo id actual.
+"""
+import asyncio
+from sqlalchemy.ext.asyncio import AsyncEngine
+from ..database import engine
+from ..models.task import Task
+from ..models.subtask import Subtask
+from .rebuild import BATCH_SIZE, rebuild_connection, rebuild_table, table_sql
+
+
+async def upgrade(engine: AsyncEngine, batch_size: int = BATCH_SIZE, pause: float = 0.0) -> None:
+    """Reconstruye tasks y subtasks con `AUTOINCREMENT` si aún no lo tienen."""
+    print("Verificando AUTOINCREMENT de tasks y subtasks...")
+    async with rebuild_connection(engine) as conn:
+        for table in (Task.__table__, Subtask.__table__):
+            if "AUTOINCREMENT" in (await table_sql(conn, table.name)).upper():
+                print(f"INFO - Tabla '{table.name}' ya usa AUTOINCREMENT")
+                continue
+            print(f"Reconstruyendo tabla '{table.name}'...")
+            copied = await rebuild_table(
+                conn, table, suffix="__autoinc", batch_size=batch_size, pause=pause
+            )
+            print(f"OK - {copied} filas copiadas en '{table.name}'")
+
+
+async def autoincrement_ids():
+    """Aplica la migración sobre la base de datos de la aplicación."""
+    await upgrade(engine)
+    print("Migracion completada exitosamente")
+
+
+if __name__ == "__main__":
+    print("Iniciando migracion: autoincrement_ids")
+    asyncio.run(autoincrement_ids())
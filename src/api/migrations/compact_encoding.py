@@ -0,0 +1,87 @@
+"""
+Migración: Codificación compacta de status y timestamps.
+
+Convierte las columnas `DATETIME` (texto ISO) a enteros de microsegundos desde
+epoch y `tasks.status` (texto) a SMALLINT, según los tipos de `models/types.py`.
+
+SQLite no permite cambiar el tipo de una columna, así que cada tabla se
+reconstruye en lotes con `rebuild.rebuild_table` (tabla temporal
+`<tabla>__compact`).
+"""
+import asyncio
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import Table, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from ..database import engine
+from ..models.project import Project
+from ..models.task import Task
+from ..models.subtask import Subtask
+from ..models.types import STATUS_CODES, EpochMicros, StatusCode, datetime_to_epoch_micros
+from .rebuild import BATCH_SIZE, Converter, rebuild_connection, rebuild_table
+
+
+def _convert_datetime(value) -> Optional[int]:
+    """Texto ISO (formato de `DateTime` en SQLite) a microsegundos desde epoch."""
+    if value is None or isinstance(value, int):
+        return value
+    return datetime_to_epoch_micros(datetime.fromisoformat(value))
+
+
+def _convert_status(value) -> Optional[int]:
+    """Status en texto a su código entero."""
+    if value is None or isinstance(value, int):
+        return value
+    return STATUS_CODES[value]
+
+
+def _converters(table: Table) -> dict[str, Converter]:
+    """Columnas de la tabla con codificación compacta y su conversión."""
+    converters = {}
+    for column in table.columns:
+        if isinstance(column.type, EpochMicros):
+            converters[column.name] = _convert_datetime
+        elif isinstance(column.type, StatusCode):
+            converters[column.name] = _convert_status
+    return converters
+
+
+async def needs_rebuild(conn: AsyncConnection, table: Table) -> bool:
+    """Indica si alguna columna compacta conserva su tipo declarado anterior."""
+    result = await conn.execute(text(f"PRAGMA table_info({table.name})"))
+    declared = {row[1]: row[2].upper() for row in result}
+    return any(
+        declared.get(name) != table.c[name].type.compile(dialect=conn.dialect)
+        for name in _converters(table)
+    )
+
+
+async def upgrade(engine: AsyncEngine, batch_size: int = BATCH_SIZE, pause: float = 0.0) -> None:
+    """Reconstruye projects, tasks y subtasks con la codificación compacta."""
+    print("Verificando codificación de columnas...")
+    async with rebuild_connection(engine) as conn:
+        rebuilt = False
+        for table in (Project.__table__, Task.__table__, Subtask.__table__):
+            if not await needs_rebuild(conn, table):
+                print(f"INFO - Tabla '{table.name}' ya usa la codificación compacta")
+                continue
+            print(f"Reconstruyendo tabla '{table.name}'...")
+            copied = await rebuild_table(
+                conn, table, _converters(table), "__compact", batch_size, pause
+            )
+            print(f"OK - {copied} filas convertidas en '{table.name}'")
+            rebuilt = True
+
+        if rebuilt:
+            await conn.execute(text("ANALYZE"))
+
+
+async def compact_encoding():
+    """Aplica la migración sobre la base de datos de la aplicación."""
+    await upgrade(engine)
+    print("Migracion completada exitosamente")
+
+
+if __name__ == "__main__":
+    print("Iniciando migracion: compact_encoding")
+    asyncio.run(compact_encoding())
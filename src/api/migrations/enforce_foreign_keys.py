@@ -0,0 +1,49 @@
+"""Migración: Limpiar filas huérfanas antes de activar `PRAGMA foreign_keys`."""
+import asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from ..database import engine
+from .add_indexes import create_indexes
+
+# Índice del FK tasks.project_id
+INDEXES = ("ix_tasks_project_id",)
+
+
+async def upgrade(engine: AsyncEngine) -> None:
+    """
+    Deja la base de datos consistente con sus foreign keys.
+
+    Hasta ahora SQLite no aplicaba los FKs, así que puede haber tareas que
+    apuntan a proyectos borrados y subtasks de tareas inexistentes. Se aplica
+    la misma semántica que los FKs: `SET NULL` en tasks y `CASCADE` en subtasks.
+
+    También crea el índice de `tasks.project_id`, que SQLite necesita para
+    aplicar el `ON DELETE SET NULL` sin recorrer toda la tabla.
+    """
+    print("Verificando foreign keys...")
+    async with engine.begin() as conn:
+        tasks = await conn.execute(text(
+            "UPDATE tasks SET project_id = NULL "
+            "WHERE project_id IS NOT NULL "
+            "AND project_id NOT IN (SELECT id FROM projects)"
+        ))
+        subtasks = await conn.execute(text(
+            "DELETE FROM subtasks WHERE task_id NOT IN (SELECT id FROM tasks)"
+        ))
+        violations = (await conn.execute(text("PRAGMA foreign_key_check"))).fetchall()
+        await create_indexes(conn, INDEXES)
+
+    if violations:
+        raise RuntimeError(f"Foreign key violations remain: {violations}")
+    print(f"OK - {tasks.rowcount} tareas desvinculadas, {subtasks.rowcount} subtasks huérfanas eliminadas")
+
+
+async def enforce_foreign_keys():
+    """Aplica la migración sobre la base de datos de la aplicación."""
+    await upgrade(engine)
+    print("Migracion completada exitosamente")
+
+
+if __name__ == "__main__":
+    print("Iniciando migracion: enforce_foreign_keys")
+    asyncio.run(enforce_foreign_keys())
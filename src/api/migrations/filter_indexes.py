@@ -0,0 +1,58 @@
+"""
+Migraciones: índices de los filtros de GET /tasks y de las columnas de GET /board.
+
+Cada versión crea sus índices y elimina el que sustituye (un prefijo suyo
+más estrecho).
+"""
+import asyncio
+from typing import Iterable
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from ..database import engine
+from .add_indexes import check_index_exists, create_indexes
+
+# Versión 8: filtros de GET /tasks
+INDEXES = ("ix_tasks_active_status_created_at", "ix_tasks_active_last_modified")
+SUPERSEDED_INDEXES = {
+    # Prefijo de ix_tasks_active_status_created_at
+    "ix_tasks_active_status": "ix_tasks_active_status_created_at",
+}
+
+# Versión 9: columnas de GET /board por proyecto
+BOARD_INDEXES = ("ix_tasks_active_project_status_created_at",)
+BOARD_SUPERSEDED_INDEXES = {
+    # Prefijo de ix_tasks_active_project_status_created_at
+    "ix_tasks_active_project_status": "ix_tasks_active_project_status_created_at",
+}
+
+
+async def _replace_indexes(engine: AsyncEngine, names: Iterable[str], superseded: dict[str, str]) -> None:
+    async with engine.begin() as conn:
+        created = await create_indexes(conn, names)
+        for old_name, new_name in superseded.items():
+            if await check_index_exists(conn, old_name):
+                print(f"Eliminando índice '{old_name}' (sustituido por '{new_name}')...")
+                await conn.execute(text(f"DROP INDEX {old_name}"))
+    print(f"OK - {len(created)} índices creados")
+
+
+async def upgrade(engine: AsyncEngine) -> None:
+    """Versión 8: crea los índices de los filtros y elimina el que sustituyen."""
+    await _replace_indexes(engine, INDEXES, SUPERSEDED_INDEXES)
+
+
+async def upgrade_board_columns(engine: AsyncEngine) -> None:
+    """Versión 9: crea el índice de las columnas por proyecto y elimina el que sustituye."""
+    await _replace_indexes(engine, BOARD_INDEXES, BOARD_SUPERSEDED_INDEXES)
+
+
+async def filter_indexes():
+    """Aplica las migraciones sobre la base de datos de la aplicación."""
+    await upgrade(engine)
+    await upgrade_board_columns(engine)
+    print("Migracion completada exitosamente")
+
+
+if __name__ == "__main__":
+    print("Iniciando migracion: filter_indexes")
+    asyncio.run(filter_indexes())
@@ -0,0 +1,140 @@
+"""
+Reconstrucción de tablas SQLite en lotes.
+
+SQLite no permite cambiar el tipo de una columna ni añadir `AUTOINCREMENT` a
+una tabla existente: hay que reconstruirla. Se crea `<tabla><sufijo>` con el
+DDL de los modelos, se copian las filas en lotes (cada uno en su propia
+transacción) y al final se reemplaza la tabla original y se recrean sus
+índices.
+
+La reconstrucción se ejecuta con `foreign_keys=OFF`: borrar la tabla original
+no debe disparar los `ON DELETE` de las tablas que la referencian. Al terminar
+se comprueba `foreign_key_check`.
+
+Las páginas de las tablas originales quedan en la freelist y se reutilizan;
+el fichero solo encoge tras un VACUUM (o con `incremental_vacuum`).
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Optional
+from sqlalchemy import Table, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlalchemy.schema import CreateTable
+
+BATCH_SIZE = 5_000
+
+Converter = Callable[[object], object]
+
+
+@asynccontextmanager
+async def transaction(conn: AsyncConnection) -> AsyncIterator[None]:
+    """Transacción explícita sobre una conexión en AUTOCOMMIT."""
+    await conn.exec_driver_sql("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        await conn.exec_driver_sql("ROLLBACK")
+        raise
+    await conn.exec_driver_sql("COMMIT")
+
+
+@asynccontextmanager
+async def rebuild_connection(engine: AsyncEngine) -> AsyncIterator[AsyncConnection]:
+    """
+    Conexión en AUTOCOMMIT con `foreign_keys=OFF` para reconstruir tablas.
+
+    Al salir sin errores comprueba `foreign_key_check`; en cualquier caso
+    restaura el valor previo de `foreign_keys`.
+
+    Raises:
+        RuntimeError: Si la reconstrucción dejó filas que violan un FK
+    """
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        foreign_keys = (await conn.execute(text("PRAGMA foreign_keys"))).scalar()
+        await conn.execute(text("PRAGMA foreign_keys=OFF"))
+        try:
+            yield conn
+            violations = (await conn.execute(text("PRAGMA foreign_key_check"))).fetchall()
+            if violations:
+                raise RuntimeError(f"Foreign key violations after rebuild: {violations}")
+        finally:
+            await conn.execute(text(f"PRAGMA foreign_keys={foreign_keys}"))
+
+
+async def table_sql(conn: AsyncConnection, name: str) -> str:
+    """DDL con el que está creada la tabla `name` ('' si no existe)."""
+    result = await conn.execute(
+        text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": name},
+    )
+    return result.scalar() or ""
+
+
+async def rebuild_table(
+    conn: AsyncConnection,
+    table: Table,
+    converters: Optional[dict[str, Converter]] = None,
+    suffix: str = "__rebuild",
+    batch_size: int = BATCH_SIZE,
+    pause: float = 0.0,
+) -> int:
+    """
+    Reconstruye `table` con el DDL de los modelos copiando las filas en lotes.
+
+    Args:
+        conn: Conexión de `rebuild_connection`
+        table: Tabla del modelo
+        converters: Conversión a aplicar a cada columna copiada
+        suffix: Sufijo de la tabla temporal
+        batch_size: Filas por lote
+        pause: Segundos a esperar entre lotes
+
+    Returns:
+        int: Filas copiadas
+    """
+    converters = converters or {}
+    tmp_name = f"{table.name}{suffix}"
+    ddl = str(CreateTable(table).compile(dialect=conn.dialect)).replace(
+        f"CREATE TABLE {table.name} (", f"CREATE TABLE {tmp_name} (", 1
+    )
+    columns = [column.name for column in table.columns]
+    select_batch = text(
+        f"SELECT {', '.join(columns)} FROM {table.name} "
+        f"WHERE id > :last_id ORDER BY id LIMIT :batch_size"
+    )
+    insert_batch = text(
+        f"INSERT INTO {tmp_name} ({', '.join(columns)}) "
+        f"VALUES ({', '.join(f':{name}' for name in columns)})"
+    )
+
+    # Una ejecución interrumpida puede haber dejado la tabla temporal
+    async with transaction(conn):
+        await conn.execute(text(f"DROP TABLE IF EXISTS {tmp_name}"))
+        await conn.execute(text(ddl))
+
+    copied = 0
+    last_id = 0
+    while True:
+        async with transaction(conn):
+            rows = (await conn.execute(
+                select_batch, {"last_id": last_id, "batch_size": batch_size}
+            )).mappings().all()
+            if rows:
+                await conn.execute(insert_batch, [
+                    {name: converters.get(name, lambda value: value)(row[name]) for name in columns}
+                    for row in rows
+                ])
+        if not rows:
+            break
+        copied += len(rows)
+        last_id = rows[-1]["id"]
+        await asyncio.sleep(pause)
+
+    async with transaction(conn):
+        await conn.execute(text(f"DROP TABLE {table.name}"))
+        await conn.execute(text(f"ALTER TABLE {tmp_name} RENAME TO {table.name}"))
+        for index in sorted(table.indexes, key=lambda idx: idx.name):
+            await conn.run_sync(index.create)
+
+    return copied
@@ -0,0 +1,298 @@
+"""
+Runner de migraciones versionadas.
+
+Cada migración registrada en `MIGRATIONS` tiene una versión entera y una
+función `upgrade(engine)` idempotente: debe detectar el estado actual del
+esquema antes de modificarlo, porque en bases de datos existentes se ejecuta
+después de `create_all` (que solo crea las tablas que faltan).
+
+Las versiones aplicadas se guardan en la tabla `schema_version`, junto con
+una huella (fingerprint) del esquema declarado en los modelos. En el arranque,
+si la versión y la huella coinciden, se omite `create_all` y toda la
+reflexión de DDL.
+"""
+import asyncio
+import hashlib
+from dataclasses import dataclass, field
+from datetime import datetime, UTC
+from typing import Awaitable, Callable, Optional
+
+from sqlalchemy import (
+    Column,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    insert,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from ..database import Base
+from . import (
+    add_deleted_at,
+    add_indexes,
+    autoincrement_ids,
+    compact_encoding,
+    enforce_foreign_keys,
+    filter_indexes,
+)
+
+UpgradeFn = Callable[[AsyncEngine], Awaitable[None]]
+BatchFn = Callable[[AsyncConnection], Awaitable[int]]
+
+# Metadata propia: la tabla de control no forma parte de los modelos de la app
+_version_metadata = MetaData()
+
+schema_version = Table(
+    "schema_version",
+    _version_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String(100), nullable=False),
+    Column("applied_at", String(32), nullable=False),
+    Column("fingerprint", String(64), nullable=True),
+)
+
+
+@dataclass(frozen=True)
+class Migration:
+    """Migración registrada: versión, nombre y función de upgrade."""
+
+    version: int
+    name: str
+    upgrade: UpgradeFn
+
+
+@dataclass
+class MigrationResult:
+    """Resultado de `migrate`."""
+
+    skipped: bool = False
+    created_schema: bool = False
+    applied: list[str] = field(default_factory=list)
+    version: int = 0
+
+
+# Registro ordenado de migraciones. Añadir siempre al final con versión +1 y
+# una función de upgrade propia: cada versión es un único cambio de esquema.
+MIGRATIONS: list[Migration] = [
+    Migration(1, "add_deleted_at", add_deleted_at.upgrade),
+    Migration(2, "add_indexes", add_indexes.upgrade),
+    Migration(3, "enforce_foreign_keys", enforce_foreign_keys.upgrade),
+    Migration(4, "compact_encoding", compact_encoding.upgrade),
+    Migration(5, "autoincrement_ids", autoincrement_ids.upgrade),
+    # Índices de filas eliminadas (ix_*_deleted_at)
+    Migration(6, "add_tombstone_indexes", add_indexes.upgrade_tombstones),
+    # Índice de la paginación keyset de tasks (ix_tasks_active_created_at)
+    Migration(7, "add_pagination_indexes", add_indexes.upgrade_pagination),
+    # Filtros de GET /tasks (ix_tasks_active_status_created_at, ix_tasks_active_last_modified)
+    Migration(8, "filter_indexes", filter_indexes.upgrade),
+    # Columnas de GET /board por proyecto (ix_tasks_active_project_status_created_at)
+    Migration(9, "board_column_indexes", filter_indexes.upgrade_board_columns),
+]
+
+HEAD_VERSION = MIGRATIONS[-1].version
+
+
+def schema_fingerprint() -> str:
+    """
+    Calcula la huella del esquema declarado en los modelos.
+
+    Incluye el DDL de tablas e índices y la lista de migraciones, de forma
+    que cualquier cambio en los modelos o en el registro invalida la huella.
+    """
+    from .. import models  # noqa: F401  (registra los modelos en Base.metadata)
+    from sqlalchemy.dialects import sqlite
+
+    dialect = sqlite.dialect()
+    digest = hashlib.sha256()
+    for table in Base.metadata.sorted_tables:
+        digest.update(str(CreateTable(table).compile(dialect=dialect)).encode())
+        for index in sorted(table.indexes, key=lambda idx: idx.name):
+            digest.update(str(CreateIndex(index).compile(dialect=dialect)).encode())
+    for migration in MIGRATIONS:
+        digest.update(f"{migration.version}:{migration.name}".encode())
+    return digest.hexdigest()
+
+
+async def get_current_state(conn: AsyncConnection) -> tuple[int, Optional[str]]:
+    """
+    Devuelve (versión, huella) de la base de datos.
+
+    Returns:
+        tuple: (0, None) si la tabla `schema_version` no existe o está vacía
+    """
+    query = (
+        select(schema_version.c.version, schema_version.c.fingerprint)
+        .order_by(schema_version.c.version.desc())
+        .limit(1)
+    )
+    try:
+        row = (await conn.execute(query)).first()
+    except OperationalError:
+        return 0, None
+    if row is None:
+        return 0, None
+    return row.version, row.fingerprint
+
+
+async def _has_app_tables(conn: AsyncConnection) -> bool:
+    """Indica si la base de datos ya contiene alguna tabla de la aplicación."""
+    names = [table.name for table in Base.metadata.sorted_tables]
+    placeholders = ", ".join(f":t{i}" for i in range(len(names)))
+    result = await conn.execute(
+        text(f"SELECT 1 FROM sqlite_master WHERE type = 'table' AND name IN ({placeholders})"),
+        {f"t{i}": name for i, name in enumerate(names)},
+    )
+    return result.first() is not None
+
+
+async def _prepare_new_database(engine: AsyncEngine) -> None:
+    """
+    Activa `auto_vacuum=INCREMENTAL` si la base de datos aún no tiene tablas.
+
+    Solo se puede cambiar antes de crear la primera tabla (o con un VACUUM
+    completo); permite que el mantenimiento devuelva páginas libres al
+    sistema con `incremental_vacuum`.
+    """
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        if not await _has_app_tables(conn):
+            await conn.execute(text("PRAGMA auto_vacuum=INCREMENTAL"))
+            # journal_mode=WAL ya escribió la cabecera: el VACUUM (instantáneo
+            # sobre una base de datos vacía) aplica el nuevo modo
+            await conn.execute(text("VACUUM"))
+
+
+async def _record(conn: AsyncConnection, migration: Migration) -> None:
+    await conn.execute(insert(schema_version).values(
+        version=migration.version,
+        name=migration.name,
+        applied_at=datetime.now(UTC).isoformat(),
+    ))
+
+
+async def migrate(engine: AsyncEngine) -> MigrationResult:
+    """
+    Lleva la base de datos a la última versión registrada.
+
+    - Base de datos al día (versión y huella coinciden): no hace nada más.
+    - Base de datos nueva: `create_all` y marca todas las migraciones como aplicadas.
+    - Base de datos existente: `create_all` (tablas nuevas) y migraciones pendientes,
+      registrando cada versión en su propia transacción.
+
+    Args:
+        engine: Engine async sobre el que migrar
+
+    Returns:
+        MigrationResult: Migraciones aplicadas y versión final
+    """
+    fingerprint = schema_fingerprint()
+
+    async with engine.connect() as conn:
+        current_version, current_fingerprint = await get_current_state(conn)
+    if current_version == HEAD_VERSION and current_fingerprint == fingerprint:
+        return MigrationResult(skipped=True, version=current_version)
+
+    if current_version == 0:
+        await _prepare_new_database(engine)
+
+    result = MigrationResult(version=current_version)
+    async with engine.begin() as conn:
+        fresh = current_version == 0 and not await _has_app_tables(conn)
+        await conn.run_sync(_version_metadata.create_all)
+        await conn.run_sync(Base.metadata.create_all)
+        if fresh:
+            for migration in MIGRATIONS:
+                await _record(conn, migration)
+            result.created_schema = True
+            result.version = HEAD_VERSION
+
+    for migration in MIGRATIONS:
+        if migration.version <= result.version:
+            continue
+        await migration.upgrade(engine)
+        async with engine.begin() as conn:
+            await _record(conn, migration)
+        result.applied.append(migration.name)
+        result.version = migration.version
+
+    async with engine.begin() as conn:
+        await conn.execute(
+            update(schema_version)
+            .where(schema_version.c.version == result.version)
+            .values(fingerprint=fingerprint)
+        )
+
+    return result
+
+
+async def run_in_batches(
+    engine: AsyncEngine,
+    batch: BatchFn,
+    pause: float = 0.0,
+) -> int:
+    """
+    Ejecuta `batch` repetidamente, cada vez en su propia transacción.
+
+    Cada lote hace commit antes de empezar el siguiente, de forma que el lock
+    de escritura de SQLite nunca se mantiene más de lo que tarda un lote.
+    Termina cuando un lote no procesa ninguna fila.
+
+    Args:
+        engine: Engine async
+        batch: Corrutina que procesa un lote y devuelve las filas afectadas
+        pause: Segundos a esperar entre lotes (cede el lock a otros escritores)
+
+    Returns:
+        int: Total de filas procesadas
+    """
+    total = 0
+    while True:
+        async with engine.begin() as conn:
+            processed = await batch(conn)
+        if processed <= 0:
+            return total
+        total += processed
+        await asyncio.sleep(pause)
+
+
+async def backfill_in_batches(
+    engine: AsyncEngine,
+    statement: str,
+    params: Optional[dict] = None,
+    batch_size: int = 1000,
+    pause: float = 0.0,
+) -> int:
+    """
+    Ejecuta un UPDATE/DELETE de backfill en lotes acotados.
+
+    La sentencia debe limitar las filas afectadas con `:batch_size` y
+    seleccionar solo filas pendientes, p. ej.:
+
+        UPDATE tasks SET completed = 0
+        WHERE rowid IN (
+            SELECT rowid FROM tasks WHERE completed IS NULL LIMIT :batch_size
+        )
+
+    Args:
+        engine: Engine async
+        statement: SQL del backfill
+        params: Parámetros adicionales de la sentencia
+        batch_size: Filas máximas por transacción
+        pause: Segundos a esperar entre lotes
+
+    Returns:
+        int: Total de filas actualizadas
+    """
+    sql = text(statement)
+    bound = {**(params or {}), "batch_size": batch_size}
+
+    async def _batch(conn: AsyncConnection) -> int:
+        return (await conn.execute(sql, bound)).rowcount
+
+    return await run_in_batches(engine, _batch, pause=pause)
@@ -2,5 +2,6 @@
 from .project import Project
 from .task import Task
 from .subtask import Subtask
+from .archive import TaskArchive, SubtaskArchive
 
-__all__ = ["Project", "Task", "Subtask"]
+__all__ = ["Project", "Task", "Subtask", "TaskArchive", "SubtaskArchive"]
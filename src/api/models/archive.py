@@ -0,0 +1,88 @@
+"""Modelos ORM del archivo de tareas (almacenamiento frío)."""
+from datetime import datetime
+from typing import Optional, List
+from sqlalchemy import String, Integer, Boolean, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from ..database import Base
+from .types import EpochMicros, StatusCode
+
+
+class TaskArchive(Base):
+    """
+    Tarea archivada.
+
+    Mismas columnas (y codificación) que `tasks` más `archived_at`: el archivado
+    copia las filas tal cual y conserva el id original, que `tasks` no
+    reutiliza (AUTOINCREMENT).
+    """
+
+    __tablename__ = "tasks_archive"
+    __table_args__ = (
+        # Listado paginado del archivo (más recientes primero)
+        Index("ix_tasks_archive_archived_at", "archived_at"),
+        # Índice del FK: ON DELETE SET NULL al borrar un proyecto y filtro por proyecto
+        Index("ix_tasks_archive_project_id", "project_id"),
+    )
+
+    # Primary Key: id original de la tarea (sin autoincrement)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+
+    # Campos básicos
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    description: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    status: Mapped[str] = mapped_column(StatusCode(), nullable=False)
+    completed: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    project_id: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        ForeignKey("projects.id", ondelete="SET NULL"),
+        nullable=True
+    )
+
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(EpochMicros(), nullable=False)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(EpochMicros(), nullable=True)
+    completed_at: Mapped[Optional[datetime]] = mapped_column(EpochMicros(), nullable=True)
+    deleted_at: Mapped[Optional[datetime]] = mapped_column(EpochMicros(), nullable=True)
+    archived_at: Mapped[datetime] = mapped_column(EpochMicros(), nullable=False)
+
+    # Relationships
+    subtasks: Mapped[List["SubtaskArchive"]] = relationship(
+        "SubtaskArchive",
+        cascade="all, delete-orphan",
+        passive_deletes=True
+    )
+
+    def __repr__(self) -> str:
+        return f"<TaskArchive(id={self.id}, name='{self.name}', archived_at={self.archived_at})>"
+
+
+class SubtaskArchive(Base):
+    """Subtask archivada junto con su tarea (mismas columnas que `subtasks`)."""
+
+    __tablename__ = "subtasks_archive"
+    __table_args__ = (
+        Index("ix_subtasks_archive_task_id", "task_id"),
+    )
+
+    # Primary Key: id original de la subtask
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+
+    # Foreign Key: se borra al borrar (o restaurar) la tarea archivada
+    task_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("tasks_archive.id", ondelete="CASCADE"),
+        nullable=False
+    )
+
+    # Campos básicos
+    name: Mapped[str] = mapped_column(String(200), nullable=False)
+    completed: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    position: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(EpochMicros(), nullable=False)
+    completed_at: Mapped[Optional[datetime]] = mapped_column(EpochMicros(), nullable=True)
+    deleted_at: Mapped[Optional[datetime]] = mapped_column(EpochMicros(), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<SubtaskArchive(id={self.id}, task_id={self.task_id}, name='{self.name}')>"
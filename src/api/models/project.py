@@ -1,9 +1,10 @@
 """Modelo ORM para Project."""
 from datetime import datetime, UTC
 from typing import Optional, TYPE_CHECKING
-from sqlalchemy import String, Integer, DateTime
+from sqlalchemy import String, Integer
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from ..database import Base
+from .types import EpochMicros
 
 if TYPE_CHECKING:
     from .task import Task
@@ -23,16 +24,18 @@ class Project(Base):
 
     # Timestamp
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True),
+        EpochMicros(),
         default=lambda: datetime.now(UTC),
         nullable=False
     )
 
     # Relationships
+    # Al borrar un proyecto, SQLite pone project_id a NULL en sus tareas
+    # (FK ON DELETE SET NULL); passive_deletes evita cargarlas en memoria.
     tasks: Mapped[list["Task"]] = relationship(
         "Task",
         back_populates="project",
-        cascade="all, delete-orphan"
+        passive_deletes=True
     )
 
     def __repr__(self) -> str:
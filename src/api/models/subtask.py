@@ -1,9 +1,10 @@
 """Modelo ORM para Subtask."""
 from datetime import datetime, UTC
 from typing import Optional, TYPE_CHECKING
-from sqlalchemy import String, Integer, DateTime, Boolean, ForeignKey
+from sqlalchemy import String, Integer, Boolean, ForeignKey, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from ..database import Base
+from .types import EpochMicros
 
 if TYPE_CHECKING:
     from .task import Task
@@ -13,6 +14,26 @@ class Subtask(Base):
     """Modelo ORM para Subtask."""
 
     __tablename__ = "subtasks"
+    __table_args__ = (
+        # Índice del FK: carga de subtasks de una tarea (incluidas eliminadas)
+        Index("ix_subtasks_task_id", "task_id"),
+        # Índice parcial: subtasks ACTIVAS de una tarea ordenadas por position
+        Index(
+            "ix_subtasks_active_task_position",
+            "task_id",
+            "position",
+            sqlite_where=text("deleted_at IS NULL"),
+        ),
+        # Índice parcial: solo subtasks ELIMINADAS, para la purga de retención
+        Index(
+            "ix_subtasks_deleted_at",
+            "deleted_at",
+            sqlite_where=text("deleted_at IS NOT NULL"),
+        ),
+        # AUTOINCREMENT: los ids no se reutilizan nunca, así una fila
+        # archivada (ver models/archive.py) siempre puede volver con su id
+        {"sqlite_autoincrement": True},
+    )
 
     # Primary Key
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -31,16 +52,16 @@ class Subtask(Base):
 
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True),
+        EpochMicros(),
         default=lambda: datetime.now(UTC),
         nullable=False
     )
     completed_at: Mapped[Optional[datetime]] = mapped_column(
-        DateTime(timezone=True),
+        EpochMicros(),
         nullable=True
     )
     deleted_at: Mapped[Optional[datetime]] = mapped_column(
-        DateTime(timezone=True),
+        EpochMicros(),
         nullable=True,
         default=None
     )
@@ -1,9 +1,10 @@
 """Modelo ORM para Task."""
 from datetime import datetime, UTC
 from typing import Optional, TYPE_CHECKING, List
-from sqlalchemy import String, Integer, DateTime, Boolean, ForeignKey
+from sqlalchemy import String, Integer, Boolean, ForeignKey, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from ..database import Base
+from .types import EpochMicros, StatusCode
 
 if TYPE_CHECKING:
     from .project import Project
@@ -14,6 +15,53 @@ class Task(Base):
     """Modelo ORM para Task."""
 
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Índice del FK: SQLite lo usa para el ON DELETE SET NULL al borrar un
+        # proyecto (los índices parciales no cubren tareas eliminadas)
+        Index("ix_tasks_project_id", "project_id"),
+        # Índices parciales: solo cubren tareas ACTIVAS (deleted_at IS NULL).
+        # (status, created_at): una columna del tablero paginada en orden de
+        # creación, sin ordenar (sustituye al antiguo ix_tasks_active_status)
+        Index(
+            "ix_tasks_active_status_created_at",
+            "status",
+            "created_at",
+            sqlite_where=text("deleted_at IS NULL"),
+        ),
+        # Lo mismo dentro de un proyecto (GET /board?project_id=...); sustituye
+        # al antiguo ix_tasks_active_project_status
+        Index(
+            "ix_tasks_active_project_status_created_at",
+            "project_id",
+            "status",
+            "created_at",
+            sqlite_where=text("deleted_at IS NULL"),
+        ),
+        # Paginación keyset de GET /tasks sobre (created_at, id): el id es
+        # el rowid, que SQLite añade al final de cada entrada del índice
+        Index(
+            "ix_tasks_active_created_at",
+            "created_at",
+            sqlite_where=text("deleted_at IS NULL"),
+        ),
+        # Filtro updated_since de GET /tasks: última modificación (las tareas
+        # nunca editadas cuentan desde su creación)
+        Index(
+            "ix_tasks_active_last_modified",
+            text("coalesce(updated_at, created_at)"),
+            sqlite_where=text("deleted_at IS NULL"),
+        ),
+        # Índice parcial inverso: solo tareas ELIMINADAS, para la purga de
+        # la política de retención (ver retention.py)
+        Index(
+            "ix_tasks_deleted_at",
+            "deleted_at",
+            sqlite_where=text("deleted_at IS NOT NULL"),
+        ),
+        # AUTOINCREMENT: los ids no se reutilizan nunca, así una fila
+        # archivada (ver models/archive.py) siempre puede volver con su id
+        {"sqlite_autoincrement": True},
+    )
 
     # Primary Key
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -23,7 +71,7 @@ class Task(Base):
     description: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
 
     # Status y completed
-    status: Mapped[str] = mapped_column(String(20), nullable=False, default="backlog")
+    status: Mapped[str] = mapped_column(StatusCode(), nullable=False, default="backlog")
     completed: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
 
     # Foreign Key (opcional, puede ser NULL)
@@ -35,20 +83,20 @@ class Task(Base):
 
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True),
+        EpochMicros(),
         default=lambda: datetime.now(UTC),
         nullable=False
     )
     updated_at: Mapped[Optional[datetime]] = mapped_column(
-        DateTime(timezone=True),
+        EpochMicros(),
         nullable=True
     )
     completed_at: Mapped[Optional[datetime]] = mapped_column(
-        DateTime(timezone=True),
+        EpochMicros(),
         nullable=True
     )
     deleted_at: Mapped[Optional[datetime]] = mapped_column(
-        DateTime(timezone=True),
+        EpochMicros(),
         nullable=True,
         default=None
     )
@@ -58,10 +106,13 @@ class Task(Base):
         "Project",
         back_populates="tasks"
     )
+    # Borrado físico de una tarea: SQLite elimina sus subtasks (FK ON DELETE
+    # CASCADE) sin que el ORM las cargue.
     subtasks: Mapped[List["Subtask"]] = relationship(
         "Subtask",
         back_populates="task",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True
     )
 
     def __repr__(self) -> str:
@@ -0,0 +1,90 @@
+"""
+Tipos de columna compactos para SQLite.
+
+- `EpochMicros`: datetimes guardados como INTEGER (microsegundos desde epoch,
+  UTC). SQLite los guarda en 1-8 bytes en lugar de un texto ISO de 26, y
+  cargarlos no requiere parsear texto.
+- `StatusCode`: status de tarea guardado como SMALLINT (1 byte en SQLite).
+
+Los valores de Python no cambian: los schemas de la API siguen recibiendo
+datetimes naive en UTC (como devolvía `DateTime` en SQLite) y strings de status.
+
+Ambos tipos sustituyen `result_processor` por una función directa: la
+conversión por defecto de `TypeDecorator` añade una llamada Python por
+valor, que en listados grandes pesa más que la propia conversión.
+"""
+from datetime import datetime, timedelta, UTC
+from typing import Optional
+from sqlalchemy import BigInteger, SmallInteger
+from sqlalchemy.types import TypeDecorator
+
+from ..schemas.tasks import TaskStatus
+
+EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Códigos persistidos: no reordenar ni reutilizar, solo añadir al final
+STATUS_CODES: dict[str, int] = {
+    TaskStatus.BACKLOG.value: 0,
+    TaskStatus.DOING.value: 1,
+    TaskStatus.DONE.value: 2,
+}
+STATUS_VALUES: dict[int, str] = {code: value for value, code in STATUS_CODES.items()}
+
+
+def datetime_to_epoch_micros(value: datetime) -> int:
+    """Convierte un datetime a microsegundos desde epoch (naive = UTC)."""
+    if value.tzinfo is not None:
+        value = value.astimezone(UTC).replace(tzinfo=None)
+    return (value - EPOCH) // _MICROSECOND
+
+
+def epoch_micros_to_datetime(value: int) -> datetime:
+    """Convierte microsegundos desde epoch a un datetime naive en UTC."""
+    return EPOCH + _MICROSECOND * value
+
+
+class EpochMicros(TypeDecorator):
+    """Datetime persistido como entero de microsegundos desde epoch (UTC)."""
+
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value: Optional[datetime], dialect) -> Optional[int]:
+        if value is None:
+            return None
+        return datetime_to_epoch_micros(value)
+
+    def process_result_value(self, value: Optional[int], dialect) -> Optional[datetime]:
+        if value is None:
+            return None
+        return epoch_micros_to_datetime(value)
+
+    def result_processor(self, dialect, coltype):
+        def process(value, epoch=EPOCH, microsecond=_MICROSECOND):
+            return None if value is None else epoch + microsecond * value
+        return process
+
+
+class StatusCode(TypeDecorator):
+    """Status de tarea (`TaskStatus`) persistido como entero pequeño."""
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def process_bind_param(self, value: Optional[str], dialect) -> Optional[int]:
+        if value is None:
+            return None
+        try:
+            return STATUS_CODES[TaskStatus(value).value]
+        except ValueError:
+            raise ValueError(f"Unknown task status '{value}'") from None
+
+    def process_result_value(self, value: Optional[int], dialect) -> Optional[str]:
+        if value is None:
+            return None
+        return STATUS_VALUES[value]
+
+    def result_processor(self, dialect, coltype):
+        # dict.get se ejecuta en C y devuelve None para NULL
+        return STATUS_VALUES.get
@@ -1,17 +1,52 @@
-"""Utilidades para paginación."""
-from typing import Generic, List, TypeVar
+"""
+Utilidades para paginación.
+
+Por defecto los listados se paginan por cursor (keyset): la consulta se
+ordena por una clave única, p. ej. `(created_at, id)`, y cada página empieza
+después de la última fila de la anterior (`WHERE (created_at, id) > (?, ?)`).
+El coste de una página no depende de su posición y las filas insertadas o
+borradas entre páginas no desplazan a las demás.
+
+El cursor es opaco para el cliente: los valores de la clave de la última
+fila, en JSON y base64url. La paginación por offset (`skip`) sigue
+disponible, y el total solo se calcula si se pide (`include_total`), porque
+obliga a un `COUNT(*)` sobre toda la colección.
+"""
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Generic, List, Optional, Sequence, TypeVar
+
 from pydantic import BaseModel, Field, ConfigDict
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .exceptions import InvalidOperationException
+from .models.types import EpochMicros, datetime_to_epoch_micros, epoch_micros_to_datetime
 
 T = TypeVar('T')
 
+# Tamaño de página por defecto y máximo de los listados paginados
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
 
 class PaginatedResponse(BaseModel, Generic[T]):
     """Respuesta paginada genérica."""
 
     items: List[T] = Field(description="Items en la página actual")
-    total: int = Field(description="Total de items en la colección")
-    skip: int = Field(description="Offset aplicado")
+    total: Optional[int] = Field(
+        default=None, description="Total de items en la colección (solo si se pide)"
+    )
+    skip: Optional[int] = Field(
+        default=None, description="Offset aplicado (solo en paginación por offset)"
+    )
     limit: int = Field(description="Límite por página")
+    next_cursor: Optional[str] = Field(
+        default=None, description="Cursor de la página siguiente (None en la última)"
+    )
 
     model_config = ConfigDict(
         json_schema_extra={
@@ -19,7 +54,126 @@ class PaginatedResponse(BaseModel, Generic[T]):
                 "items": [{"id": 1, "name": "Item de ejemplo"}],
                 "total": 50,
                 "skip": 0,
-                "limit": 10
+                "limit": 10,
+                "next_cursor": "WzE3MDQwNjcyMDAwMDAwMDAsIDEwXQ",
             }]
         }
     )
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Codifica los valores de la clave de una fila como cursor opaco."""
+    payload = [
+        datetime_to_epoch_micros(value) if isinstance(value, datetime) else value
+        for value in values
+    ]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, keys: Sequence[Any]) -> list[Any]:
+    """
+    Decodifica un cursor con los valores de las columnas `keys`.
+
+    Raises:
+        InvalidOperationException: Si el cursor no es válido para esas columnas
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidOperationException("Invalid cursor")
+    if (
+        not isinstance(values, list)
+        or len(values) != len(keys)
+        or not all(isinstance(value, int) for value in values)
+    ):
+        raise InvalidOperationException("Invalid cursor")
+    return [
+        epoch_micros_to_datetime(value) if isinstance(key.type, EpochMicros) else value
+        for key, value in zip(keys, values)
+    ]
+
+
+@dataclass
+class Page:
+    """Una página de filas y los datos del envoltorio paginado."""
+
+    rows: list
+    limit: int
+    total: Optional[int] = None
+    skip: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+    def envelope(self, items: list) -> dict:
+        """Envoltorio `PaginatedResponse` (como dict) con los `items` de la página."""
+        return {
+            "items": items,
+            "total": self.total,
+            "skip": self.skip,
+            "limit": self.limit,
+            "next_cursor": self.next_cursor,
+        }
+
+
+def cut_page(rows: list, limit: int, key: Callable[[Any], tuple]) -> tuple[list, Optional[str]]:
+    """
+    Ordena por `key` hasta `limit + 1` filas leídas y corta la página.
+
+    Cada base de datos devuelve su propia página ordenada (modo sharded):
+    ordenar la unión y cortar da la página global.
+
+    Returns:
+        tuple: Filas de la página y cursor de la siguiente (None si no hay más)
+    """
+    rows = sorted(rows, key=key)
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(key(rows[-1]))
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    keys: Sequence[Any],
+    key: Callable[[Any], tuple],
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    skip: Optional[int] = None,
+    include_total: bool = False,
+) -> Page:
+    """
+    Ejecuta una página de `query` ordenada por las columnas `keys`.
+
+    Args:
+        db: Sesión de base de datos
+        query: Consulta Core ya filtrada, sin ORDER BY ni LIMIT
+        keys: Columnas de la clave de orden (la última, única: el id)
+        key: Valores de la clave de una fila, en el orden de `keys`
+        limit: Filas por página
+        cursor: Cursor devuelto en la página anterior (paginación keyset)
+        skip: Offset (paginación por offset); incompatible con `cursor`
+        include_total: Calcula el total de filas de la consulta
+
+    Returns:
+        Page: Filas de la página y cursor de la siguiente
+    """
+    if cursor is not None and skip is not None:
+        raise InvalidOperationException("Use either cursor or skip, not both")
+
+    total = None
+    if include_total:
+        count_query = select(func.count()).select_from(query.order_by(None).subquery())
+        # Con varias bases de datos (modo sharded) llega un conteo por cada una
+        total = sum((await db.execute(count_query)).scalars())
+
+    page_query = query
+    if cursor is not None:
+        page_query = page_query.where(tuple_(*keys) > tuple(decode_cursor(cursor, keys)))
+    page_query = page_query.order_by(*keys).limit(limit + 1)
+    if skip is not None:
+        page_query = page_query.offset(skip)
+
+    rows, next_cursor = cut_page((await db.execute(page_query)).all(), limit, key)
+
+    return Page(rows=rows, limit=limit, total=total, skip=skip, next_cursor=next_cursor)
@@ -0,0 +1,502 @@
+"""
+Modelo de lectura en memoria (write-through) para las lecturas calientes.
+
+La versión original (`backups/tasks.py.bak`) servía todo desde dicts en el
+proceso. Con `read_model_enabled` se recupera esa velocidad sin dejar de
+usar SQLite como fuente de verdad: al arrancar se cargan las tareas activas
+con sus subtasks activas en registros compactos (`__slots__`), indexados por
+id, status y proyecto, y GET /tasks, GET /tasks/{id} y GET
+/tasks/{id}/subtasks se sirven desde ellos sin tocar SQLite.
+
+Sincronización: cada ruta de escritura de tasks/subtasks llama a
+`track_task` (y DELETE /projects a `track_project_deleted`) dentro de su
+transacción. El hook relee la tarea en la sesión de escritura y deja el
+cambio pendiente en la sesión; se aplica al modelo en el `after_commit` de
+la transacción externa y se descarta si esa transacción, o el savepoint en
+el que se registró (pipeline de escritura), hace rollback (ver
+commit_hooks.py). El modelo nunca refleja escrituras sin confirmar. El job
+de archivado quita del modelo las tareas archivadas al terminar.
+
+Limitaciones:
+- Solo tareas y subtasks activas: `show_deleted=true`, el streaming NDJSON
+  y el resto de rutas siguen leyendo de SQLite.
+- El modelo es del proceso: escrituras de otros procesos (varios workers,
+  scripts de `python -m src.api...`) no se ven hasta `POST
+  /admin/read-model/reload`. No se admite en modo sharded.
+
+Con `read_model_check_reads` cada lectura se resuelve también en SQLite:
+se responde con SQLite y las discrepancias se cuentan en
+`GET /admin/read-model`. `POST /admin/read-model/check` compara el modelo
+completo con la base de datos.
+"""
+import sys
+import time
+from bisect import bisect_right, insort
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, UTC
+from typing import Any, Callable, Iterable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from .commit_hooks import on_commit
+from .exceptions import InvalidOperationException
+from .models.subtask import Subtask
+from .models.task import Task
+from .models.types import datetime_to_epoch_micros, epoch_micros_to_datetime
+from .pagination import Page, cut_page, decode_cursor
+from .reads import select_subtasks, select_tasks
+from .schemas.tasks import TaskFieldset, TaskListFilters
+from .streaming import stream_batches
+
+# Discrepancias recientes que se conservan en las métricas
+RECENT_MISMATCHES = 20
+
+
+class SubtaskRecord:
+    """Subtask activa en memoria (los campos de `SubtaskResponse`)."""
+
+    __slots__ = ("id", "task_id", "name", "completed", "position", "created_at", "completed_at")
+
+    def __init__(self, row: Any):
+        for name in self.__slots__:
+            setattr(self, name, getattr(row, name))
+
+    def document(self) -> dict:
+        """La subtask como dict de respuesta (`deleted_at` siempre es None)."""
+        return {name: getattr(self, name) for name in self.__slots__} | {"deleted_at": None}
+
+
+class TaskRecord:
+    """
+    Tarea activa en memoria (los campos de `TaskResponse`).
+
+    `key` es la clave de orden `(created_at, id)`: la misma tupla se
+    comparte en todos los índices.
+    """
+
+    __slots__ = (
+        "id", "name", "description", "project_id", "status", "completed",
+        "created_at", "updated_at", "completed_at", "subtasks", "key",
+    )
+
+    def __init__(self, row: Any, subtasks: list[SubtaskRecord]):
+        for name in self.__slots__[:-2]:
+            setattr(self, name, getattr(row, name))
+        self.status = sys.intern(self.status)
+        self.subtasks = subtasks
+        self.key = (self.created_at, self.id)
+
+    def document(self, fieldset: TaskFieldset = TaskFieldset()) -> dict:
+        """La tarea como dict de respuesta con los campos y relaciones de `fieldset`."""
+        document = {name: getattr(self, name, None) for name in fieldset.fields}
+        if "subtasks" in fieldset.include:
+            document["subtasks"] = [subtask.document() for subtask in self.subtasks]
+        if "subtask_summary" in fieldset.include:
+            document["subtask_summary"] = {
+                "total": len(self.subtasks),
+                "completed": sum(subtask.completed for subtask in self.subtasks),
+            }
+        return document
+
+    def has_open_subtasks(self) -> bool:
+        return any(not subtask.completed for subtask in self.subtasks)
+
+
+def _utc(value: datetime) -> datetime:
+    """Un datetime como lo compara SQLite: naive en UTC, truncado a microsegundos."""
+    return epoch_micros_to_datetime(datetime_to_epoch_micros(value))
+
+
+def _filter_predicate(filters: TaskListFilters) -> Callable[[TaskRecord], bool]:
+    """Los filtros de GET /tasks (`_filter_tasks`) evaluados sobre un registro."""
+    checks = []
+    if filters.status is not None:
+        checks.append(lambda task, value=filters.status.value: task.status == value)
+    if filters.project_id is not None:
+        checks.append(lambda task, value=filters.project_id: task.project_id == value)
+    if filters.completed is not None:
+        checks.append(lambda task, value=filters.completed: task.completed == value)
+    if filters.created_after is not None:
+        checks.append(lambda task, value=_utc(filters.created_after): task.created_at >= value)
+    if filters.created_before is not None:
+        checks.append(lambda task, value=_utc(filters.created_before): task.created_at < value)
+    if filters.updated_since is not None:
+        checks.append(lambda task, value=_utc(filters.updated_since): (task.updated_at or task.created_at) >= value)
+    if filters.has_open_subtasks is not None:
+        checks.append(lambda task, value=filters.has_open_subtasks: task.has_open_subtasks() == value)
+    return lambda task: all(check(task) for check in checks)
+
+
+def _page_start(keys: list, cursor: Optional[str], skip: Optional[int], cursor_columns: tuple) -> int:
+    """Posición de `keys` (ordenadas) a partir de la que empieza la página."""
+    if cursor is not None and skip is not None:
+        raise InvalidOperationException("Use either cursor or skip, not both")
+    if cursor is None:
+        return 0
+    return bisect_right(keys, tuple(decode_cursor(cursor, cursor_columns)))
+
+
+@dataclass
+class ReadModelStats:
+    """Métricas del modelo: lecturas servidas, escrituras aplicadas y comprobaciones."""
+
+    hits: dict[str, int] = field(default_factory=lambda: {"tasks": 0, "task": 0, "subtasks": 0})
+    writes_applied: int = 0
+    writes_discarded: int = 0
+    reads_checked: int = 0
+    mismatches: int = 0
+    recent_mismatches: deque = field(default_factory=lambda: deque(maxlen=RECENT_MISMATCHES))
+    loaded_at: Optional[datetime] = None
+    load_ms: float = 0.0
+
+    def as_dict(self) -> dict:
+        """Representación serializable."""
+        return {
+            "hits": dict(self.hits),
+            "writes_applied": self.writes_applied,
+            "writes_discarded": self.writes_discarded,
+            "reads_checked": self.reads_checked,
+            "mismatches": self.mismatches,
+            "recent_mismatches": list(self.recent_mismatches),
+            "loaded_at": self.loaded_at.isoformat() if self.loaded_at else None,
+            "load_ms": round(self.load_ms, 3),
+        }
+
+
+class ReadModel:
+    """
+    Tareas activas en memoria, indexadas por id, status y proyecto.
+
+    Cada índice secundario es una lista de claves `(created_at, id)`
+    ordenada: una página es un `bisect` al cursor y un recorrido de como
+    mucho `limit + 1` coincidencias, igual que la consulta keyset en SQLite.
+
+    Args:
+        check_reads: Resuelve también cada lectura en SQLite y compara
+    """
+
+    def __init__(self, check_reads: bool = False):
+        self.check_reads = check_reads
+        self.stats = ReadModelStats()
+        self._tasks: dict[int, TaskRecord] = {}
+        self._order: list[tuple] = []
+        self._by_status: dict[str, list[tuple]] = {}
+        self._by_project: dict[int, list[tuple]] = {}
+        # Cambios confirmados mientras se recarga (se reaplican sobre la carga)
+        self._replay: Optional[list[Callable[["ReadModel"], None]]] = None
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    # --- Carga y escritura ---------------------------------------------
+
+    async def load(self, session_maker: async_sessionmaker[AsyncSession]) -> None:
+        """
+        (Re)carga el modelo completo desde la base de datos.
+
+        Las escrituras confirmadas durante la carga se aplican al modelo
+        anterior y se reaplican, en orden, sobre el nuevo: cada cambio es el
+        estado completo de la tarea tras su commit, así que gana el último.
+        """
+        start = time.perf_counter()
+        self._replay = []
+        try:
+            async with session_maker() as db:
+                tasks = await load_task_records(db)
+        finally:
+            replay, self._replay = self._replay, None
+        self._tasks = {}
+        self._order = []
+        self._by_status = {}
+        self._by_project = {}
+        for task in sorted(tasks, key=lambda task: task.key):
+            self._tasks[task.id] = task
+            self._order.append(task.key)
+            self._by_status.setdefault(task.status, []).append(task.key)
+            if task.project_id is not None:
+                self._by_project.setdefault(task.project_id, []).append(task.key)
+        for change in replay:
+            change(self)
+        self.stats.loaded_at = datetime.now(UTC)
+        self.stats.load_ms = (time.perf_counter() - start) * 1000
+
+    def apply(self, change: Callable[["ReadModel"], None]) -> None:
+        """Aplica un cambio confirmado (y lo guarda si hay una recarga en curso)."""
+        change(self)
+        if self._replay is not None:
+            self._replay.append(change)
+
+    def put_task(self, task_id: int, task: Optional[TaskRecord]) -> None:
+        """Sustituye una tarea (None: ya no está activa y sale del modelo)."""
+        previous = self._tasks.pop(task_id, None)
+        if previous is not None:
+            self._unindex(previous)
+        if task is not None:
+            self._tasks[task_id] = task
+            self._index(task)
+
+    def unlink_project(self, project_id: int) -> None:
+        """Desvincula las tareas de un proyecto eliminado (FK ON DELETE SET NULL)."""
+        for key in self._by_project.pop(project_id, []):
+            self._tasks[key[1]].project_id = None
+
+    def forget_archived(self, cutoff: datetime) -> None:
+        """Quita las tareas que el archivado mueve con este `cutoff` (ver archive.py)."""
+        cutoff = _utc(cutoff)
+        for task in list(self._tasks.values()):
+            last_activity = task.updated_at or task.completed_at or task.created_at
+            if task.status == "done" and last_activity < cutoff:
+                self.put_task(task.id, None)
+
+    def _index(self, task: TaskRecord) -> None:
+        insort(self._order, task.key)
+        insort(self._by_status.setdefault(task.status, []), task.key)
+        if task.project_id is not None:
+            insort(self._by_project.setdefault(task.project_id, []), task.key)
+
+    def _unindex(self, task: TaskRecord) -> None:
+        for keys in (self._order, self._by_status[task.status],
+                     self._by_project.get(task.project_id) if task.project_id is not None else None):
+            if keys is not None:
+                del keys[bisect_right(keys, task.key) - 1]
+
+    # --- Lectura -------------------------------------------------------
+
+    def get_task(self, task_id: int) -> Optional[TaskRecord]:
+        """Una tarea activa, o None."""
+        return self._tasks.get(task_id)
+
+    def task_page(
+        self,
+        filters: TaskListFilters,
+        limit: int,
+        cursor: Optional[str] = None,
+        skip: Optional[int] = None,
+        include_total: bool = False,
+    ) -> Page:
+        """
+        Página de tareas activas filtradas, como `paginate` sobre SQLite.
+
+        Recorre el índice más selectivo de los filtros (status, proyecto o el
+        orden global) desde el cursor y evalúa el resto de filtros por tarea.
+        """
+        candidates = self._order
+        if filters.status is not None:
+            candidates = self._by_status.get(filters.status.value, [])
+        if filters.project_id is not None:
+            by_project = self._by_project.get(filters.project_id, [])
+            candidates = min(candidates, by_project, key=len) if filters.status is not None else by_project
+        matches = _filter_predicate(filters)
+
+        start = _page_start(candidates, cursor, skip, (Task.created_at, Task.id))
+        rows = []
+        skipped = 0
+        for position in range(start, len(candidates)):
+            task = self._tasks[candidates[position][1]]
+            if not matches(task):
+                continue
+            if skipped < (skip or 0):
+                skipped += 1
+                continue
+            rows.append(task)
+            if len(rows) > limit:
+                break
+
+        total = sum(1 for key in candidates if matches(self._tasks[key[1]])) if include_total else None
+        rows, next_cursor = cut_page(rows, limit, lambda task: task.key)
+        return Page(rows=rows, limit=limit, total=total, skip=skip, next_cursor=next_cursor)
+
+    def subtask_page(
+        self,
+        task_id: int,
+        limit: int,
+        cursor: Optional[str] = None,
+        skip: Optional[int] = None,
+        include_total: bool = False,
+    ) -> Optional[Page]:
+        """Página de subtasks activas de una tarea por `(position, id)`; None si la tarea no está activa."""
+        task = self._tasks.get(task_id)
+        if task is None:
+            return None
+        subtasks = sorted(task.subtasks, key=lambda subtask: (subtask.position, subtask.id))
+        keys = [(subtask.position, subtask.id) for subtask in subtasks]
+        start = _page_start(keys, cursor, skip, (Subtask.position, Subtask.id)) + (skip or 0)
+        rows, next_cursor = cut_page(
+            subtasks[start:start + limit + 1], limit, lambda subtask: (subtask.position, subtask.id)
+        )
+        return Page(
+            rows=[subtask.document() for subtask in rows],
+            limit=limit,
+            total=len(subtasks) if include_total else None,
+            skip=skip,
+            next_cursor=next_cursor,
+        )
+
+    def hit(self, kind: str) -> None:
+        self.stats.hits[kind] += 1
+
+    def record_check(self, path: str, served: bytes, expected: bytes) -> None:
+        """Compara una respuesta del modelo con la de SQLite (modo `check_reads`)."""
+        self.stats.reads_checked += 1
+        if served != expected:
+            self.stats.mismatches += 1
+            self.stats.recent_mismatches.append(path)
+
+    # --- Consistencia y memoria ----------------------------------------
+
+    async def check(self, db: AsyncSession) -> dict:
+        """
+        Compara el modelo completo con las tareas activas de la base de datos.
+
+        Returns:
+            dict: Tareas de cada lado y ids que faltan, sobran o difieren
+        """
+        expected = {task.id: task for task in await load_task_records(db)}
+        missing = sorted(expected.keys() - self._tasks.keys())
+        stale = sorted(self._tasks.keys() - expected.keys())
+        different = sorted(
+            task_id for task_id in expected.keys() & self._tasks.keys()
+            if self._tasks[task_id].document() != expected[task_id].document()
+        )
+        indexes_ok = (
+            self._order == sorted(task.key for task in self._tasks.values())
+            and sum(map(len, self._by_status.values())) == len(self._tasks)
+        )
+        return {
+            "consistent": not (missing or stale or different) and indexes_ok,
+            "tasks": len(self._tasks),
+            "database_tasks": len(expected),
+            "missing": missing,
+            "stale": stale,
+            "different": different,
+            "indexes_ok": indexes_ok,
+        }
+
+    def memory(self) -> dict:
+        """
+        Bytes aproximados (`sys.getsizeof`) de registros e índices.
+
+        Cuenta cada objeto referenciado por un registro (strings, datetimes,
+        la lista de subtasks, la clave); los status están internados y no
+        cuentan, como los valores singleton (None, bool, ints pequeños).
+        """
+        records = sum(map(_record_bytes, self._tasks.values()))
+        indexes = (
+            sys.getsizeof(self._tasks)
+            + sys.getsizeof(self._order)
+            + sum(sys.getsizeof(keys) for keys in self._by_status.values())
+            + sys.getsizeof(self._by_project)
+            + sum(sys.getsizeof(keys) for keys in self._by_project.values())
+        )
+        return {
+            "tasks": len(self._tasks),
+            "subtasks": sum(len(task.subtasks) for task in self._tasks.values()),
+            "record_bytes": records,
+            "index_bytes": indexes,
+            "total_bytes": records + indexes,
+        }
+
+
+def _value_bytes(value: Any) -> int:
+    if value is None or isinstance(value, bool) or (isinstance(value, int) and -5 <= value <= 256):
+        return 0
+    return sys.getsizeof(value)
+
+
+def _record_bytes(task: TaskRecord) -> int:
+    size = sys.getsizeof(task) + sys.getsizeof(task.subtasks) + sys.getsizeof(task.key)
+    size += sum(_value_bytes(getattr(task, name)) for name in TaskRecord.__slots__[:-2] if name != "status")
+    for subtask in task.subtasks:
+        size += sys.getsizeof(subtask) + sum(_value_bytes(getattr(subtask, name)) for name in SubtaskRecord.__slots__)
+    return size
+
+
+async def load_task_records(db: AsyncSession, task_ids: Optional[Iterable[int]] = None) -> list[TaskRecord]:
+    """
+    Registros de las tareas activas (todas o las de `task_ids`) con sus subtasks activas.
+
+    Se recorre en lotes (`stream_batches`): cargar el modelo no materializa
+    todas las filas a la vez además de los registros.
+    """
+    tasks = select_tasks().where(Task.deleted_at.is_(None))
+    subtasks = select_subtasks().where(Subtask.deleted_at.is_(None))
+    if task_ids is not None:
+        task_ids = list(task_ids)
+        tasks = tasks.where(Task.id.in_(task_ids))
+        subtasks = subtasks.where(Subtask.task_id.in_(task_ids))
+
+    by_task: dict[int, list[SubtaskRecord]] = {}
+    async for rows in stream_batches(db, subtasks.order_by(Subtask.task_id, Subtask.id)):
+        for row in rows:
+            by_task.setdefault(row.task_id, []).append(SubtaskRecord(row))
+    records = []
+    async for rows in stream_batches(db, tasks):
+        records += [TaskRecord(row, by_task.get(row.id, [])) for row in rows]
+    return records
+
+
+# --- Hooks de escritura ----------------------------------------------------
+
+
+def _defer(db: AsyncSession, change: Callable[[ReadModel], None]) -> None:
+    """Aplica `change` al modelo cuando se confirme la transacción de `db` (ver commit_hooks)."""
+    def apply() -> None:
+        if _read_model is not None:
+            _read_model.apply(change)
+            _read_model.stats.writes_applied += 1
+
+    def discard() -> None:
+        if _read_model is not None:
+            _read_model.stats.writes_discarded += 1
+
+    on_commit(db, apply, discard)
+
+
+async def track_task(db: AsyncSession, task_id: int) -> None:
+    """
+    Hook de las rutas de escritura: refleja en el modelo el estado de una tarea.
+
+    Relee la tarea (y sus subtasks activas) en la sesión de escritura, tras
+    hacer flush, y la aplica al modelo cuando la transacción hace commit.
+    Sin modelo activo no hace nada.
+    """
+    if _read_model is None:
+        return
+    await db.flush()
+    records = await load_task_records(db, [task_id])
+    record = records[0] if records else None
+    _defer(db, lambda model: model.put_task(task_id, record))
+
+
+def track_project_deleted(db: AsyncSession, project_id: int) -> None:
+    """Hook de DELETE /projects: desvincula sus tareas del modelo al hacer commit."""
+    if _read_model is not None:
+        _defer(db, lambda model: model.unlink_project(project_id))
+
+
+# --- Ciclo de vida ---------------------------------------------------------
+
+_read_model: Optional[ReadModel] = None
+
+
+def get_read_model() -> Optional[ReadModel]:
+    """Dependency con el modelo de lectura activo, o None si está deshabilitado."""
+    return _read_model
+
+
+async def start_read_model(
+    session_maker: async_sessionmaker[AsyncSession], check_reads: bool = False
+) -> ReadModel:
+    """Crea el modelo global de la aplicación y lo carga desde la base de datos."""
+    global _read_model
+    model = ReadModel(check_reads=check_reads)
+    await model.load(session_maker)
+    _read_model = model
+    return model
+
+
+def stop_read_model() -> None:
+    """Desactiva el modelo global: las lecturas vuelven a SQLite."""
+    global _read_model
+    _read_model = None
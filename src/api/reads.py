@@ -0,0 +1,167 @@
+"""
+Capa de lectura a nivel Core para los listados de solo lectura.
+
+Las rutas de listado no modifican lo que leen: instanciar objetos ORM (con
+su estado, identity map y colecciones) para después copiarlos a un schema
+es coste puro. Aquí se seleccionan solo las columnas del schema de
+respuesta, como filas (`Row`), y el anidado task → subtasks se monta en una
+única pasada agrupada sobre una segunda consulta `task_id IN (...)`.
+
+El resultado son dicts que `serialization.json_response` valida y
+serializa una sola vez (sin `model_validate` previo en Python).
+
+Las columnas salen de los campos de cada schema, así que añadir un campo a
+`TaskResponse`/`SubtaskResponse`/`ProjectResponse` que exista como columna
+lo incluye automáticamente.
+"""
+from typing import Any, AsyncIterator, Iterable, Optional, Sequence
+
+from pydantic import BaseModel
+from sqlalchemy import Select, func, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models.project import Project
+from .models.subtask import Subtask
+from .models.task import Task
+from .schemas.projects import ProjectResponse
+from .schemas.subtasks import SubtaskResponse
+from .schemas.tasks import TaskResponse
+from .streaming import stream_batches
+
+
+def response_columns(model, schema: type[BaseModel]) -> list:
+    """Columnas de `model` que forman parte del schema de respuesta, en su orden."""
+    table_columns = model.__table__.c
+    return [getattr(model, name) for name in schema.model_fields if name in table_columns]
+
+
+TASK_COLUMNS = response_columns(Task, TaskResponse)
+SUBTASK_COLUMNS = response_columns(Subtask, SubtaskResponse)
+PROJECT_COLUMNS = response_columns(Project, ProjectResponse)
+
+# Columnas de tasks que se leen siempre, aunque no estén en `fields`
+TASK_KEY_FIELDS = ("id", "created_at")
+
+# Ids por consulta `IN` de subtasks (el mismo lote que usa selectinload)
+SUBTASK_BATCH_SIZE = 500
+
+
+def select_tasks(fields: Optional[Iterable[str]] = None) -> Select:
+    """
+    `select` de las columnas de `TaskResponse` (sin subtasks).
+
+    Con `fields`, solo esas columnas más `TASK_KEY_FIELDS` (el id agrupa las
+    relaciones y `(created_at, id)` es la clave de paginación); las columnas
+    de más se descartan al validar con el schema del fieldset.
+    """
+    if fields is None:
+        return select(*TASK_COLUMNS)
+    wanted = set(fields) | set(TASK_KEY_FIELDS)
+    return select(*(column for column in TASK_COLUMNS if column.key in wanted))
+
+
+def select_subtasks() -> Select:
+    """`select` de las columnas de `SubtaskResponse`."""
+    return select(*SUBTASK_COLUMNS)
+
+
+def select_projects() -> Select:
+    """`select` de las columnas de `ProjectResponse`."""
+    return select(*PROJECT_COLUMNS)
+
+
+def as_dicts(rows: Iterable[Any]) -> list[dict]:
+    """Filas Core como dicts (la entrada del `response_model`)."""
+    return [row._asdict() for row in rows]
+
+
+async def task_documents(
+    db: AsyncSession,
+    tasks: Sequence[Any],
+    include: Iterable[str] = ("subtasks",),
+    show_deleted: bool = False,
+) -> list[dict]:
+    """
+    Tareas como dicts con las relaciones de `include`, por lotes de ids.
+
+    - `subtasks`: la lista de subtasks de cada tarea, ordenadas por id, en
+      una pasada agrupada sobre una consulta `task_id IN (...)` por lote.
+    - `subtask_summary`: `{total, completed}` de un `GROUP BY task_id` por
+      lote; no se lee ninguna fila de subtask.
+
+    Args:
+        db: Sesión de base de datos
+        tasks: Filas de `select_tasks()`
+        include: Relaciones a añadir (`TASK_INCLUDES`)
+        show_deleted: Si True, las subtasks eliminadas también cuentan
+
+    Returns:
+        list[dict]: Tareas como dicts, en el mismo orden
+    """
+    documents = as_dicts(tasks)
+    if not documents:
+        return documents
+
+    by_task = {task["id"]: task for task in documents}
+    for task in documents:
+        if "subtasks" in include:
+            task["subtasks"] = []
+        if "subtask_summary" in include:
+            task["subtask_summary"] = {"total": 0, "completed": 0}
+
+    task_ids = list(by_task)
+    for start in range(0, len(task_ids), SUBTASK_BATCH_SIZE):
+        batch = task_ids[start:start + SUBTASK_BATCH_SIZE]
+        if "subtasks" in include:
+            await _add_subtasks(db, by_task, batch, show_deleted)
+        if "subtask_summary" in include:
+            await _add_subtask_summaries(db, by_task, batch, show_deleted)
+
+    return documents
+
+
+async def _add_subtasks(db: AsyncSession, by_task: dict[int, dict], batch: list[int], show_deleted: bool) -> None:
+    """Añade a cada tarea de `batch` sus subtasks."""
+    query = select_subtasks().where(Subtask.task_id.in_(batch)).order_by(Subtask.task_id, Subtask.id)
+    if not show_deleted:
+        query = query.where(Subtask.deleted_at.is_(None))
+
+    # Pasada agrupada: cada subtask va a la lista de su tarea
+    for subtask in await db.execute(query):
+        by_task[subtask.task_id]["subtasks"].append(subtask._asdict())
+
+
+async def _add_subtask_summaries(
+    db: AsyncSession, by_task: dict[int, dict], batch: list[int], show_deleted: bool
+) -> None:
+    """Añade a cada tarea de `batch` el recuento de sus subtasks."""
+    query = (
+        select(
+            Subtask.task_id,
+            func.count().label("total"),
+            func.count().filter(Subtask.completed == true()).label("completed"),
+        )
+        .where(Subtask.task_id.in_(batch))
+        .group_by(Subtask.task_id)
+    )
+    if not show_deleted:
+        query = query.where(Subtask.deleted_at.is_(None))
+
+    for summary in await db.execute(query):
+        by_task[summary.task_id]["subtask_summary"] = {"total": summary.total, "completed": summary.completed}
+
+
+async def with_subtasks(db: AsyncSession, tasks: Sequence[Any], show_deleted: bool = False) -> list[dict]:
+    """Tareas como dicts con la lista `subtasks` (ver `task_documents`)."""
+    return await task_documents(db, tasks, ("subtasks",), show_deleted)
+
+
+async def stream_task_documents(
+    db: AsyncSession,
+    query: Select,
+    include: Iterable[str] = ("subtasks",),
+    show_deleted: bool = False,
+) -> AsyncIterator[list[dict]]:
+    """Recorre en lotes las tareas de `query` (`stream_batches`), cada lote con sus relaciones."""
+    async for tasks in stream_batches(db, query):
+        yield await task_documents(db, tasks, include, show_deleted)
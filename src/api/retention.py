@@ -0,0 +1,164 @@
+"""
+Política de retención: purga física de filas eliminadas (soft delete).
+
+`delete_task` y `delete_subtask` solo marcan `deleted_at`. Las filas cuyo
+`deleted_at` es anterior a `retention_days` días se borran definitivamente,
+primero las subtasks y después las tareas (el FK `ON DELETE CASCADE` borra las
+subtasks que aún cuelguen de ellas).
+
+El borrado se hace en lotes de `batch_size` filas, cada lote en su propia
+transacción y con una pausa entre lotes, de forma que el lock de escritura
+nunca se mantiene más de lo que tarda un lote. Los índices parciales
+`ix_*_deleted_at` (solo filas eliminadas) localizan cada lote sin recorrer
+las filas activas.
+
+En la aplicación la purga es opcional (`maintenance_retention_interval_s`,
+0 por defecto): sin configurarla las filas eliminadas se conservan y
+`show_deleted=true` las sigue devolviendo.
+
+Las páginas liberadas pasan a la freelist; el job `incremental_vacuum` las
+devuelve al sistema.
+
+Uso:
+    python -m src.api.retention --days 30 --batch-size 500
+"""
+import argparse
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta, UTC
+from typing import Optional
+
+from sqlalchemy import delete, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from .config import get_settings
+from .migrations.runner import run_in_batches
+from .models.subtask import Subtask
+from .models.task import Task
+
+# Orden de purga: las subtasks antes que sus tareas
+PURGE_ORDER = (Subtask, Task)
+
+
+@dataclass
+class RetentionResult:
+    """Resultado de una purga."""
+
+    cutoff: datetime
+    subtasks: int = 0
+    tasks: int = 0
+    batches: int = 0
+    pages_freed: int = 0
+
+    def add_batch(self, model, rows: int) -> None:
+        """Acumula las filas borradas por un lote."""
+        if model is Task:
+            self.tasks += rows
+        else:
+            self.subtasks += rows
+        self.batches += 1
+
+    def as_dict(self) -> dict:
+        """Representación serializable."""
+        return {
+            "cutoff": self.cutoff.isoformat(),
+            "subtasks": self.subtasks,
+            "tasks": self.tasks,
+            "batches": self.batches,
+            "pages_freed": self.pages_freed,
+        }
+
+
+def retention_cutoff(retention_days: float, now: Optional[datetime] = None) -> datetime:
+    """Fecha límite: se purgan las filas eliminadas antes de ella."""
+    return (now or datetime.now(UTC)) - timedelta(days=retention_days)
+
+
+async def purge_batch(conn: AsyncConnection, model, cutoff: datetime, batch_size: int) -> int:
+    """
+    Borra un lote de filas de `model` eliminadas antes de `cutoff`.
+
+    Args:
+        conn: Conexión con una transacción abierta
+        model: Task o Subtask
+        cutoff: Fecha límite de `deleted_at`
+        batch_size: Filas máximas del lote
+
+    Returns:
+        int: Filas borradas
+    """
+    batch = (
+        select(model.id)
+        .where(model.deleted_at.is_not(None), model.deleted_at < cutoff)
+        .limit(batch_size)
+        .scalar_subquery()
+    )
+    result = await conn.execute(delete(model).where(model.id.in_(batch)))
+    return result.rowcount
+
+
+async def _freelist_count(engine: AsyncEngine) -> int:
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        return (await conn.execute(text("PRAGMA freelist_count"))).scalar()
+
+
+async def purge_deleted(
+    engine: AsyncEngine,
+    retention_days: float,
+    batch_size: int = 500,
+    pause: float = 0.05,
+) -> RetentionResult:
+    """
+    Purga en lotes las subtasks y tareas eliminadas hace más de `retention_days`.
+
+    Args:
+        engine: Engine de escritura
+        retention_days: Días que se conservan las filas eliminadas
+        batch_size: Filas por transacción
+        pause: Segundos a esperar entre lotes
+
+    Returns:
+        RetentionResult: Filas purgadas por tabla, lotes y páginas liberadas
+    """
+    result = RetentionResult(cutoff=retention_cutoff(retention_days))
+    freelist_before = await _freelist_count(engine)
+
+    for model in PURGE_ORDER:
+        async def _batch(conn: AsyncConnection) -> int:
+            rows = await purge_batch(conn, model, result.cutoff, batch_size)
+            if rows:
+                result.add_batch(model, rows)
+            return rows
+
+        await run_in_batches(engine, _batch, pause=pause)
+
+    result.pages_freed = max(0, await _freelist_count(engine) - freelist_before)
+    return result
+
+
+async def _cli(args: argparse.Namespace) -> None:
+    from .database import engine
+
+    try:
+        result = await purge_deleted(engine, args.days, args.batch_size, args.pause_ms / 1000)
+        print(
+            f"OK - {result.tasks} tareas y {result.subtasks} subtasks purgadas "
+            f"en {result.batches} lotes, {result.pages_freed} páginas liberadas "
+            f"(eliminadas antes de {result.cutoff:%Y-%m-%d})"
+        )
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Purga las filas eliminadas fuera del periodo de retención")
+    parser.add_argument("--days", type=float, default=settings.retention_days, help="Días de retención")
+    parser.add_argument("--batch-size", type=int, default=settings.retention_batch_size, help="Filas por transacción")
+    parser.add_argument("--pause-ms", type=float, default=settings.maintenance_step_pause_ms, help="Pausa entre lotes (ms)")
+    asyncio.run(_cli(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""
+Router de administración y métricas internas.
+
+Expone métricas, jobs de mantenimiento y backups de la base de datos
+completa, así que está deshabilitado por defecto: solo responde si se
+configura `admin_token` (`APP_ADMIN_TOKEN`) y la request lo envía en la
+cabecera `X-Admin-Token`. Sin token configurado, todas las rutas responden
+404.
+"""
+import os
+import secrets
+import shutil
+import tempfile
+from datetime import datetime, UTC
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.background import BackgroundTask
+
+from ..backup import backup_database, get_backup_dir, get_backup_source, iter_file
+from ..coalescing import SingleFlight, get_single_flight
+from ..config import get_settings
+from ..database import get_read_db, get_read_sessionmaker
+from ..maintenance import MaintenanceScheduler, get_maintenance_scheduler
+from ..read_model import ReadModel, get_read_model
+from ..versions import DataVersions, get_data_versions
+from ..sharding import ShardManager, get_shard_manager
+from ..write_pipeline import WritePipeline, get_write_pipeline
+
+
+
+def get_admin_token() -> Optional[str]:
+    """Dependency con el token de administración (None = router deshabilitado)."""
+    return get_settings().admin_token
+
+
+def require_admin(
+    x_admin_token: Optional[str] = Header(default=None),
+    admin_token: Optional[str] = Depends(get_admin_token),
+) -> None:
+    """Exige el token de administración en todas las rutas del router."""
+    if admin_token is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Not Found"
+        )
+    if x_admin_token is None or not secrets.compare_digest(x_admin_token, admin_token):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid admin token"
+        )
+
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/write-pipeline")
+async def get_write_pipeline_stats(
+    pipeline: Optional[WritePipeline] = Depends(get_write_pipeline),
+):
+    """Métricas del pipeline de escritura (tamaños de lote y latencia de commit)."""
+    if pipeline is None:
+        return {"enabled": False}
+
+    return {
+        "enabled": True,
+        "max_batch_size": pipeline.max_batch_size,
+        "max_wait_ms": pipeline.max_wait * 1000,
+        "stats": pipeline.stats.as_dict(),
+    }
+
+
+@router.get("/maintenance")
+async def get_maintenance_stats(
+    scheduler: Optional[MaintenanceScheduler] = Depends(get_maintenance_scheduler),
+):
+    """Última ejecución, duración y resultado de cada job de mantenimiento."""
+    if scheduler is None:
+        return {"enabled": False}
+
+    return {
+        "enabled": True,
+        "running": scheduler.running,
+        "step_pause_ms": scheduler.step_pause * 1000,
+        "jobs": scheduler.as_dict(),
+    }
+
+
+@router.post("/maintenance/{job_name}/run")
+async def run_maintenance_job(
+    job_name: str,
+    scheduler: Optional[MaintenanceScheduler] = Depends(get_maintenance_scheduler),
+):
+    """Ejecuta un job de mantenimiento inmediatamente."""
+    if scheduler is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Maintenance scheduler is disabled"
+        )
+    if job_name not in scheduler.jobs:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Maintenance job not found"
+        )
+
+    stats = await scheduler.run_job(job_name)
+    return stats.as_dict()
+
+
+@router.get("/coalescing")
+async def get_coalescing_stats(
+    flights: Optional[SingleFlight] = Depends(get_single_flight),
+    versions: DataVersions = Depends(get_data_versions),
+):
+    """Lecturas agrupadas (hits), ejecutadas (misses) y versión actual de los datos."""
+    if flights is None:
+        return {"enabled": False, "data_versions": versions.as_dict()}
+
+    return {
+        "enabled": True,
+        "in_flight": flights.in_flight,
+        "stats": flights.stats.as_dict(),
+        "data_versions": versions.as_dict(),
+    }
+
+
+def _require_read_model(read_model: Optional[ReadModel] = Depends(get_read_model)) -> ReadModel:
+    if read_model is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Read model is disabled"
+        )
+    return read_model
+
+
+@router.get("/read-model")
+async def get_read_model_stats(read_model: Optional[ReadModel] = Depends(get_read_model)):
+    """Lecturas servidas, escrituras aplicadas, comprobaciones y memoria del modelo en memoria."""
+    if read_model is None:
+        return {"enabled": False}
+
+    return {
+        "enabled": True,
+        "check_reads": read_model.check_reads,
+        "memory": read_model.memory(),
+        "stats": read_model.stats.as_dict(),
+    }
+
+
+@router.post("/read-model/check")
+async def check_read_model(
+    read_model: ReadModel = Depends(_require_read_model),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Compara el modelo en memoria completo con las tareas activas de la base de datos."""
+    return await read_model.check(db)
+
+
+@router.post("/read-model/reload")
+async def reload_read_model(
+    read_model: ReadModel = Depends(_require_read_model),
+    session_maker=Depends(get_read_sessionmaker),
+):
+    """Recarga el modelo en memoria desde la base de datos."""
+    await read_model.load(session_maker)
+    return {"memory": read_model.memory(), "load_ms": round(read_model.stats.load_ms, 3)}
+
+
+@router.get("/shards")
+async def get_shards(manager: Optional[ShardManager] = Depends(get_shard_manager)):
+    """Shards abiertos en modo sharded y el tamaño de cada fichero."""
+    if manager is None:
+        return {"enabled": False}
+
+    return {
+        "enabled": True,
+        "shard_dir": manager.shard_dir,
+        "shards": [
+            {
+                "shard": shard,
+                "bytes": os.path.getsize(manager.shard_path(shard)),
+                "open": manager.is_open(shard),
+            }
+            for shard in manager.shard_ids
+        ],
+    }
+
+
+def _require_backup_source(
+    source: Optional[str] = Depends(get_backup_source),
+    manager: Optional[ShardManager] = Depends(get_shard_manager),
+) -> str:
+    # En modo sharded la fuente es solo el catálogo: las tareas no estarían en la copia
+    if manager is not None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Backups are not supported with storage_mode=sharded"
+        )
+    if source is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="In-memory database cannot be backed up"
+        )
+    return source
+
+
+def _snapshot_name() -> str:
+    return f"app-{datetime.now(UTC).strftime('%Y%m%dT%H%M%S%fZ')}.db"
+
+
+@router.post("/backup", status_code=status.HTTP_201_CREATED)
+async def create_backup(
+    source: str = Depends(_require_backup_source),
+    backup_dir: str = Depends(get_backup_dir),
+):
+    """Crea un snapshot consistente de la base de datos sin detener las escrituras."""
+    settings = get_settings()
+    result = await backup_database(
+        source,
+        os.path.join(backup_dir, _snapshot_name()),
+        pages_per_step=settings.backup_pages_per_step,
+        step_pause=settings.backup_step_pause_ms / 1000,
+    )
+    return result.as_dict()
+
+
+@router.get("/backup/download")
+async def download_backup(
+    compress: bool = True,
+    source: str = Depends(_require_backup_source),
+):
+    """Crea un snapshot y lo envía como descarga (gzip por defecto)."""
+    settings = get_settings()
+    tmp_dir = tempfile.mkdtemp(prefix="backup-")
+    filename = _snapshot_name()
+    path = os.path.join(tmp_dir, filename)
+    try:
+        await backup_database(
+            source,
+            path,
+            pages_per_step=settings.backup_pages_per_step,
+            step_pause=settings.backup_step_pause_ms / 1000,
+        )
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    if compress:
+        filename += ".gz"
+    # El snapshot lo borra la respuesta al terminar, no el `finally` de un
+    # generador que solo se ejecuta si alguien lo consume o lo cierra
+    return StreamingResponse(
+        iter_file(path, compress=compress),
+        media_type="application/gzip" if compress else "application/vnd.sqlite3",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        background=BackgroundTask(shutil.rmtree, tmp_dir, ignore_errors=True),
+    )
@@ -0,0 +1,117 @@
+"""
+Router del tablero por columnas (una por status).
+
+GET /board devuelve, en una sola consulta de tareas, la primera página de
+cada columna con su propio cursor; GET /board/{status} sigue una columna
+con ese cursor. La primera carga lee como mucho `limit + 1` tareas por
+columna, por mucho historial que acumule `done`.
+
+Cada columna es un `SELECT ... WHERE status = ? ORDER BY created_at, id
+LIMIT ?` sobre ix_tasks_active_status_created_at, y las tres van unidas
+con UNION ALL. Una ventana `row_number() OVER (PARTITION BY status ...)`
+filtrada por `rn <= limit` daría las mismas filas, pero SQLite calcula la
+ventana sobre todas las tareas de cada status antes de filtrar: su coste
+crece con el historial (ver benchmarks/bench_board_columns.py).
+"""
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import Select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import get_read_db
+from ..etags import TASK_DOCUMENT_TABLES, tables_etag
+from ..models.task import Task
+from ..pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, cut_page, paginate
+from ..reads import select_tasks, with_subtasks
+from ..schemas.board import BoardColumn, BoardResponse
+from ..schemas.tasks import TaskStatus
+from ..serialization import json_response
+
+router = APIRouter(
+    prefix="/board",
+    tags=["board"],
+    dependencies=[Depends(tables_etag(*TASK_DOCUMENT_TABLES, streams=False))],
+)
+
+
+def _task_key(task) -> tuple:
+    """Clave de orden (y del cursor) de una tarea en su columna."""
+    return task.created_at, task.id
+
+
+def _column_query(column: TaskStatus, project_id: Optional[int]) -> Select:
+    """Tareas activas de una columna (opcionalmente de un proyecto), sin ordenar."""
+    query = select_tasks().where(Task.status == column.value, Task.deleted_at.is_(None))
+    if project_id is not None:
+        query = query.where(Task.project_id == project_id)
+    return query
+
+
+def board_query(limit: int, project_id: Optional[int] = None) -> Select:
+    """
+    Primeras `limit + 1` tareas de cada columna, en una consulta.
+
+    La fila de más de cada columna indica si hay página siguiente.
+    """
+    return union_all(*(
+        _column_query(column, project_id)
+        .order_by(Task.created_at, Task.id)
+        .limit(limit + 1)
+        .subquery()
+        .select()
+        for column in TaskStatus
+    ))
+
+
+@router.get("/", response_model=BoardResponse)
+async def get_board(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Tareas por columna"),
+    project_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Obtiene la primera página de cada columna del tablero.
+
+    Una consulta para las tareas de las tres columnas y otra para sus
+    subtasks activas. El `next_cursor` de cada columna pide su página
+    siguiente en GET /board/{status}.
+    """
+    rows = {column.value: [] for column in TaskStatus}
+    for task in await db.execute(board_query(limit, project_id)):
+        rows[task.status].append(task)
+
+    pages = {status: cut_page(column_rows, limit, _task_key) for status, column_rows in rows.items()}
+    tasks = await with_subtasks(db, [task for page_rows, _ in pages.values() for task in page_rows])
+
+    columns = {}
+    start = 0
+    for status, (page_rows, next_cursor) in pages.items():
+        columns[status] = {"items": tasks[start:start + len(page_rows)], "next_cursor": next_cursor}
+        start += len(page_rows)
+
+    return json_response(BoardResponse, columns)
+
+
+@router.get("/{status}", response_model=BoardColumn)
+async def get_board_column(
+    status: TaskStatus,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Tareas por página"),
+    cursor: Optional[str] = None,
+    project_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Obtiene la página siguiente de una columna (`next_cursor` de la anterior)."""
+    page = await paginate(
+        db,
+        _column_query(status, project_id),
+        keys=(Task.created_at, Task.id),
+        key=_task_key,
+        limit=limit,
+        cursor=cursor,
+    )
+
+    return json_response(BoardColumn, {
+        "items": await with_subtasks(db, page.rows),
+        "next_cursor": page.next_cursor,
+    })
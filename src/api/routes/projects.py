@@ -1,12 +1,19 @@
 """Router para el recurso projects."""
 from fastapi import APIRouter, HTTPException, status, Depends
 from typing import List
-from sqlalchemy import select
+from sqlalchemy import delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..schemas.projects import ProjectCreate, ProjectUpdate, ProjectResponse
-from ..database import get_db
+from ..database import get_read_db, get_write_db
+from ..etags import tables_etag
 from ..models.project import Project
+from ..models.task import Task
+from ..read_model import track_project_deleted
+from ..reads import as_dicts, select_projects
+from ..serialization import json_response
+from ..streaming import NDJSON_RESPONSES, ndjson_response, stream_batches, stream_requested
+from ..sharding import get_shard_manager
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
@@ -15,18 +22,28 @@ router = APIRouter(prefix="/projects", tags=["projects"])
 # _next_id = 5
 
 
-@router.get("/", response_model=List[ProjectResponse])
-async def get_all_projects(db: AsyncSession = Depends(get_db)):
-    """Obtiene todos los proyectos desde la base de datos."""
-    query = select(Project)
-    result = await db.execute(query)
-    projects = result.scalars().all()
-
-    return [ProjectResponse.model_validate(project) for project in projects]
-
-
-@router.get("/{project_id}", response_model=ProjectResponse)
-async def get_project(project_id: int, db: AsyncSession = Depends(get_db)):
+@router.get(
+    "/",
+    response_model=List[ProjectResponse],
+    responses=NDJSON_RESPONSES,
+    dependencies=[Depends(tables_etag("projects"))],
+)
+async def get_all_projects(
+    stream: bool = Depends(stream_requested),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Obtiene todos los proyectos desde la base de datos (capa Core, sin ORM)."""
+    if stream:
+        return ndjson_response(ProjectResponse, stream_batches(db, select_projects().order_by(Project.id)))
+    return json_response(List[ProjectResponse], as_dicts(await db.execute(select_projects())))
+
+
+@router.get(
+    "/{project_id}",
+    response_model=ProjectResponse,
+    dependencies=[Depends(tables_etag("projects", streams=False))],
+)
+async def get_project(project_id: int, db: AsyncSession = Depends(get_read_db)):
     """Obtiene un proyecto por ID."""
     query = select(Project).where(Project.id == project_id)
     result = await db.execute(query)
@@ -38,11 +55,11 @@ async def get_project(project_id: int, db: AsyncSession = Depends(get_db)):
             detail="Project not found"
         )
 
-    return ProjectResponse.model_validate(project)
+    return json_response(ProjectResponse, project)
 
 
 @router.post("/", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
-async def create_project(data: ProjectCreate, db: AsyncSession = Depends(get_db)):
+async def create_project(data: ProjectCreate, db: AsyncSession = Depends(get_write_db, scope="function")):
     """Crea un nuevo proyecto."""
     # Crear instancia ORM
     db_project = Project(**data.model_dump())
@@ -52,14 +69,14 @@ async def create_project(data: ProjectCreate, db: AsyncSession = Depends(get_db)
     await db.flush()  # Obtener ID sin commit
     await db.refresh(db_project)  # Cargar campos generados
 
-    return ProjectResponse.model_validate(db_project)
+    return json_response(ProjectResponse, db_project, status.HTTP_201_CREATED)
 
 
 @router.put("/{project_id}", response_model=ProjectResponse)
 async def update_project(
     project_id: int,
     data: ProjectUpdate,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_write_db, scope="function")
 ):
     """Actualiza un proyecto existente."""
     # Obtener proyecto
@@ -81,22 +98,36 @@ async def update_project(
     await db.flush()
     await db.refresh(db_project)
 
-    return ProjectResponse.model_validate(db_project)
+    return json_response(ProjectResponse, db_project)
 
 
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_project(project_id: int, db: AsyncSession = Depends(get_db)):
-    """Elimina un proyecto."""
-    # Obtener proyecto
-    query = select(Project).where(Project.id == project_id)
-    result = await db.execute(query)
-    db_project = result.scalar_one_or_none()
-
-    if db_project is None:
+async def delete_project(project_id: int, db: AsyncSession = Depends(get_write_db, scope="function")):
+    """
+    Elimina un proyecto.
+
+    Un único DELETE: SQLite desvincula sus tareas (FK ON DELETE SET NULL) sin
+    cargarlas en la sesión. En modo sharded las tareas están en otro fichero
+    y el FK no existe: se desvinculan con un UPDATE en el shard del proyecto.
+
+    Los dos ficheros se confirman por separado, así que el orden importa:
+    primero se confirma el UPDATE del shard y después se borra el proyecto
+    del catálogo. Si el borrado falla, el proyecto sigue existiendo (con sus
+    tareas ya desvinculadas) y repetir el DELETE lo completa; nunca quedan
+    tareas apuntando a un proyecto borrado.
+    """
+    if get_shard_manager() is not None:
+        await db.execute(update(Task).where(Task.project_id == project_id).values(project_id=None))
+        await db.commit()
+
+    result = await db.execute(delete(Project).where(Project.id == project_id))
+
+    if result.rowcount == 0:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
         )
 
-    await db.delete(db_project)
+    track_project_deleted(db, project_id)
+
     return None
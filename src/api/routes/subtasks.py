@@ -1,14 +1,20 @@
 """Router para el recurso subtasks."""
-from fastapi import APIRouter, HTTPException, status, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Query, Request, status, Depends
+from typing import Optional
 from datetime import datetime, UTC
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..schemas.subtasks import SubtaskCreate, SubtaskUpdate, SubtaskResponse
-from ..database import get_db
+from ..database import get_read_db, get_write_db
+from ..etags import task_etag, task_listing_etag
 from ..models.subtask import Subtask
 from ..models.task import Task
+from ..pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, PaginatedResponse, paginate
+from ..read_model import ReadModel, get_read_model, track_task
+from ..reads import as_dicts, select_subtasks
+from ..serialization import json_response
+from ..streaming import NDJSON_RESPONSES, ndjson_response, stream_batches, stream_requested
 
 router = APIRouter(prefix="/tasks/{task_id}/subtasks", tags=["subtasks"])
 
@@ -95,48 +101,104 @@ async def _get_task_or_404(task_id: int, db: AsyncSession) -> Task:
     return task
 
 
-@router.get("/", response_model=List[SubtaskResponse])
+@router.get(
+    "/",
+    response_model=PaginatedResponse[SubtaskResponse],
+    responses=NDJSON_RESPONSES,
+    dependencies=[Depends(task_listing_etag)],
+)
 async def get_task_subtasks(
+    request: Request,
     task_id: int,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    skip: Optional[int] = Query(None, ge=0),
+    include_total: bool = False,
     show_deleted: bool = False,
-    db: AsyncSession = Depends(get_db)
+    stream: bool = Depends(stream_requested),
+    read_model: Optional[ReadModel] = Depends(get_read_model),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
-    Obtiene todas las subtasks de una tarea, ordenadas por position.
+    Obtiene las subtasks de una tarea, ordenadas por position y paginadas.
+
+    Con `stream=true` o `Accept: application/x-ndjson` las devuelve todas
+    como NDJSON, en streaming. Con el modelo de lectura en memoria activo,
+    las subtasks activas se sirven desde él.
 
     Args:
         task_id: ID de la tarea padre
+        limit: Subtasks por página
+        cursor: `next_cursor` de la página anterior
+        skip: Offset (paginación por offset en lugar de cursor)
+        include_total: Si True, incluye el total de subtasks
         show_deleted: Si True, incluye subtasks eliminadas
+        stream: Si True, todas las subtasks en NDJSON (sin paginar)
+        read_model: Modelo de lectura en memoria (None si está deshabilitado)
         db: Sesión de base de datos
 
     Returns:
-        List[SubtaskResponse]: Lista de subtasks ordenadas
+        PaginatedResponse[SubtaskResponse]: Página de subtasks ordenadas
     """
-    # Verificar que la tarea existe
-    await _get_task_or_404(task_id, db)
+    schema = PaginatedResponse[SubtaskResponse]
+    checked = read_model is not None and not show_deleted and not stream
+    served = None
+    if checked:
+        page = read_model.subtask_page(task_id, limit, cursor, skip, include_total)
+        served = json_response(schema, page.envelope(page.rows)) if page is not None else None
+        if not read_model.check_reads:
+            if served is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Task with id {task_id} not found"
+                )
+            read_model.hit("subtasks")
+            return served
+
+    # Verificar que la tarea existe (solo su id: sin instanciar la tarea)
+    active_task = select(Task.id).where(Task.id == task_id, Task.deleted_at.is_(None))
+    if (await db.execute(active_task)).first() is None:
+        if checked:
+            read_model.record_check(str(request.url), served and served.body, None)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Task with id {task_id} not found"
+        )
 
-    # Obtener subtasks ordenadas por position
-    query = (
-        select(Subtask)
-        .where(Subtask.task_id == task_id)
-        .order_by(Subtask.position)
-    )
+    query = select_subtasks().where(Subtask.task_id == task_id)
 
     # Filtrar eliminadas si show_deleted=False
     if not show_deleted:
         query = query.where(Subtask.deleted_at.is_(None))
 
-    result = await db.execute(query)
-    subtasks = result.scalars().all()
+    if stream:
+        query = query.order_by(Subtask.position, Subtask.id)
+        return ndjson_response(SubtaskResponse, stream_batches(db, query))
+
+    # Keyset sobre (position, id): el orden del checklist, cubierto por
+    # ix_subtasks_active_task_position (el id va implícito en el índice)
+    page = await paginate(
+        db,
+        query,
+        keys=(Subtask.position, Subtask.id),
+        key=lambda subtask: (subtask.position, subtask.id),
+        limit=limit,
+        cursor=cursor,
+        skip=skip,
+        include_total=include_total,
+    )
 
-    return [SubtaskResponse.model_validate(subtask) for subtask in subtasks]
+    response = json_response(schema, page.envelope(as_dicts(page.rows)))
+    if checked:
+        read_model.record_check(str(request.url), served and served.body, response.body)
+    return response
 
 
 @router.post("/", response_model=SubtaskResponse, status_code=status.HTTP_201_CREATED)
 async def create_subtask(
     task_id: int,
     data: SubtaskCreate,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_write_db, scope="function")
 ):
     """
     Crea una nueva subtask para una tarea.
@@ -185,16 +247,17 @@ async def create_subtask(
 
     # Auto-completar task si es necesario
     await _auto_complete_task_if_needed(task_id, db)
+    await track_task(db, task_id)
 
-    return SubtaskResponse.model_validate(db_subtask)
+    return json_response(SubtaskResponse, db_subtask, status.HTTP_201_CREATED)
 
 
-@router.get("/{subtask_id}", response_model=SubtaskResponse)
+@router.get("/{subtask_id}", response_model=SubtaskResponse, dependencies=[Depends(task_etag)])
 async def get_subtask(
     task_id: int,
     subtask_id: int,
     show_deleted: bool = False,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Obtiene una subtask específica.
@@ -230,7 +293,7 @@ async def get_subtask(
             detail=f"Subtask with id {subtask_id} not found for task {task_id}"
         )
 
-    return SubtaskResponse.model_validate(subtask)
+    return json_response(SubtaskResponse, subtask)
 
 
 @router.put("/{subtask_id}", response_model=SubtaskResponse)
@@ -238,7 +301,7 @@ async def update_subtask(
     task_id: int,
     subtask_id: int,
     data: SubtaskUpdate,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_write_db, scope="function")
 ):
     """
     Actualiza una subtask existente.
@@ -285,15 +348,16 @@ async def update_subtask(
 
     # Auto-completar task si es necesario
     await _auto_complete_task_if_needed(task_id, db)
+    await track_task(db, task_id)
 
-    return SubtaskResponse.model_validate(db_subtask)
+    return json_response(SubtaskResponse, db_subtask)
 
 
 @router.patch("/{subtask_id}/toggle", response_model=SubtaskResponse)
 async def toggle_subtask(
     task_id: int,
     subtask_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_write_db, scope="function")
 ):
     """
     Alterna el estado de completado de una subtask.
@@ -335,15 +399,16 @@ async def toggle_subtask(
 
     # CRÍTICO: Auto-completar task si es necesario
     await _auto_complete_task_if_needed(task_id, db)
+    await track_task(db, task_id)
 
-    return SubtaskResponse.model_validate(db_subtask)
+    return json_response(SubtaskResponse, db_subtask)
 
 
 @router.delete("/{subtask_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_subtask(
     task_id: int,
     subtask_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_write_db, scope="function")
 ):
     """
     Elimina una subtask (borrado lógico).
@@ -378,5 +443,6 @@ async def delete_subtask(
 
     # CRÍTICO: Auto-completar task si es necesario después de eliminar
     await _auto_complete_task_if_needed(task_id, db)
+    await track_task(db, task_id)
 
     return None
@@ -1,14 +1,31 @@
 """Router para el recurso tasks."""
-from fastapi import APIRouter, HTTPException, status, Depends
-from typing import List
+import inspect
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status, Depends
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+from typing import Annotated, List, Optional
 from datetime import datetime, UTC
-from sqlalchemy import select
+from sqlalchemy import exists, false, func, select
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..schemas.tasks import TaskCreate, TaskUpdate, TaskResponse, TaskStatus
-from ..database import get_db
+from ..archive import restore_task
+from ..schemas.tasks import (
+    TASK_FIELDS, ArchivedTaskResponse, TaskCreate, TaskFieldset, TaskListFilters, TaskUpdate, TaskResponse,
+    TaskStatus, task_response_schema,
+)
+from ..database import get_read_db, get_write_db
+from ..etags import TASK_DOCUMENT_TABLES, tables_etag, task_etag
+from ..json_documents import board_json_query, fetch_json_array
+from ..models.archive import TaskArchive
+from ..models.project import Project
+from ..models.subtask import Subtask
 from ..models.task import Task
+from ..pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, PaginatedResponse, paginate
+from ..read_model import ReadModel, get_read_model, track_task
+from ..reads import select_tasks, stream_task_documents, task_documents
+from ..serialization import json_response
+from ..streaming import NDJSON_RESPONSES, ndjson_response, stream_requested
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
@@ -17,56 +34,318 @@ router = APIRouter(prefix="/tasks", tags=["tasks"])
 # _next_id = 1
 
 
-@router.get("/", response_model=List[TaskResponse])
-async def get_all_tasks(show_deleted: bool = False, db: AsyncSession = Depends(get_db)):
-    """Obtiene todas las tareas con sus subtareas desde la base de datos."""
-    # Eager loading de subtasks para evitar N+1 queries
-    query = select(Task).options(selectinload(Task.subtasks))
+def _load_subtasks():
+    """
+    Eager loading de las subtasks activas (evita N+1 queries).
+
+    El filtro de eliminadas va en la propia consulta del loader: las subtasks
+    eliminadas no se leen ni se instancian, y la colección cargada no se
+    modifica después (en una sesión de escritura, quitar elementos de ella
+    borraría las subtasks por delete-orphan).
+    """
+    return selectinload(Task.subtasks.and_(Subtask.deleted_at.is_(None)))
+
+
+def _query_validation_error(exc: ValidationError) -> RequestValidationError:
+    """Errores de un schema construido a partir de query params, como 422."""
+    return RequestValidationError(
+        [{**error, "loc": ("query", *error["loc"])} for error in exc.errors(include_url=False)]
+    )
+
+
+def _task_filters(**values) -> TaskListFilters:
+    """
+    Dependencia: filtros de GET /tasks a partir de los query params.
+
+    FastAPI valida cada campo como query param; los errores de validación
+    entre campos del schema también se devuelven como 422 (no como 500).
+    """
+    try:
+        return TaskListFilters(**values)
+    except ValidationError as exc:
+        raise _query_validation_error(exc)
+
+
+_task_filters.__signature__ = inspect.signature(TaskListFilters)
+
+
+def _task_fieldset(
+    fields: Optional[str] = Query(
+        None, description=f"Campos de cada tarea, separados por comas ({', '.join(TASK_FIELDS)})"
+    ),
+    include: Optional[str] = Query(
+        None, description="Relaciones: subtasks (por defecto) y/o subtask_summary; vacío, ninguna"
+    ),
+) -> TaskFieldset:
+    """Dependencia: campos y relaciones de las tareas de la respuesta."""
+    values = {name: value for name, value in (("fields", fields), ("include", include)) if value is not None}
+    try:
+        return TaskFieldset(**values)
+    except ValidationError as exc:
+        raise _query_validation_error(exc)
+
+
+def _filter_tasks(query, filters: TaskListFilters):
+    """
+    Añade a la consulta los filtros de GET /tasks, en un único WHERE.
+
+    Cada filtro tiene índice: status (ix_tasks_active_status_created_at),
+    project_id (ix_tasks_active_project_status_created_at), created_after/before
+    (ix_tasks_active_created_at), updated_since
+    (ix_tasks_active_last_modified) y has_open_subtasks (EXISTS por tarea
+    sobre los índices de task_id de subtasks).
+    """
+    if filters.status is not None:
+        query = query.where(Task.status == filters.status.value)
+    if filters.project_id is not None:
+        query = query.where(Task.project_id == filters.project_id)
+    if filters.completed is not None:
+        query = query.where(Task.completed == filters.completed)
+    if filters.created_after is not None:
+        query = query.where(Task.created_at >= filters.created_after)
+    if filters.created_before is not None:
+        query = query.where(Task.created_at < filters.created_before)
+    if filters.updated_since is not None:
+        # Misma expresión que el índice ix_tasks_active_last_modified
+        query = query.where(func.coalesce(Task.updated_at, Task.created_at) >= filters.updated_since)
+    if filters.has_open_subtasks is not None:
+        open_subtasks = exists().where(
+            Subtask.task_id == Task.id,
+            Subtask.deleted_at.is_(None),
+            Subtask.completed == false(),
+        )
+        query = query.where(open_subtasks if filters.has_open_subtasks else ~open_subtasks)
+    return query
+
+
+async def _ensure_project_exists(db: AsyncSession, project_id: Optional[int]) -> None:
+    """
+    Lanza 404 si `project_id` no es un proyecto existente.
+
+    Con `foreign_keys=ON` SQLite rechazaría la escritura con un
+    IntegrityError (500); se comprueba antes, como `_get_task_or_404` en
+    las subtasks.
+    """
+    if project_id is None:
+        return
+    if (await db.execute(select(Project.id).where(Project.id == project_id))).first() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+
+
+async def _reload_task(db: AsyncSession, task_id: int) -> Task:
+    """Vuelve a leer una tarea escrita en la sesión, con sus subtasks activas."""
+    result = await db.execute(
+        select(Task)
+        .options(_load_subtasks())
+        .where(Task.id == task_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one()
+
+
+@router.get(
+    "/",
+    response_model=PaginatedResponse[TaskResponse],
+    responses=NDJSON_RESPONSES,
+    dependencies=[Depends(tables_etag(*TASK_DOCUMENT_TABLES))],
+)
+async def get_all_tasks(
+    request: Request,
+    filters: Annotated[TaskListFilters, Depends(_task_filters)],
+    fieldset: Annotated[TaskFieldset, Depends(_task_fieldset)],
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    skip: Optional[int] = Query(None, ge=0),
+    include_total: bool = False,
+    show_deleted: bool = False,
+    stream: bool = Depends(stream_requested),
+    read_model: Optional[ReadModel] = Depends(get_read_model),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Obtiene las tareas con sus subtareas, paginadas por `(created_at, id)`.
+
+    Los filtros (status, project_id, completed, created_after/before,
+    updated_since, has_open_subtasks) se aplican en la consulta: una columna
+    o un proyecto solo lee y serializa sus tareas. Por defecto pagina por cursor: `next_cursor` de la respuesta pide la
+    página siguiente. `skip` pagina por offset y `include_total` añade el
+    total de tareas (un COUNT sobre toda la tabla).
+
+    La lectura va por la capa Core (`reads`): columnas de `TaskResponse`
+    como filas y las subtasks de la página en una segunda consulta.
+
+    Con `stream=true` o `Accept: application/x-ndjson` devuelve todas las
+    tareas filtradas como NDJSON, en streaming (ver streaming.py).
+
+    `fields=` selecciona en SQL solo esas columnas e `include=` las
+    relaciones: `subtask_summary` devuelve `{total, completed}` de un
+    agregado agrupado, sin leer las filas de subtasks.
+
+    Con el modelo de lectura en memoria activo (ver read_model.py), las
+    páginas de tareas activas se sirven desde él sin consultar SQLite.
+    """
+    schema = PaginatedResponse[task_response_schema(fieldset)]
+    served = None
+    if read_model is not None and not show_deleted and not stream:
+        page = read_model.task_page(filters, limit, cursor, skip, include_total)
+        served = json_response(schema, page.envelope([task.document(fieldset) for task in page.rows]))
+        if not read_model.check_reads:
+            read_model.hit("tasks")
+            return served
+
+    query = _filter_tasks(select_tasks(fieldset.fields), filters)
 
     # Filtrar tareas eliminadas si show_deleted=False
     if not show_deleted:
         query = query.where(Task.deleted_at.is_(None))
 
-    result = await db.execute(query)
-    tasks = result.scalars().all()
+    if stream:
+        query = query.order_by(Task.created_at, Task.id)
+        documents = stream_task_documents(db, query, fieldset.include, show_deleted)
+        return ndjson_response(task_response_schema(fieldset), documents)
+
+    page = await paginate(
+        db,
+        query,
+        keys=(Task.created_at, Task.id),
+        key=lambda task: (task.created_at, task.id),
+        limit=limit,
+        cursor=cursor,
+        skip=skip,
+        include_total=include_total,
+    )
 
-    # Filtrar subtasks eliminadas en cada tarea (si show_deleted=False)
-    if not show_deleted:
-        for task in tasks:
-            task.subtasks = [s for s in task.subtasks if s.deleted_at is None]
+    items = await task_documents(db, page.rows, fieldset.include, show_deleted)
+    response = json_response(schema, page.envelope(items))
+    if served is not None:
+        read_model.record_check(str(request.url), served.body, response.body)
+    return response
+
+
+# Declarada antes de /{task_id} para que "board" no se interprete como un id
+@router.get(
+    "/board",
+    response_model=List[TaskResponse],
+    dependencies=[Depends(tables_etag(*TASK_DOCUMENT_TABLES, streams=False))],
+)
+async def get_board(
+    filters: Annotated[TaskListFilters, Depends(_task_filters)],
+    fieldset: Annotated[TaskFieldset, Depends(_task_fieldset)],
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Obtiene el tablero completo (tareas activas con sus subtareas activas).
+
+    Camino rápido: SQLite construye el documento JSON en una sola consulta
+    (ver json_documents.py) y se devuelve tal cual, sin objetos ORM ni
+    validación Pydantic. El JSON es el mismo que el de una lista de
+    TaskResponse, en orden (created_at, id). Admite los filtros de GET /tasks
+    y sus `fields=`/`include=`.
+    """
+    tasks = _filter_tasks(select(), filters).where(Task.deleted_at.is_(None))
+    content = await fetch_json_array(db, board_json_query(tasks, fieldset))
+
+    return Response(content=content, media_type="application/json")
+
+
+# Rutas del archivo: declaradas antes de /{task_id} para que "archive" no se
+# interprete como un id
+@router.get("/archive", response_model=PaginatedResponse[ArchivedTaskResponse])
+async def get_archived_tasks(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    project_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Obtiene las tareas archivadas, de la más reciente a la más antigua."""
+    query = select(TaskArchive).options(selectinload(TaskArchive.subtasks))
+    count_query = select(func.count()).select_from(TaskArchive)
+    if project_id is not None:
+        query = query.where(TaskArchive.project_id == project_id)
+        count_query = count_query.where(TaskArchive.project_id == project_id)
+
+    total = (await db.execute(count_query)).scalar_one()
+    result = await db.execute(
+        query
+        .order_by(TaskArchive.archived_at.desc(), TaskArchive.id.desc())
+        .offset(skip)
+        .limit(limit)
+    )
 
-    return [TaskResponse.model_validate(task) for task in tasks]
+    return json_response(PaginatedResponse[ArchivedTaskResponse], {
+        "items": result.scalars().all(),
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+    })
 
 
-@router.get("/{task_id}", response_model=TaskResponse)
-async def get_task(task_id: int, show_deleted: bool = False, db: AsyncSession = Depends(get_db)):
-    """Obtiene una tarea por ID con sus subtareas."""
-    # Eager loading de subtasks
-    query = select(Task).options(selectinload(Task.subtasks)).where(Task.id == task_id)
+@router.post("/archive/{task_id}/restore", response_model=TaskResponse)
+async def restore_archived_task(task_id: int, db: AsyncSession = Depends(get_write_db, scope="function")):
+    """Devuelve una tarea archivada (con sus subtareas) al tablero."""
+    if not await restore_task(db, task_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Archived task not found"
+        )
+    await track_task(db, task_id)
+
+    return json_response(TaskResponse, await _reload_task(db, task_id))
+
+
+@router.get("/{task_id}", response_model=TaskResponse, dependencies=[Depends(task_etag)])
+async def get_task(
+    request: Request,
+    task_id: int,
+    fieldset: Annotated[TaskFieldset, Depends(_task_fieldset)],
+    show_deleted: bool = False,
+    read_model: Optional[ReadModel] = Depends(get_read_model),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Obtiene una tarea por ID con sus subtareas (o los `fields=`/`include=` pedidos)."""
+    schema = task_response_schema(fieldset)
+    served = None
+    if read_model is not None and not show_deleted:
+        task = read_model.get_task(task_id)
+        served = json_response(schema, task.document(fieldset)) if task is not None else None
+        if not read_model.check_reads:
+            if served is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Task not found"
+                )
+            read_model.hit("task")
+            return served
+
+    query = select_tasks(fieldset.fields).where(Task.id == task_id)
 
     # Filtrar tareas eliminadas si show_deleted=False
     if not show_deleted:
         query = query.where(Task.deleted_at.is_(None))
 
-    result = await db.execute(query)
-    task = result.scalar_one_or_none()
+    tasks = await task_documents(db, (await db.execute(query)).all(), fieldset.include, show_deleted)
+    response = json_response(schema, tasks[0]) if tasks else None
+    if read_model is not None and not show_deleted:
+        read_model.record_check(
+            str(request.url), served and served.body, response and response.body
+        )
 
-    if task is None:
+    if response is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Task not found"
         )
 
-    # Filtrar subtasks eliminadas (si show_deleted=False)
-    if not show_deleted:
-        task.subtasks = [s for s in task.subtasks if s.deleted_at is None]
-
-    return TaskResponse.model_validate(task)
+    return response
 
 
 @router.post("/", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
-async def create_task(data: TaskCreate, db: AsyncSession = Depends(get_db)):
+async def create_task(data: TaskCreate, db: AsyncSession = Depends(get_write_db, scope="function")):
     """Crea una nueva tarea."""
+    await _ensure_project_exists(db, data.project_id)
     task_data = data.model_dump()
 
     # Status default es "backlog" (manejado por schema)
@@ -81,16 +360,16 @@ async def create_task(data: TaskCreate, db: AsyncSession = Depends(get_db)):
     # Guardar en BD
     db.add(db_task)
     await db.flush()
-    await db.refresh(db_task, ["subtasks"])
+    await track_task(db, db_task.id)
 
-    return TaskResponse.model_validate(db_task)
+    return json_response(TaskResponse, await _reload_task(db, db_task.id), status.HTTP_201_CREATED)
 
 
 @router.put("/{task_id}", response_model=TaskResponse)
 async def update_task(
     task_id: int,
     data: TaskUpdate,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_write_db, scope="function")
 ):
     """Actualiza una tarea existente."""
     # Obtener tarea (solo activas)
@@ -108,6 +387,8 @@ async def update_task(
         )
 
     update_data = data.model_dump(exclude_unset=True)
+    if "project_id" in update_data:
+        await _ensure_project_exists(db, update_data["project_id"])
 
     # CRÍTICO: Sincronización bidireccional completed ↔ status
     if "status" in update_data and "completed" not in update_data:
@@ -151,13 +432,13 @@ async def update_task(
     db_task.updated_at = datetime.now(UTC)
 
     await db.flush()
-    await db.refresh(db_task, ["subtasks"])
+    await track_task(db, db_task.id)
 
-    return TaskResponse.model_validate(db_task)
+    return json_response(TaskResponse, await _reload_task(db, db_task.id))
 
 
 @router.patch("/{task_id}/toggle", response_model=TaskResponse)
-async def toggle_task(task_id: int, db: AsyncSession = Depends(get_db)):
+async def toggle_task(task_id: int, db: AsyncSession = Depends(get_write_db, scope="function")):
     """Alterna el estado de completado de una tarea."""
     # Obtener tarea (solo activas)
     query = select(Task).where(
@@ -182,16 +463,16 @@ async def toggle_task(task_id: int, db: AsyncSession = Depends(get_db)):
     db_task.status = "done" if db_task.completed else "backlog"
 
     await db.flush()
-    await db.refresh(db_task, ["subtasks"])
+    await track_task(db, db_task.id)
 
-    return TaskResponse.model_validate(db_task)
+    return json_response(TaskResponse, await _reload_task(db, db_task.id))
 
 
 @router.patch("/{task_id}/status", response_model=TaskResponse)
 async def update_task_status(
     task_id: int,
     new_status: TaskStatus,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_write_db, scope="function")
 ):
     """Actualiza rápidamente solo el status de una tarea."""
     # Obtener tarea (solo activas)
@@ -224,19 +505,19 @@ async def update_task_status(
     db_task.updated_at = datetime.now(UTC)
 
     await db.flush()
-    await db.refresh(db_task, ["subtasks"])
+    await track_task(db, db_task.id)
 
-    return TaskResponse.model_validate(db_task)
+    return json_response(TaskResponse, await _reload_task(db, db_task.id))
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_task(task_id: int, db: AsyncSession = Depends(get_db)):
+async def delete_task(task_id: int, db: AsyncSession = Depends(get_write_db, scope="function")):
     """Elimina una tarea (borrado lógico)."""
-    # Obtener tarea con subtasks (para cascada lógica)
+    # Obtener tarea con sus subtasks activas (para cascada lógica)
     query = select(Task).where(
         Task.id == task_id,
         Task.deleted_at.is_(None)  # Solo tareas activas
-    ).options(selectinload(Task.subtasks))
+    ).options(_load_subtasks())
     result = await db.execute(query)
     db_task = result.scalar_one_or_none()
 
@@ -250,9 +531,9 @@ async def delete_task(task_id: int, db: AsyncSession = Depends(get_db)):
     now = datetime.now(UTC)
     db_task.deleted_at = now
 
-    # Cascada lógica: marcar subtasks también
+    # Cascada lógica: marcar subtasks también (solo se cargan las activas)
     for subtask in db_task.subtasks:
-        if subtask.deleted_at is None:  # Solo si no estaba eliminada
-            subtask.deleted_at = now
+        subtask.deleted_at = now
+    await track_task(db, task_id)
 
     return None
@@ -1,10 +1,16 @@
 # Pydantic Schemas
-from .tasks import TaskCreate, TaskUpdate, TaskResponse, TaskStatus, SubtaskResponseNested
+from .tasks import (
+    TaskCreate, TaskUpdate, TaskResponse, TaskStatus, SubtaskResponseNested, ArchivedTaskResponse,
+    TaskListFilters, TaskFieldset, SubtaskSummary, task_response_schema,
+)
 from .projects import ProjectCreate, ProjectUpdate, ProjectResponse
 from .subtasks import SubtaskCreate, SubtaskUpdate, SubtaskResponse
+from .board import BoardColumn, BoardResponse
 
 __all__ = [
-    "TaskCreate", "TaskUpdate", "TaskResponse", "TaskStatus", "SubtaskResponseNested",
+    "TaskCreate", "TaskUpdate", "TaskResponse", "TaskStatus", "SubtaskResponseNested", "ArchivedTaskResponse",
+    "TaskListFilters", "TaskFieldset", "SubtaskSummary", "task_response_schema",
     "ProjectCreate", "ProjectUpdate", "ProjectResponse",
     "SubtaskCreate", "SubtaskUpdate", "SubtaskResponse",
+    "BoardColumn", "BoardResponse",
 ]
@@ -0,0 +1,21 @@
+"""Schemas Pydantic para el tablero por columnas."""
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from .tasks import TaskResponse
+
+
+class BoardColumn(BaseModel):
+    """Una columna del tablero: una página de tareas de un status."""
+    items: List[TaskResponse] = Field(description="Tareas de la columna, en orden (created_at, id)")
+    next_cursor: Optional[str] = Field(
+        default=None, description="Cursor para GET /board/{status} (None si no hay más)"
+    )
+
+
+class BoardResponse(BaseModel):
+    """Primera página de cada columna del tablero."""
+    backlog: BoardColumn
+    doing: BoardColumn
+    done: BoardColumn
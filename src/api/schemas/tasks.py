@@ -1,5 +1,6 @@
 """Schemas Pydantic para el recurso tasks."""
-from pydantic import BaseModel, ConfigDict, Field
+from functools import lru_cache
+from pydantic import BaseModel, ConfigDict, Field, create_model, field_validator, model_validator
 from typing import Optional, List
 from datetime import datetime, UTC
 from enum import Enum
@@ -34,6 +35,35 @@ class TaskUpdate(BaseModel):
     status: Optional[TaskStatus] = Field(None, description="Estado de la tarea en el tablero Kanban")
 
 
+class TaskListFilters(BaseModel):
+    """Filtros de GET /tasks (query params); se combinan con AND."""
+    status: Optional[TaskStatus] = Field(None, description="Solo tareas con este status")
+    project_id: Optional[int] = Field(None, description="Solo tareas de este proyecto")
+    completed: Optional[bool] = Field(None, description="Solo tareas completadas / sin completar")
+    created_after: Optional[datetime] = Field(None, description="Creadas en o después de esta fecha")
+    created_before: Optional[datetime] = Field(None, description="Creadas antes de esta fecha")
+    updated_since: Optional[datetime] = Field(
+        None, description="Modificadas (o creadas) en o después de esta fecha"
+    )
+    has_open_subtasks: Optional[bool] = Field(
+        None, description="Con (True) o sin (False) subtareas activas sin completar"
+    )
+
+    @model_validator(mode="after")
+    def check_created_range(self) -> "TaskListFilters":
+        """El rango de creación no puede estar vacío."""
+        if self.created_after is None or self.created_before is None:
+            return self
+        # Fechas sin zona horaria = UTC (como se guardan en la base de datos)
+        after, before = (
+            value if value.tzinfo else value.replace(tzinfo=UTC)
+            for value in (self.created_after, self.created_before)
+        )
+        if after >= before:
+            raise ValueError("created_after must be earlier than created_before")
+        return self
+
+
 class TaskResponse(TaskBase):
     """Schema de respuesta con campos adicionales."""
     model_config = ConfigDict(from_attributes=True)
@@ -48,6 +78,11 @@ class TaskResponse(TaskBase):
     subtasks: List["SubtaskResponseNested"] = Field(default_factory=list, description="Lista de subtareas")
 
 
+class ArchivedTaskResponse(TaskResponse):
+    """Schema de respuesta de una tarea archivada."""
+    archived_at: datetime = Field(..., description="Fecha de archivado")
+
+
 # Schema simplificado para subtasks anidadas (evitar importación circular)
 class SubtaskResponseNested(BaseModel):
     """Schema simplificado de Subtask para incluir en TaskResponse."""
@@ -61,3 +96,76 @@ class SubtaskResponseNested(BaseModel):
     created_at: datetime
     completed_at: Optional[datetime] = None
     deleted_at: Optional[datetime] = Field(None, description="Fecha de eliminación (NULL = activo)")
+
+
+class SubtaskSummary(BaseModel):
+    """Recuento de las subtareas de una tarea (en lugar de la lista)."""
+    total: int = Field(..., description="Número de subtareas")
+    completed: int = Field(..., description="Número de subtareas completadas")
+
+
+# Campos de TaskResponse seleccionables con `fields=` y relaciones de `include=`
+TASK_FIELDS = tuple(name for name in TaskResponse.model_fields if name != "subtasks")
+TASK_INCLUDES = ("subtasks", "subtask_summary")
+
+
+class TaskFieldset(BaseModel):
+    """
+    Campos (`fields=`) y relaciones (`include=`) de las tareas de una respuesta.
+
+    Ambos se reciben como listas separadas por comas. Por defecto, todos los
+    campos y la lista de subtasks (el `TaskResponse` completo); `include=`
+    vacío no incluye ninguna relación.
+    """
+    model_config = ConfigDict(frozen=True)
+
+    fields: tuple[str, ...] = Field(TASK_FIELDS, description="Campos de cada tarea")
+    include: tuple[str, ...] = Field(("subtasks",), description="subtasks y/o subtask_summary")
+
+    @field_validator("fields", "include", mode="before")
+    @classmethod
+    def split_commas(cls, value):
+        """`"a,b"` → `("a", "b")`, sin espacios ni elementos vacíos."""
+        if isinstance(value, str):
+            return tuple(item.strip() for item in value.split(",") if item.strip())
+        return value
+
+    @field_validator("fields")
+    @classmethod
+    def check_fields(cls, value: tuple[str, ...]) -> tuple[str, ...]:
+        """Campos conocidos, sin repetir y en el orden de TaskResponse."""
+        unknown = sorted(set(value) - set(TASK_FIELDS))
+        if unknown:
+            raise ValueError(f"Unknown task fields: {', '.join(unknown)}")
+        if not value:
+            raise ValueError("At least one task field is required")
+        return tuple(name for name in TASK_FIELDS if name in value)
+
+    @field_validator("include")
+    @classmethod
+    def check_include(cls, value: tuple[str, ...]) -> tuple[str, ...]:
+        """Relaciones conocidas, sin repetir y en orden fijo."""
+        unknown = sorted(set(value) - set(TASK_INCLUDES))
+        if unknown:
+            raise ValueError(f"Unknown task includes: {', '.join(unknown)}")
+        return tuple(name for name in TASK_INCLUDES if name in value)
+
+
+@lru_cache(maxsize=None)
+def task_response_schema(fieldset: TaskFieldset) -> type[BaseModel]:
+    """
+    Schema de respuesta de una tarea con solo los campos de `fieldset`.
+
+    Los campos conservan el tipo y el orden de `TaskResponse`; con el
+    fieldset por defecto es el propio `TaskResponse`. Se crea uno por
+    fieldset distinto.
+    """
+    if fieldset == TaskFieldset():
+        return TaskResponse
+    definitions = {name: (TaskResponse.model_fields[name].annotation, TaskResponse.model_fields[name])
+                   for name in fieldset.fields}
+    if "subtasks" in fieldset.include:
+        definitions["subtasks"] = (List[SubtaskResponseNested], TaskResponse.model_fields["subtasks"])
+    if "subtask_summary" in fieldset.include:
+        definitions["subtask_summary"] = (SubtaskSummary, Field(..., description="Recuento de subtareas"))
+    return create_model("TaskFieldsResponse", __config__=ConfigDict(from_attributes=True), **definitions)
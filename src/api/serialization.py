@@ -0,0 +1,51 @@
+"""
+Serialización de respuestas: una sola validación y bytes JSON directos.
+
+Con `response_model`, FastAPI valida el valor que devuelve la ruta y lo
+vuelve a codificar; si la ruta ya había hecho `model_validate`, cada objeto
+se procesaba tres veces. Las rutas devuelven en su lugar `json_response`:
+un `TypeAdapter` cacheado por tipo de respuesta valida una vez (instancias
+ORM, filas Core como dicts o modelos ya validados) y `dump_json` escribe
+los bytes del cuerpo.
+
+FastAPI devuelve una `Response` tal cual, sin volver a validarla, así que el
+`response_model` de cada ruta se mantiene solo para la documentación
+OpenAPI: debe ser el mismo tipo que se pasa a `json_response`.
+"""
+from functools import lru_cache
+from typing import Any
+
+from fastapi import Response, status
+from pydantic import TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def response_adapter(response_type: Any) -> TypeAdapter:
+    """`TypeAdapter` de un tipo de respuesta (p. ej. `List[TaskResponse]`), uno por tipo."""
+    return TypeAdapter(response_type)
+
+
+def dump_response(response_type: Any, data: Any) -> bytes:
+    """Valida `data` como `response_type` y devuelve su JSON en bytes."""
+    adapter = response_adapter(response_type)
+    return adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+
+
+def json_response(response_type: Any, data: Any, status_code: int = status.HTTP_200_OK) -> Response:
+    """
+    Respuesta JSON de `data` serializado como `response_type`.
+
+    Args:
+        response_type: Tipo declarado como `response_model` de la ruta
+        data: Instancias ORM, dicts o modelos Pydantic
+        status_code: Código de la respuesta (el `status_code` de la ruta no
+            se aplica a una `Response` devuelta directamente)
+
+    Returns:
+        Response: Cuerpo ya codificado, `application/json`
+    """
+    return Response(
+        content=dump_response(response_type, data),
+        status_code=status_code,
+        media_type="application/json",
+    )
@@ -0,0 +1,389 @@
+"""
+Modo de almacenamiento sharded: un fichero SQLite por proyecto.
+
+En modo `single` todas las tablas viven en `app.db` y todas las escrituras
+se serializan detrás del único lock de escritura de SQLite. En modo
+`sharded` (`APP_STORAGE_MODE=sharded`) las tasks y subtasks de cada proyecto
+viven en su propio fichero `<shard_dir>/project_<id>.db` (las tareas sin
+proyecto en `project_0.db`), con su propio escritor y su propio pool de
+lectores: las escrituras de proyectos distintos avanzan en paralelo.
+
+`app.db` queda como catálogo global: proyectos, archivo y control de
+esquema. No hace falta una tabla de lookup id → shard: cada shard asigna sus
+ids en un rango propio (`shard << SHARD_ID_BITS` en adelante, sembrado en
+`sqlite_sequence` al crear el fichero), así que el shard de una tarea o
+subtask se calcula a partir de su id.
+
+El enrutado lo hace `ShardedSession` (extensión `horizontal_shard` de
+SQLAlchemy), así que las rutas no cambian:
+
+- Filas nuevas: por `project_id` (tasks) o por el id de la tarea (subtasks).
+- Consultas: por el id o el `project_id` de los criterios de la consulta
+  (términos `==`/`IN` unidos con AND); si no hay ninguno, se consultan
+  todos los shards y se concatenan los resultados (sin orden global).
+- Cargas de relaciones y refresh: el shard de la fila de origen.
+
+Los ficheros de shard se crean y sus engines se abren bajo demanda, la
+primera vez que se escribe en un proyecto.
+
+Limitaciones:
+- Solo para bases de datos nuevas: las tasks y subtasks que ya estén en
+  `app.db` no se verían (se leen de los shards) y no se pueden repartir sin
+  cambiarles el id (el id indica el shard). La aplicación no arranca en modo
+  sharded mientras el catálogo tenga alguna (`check_catalog_has_no_tasks`).
+- Una tarea no puede cambiar de proyecto (InvalidOperationException).
+- Las consultas sobre todos los shards no respetan ORDER BY/LIMIT globales.
+  La paginación por cursor de GET /tasks sí es global (`pagination.paginate`
+  ordena la unión de las páginas de cada shard); la de offset no. Los
+  listados en streaming (NDJSON) llegan shard a shard.
+- El archivado, la retención y el mantenimiento operan sobre el catálogo.
+- Sin backups (`/admin/backup` responde 409): solo copiarían el catálogo.
+- Incompatible con el pipeline de escritura (un lote = una transacción).
+"""
+import os
+import re
+import sqlite3
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import MetaData, event, inspect, text
+from sqlalchemy.dialects import sqlite as sqlite_dialect
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.ext.horizontal_shard import ShardedSession
+from sqlalchemy.orm import Mapper, ORMExecuteState
+from sqlalchemy.schema import CreateIndex, CreateTable
+from sqlalchemy.sql import elements, operators
+from sqlalchemy.sql.util import find_tables
+
+from .database import create_read_engine, create_write_engine, use_session_makers
+from .exceptions import InvalidOperationException
+from .models.subtask import Subtask
+from .models.task import Task
+from .sqlite_profiles import SqliteProfile
+
+# Bits bajos del id reservados para el contador de cada shard
+SHARD_ID_BITS = 32
+
+# Identificador del catálogo global (app.db) entre los shards de la sesión
+CATALOG = "catalog"
+
+# Shard de las tareas sin proyecto
+UNASSIGNED_SHARD = 0
+
+_SHARD_FILE = re.compile(r"^project_(\d+)\.db$")
+
+
+def shard_for_project(project_id: Optional[int]) -> int:
+    """Shard en el que se guardan las tareas de un proyecto."""
+    return project_id or UNASSIGNED_SHARD
+
+
+def shard_for_id(row_id: int) -> int:
+    """Shard al que pertenece el id de una tarea o subtask."""
+    return row_id >> SHARD_ID_BITS
+
+
+def shard_ddl() -> list[str]:
+    """
+    DDL de tasks y subtasks en un fichero de shard.
+
+    Igual que en los modelos salvo el FK `tasks.project_id → projects.id`:
+    los proyectos viven en el catálogo y SQLite no aplica FKs entre ficheros.
+    """
+    metadata = MetaData()
+    tasks = Task.__table__.to_metadata(metadata)
+    subtasks = Subtask.__table__.to_metadata(metadata)
+    for constraint in list(tasks.foreign_key_constraints):
+        tasks.constraints.discard(constraint)
+    tasks.c.project_id.foreign_keys.clear()
+
+    dialect = sqlite_dialect.dialect()
+    statements = []
+    for table in (tasks, subtasks):
+        statements.append(str(CreateTable(table, if_not_exists=True).compile(dialect=dialect)))
+        for index in sorted(table.indexes, key=lambda idx: idx.name):
+            statements.append(str(CreateIndex(index, if_not_exists=True).compile(dialect=dialect)))
+    return statements
+
+
+def _shard_tables() -> set[str]:
+    return {Task.__tablename__, Subtask.__tablename__}
+
+
+def _conjuncts(clause) -> Iterable:
+    """Términos unidos con AND al nivel superior de un WHERE."""
+    if isinstance(clause, elements.BooleanClauseList) and clause.operator is operators.and_:
+        for term in clause.clauses:
+            yield from _conjuncts(term)
+    elif clause is not None:
+        yield clause
+
+
+def _criteria_shards(statement, parameters: Optional[dict] = None) -> Optional[set[int]]:
+    """
+    Shards que determinan los criterios `id`/`task_id`/`project_id` de una consulta.
+
+    Args:
+        statement: Sentencia a analizar
+        parameters: Parámetros de la ejecución (p. ej. el id de un refresh)
+
+    Returns:
+        set[int] | None: None si los criterios no acotan los shards
+    """
+    whereclause = getattr(statement, "whereclause", None)
+    for term in _conjuncts(whereclause):
+        if not isinstance(term, elements.BinaryExpression):
+            continue
+        column, value = term.left, term.right
+        if (
+            not isinstance(value, elements.BindParameter)
+            or getattr(column, "table", None) is None
+            or column.table.name not in _shard_tables()
+            or term.operator not in (operators.eq, operators.in_op)
+        ):
+            continue
+        values = (parameters or {}).get(value.key, value.effective_value)
+        values = values if isinstance(values, (list, tuple)) else [values]
+        if None in values:
+            continue
+        if column.key in ("id", "task_id"):
+            return {shard_for_id(v) for v in values}
+        if column.key == "project_id":
+            return {shard_for_project(v) for v in values}
+    return None
+
+
+class ShardManager:
+    """
+    Ficheros de shard y sus engines, abiertos bajo demanda.
+
+    Args:
+        catalog_write: Engine de escritura del catálogo (app.db)
+        catalog_read: Engine de lectura del catálogo
+        shard_dir: Directorio de los ficheros de shard
+        profile: Perfil de PRAGMAs de cada conexión
+        read_pool_size: Conexiones de lectura por shard
+    """
+
+    def __init__(
+        self,
+        catalog_write: AsyncEngine,
+        catalog_read: AsyncEngine,
+        shard_dir: str,
+        profile: SqliteProfile,
+        read_pool_size: int = 2,
+    ):
+        self.catalog_write = catalog_write
+        self.catalog_read = catalog_read
+        self.shard_dir = shard_dir
+        self.profile = profile
+        self.read_pool_size = read_pool_size
+        self._ddl = shard_ddl()
+        self._write_engines: dict[int, AsyncEngine] = {}
+        self._read_engines: dict[int, AsyncEngine] = {}
+
+        os.makedirs(shard_dir, exist_ok=True)
+        self._shards = {
+            int(match.group(1))
+            for match in map(_SHARD_FILE.match, os.listdir(shard_dir))
+            if match
+        }
+        self.ensure_shard(UNASSIGNED_SHARD)
+
+        self.read_sessionmaker = self._sessionmaker(read_only=True)
+        self.write_sessionmaker = self._sessionmaker(read_only=False)
+
+    def shard_path(self, shard: int) -> str:
+        """Ruta del fichero de un shard."""
+        return os.path.join(self.shard_dir, f"project_{shard}.db")
+
+    @property
+    def shard_ids(self) -> list[int]:
+        """Shards existentes, en orden."""
+        return sorted(self._shards)
+
+    def is_open(self, shard: int) -> bool:
+        """Indica si el shard tiene engines abiertos."""
+        return shard in self._write_engines or shard in self._read_engines
+
+    def ensure_shard(self, shard: int) -> None:
+        """
+        Crea el fichero del shard si no existe.
+
+        Se hace con una conexión sqlite3 síncrona (una única vez por shard):
+        crea las tablas y siembra `sqlite_sequence` con el inicio del rango
+        de ids del shard.
+        """
+        if shard in self._shards:
+            return
+        conn = sqlite3.connect(self.shard_path(shard), isolation_level=None)
+        try:
+            conn.execute(f"PRAGMA journal_mode={self.profile.journal_mode}")
+            conn.execute("BEGIN IMMEDIATE")
+            for statement in self._ddl:
+                conn.execute(statement)
+            conn.executemany(
+                "INSERT INTO sqlite_sequence (name, seq) SELECT ?, ? "
+                "WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = ?)",
+                [(table, shard << SHARD_ID_BITS, table) for table in (Task.__tablename__, Subtask.__tablename__)],
+            )
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+        self._shards.add(shard)
+
+    def write_engine(self, shard: int) -> AsyncEngine:
+        """Escritor del shard (lo crea, junto con el fichero, si no existe)."""
+        engine = self._write_engines.get(shard)
+        if engine is None:
+            self.ensure_shard(shard)
+            engine = create_write_engine(f"sqlite+aiosqlite:///{self.shard_path(shard)}", self.profile)
+            self._write_engines[shard] = engine
+        return engine
+
+    def read_engine(self, shard: int) -> AsyncEngine:
+        """Pool de lectores del shard."""
+        engine = self._read_engines.get(shard)
+        if engine is None:
+            engine = create_read_engine(
+                f"sqlite+aiosqlite:///{self.shard_path(shard)}", self.profile, self.read_pool_size
+            )
+            self._read_engines[shard] = engine
+        return engine
+
+    def bind(self, shard: Any, read_only: bool) -> Engine:
+        """Engine (síncrono, para la sesión) de un shard o del catálogo."""
+        if shard == CATALOG:
+            engine = self.catalog_read if read_only else self.catalog_write
+        elif read_only:
+            # Un shard que aún no existe no tiene filas: se lee el de las
+            # tareas sin proyecto, que siempre existe
+            engine = self.read_engine(shard if shard in self._shards else UNASSIGNED_SHARD)
+        else:
+            engine = self.write_engine(shard)
+        return engine.sync_engine
+
+    # --- Choosers de ShardedSession ---
+
+    def shard_chooser(self, mapper: Optional[Mapper], instance: Any, clause=None, **kw: Any) -> Any:
+        """Shard de una fila nueva (o de una sentencia sin shard explícito)."""
+        if mapper is not None and mapper.class_ is Task and instance is not None:
+            return shard_for_project(instance.project_id)
+        if mapper is not None and mapper.class_ is Subtask and instance is not None:
+            if instance.task_id is not None:
+                return shard_for_id(instance.task_id)
+            return inspect(instance.task).identity_token
+        if clause is not None and {t.name for t in find_tables(clause, include_crud=True)} & _shard_tables():
+            shards = _criteria_shards(clause)
+            if shards is None or len(shards) != 1:
+                raise InvalidOperationException("Statement does not target a single shard")
+            return shards.pop()
+        return CATALOG
+
+    def identity_chooser(self, mapper: Mapper, primary_key: Any, **kw: Any) -> list[Any]:
+        """Shard de una fila a partir de su primary key."""
+        if mapper.class_ in (Task, Subtask):
+            return [shard_for_id(primary_key[0])]
+        return [CATALOG]
+
+    def execute_chooser(self, context: ORMExecuteState) -> list[Any]:
+        """Shards en los que ejecutar una consulta."""
+        # Carga perezosa de una relación: el shard de la fila de origen
+        if context.is_select and context.lazy_loaded_from is not None:
+            return [context.lazy_loaded_from.identity_token]
+        tables = {table.name for table in find_tables(context.statement, include_crud=True)}
+        if not tables & _shard_tables():
+            return [CATALOG]
+        if tables - _shard_tables():
+            raise InvalidOperationException("Statement mixes catalog and shard tables")
+        parameters = context.parameters if isinstance(context.parameters, dict) else None
+        shards = _criteria_shards(context.statement, parameters)
+        if shards is None:
+            return self.shard_ids
+        return sorted(shards & self._shards) or [UNASSIGNED_SHARD]
+
+    def _sessionmaker(self, read_only: bool) -> async_sessionmaker[AsyncSession]:
+        manager = self
+
+        class _Session(ShardedSession):
+            def get_bind(self, mapper=None, *, shard_id=None, instance=None, clause=None, **kw):
+                if shard_id is None:
+                    shard_id = self._choose_shard_and_assign(mapper, instance=instance, clause=clause)
+                return manager.bind(shard_id, read_only)
+
+        maker = async_sessionmaker(
+            class_=AsyncSession,
+            sync_session_class=_Session,
+            expire_on_commit=False,
+            shard_chooser=self.shard_chooser,
+            identity_chooser=self.identity_chooser,
+            execute_chooser=self.execute_chooser,
+        )
+        event.listen(_Session, "before_flush", _reject_project_moves)
+        return maker
+
+    async def dispose(self) -> None:
+        """Cierra los engines de todos los shards."""
+        for engine in [*self._write_engines.values(), *self._read_engines.values()]:
+            await engine.dispose()
+        self._write_engines.clear()
+        self._read_engines.clear()
+
+
+def _reject_project_moves(session, flush_context, instances) -> None:
+    """Una tarea vive en el shard de su proyecto: no puede cambiar de proyecto."""
+    for instance in session.dirty:
+        if isinstance(instance, Task):
+            state = inspect(instance)
+            if (
+                state.attrs.project_id.history.has_changes()
+                and shard_for_project(instance.project_id) != state.identity_token
+            ):
+                raise InvalidOperationException("Tasks cannot be moved between projects in sharded mode")
+
+
+async def check_catalog_has_no_tasks(catalog: AsyncEngine) -> None:
+    """
+    Comprueba que `app.db` no tiene tasks ni subtasks antes de activar los shards.
+
+    Raises:
+        RuntimeError: Si el catálogo tiene filas que el modo sharded ocultaría
+    """
+    async with catalog.connect() as conn:
+        for table in (Task.__tablename__, Subtask.__tablename__):
+            if (await conn.execute(text(f"SELECT EXISTS (SELECT 1 FROM {table})"))).scalar():
+                raise RuntimeError(
+                    f"storage_mode=sharded requires a catalog without {table}: "
+                    f"{catalog.url.database} already has rows that would be hidden"
+                )
+
+
+_shard_manager: Optional[ShardManager] = None
+
+
+def get_shard_manager() -> Optional[ShardManager]:
+    """Shard manager activo, o None en modo single."""
+    return _shard_manager
+
+
+def start_sharding(
+    catalog_write: AsyncEngine,
+    catalog_read: AsyncEngine,
+    shard_dir: str,
+    profile: SqliteProfile,
+    read_pool_size: int = 2,
+) -> ShardManager:
+    """Activa el modo sharded: las sesiones de la aplicación pasan a enrutar por shard."""
+    global _shard_manager
+    _shard_manager = ShardManager(catalog_write, catalog_read, shard_dir, profile, read_pool_size)
+    use_session_makers(_shard_manager.read_sessionmaker, _shard_manager.write_sessionmaker)
+    return _shard_manager
+
+
+async def stop_sharding() -> None:
+    """Desactiva el modo sharded y cierra los engines de los shards."""
+    global _shard_manager
+    if _shard_manager is not None:
+        use_session_makers()
+        await _shard_manager.dispose()
+        _shard_manager = None
@@ -0,0 +1,123 @@
+"""Perfiles de PRAGMAs de SQLite aplicados en cada conexión."""
+from dataclasses import asdict, dataclass
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+@dataclass(frozen=True)
+class SqliteProfile:
+    """
+    Conjunto de PRAGMAs de SQLite.
+
+    - journal_mode=WAL: los lectores no bloquean al escritor y viceversa.
+    - synchronous: FULL hace fsync en cada commit; NORMAL solo en checkpoints
+      del WAL (un corte de luz puede perder los últimos commits, nunca corrompe).
+    - cache_size: negativo = KiB de page cache por conexión.
+    - mmap_size: bytes de la base de datos leídos vía memory-mapped I/O.
+    - temp_store: MEMORY evita ficheros temporales para ordenaciones/índices.
+    - busy_timeout: ms que una conexión espera un lock antes de fallar.
+
+    `foreign_keys=ON` no depende del perfil: SQLite solo aplica los FKs (y
+    sus `ON DELETE`) en las conexiones que lo activan.
+    """
+
+    name: str
+    journal_mode: str
+    synchronous: str
+    cache_size: int
+    mmap_size: int
+    temp_store: str
+    busy_timeout: int
+
+    def statements(self, read_only: bool = False) -> list[str]:
+        """
+        Sentencias PRAGMA que aplican el perfil.
+
+        Args:
+            read_only: Conexión de solo lectura: no cambia journal_mode (requiere
+                escritura) y activa query_only como segunda barrera
+        """
+        if read_only:
+            mode = ["PRAGMA query_only=ON"]
+        else:
+            mode = [f"PRAGMA journal_mode={self.journal_mode}"]
+        return mode + [
+            f"PRAGMA synchronous={self.synchronous}",
+            f"PRAGMA cache_size={self.cache_size}",
+            f"PRAGMA mmap_size={self.mmap_size}",
+            f"PRAGMA temp_store={self.temp_store}",
+            f"PRAGMA busy_timeout={self.busy_timeout}",
+            "PRAGMA foreign_keys=ON",
+        ]
+
+    def as_dict(self) -> dict:
+        """Representación serializable (p. ej. para /health)."""
+        return asdict(self)
+
+
+PROFILES: dict[str, SqliteProfile] = {
+    # Máxima durabilidad: fsync en cada commit
+    "durable": SqliteProfile(
+        name="durable",
+        journal_mode="WAL",
+        synchronous="FULL",
+        cache_size=-16_000,
+        mmap_size=64 * 1024 * 1024,
+        temp_store="MEMORY",
+        busy_timeout=5_000,
+    ),
+    # Por defecto: WAL + NORMAL, sin riesgo de corrupción
+    "balanced": SqliteProfile(
+        name="balanced",
+        journal_mode="WAL",
+        synchronous="NORMAL",
+        cache_size=-64_000,
+        mmap_size=256 * 1024 * 1024,
+        temp_store="MEMORY",
+        busy_timeout=5_000,
+    ),
+    # Máximo rendimiento: sin fsync (solo para datos reconstruibles)
+    "throughput": SqliteProfile(
+        name="throughput",
+        journal_mode="WAL",
+        synchronous="OFF",
+        cache_size=-256_000,
+        mmap_size=1024 * 1024 * 1024,
+        temp_store="MEMORY",
+        busy_timeout=10_000,
+    ),
+}
+
+
+def get_profile(name: str) -> SqliteProfile:
+    """
+    Obtiene un perfil por nombre.
+
+    Raises:
+        ValueError: Si el perfil no existe
+    """
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown SQLite profile '{name}'. Available: {', '.join(PROFILES)}"
+        ) from None
+
+
+def install_pragmas(engine: AsyncEngine, profile: SqliteProfile, read_only: bool = False) -> None:
+    """
+    Registra un listener `connect` que aplica el perfil a cada conexión nueva.
+
+    Args:
+        engine: Engine async de SQLAlchemy
+        profile: Perfil a aplicar
+        read_only: Si el engine es el pool de lectores
+    """
+    statements = profile.statements(read_only=read_only)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for statement in statements:
+            cursor.execute(statement)
+        cursor.close()
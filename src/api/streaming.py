@@ -0,0 +1,85 @@
+"""
+Respuestas NDJSON en streaming para listados grandes.
+
+Un listado normal materializa la página entera antes de responder. En modo
+streaming (`Accept: application/x-ndjson` o `?stream=true`) la consulta se
+recorre en el servidor por lotes (`yield_per`): cada lote se valida, se
+escribe como líneas JSON (un objeto por línea) y se envía antes de leer el
+siguiente. La memoria queda acotada por el tamaño del lote y el primer byte
+sale tras el primer lote, no tras la consulta completa.
+
+En streaming se devuelve la colección completa en el orden del listado: los
+parámetros de paginación no se aplican. En modo sharded las filas de cada
+shard llegan seguidas, sin orden global.
+"""
+from typing import Any, AsyncIterator, Optional
+
+from fastapi import Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .serialization import response_adapter
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Filas por lote leído de SQLite (y por escritura en la respuesta)
+STREAM_BATCH_SIZE = 500
+
+# Documentación OpenAPI de la variante NDJSON de un listado
+NDJSON_RESPONSES = {
+    200: {
+        "content": {NDJSON_MEDIA_TYPE: {"schema": {"type": "string"}}},
+        "description": "Con `stream=true` o `Accept: application/x-ndjson`: un objeto JSON por línea",
+    }
+}
+
+
+def stream_requested(
+    request: Request,
+    stream: bool = Query(False, description="Devuelve la colección completa como NDJSON en streaming"),
+) -> bool:
+    """Dependencia: True si se pide el listado en streaming (flag o cabecera Accept)."""
+    return stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+async def stream_batches(
+    db: AsyncSession, query: Select, batch_size: Optional[int] = None
+) -> AsyncIterator[list]:
+    """
+    Recorre `query` en el servidor, en lotes de filas.
+
+    Args:
+        db: Sesión de base de datos (abierta mientras dure el streaming)
+        query: Consulta Core ya ordenada
+        batch_size: Filas por lote (por defecto STREAM_BATCH_SIZE)
+
+    Yields:
+        list: Filas de cada lote, en orden
+    """
+    result = await db.stream(query.execution_options(yield_per=batch_size or STREAM_BATCH_SIZE))
+    async for rows in result.partitions():
+        yield rows
+
+
+def ndjson_response(item_type: Any, batches: AsyncIterator[list]) -> StreamingResponse:
+    """
+    Respuesta NDJSON: cada elemento de cada lote validado como `item_type`.
+
+    Args:
+        item_type: Schema de un elemento (p. ej. `TaskResponse`)
+        batches: Lotes de filas Core, dicts o instancias ORM
+
+    Returns:
+        StreamingResponse: Una línea JSON por elemento
+    """
+    adapter = response_adapter(item_type)
+
+    async def lines() -> AsyncIterator[bytes]:
+        async for batch in batches:
+            yield b"".join(
+                adapter.dump_json(adapter.validate_python(item, from_attributes=True)) + b"\n"
+                for item in batch
+            )
+
+    return StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE)
@@ -0,0 +1,153 @@
+"""
+Contadores de versión de los datos, por tabla.
+
+Cada transacción de sesión que escribe en una tabla incrementa, al hacer
+commit, el contador de esa tabla y la versión global. Las tablas escritas se
+detectan solas:
+
+- objetos ORM añadidos, modificados o borrados en cada flush;
+- sentencias INSERT/UPDATE/DELETE ejecutadas con `session.execute` (p. ej.
+  el DELETE de proyectos o la restauración desde el archivo). Un DELETE
+  cuenta también para las tablas cuyas FKs tienen `ondelete` sobre ella
+  (borrar un proyecto desvincula sus tareas).
+
+El incremento va en un callback de `on_commit` (commit_hooks.py): una
+escritura deshecha no cambia ninguna versión y la versión cambia antes de
+que la request de escritura responda. Las escrituras por conexión (jobs de
+mantenimiento) llaman a `bump_tables` tras confirmar cada lote.
+
+Además hay una versión por tarea, que cubre la fila de la tarea y sus
+subtasks (las rutas de subtasks y GET /tasks/{id}). Las escrituras ORM
+saben qué tareas tocan; las que no (DML sobre tasks/subtasks, jobs de
+mantenimiento, borrar un proyecto) abren una nueva generación, que cambia
+la versión de todas las tareas.
+
+Los contadores son del proceso y empiezan en 0 en cada arranque.
+"""
+from functools import lru_cache
+from typing import Iterable, Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import ORMExecuteState, Session, UOWTransaction
+
+from .commit_hooks import on_commit
+from .database import Base
+
+# Tablas cuyas escrituras cambian la versión de una tarea
+TASK_TABLES = frozenset({"tasks", "subtasks"})
+
+
+class DataVersions:
+    """Versión global, por tabla y por tarea, monótonas."""
+
+    def __init__(self):
+        self.version = 0
+        self.task_generation = 0
+        self._tables: dict[str, int] = {}
+        self._tasks: dict[int, int] = {}
+
+    def get(self, table: str) -> int:
+        """Versión de una tabla (0 si no se ha escrito desde el arranque)."""
+        return self._tables.get(table, 0)
+
+    def task(self, task_id: int) -> tuple[int, int]:
+        """Versión de una tarea y sus subtasks: (generación, escrituras en la generación)."""
+        return self.task_generation, self._tasks.get(task_id, 0)
+
+    def bump(self, tables: Iterable[str], task_ids: Optional[Iterable[int]] = None) -> None:
+        """
+        Incrementa la versión global y la de cada tabla.
+
+        Args:
+            tables: Tablas escritas
+            task_ids: Tareas escritas; None si no se conocen, y entonces una
+                escritura en tasks/subtasks abre una nueva generación
+        """
+        tables = set(tables)
+        self.version += 1
+        for table in tables:
+            self._tables[table] = self._tables.get(table, 0) + 1
+        if task_ids is not None:
+            for task_id in task_ids:
+                self._tasks[task_id] = self._tasks.get(task_id, 0) + 1
+        elif tables & TASK_TABLES:
+            # Las versiones de la generación anterior ya no coinciden con ninguna
+            self.task_generation += 1
+            self._tasks.clear()
+
+    def as_dict(self) -> dict:
+        """Representación serializable."""
+        return {
+            "version": self.version,
+            "tables": dict(sorted(self._tables.items())),
+            "task_generation": self.task_generation,
+            "tasks_tracked": len(self._tasks),
+        }
+
+
+_versions = DataVersions()
+
+
+def get_data_versions() -> DataVersions:
+    """Dependency con los contadores de versión del proceso."""
+    return _versions
+
+
+def bump_tables(tables: Iterable[str]) -> None:
+    """Registra una escritura ya confirmada fuera de una sesión (p. ej. un job por conexión)."""
+    _versions.bump(tables)
+
+
+@lru_cache
+def _on_delete_dependents(table: str) -> frozenset[str]:
+    """Tablas que SQLite modifica al borrar filas de `table` (FKs con `ondelete`)."""
+    return frozenset(
+        other.name
+        for other in Base.metadata.tables.values()
+        for foreign_key in other.foreign_keys
+        if foreign_key.ondelete and foreign_key.column.table.name == table
+    )
+
+
+def _track(session: Session, tables: set[str], task_ids: Optional[set[int]] = None) -> None:
+    if tables:
+        on_commit(session, lambda: _versions.bump(tables, task_ids))
+
+
+def _instance_task_ids(instance) -> Optional[set[int]]:
+    """Tareas cuya versión cambia al escribir `instance`; None si no se sabe."""
+    table = type(instance).__table__.name
+    if table == "tasks":
+        return {instance.id}
+    if table == "subtasks":
+        # La tarea actual y, si la subtask se movió, la anterior
+        task_ids = {instance.task_id, *inspect(instance).attrs.task_id.history.deleted}
+        return None if None in task_ids else task_ids
+    return set()
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session: Session, flush_context: UOWTransaction) -> None:
+    tables: set[str] = set()
+    task_ids: Optional[set[int]] = set()
+    for instances, deleted in ((session.new, False), (session.dirty, False), (session.deleted, True)):
+        for instance in instances:
+            table = type(instance).__table__.name
+            written = {table} | (_on_delete_dependents(table) if deleted else set())
+            tables |= written
+            instance_task_ids = _instance_task_ids(instance)
+            if instance_task_ids is None or (not instance_task_ids and written & TASK_TABLES):
+                # P. ej. borrar un proyecto desvincula tareas que no están en la sesión
+                task_ids = None
+            elif task_ids is not None:
+                task_ids |= instance_task_ids
+    _track(session, tables, task_ids)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_dml(state: ORMExecuteState) -> None:
+    if not (state.is_insert or state.is_update or state.is_delete):
+        return
+    table = state.statement.table.name
+    tables = {table} | (_on_delete_dependents(table) if state.is_delete else set())
+    _track(state.session, tables)
@@ -0,0 +1,286 @@
+"""
+Pipeline de escritura con group commit.
+
+Las requests de escritura se encolan en una `asyncio.Queue`. Una única tarea
+escritora drena la cola en lotes: abre UNA transacción, ejecuta cada request
+dentro de su propio SAVEPOINT y hace un solo commit (un solo fsync) para todo
+el lote. Cada request espera a que su lote se confirme antes de responder.
+
+Si una request falla, solo se deshace su savepoint; el resto del lote sigue.
+Si falla el lote (el commit, o un error inesperado de la tarea escritora),
+todas las requests del lote reciben el error y la tarea sigue con el
+siguiente. Al detenerse la tarea, las requests en cola o en curso reciben
+un error en lugar de esperar para siempre.
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+# Límites superiores de los buckets del histograma de tamaños de lote
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+
+@dataclass
+class _WriteJob:
+    """Request de escritura encolada."""
+
+    session_ready: asyncio.Future
+    handler_done: asyncio.Future
+    committed: asyncio.Future
+
+
+def _handler_failed(job: _WriteJob) -> bool:
+    done = job.handler_done
+    return done.done() and not done.cancelled() and done.result() is not None
+
+
+def _set_handler_done(job: _WriteJob, error: Optional[BaseException]) -> None:
+    # Si la tarea escritora se canceló esperándolo, `handler_done` ya está cancelado
+    if not job.handler_done.done():
+        job.handler_done.set_result(error)
+
+
+@dataclass
+class PipelineStats:
+    """Métricas del pipeline: tamaños de lote y latencia de commit."""
+
+    batches: int = 0
+    requests: int = 0
+    committed: int = 0
+    rolled_back: int = 0
+    failed_batches: int = 0
+    max_batch_size: int = 0
+    batch_size_histogram: dict[str, int] = field(
+        default_factory=lambda: {f"<={b}": 0 for b in BATCH_SIZE_BUCKETS} | {f">{BATCH_SIZE_BUCKETS[-1]}": 0}
+    )
+    commit_latency_total_ms: float = 0.0
+    commit_latency_max_ms: float = 0.0
+    commit_latency_last_ms: float = 0.0
+
+    def record_batch(self, size: int, committed: int, commit_ms: float) -> None:
+        """Registra un lote confirmado."""
+        self.batches += 1
+        self.requests += size
+        self.committed += committed
+        self.rolled_back += size - committed
+        self.max_batch_size = max(self.max_batch_size, size)
+        bucket = next((f"<={b}" for b in BATCH_SIZE_BUCKETS if size <= b), f">{BATCH_SIZE_BUCKETS[-1]}")
+        self.batch_size_histogram[bucket] += 1
+        self.commit_latency_total_ms += commit_ms
+        self.commit_latency_max_ms = max(self.commit_latency_max_ms, commit_ms)
+        self.commit_latency_last_ms = commit_ms
+
+    def as_dict(self) -> dict:
+        """Representación serializable con medias calculadas."""
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "committed": self.committed,
+            "rolled_back": self.rolled_back,
+            "failed_batches": self.failed_batches,
+            "avg_batch_size": round(self.requests / self.batches, 2) if self.batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "batch_size_histogram": dict(self.batch_size_histogram),
+            "commit_latency_ms": {
+                "avg": round(self.commit_latency_total_ms / self.batches, 3) if self.batches else 0.0,
+                "max": round(self.commit_latency_max_ms, 3),
+                "last": round(self.commit_latency_last_ms, 3),
+            },
+        }
+
+
+class WritePipeline:
+    """
+    Tarea escritora que agrupa requests en transacciones compartidas.
+
+    Args:
+        session_maker: Factory de sesiones sobre el engine de escritura
+        max_batch_size: Requests máximas por lote
+        max_wait: Segundos máximos que el primer job de un lote espera a más jobs
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        max_batch_size: int = 64,
+        max_wait: float = 0.002,
+    ):
+        self._session_maker = session_maker
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.stats = PipelineStats()
+        self._queue: asyncio.Queue[_WriteJob] = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Arranca la tarea escritora en el event loop actual."""
+        if not self.running:
+            self._task = asyncio.create_task(self._run(), name="write-pipeline")
+
+    async def stop(self) -> None:
+        """Detiene la tarea escritora: el lote en curso y la cola fallan con RuntimeError."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._fail_queued(RuntimeError("Write pipeline stopped"))
+
+    def _fail_queued(self, exc: BaseException) -> None:
+        """Las requests que seguían en cola no llegarán a ejecutarse."""
+        while not self._queue.empty():
+            self._fail([self._queue.get_nowait()], exc)
+
+    @staticmethod
+    def _fail(batch: list[_WriteJob], exc: BaseException) -> None:
+        """
+        Resuelve con `exc` los jobs de un lote que no se confirmó.
+
+        Un job cancelado en la cola (`session_ready` ya resuelto sin que se
+        ejecutara su handler) o cuyo handler falló no tiene a nadie
+        esperando el commit: su `committed` se cancela.
+        """
+        for job in batch:
+            if not job.session_ready.done():
+                job.session_ready.set_exception(exc)
+                job.committed.cancel()
+            elif job.committed.done():
+                continue
+            elif job.session_ready.cancelled() or _handler_failed(job):
+                job.committed.cancel()
+            else:
+                # Handler terminado sin error, o aún en curso: espera el commit
+                job.committed.set_exception(exc)
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[AsyncSession]:
+        """
+        Ejecuta el bloque dentro del siguiente lote del pipeline.
+
+        Yields:
+            AsyncSession: Sesión compartida del lote, dentro de un savepoint propio
+
+        Raises:
+            Exception: La del bloque, o la del commit del lote si este falla
+        """
+        loop = asyncio.get_running_loop()
+        job = _WriteJob(loop.create_future(), loop.create_future(), loop.create_future())
+        await self._queue.put(job)
+        session = await job.session_ready
+
+        try:
+            yield session
+        except BaseException as exc:
+            _set_handler_done(job, exc)
+            # Si el lote ya falló, el error del commit no lo espera nadie
+            if job.committed.done() and not job.committed.cancelled():
+                job.committed.exception()
+            raise
+        _set_handler_done(job, None)
+        await job.committed
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        batch: list[_WriteJob] = []
+        try:
+            while True:
+                batch = [await self._queue.get()]
+                deadline = loop.time() + self.max_wait
+                while len(batch) < self.max_batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                try:
+                    await self._process(batch)
+                except Exception as exc:
+                    # Un lote roto no detiene la tarea escritora
+                    self.stats.failed_batches += 1
+                    self._fail(batch, exc)
+                batch = []
+        finally:
+            stopped = RuntimeError("Write pipeline stopped")
+            self._fail(batch, stopped)
+            self._fail_queued(stopped)
+
+    async def _process(self, batch: list[_WriteJob]) -> None:
+        applied: list[_WriteJob] = []
+        async with self._session_maker() as session:
+            try:
+                for job in batch:
+                    # La request se canceló mientras esperaba turno
+                    if job.session_ready.done():
+                        continue
+                    savepoint = await session.begin_nested()
+                    job.session_ready.set_result(session)
+                    error = await job.handler_done
+                    if error is None:
+                        try:
+                            await savepoint.commit()
+                        except Exception as exc:
+                            # Fallo al hacer flush/RELEASE: solo afecta a esta request
+                            if savepoint.is_active:
+                                await savepoint.rollback()
+                            job.committed.set_exception(exc)
+                        else:
+                            applied.append(job)
+                    elif savepoint.is_active:
+                        await savepoint.rollback()
+
+                start = time.perf_counter()
+                await session.commit()
+                commit_ms = (time.perf_counter() - start) * 1000
+            except Exception as exc:
+                self.stats.failed_batches += 1
+                self._fail(batch, exc)
+                await session.rollback()
+                return
+
+        self.stats.record_batch(len(batch), len(applied), commit_ms)
+        for job in applied:
+            job.committed.set_result(None)
+        for job in batch:
+            if not job.committed.done():
+                job.committed.cancel()
+
+
+_pipeline: Optional[WritePipeline] = None
+
+
+def get_write_pipeline() -> Optional[WritePipeline]:
+    """Dependency con el pipeline activo, o None si está deshabilitado."""
+    return _pipeline
+
+
+def start_write_pipeline(
+    session_maker: async_sessionmaker[AsyncSession],
+    max_batch_size: int,
+    max_wait: float,
+) -> WritePipeline:
+    """Crea y arranca el pipeline global de la aplicación."""
+    global _pipeline
+    _pipeline = WritePipeline(session_maker, max_batch_size=max_batch_size, max_wait=max_wait)
+    _pipeline.start()
+    return _pipeline
+
+
+async def stop_write_pipeline() -> None:
+    """Detiene el pipeline global si está activo."""
+    global _pipeline
+    if _pipeline is not None:
+        await _pipeline.stop()
+        _pipeline = None
@@ -3,10 +3,20 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from .api.database import init_db
+from .api.database import (
+    async_session_maker, engine, init_db, read_engine, read_session_maker, settings, sqlite_profile,
+)
+from .api.coalescing import CoalescingMiddleware, start_coalescing, stop_coalescing
+from .api.etags import ETagMiddleware, start_etags, stop_etags
+from .api.maintenance import start_maintenance, stop_maintenance
+from .api.read_model import start_read_model, stop_read_model
+from .api.sharding import check_catalog_has_no_tasks, start_sharding, stop_sharding
+from .api.write_pipeline import start_write_pipeline, stop_write_pipeline
 from .api.routes.tasks import router as tasks_router
 from .api.routes.projects import router as projects_router
 from .api.routes.subtasks import router as subtasks_router
+from .api.routes.admin import router as admin_router
+from .api.routes.board import router as board_router
 
 
 @asynccontextmanager
@@ -14,8 +24,37 @@ async def lifespan(app: FastAPI):
     """Gestiona el ciclo de vida de la aplicación."""
     # Startup: Crear tablas
     await init_db()
+    if settings.storage_mode == "sharded":
+        await check_catalog_has_no_tasks(engine)
+        start_sharding(
+            engine,
+            read_engine,
+            settings.shard_dir,
+            sqlite_profile,
+            read_pool_size=settings.shard_read_pool_size,
+        )
+    if settings.write_pipeline_enabled:
+        start_write_pipeline(
+            async_session_maker,
+            max_batch_size=settings.write_batch_size,
+            max_wait=settings.write_batch_max_wait_ms / 1000,
+        )
+    if settings.read_model_enabled:
+        await start_read_model(read_session_maker, check_reads=settings.read_model_check_reads)
+    if settings.read_coalescing_enabled:
+        start_coalescing()
+    if settings.etags_enabled:
+        start_etags()
+    if settings.maintenance_enabled:
+        start_maintenance(engine, settings)
     yield
     # Shutdown: Cleanup si necesario
+    stop_coalescing()
+    stop_etags()
+    stop_read_model()
+    await stop_maintenance()
+    await stop_write_pipeline()
+    await stop_sharding()
 
 
 app = FastAPI(
@@ -33,11 +72,15 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(ETagMiddleware)
+app.add_middleware(CoalescingMiddleware)
 
 # Include routers
 app.include_router(tasks_router)
 app.include_router(projects_router)
 app.include_router(subtasks_router)
+app.include_router(admin_router)
+app.include_router(board_router)
 
 
 @app.get("/")
@@ -49,4 +92,10 @@ async def root():
 @app.get("/health")
 async def health():
     """Health check endpoint."""
-    return {"status": "healthy"}
+    return {
+        "status": "healthy",
+        "database": {
+            "sqlite_profile": sqlite_profile.as_dict(),
+            "storage_mode": settings.storage_mode,
+        },
+    }
@@ -0,0 +1,245 @@
+"""Tests para el archivado de tareas terminadas (tasks_archive/subtasks_archive)."""
+from datetime import datetime, timedelta, UTC
+import pytest
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from src.main import app
+from src.api.archive import archive_done_tasks
+from src.api.database import Base, get_read_sessionmaker, get_write_sessionmaker
+from src.api.maintenance import MaintenanceJob, MaintenanceScheduler, archive_job
+from src.api.migrations import autoincrement_ids
+from src.api.models.archive import SubtaskArchive, TaskArchive
+from src.api.models.project import Project
+from src.api.models.task import Task
+from src.api.models.subtask import Subtask
+from src.api.sqlite_profiles import get_profile, install_pragmas
+
+
+# Engine de test en memoria con los PRAGMAs de la aplicación (foreign_keys=ON)
+TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+test_engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+install_pragmas(test_engine, get_profile("balanced"))
+test_async_session_maker = async_sessionmaker(
+    test_engine, class_=AsyncSession, expire_on_commit=False
+)
+
+OLD = datetime.now(UTC) - timedelta(days=200)
+RECENT = datetime.now(UTC) - timedelta(days=5)
+
+
+@pytest.fixture
+async def test_db():
+    """Fixture para crear/destruir tablas en cada test."""
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield
+
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+def override_get_sessionmaker():
+    """Override de las session factories para tests."""
+    return test_async_session_maker
+
+
+@pytest.fixture
+async def async_client(test_db):
+    """Fixture para AsyncClient con BD de test."""
+    app.dependency_overrides[get_read_sessionmaker] = override_get_sessionmaker
+    app.dependency_overrides[get_write_sessionmaker] = override_get_sessionmaker
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test"
+    ) as client:
+        yield client
+
+    app.dependency_overrides.clear()
+
+
+async def _add_task(status: str, last_activity: datetime, project_id=None, subtasks: int = 0, deleted: bool = False) -> int:
+    async with test_async_session_maker() as session:
+        task = Task(
+            name=f"Tarea {status}",
+            status=status,
+            completed=status == "done",
+            project_id=project_id,
+            created_at=last_activity,
+            completed_at=last_activity if status == "done" else None,
+            deleted_at=last_activity if deleted else None,
+            subtasks=[
+                Subtask(name=f"Sub {i}", position=i, created_at=last_activity)
+                for i in range(subtasks)
+            ],
+        )
+        session.add(task)
+        await session.commit()
+        return task.id
+
+
+async def _count(model) -> int:
+    async with test_engine.connect() as conn:
+        return (await conn.execute(select(func.count()).select_from(model))).scalar()
+
+
+@pytest.mark.asyncio
+async def test_archive_moves_only_old_done_tasks(test_db):
+    """Solo las tareas done sin actividad reciente (y no eliminadas) pasan al archivo."""
+    old_done = [await _add_task("done", OLD, subtasks=2) for _ in range(5)]
+    recent_done = await _add_task("done", RECENT, subtasks=1)
+    old_doing = await _add_task("doing", OLD)
+    old_deleted = await _add_task("done", OLD, deleted=True)
+
+    result = await archive_done_tasks(test_engine, older_than_days=90, batch_size=2, pause=0)
+
+    assert (result.tasks, result.subtasks, result.batches) == (5, 10, 3)
+    async with test_engine.connect() as conn:
+        hot = set((await conn.execute(select(Task.id))).scalars())
+        archived = set((await conn.execute(select(TaskArchive.id))).scalars())
+        archived_subtasks = (await conn.execute(
+            select(SubtaskArchive.task_id).distinct()
+        )).scalars().all()
+    assert hot == {recent_done, old_doing, old_deleted}
+    assert archived == set(old_done)
+    assert set(archived_subtasks) == set(old_done)
+    assert await _count(Subtask) == 1
+
+    # Segunda ejecución: no queda nada por archivar
+    result = await archive_done_tasks(test_engine, older_than_days=90, batch_size=2, pause=0)
+    assert result.tasks == 0
+
+
+@pytest.mark.asyncio
+async def test_get_archived_tasks_paginated(async_client: AsyncClient):
+    """GET /tasks/archive pagina el archivo y filtra por proyecto."""
+    async with test_async_session_maker() as session:
+        project = Project(name="Proyecto", color="#000000")
+        session.add(project)
+        await session.commit()
+    for i in range(5):
+        await _add_task("done", OLD, project_id=project.id if i % 2 == 0 else None, subtasks=1)
+    await archive_done_tasks(test_engine, older_than_days=90, pause=0)
+
+    response = await async_client.get("/tasks/archive", params={"skip": 1, "limit": 2})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 5
+    assert (data["skip"], data["limit"]) == (1, 2)
+    assert [task["id"] for task in data["items"]] == [4, 3]
+    assert data["items"][0]["archived_at"] is not None
+    assert data["items"][0]["status"] == "done"
+    assert len(data["items"][0]["subtasks"]) == 1
+
+    response = await async_client.get("/tasks/archive", params={"project_id": project.id})
+    assert response.json()["total"] == 3
+
+    # Las tareas archivadas ya no aparecen en el tablero
+    response = await async_client.get("/tasks/")
+    assert response.json()["items"] == []
+
+
+@pytest.mark.asyncio
+async def test_restore_archived_task(async_client: AsyncClient):
+    """Restaurar devuelve la tarea con su id y sus subtasks, y no se vuelve a archivar."""
+    task_id = await _add_task("done", OLD, subtasks=2)
+    await archive_done_tasks(test_engine, older_than_days=90, pause=0)
+
+    response = await async_client.post(f"/tasks/archive/{task_id}/restore")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["id"] == task_id
+    assert data["status"] == "done"
+    assert len(data["subtasks"]) == 2
+    assert await _count(TaskArchive) == 0
+    assert await _count(SubtaskArchive) == 0
+
+    response = await async_client.get(f"/tasks/{task_id}")
+    assert response.status_code == 200
+
+    result = await archive_done_tasks(test_engine, older_than_days=90, pause=0)
+    assert result.tasks == 0
+
+
+@pytest.mark.asyncio
+async def test_restore_unknown_task_returns_404(async_client: AsyncClient):
+    """Una tarea que no está en el archivo no se puede restaurar."""
+    response = await async_client.post("/tasks/archive/999/restore")
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_archived_ids_are_not_reused(async_client: AsyncClient):
+    """Una tarea nueva nunca recibe el id de una tarea archivada."""
+    task_id = await _add_task("done", OLD)
+    await archive_done_tasks(test_engine, older_than_days=90, pause=0)
+
+    response = await async_client.post("/tasks/", json={"name": "Nueva"})
+
+    assert response.json()["id"] > task_id
+    response = await async_client.post(f"/tasks/archive/{task_id}/restore")
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_archive_job_runs_one_batch_per_step(test_db):
+    """El job de mantenimiento archiva un lote por paso transaccional."""
+    for _ in range(5):
+        await _add_task("done", OLD, subtasks=1)
+    scheduler = MaintenanceScheduler(test_engine, [MaintenanceJob("archive", 3600, archive_job(90, 2))], step_pause=0)
+
+    stats = await scheduler.run_job("archive")
+
+    assert stats.last_error is None
+    assert stats.last_result["tasks"] == 5
+    assert stats.last_result["subtasks"] == 5
+    assert stats.last_steps == 4  # 3 lotes + el lote vacío que termina el job
+    assert await _count(TaskArchive) == 5
+
+
+@pytest.mark.asyncio
+async def test_autoincrement_migration_rebuilds_tables(tmp_path):
+    """La migración añade AUTOINCREMENT conservando filas e ids."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'legacy.db'}", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        for name in ("subtasks", "tasks"):
+            await conn.execute(text(f"DROP TABLE {name}"))
+        await conn.execute(text(
+            "CREATE TABLE tasks (id INTEGER PRIMARY KEY, name VARCHAR(100) NOT NULL, "
+            "description VARCHAR(500), status SMALLINT NOT NULL, completed BOOLEAN NOT NULL, "
+            "project_id INTEGER REFERENCES projects(id) ON DELETE SET NULL, created_at BIGINT NOT NULL, "
+            "updated_at BIGINT, completed_at BIGINT, deleted_at BIGINT)"
+        ))
+        await conn.execute(text(
+            "CREATE TABLE subtasks (id INTEGER PRIMARY KEY, task_id INTEGER NOT NULL "
+            "REFERENCES tasks(id) ON DELETE CASCADE, name VARCHAR(200) NOT NULL, completed BOOLEAN NOT NULL, "
+            "position INTEGER NOT NULL, created_at BIGINT NOT NULL, completed_at BIGINT, deleted_at BIGINT)"
+        ))
+        await conn.execute(insert(Task), [
+            {"id": i, "name": f"Tarea {i}", "status": "done", "completed": True} for i in (1, 2, 7)
+        ])
+        await conn.execute(insert(Subtask), [{"task_id": 7, "name": "Sub", "position": 0}])
+
+    await autoincrement_ids.upgrade(engine, batch_size=2)
+    await autoincrement_ids.upgrade(engine, batch_size=2)
+
+    async with engine.connect() as conn:
+        sql = (await conn.execute(text(
+            "SELECT group_concat(sql) FROM sqlite_master WHERE name IN ('tasks', 'subtasks')"
+        ))).scalar()
+        sequence = dict((await conn.execute(text("SELECT name, seq FROM sqlite_sequence"))).all())
+        ids = (await conn.execute(select(Task.id).order_by(Task.id))).scalars().all()
+        indexes = (await conn.execute(text(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'index' AND tbl_name = 'tasks'"
+        ))).scalar()
+    await engine.dispose()
+
+    assert sql.count("AUTOINCREMENT") == 2
+    assert sequence == {"tasks": 7, "subtasks": 1}
+    assert ids == [1, 2, 7]
+    assert indexes == len(Task.__table__.indexes)
@@ -0,0 +1,158 @@
+"""Tests para los backups online con la API de backup de SQLite."""
+import asyncio
+import gzip
+import os
+import sqlite3
+import tempfile
+import pytest
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import text
+from src.main import app
+from src.api.backup import backup_database, database_path, get_backup_dir, get_backup_source
+from src.api.database import create_write_engine
+from src.api.migrations.runner import migrate
+from src.api.routes.admin import get_admin_token, require_admin
+from src.api.sqlite_profiles import get_profile
+
+
+@pytest.fixture
+async def source(tmp_path):
+    """Base de datos en fichero (WAL) con 2000 proyectos."""
+    path = str(tmp_path / "source.db")
+    engine = create_write_engine(f"sqlite+aiosqlite:///{path}", get_profile("balanced"))
+    await migrate(engine)
+    async with engine.begin() as conn:
+        await conn.execute(
+            text("INSERT INTO projects (name, color, created_at) VALUES (:name, '#000000', 0)"),
+            [{"name": f"Proyecto {i}" * 5} for i in range(2000)],
+        )
+
+    yield path, engine
+
+    await engine.dispose()
+
+
+def _count_projects(path: str) -> int:
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM projects").fetchone()[0]
+
+
+def test_database_path():
+    """Solo las bases de datos en fichero tienen ruta de backup."""
+    assert database_path("sqlite+aiosqlite:///./app.db") == "./app.db"
+    assert database_path("sqlite+aiosqlite:///:memory:") is None
+
+
+@pytest.mark.asyncio
+async def test_backup_copies_in_steps(source, tmp_path):
+    """La copia se hace en pasos acotados y es un fichero autocontenido."""
+    path, _ = source
+    destination = str(tmp_path / "out" / "backup.db")
+
+    result = await backup_database(path, destination, pages_per_step=10, step_pause=0)
+
+    assert result.steps == -(-result.pages // 10)
+    assert result.bytes == os.path.getsize(destination)
+    assert not os.path.exists(f"{destination}.partial")
+    with sqlite3.connect(destination) as conn:
+        assert conn.execute("PRAGMA integrity_check").fetchone() == ("ok",)
+        assert conn.execute("PRAGMA journal_mode").fetchone() == ("delete",)
+    assert _count_projects(destination) == 2000
+
+
+@pytest.mark.asyncio
+async def test_backup_is_consistent_snapshot_with_concurrent_writes(source, tmp_path):
+    """Los escritores no esperan al backup y la copia no refleja sus cambios posteriores."""
+    path, engine = source
+    destination = str(tmp_path / "backup.db")
+    writes = 0
+    done = asyncio.Event()
+
+    async def writer() -> None:
+        nonlocal writes
+        while not done.is_set():
+            async with engine.begin() as conn:
+                await conn.execute(text(
+                    "INSERT INTO projects (name, color, created_at) VALUES ('Nuevo', '#ffffff', 0)"
+                ))
+            writes += 1
+            await asyncio.sleep(0)
+
+    task = asyncio.create_task(writer())
+    await asyncio.sleep(0.01)
+    result = await backup_database(path, destination, pages_per_step=5, step_pause=0.002)
+    done.set()
+    await task
+
+    assert result.steps > 10
+    assert writes > 0
+    copied = _count_projects(destination)
+    assert 2000 <= copied <= 2000 + writes
+    with sqlite3.connect(destination) as conn:
+        assert conn.execute("PRAGMA integrity_check").fetchone() == ("ok",)
+
+
+@pytest.mark.asyncio
+async def test_admin_backup_endpoints(source, tmp_path, monkeypatch):
+    """POST crea un snapshot en el directorio de backups y GET lo descarga comprimido."""
+    path, _ = source
+    backup_dir = str(tmp_path / "backups")
+    app.dependency_overrides[get_backup_source] = lambda: path
+    app.dependency_overrides[get_backup_dir] = lambda: backup_dir
+    snapshots = tmp_path / "tmp"
+    snapshots.mkdir()
+    monkeypatch.setattr(tempfile, "tempdir", str(snapshots))
+    app.dependency_overrides[require_admin] = lambda: None
+
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.post("/admin/backup")
+            assert response.status_code == 201
+            data = response.json()
+            assert os.path.dirname(data["path"]) == backup_dir
+            assert _count_projects(data["path"]) == 2000
+
+            response = await client.get("/admin/backup/download")
+    finally:
+        app.dependency_overrides.clear()
+    # El snapshot temporal se borra al terminar la respuesta
+    assert os.listdir(snapshots) == []
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/gzip"
+    assert response.headers["content-disposition"].endswith('.db.gz"')
+    downloaded = tmp_path / "downloaded.db"
+    downloaded.write_bytes(gzip.decompress(response.content))
+    assert _count_projects(str(downloaded)) == 2000
+
+
+@pytest.mark.asyncio
+async def test_admin_backup_rejects_memory_database():
+    """Una base de datos en memoria no se puede copiar."""
+    app.dependency_overrides[get_backup_source] = lambda: None
+    app.dependency_overrides[require_admin] = lambda: None
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.post("/admin/backup")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_admin_router_requires_token():
+    """Sin `admin_token` el router no existe (404); con él, exige la cabecera X-Admin-Token."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/admin/backup/download")
+        assert response.status_code == 404
+
+        app.dependency_overrides[get_admin_token] = lambda: "secreto"
+        try:
+            for headers in ({}, {"X-Admin-Token": "otro"}):
+                response = await client.get("/admin/backup/download", headers=headers)
+                assert response.status_code == 401
+            response = await client.get("/admin/write-pipeline", headers={"X-Admin-Token": "secreto"})
+            assert response.status_code == 200
+        finally:
+            app.dependency_overrides.clear()
@@ -0,0 +1,155 @@
+"""Tests para el tablero por columnas (GET /board)."""
+from datetime import datetime, timedelta
+import pytest
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import insert, text
+from sqlalchemy.dialects import sqlite as sqlite_dialect
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from src.main import app
+from src.api.database import Base, get_read_sessionmaker, get_write_sessionmaker
+from src.api.models.project import Project
+from src.api.models.subtask import Subtask
+from src.api.models.task import Task
+from src.api.routes.board import board_query
+
+
+# Engine de test en memoria
+TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+test_engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+test_async_session_maker = async_sessionmaker(
+    test_engine, class_=AsyncSession, expire_on_commit=False
+)
+
+
+@pytest.fixture
+async def test_db():
+    """Fixture para crear/destruir tablas en cada test."""
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield
+
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+def override_get_sessionmaker():
+    """Override de las session factories para tests."""
+    return test_async_session_maker
+
+
+@pytest.fixture
+async def async_client(test_db):
+    """Fixture para AsyncClient con BD de test."""
+    app.dependency_overrides[get_read_sessionmaker] = override_get_sessionmaker
+    app.dependency_overrides[get_write_sessionmaker] = override_get_sessionmaker
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test"
+    ) as client:
+        yield client
+
+    app.dependency_overrides.clear()
+
+
+async def _seed() -> dict[str, list[int]]:
+    """
+    2 tareas en backlog, 1 en doing y 7 en done (más una eliminada), la
+    mitad de done en un proyecto. Devuelve los ids por status, en orden.
+    """
+    start = datetime(2024, 1, 1)
+    statuses = ["backlog", "backlog", "doing"] + ["done"] * 7
+    async with test_engine.begin() as conn:
+        await conn.execute(insert(Project), [{"id": 1, "name": "Proyecto", "color": "#000000"}])
+        ids = (await conn.execute(insert(Task).returning(Task.id, Task.status), [
+            {"name": f"Task {i}", "status": status, "completed": status == "done",
+             "project_id": 1 if status == "done" and i % 2 else None,
+             "created_at": start + timedelta(minutes=len(statuses) - i)}
+            for i, status in enumerate(statuses)
+        ])).all()
+        await conn.execute(insert(Task), [
+            {"name": "Eliminada", "status": "done", "created_at": start, "deleted_at": start}
+        ])
+        await conn.execute(insert(Subtask), [
+            {"task_id": task_id, "name": "Sub", "position": 0, "created_at": start} for task_id, _ in ids
+        ])
+    # Más antigua primero: created_at decrece con el índice
+    by_status = {"backlog": [], "doing": [], "done": []}
+    for task_id, status in reversed(ids):
+        by_status[status].append(task_id)
+    return by_status
+
+
+@pytest.mark.asyncio
+async def test_board_returns_first_page_of_each_column(async_client: AsyncClient):
+    """Cada columna trae sus primeras tareas y su propio cursor."""
+    ids = await _seed()
+
+    response = await async_client.get("/board/", params={"limit": 3})
+
+    assert response.status_code == 200
+    board = response.json()
+    assert {status: [task["id"] for task in column["items"]] for status, column in board.items()} == {
+        "backlog": ids["backlog"], "doing": ids["doing"], "done": ids["done"][:3],
+    }
+    assert board["backlog"]["next_cursor"] is None
+    assert board["doing"]["next_cursor"] is None
+    assert board["done"]["next_cursor"] is not None
+    assert all(len(task["subtasks"]) == 1 for column in board.values() for task in column["items"])
+
+
+@pytest.mark.asyncio
+async def test_column_cursor_loads_rest_of_one_column(async_client: AsyncClient):
+    """El cursor de una columna sigue solo esa columna, sin repetir tareas."""
+    ids = await _seed()
+    cursor = (await async_client.get("/board/", params={"limit": 3})).json()["done"]["next_cursor"]
+
+    loaded = []
+    while cursor is not None:
+        column = (await async_client.get("/board/done", params={"limit": 3, "cursor": cursor})).json()
+        loaded += [task["id"] for task in column["items"]]
+        assert all(task["status"] == "done" for task in column["items"])
+        cursor = column["next_cursor"]
+
+    assert loaded == ids["done"][3:]
+
+
+@pytest.mark.asyncio
+async def test_board_scoped_to_project(async_client: AsyncClient):
+    """project_id acota el tablero y las páginas de cada columna."""
+    await _seed()
+
+    board = (await async_client.get("/board/", params={"project_id": 1, "limit": 2})).json()
+
+    assert board["backlog"]["items"] == [] and board["doing"]["items"] == []
+    assert {task["project_id"] for task in board["done"]["items"]} == {1}
+    column = (await async_client.get(
+        "/board/done", params={"project_id": 1, "limit": 2, "cursor": board["done"]["next_cursor"]}
+    )).json()
+    assert len(board["done"]["items"] + column["items"]) == 4
+    assert column["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_board_rejects_invalid_params(async_client: AsyncClient):
+    """Status desconocido → 422; cursor inválido → 400."""
+    assert (await async_client.get("/board/archived")).status_code == 422
+    assert (await async_client.get("/board/done", params={"cursor": "nope"})).status_code == 400
+    assert (await async_client.get("/board/", params={"limit": 0})).status_code == 422
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("project_id", [None, 1])
+async def test_board_query_reads_only_first_rows(test_db, project_id):
+    """Cada columna es una búsqueda por índice ordenada: no recorre el historial."""
+    statement = board_query(50, project_id).compile(
+        dialect=sqlite_dialect.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    async with test_engine.connect() as conn:
+        plan = " | ".join(
+            row[-1] for row in (await conn.execute(text(f"EXPLAIN QUERY PLAN {statement}"))).all()
+        )
+
+    assert plan.count("SEARCH tasks USING INDEX ix_tasks_active") == 3
+    assert "TEMP B-TREE" not in plan
@@ -0,0 +1,213 @@
+"""Tests para el coalescing (single-flight) de lecturas y las versiones de datos."""
+import asyncio
+import time
+import pytest
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import delete, event, insert
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from src.main import app
+from src.api.coalescing import SingleFlight, request_key, start_coalescing, stop_coalescing
+from src.api.database import Base, get_read_sessionmaker, get_write_sessionmaker
+from src.api.models.project import Project
+from src.api.models.task import Task
+from src.api.routes.admin import require_admin
+from src.api.versions import get_data_versions
+
+
+# Engine de test en memoria
+TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+test_engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+test_async_session_maker = async_sessionmaker(
+    test_engine, class_=AsyncSession, expire_on_commit=False
+)
+
+
+@pytest.fixture
+async def test_db():
+    """Fixture para crear/destruir tablas en cada test."""
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield
+
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+def override_get_sessionmaker():
+    """Override de las session factories para tests."""
+    return test_async_session_maker
+
+
+@pytest.fixture
+async def flights(test_db):
+    """Coalescing activo durante el test."""
+    yield start_coalescing()
+    stop_coalescing()
+
+
+@pytest.fixture
+async def async_client(flights):
+    """Fixture para AsyncClient con BD de test."""
+    app.dependency_overrides[get_read_sessionmaker] = override_get_sessionmaker
+    app.dependency_overrides[get_write_sessionmaker] = override_get_sessionmaker
+    app.dependency_overrides[require_admin] = lambda: None
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test"
+    ) as client:
+        yield client
+
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def slow_selects():
+    """Cada SELECT tarda 20 ms (en el hilo de SQLite) y se cuenta."""
+    selects = []
+
+    def slow(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            selects.append(statement)
+            time.sleep(0.02)
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", slow)
+    yield selects
+    event.remove(test_engine.sync_engine, "before_cursor_execute", slow)
+
+
+async def _seed() -> None:
+    async with test_engine.begin() as conn:
+        await conn.execute(insert(Project), [{"id": 1, "name": "Proyecto", "color": "#000000"}])
+        await conn.execute(insert(Task), [{"name": f"Task {i}", "project_id": 1} for i in range(3)])
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_reads_share_one_query(async_client: AsyncClient, flights, slow_selects):
+    """Diez GETs iguales (query params en otro orden) ejecutan una sola lectura."""
+    await _seed()
+
+    responses = await asyncio.gather(*(
+        async_client.get("/tasks/?limit=10&status=backlog" if i % 2 else "/tasks/?status=backlog&limit=10")
+        for i in range(10)
+    ))
+
+    assert {response.status_code for response in responses} == {200}
+    assert len({response.content for response in responses}) == 1
+    assert len(responses[0].json()["items"]) == 3
+    assert flights.stats.misses == 1
+    assert flights.stats.hits == 9
+    single_read = len(slow_selects)
+
+    await async_client.get("/tasks/?limit=10")
+    await async_client.get("/tasks/?limit=11")
+    assert flights.stats.misses == 3
+    assert len(slow_selects) == 3 * single_read
+
+
+@pytest.mark.asyncio
+async def test_origins_are_not_shared(async_client: AsyncClient, flights, slow_selects):
+    """Cada Origin recibe su propio Access-Control-Allow-Origin."""
+    await _seed()
+    origins = ["http://localhost:3000", "http://localhost:5173"] * 2
+
+    responses = await asyncio.gather(*(
+        async_client.get("/tasks/", headers={"Origin": origin}) for origin in origins
+    ))
+
+    assert [response.headers["access-control-allow-origin"] for response in responses] == origins
+    assert flights.stats.misses == 2
+    assert flights.stats.hits == 2
+
+
+def _scope(query: bytes = b"", headers: list = ()) -> dict:
+    return {"type": "http", "method": "GET", "path": "/projects/", "query_string": query, "headers": list(headers)}
+
+
+@pytest.mark.asyncio
+async def test_write_changes_the_key(async_client: AsyncClient, flights):
+    """Una escritura confirmada cambia la clave: las lecturas posteriores no se unen a las anteriores."""
+    await _seed()
+    key = request_key(_scope(b"a=1&b=2"))
+    assert request_key(_scope(b"b=2&a=1")) == key
+
+    created = await async_client.post("/projects/", json={"name": "Nuevo", "color": "#ffffff"})
+
+    assert created.status_code == 201
+    assert request_key(_scope(b"a=1&b=2")) != key
+    assert request_key(_scope(b"a=1&b=2", [(b"accept", b"text/html")])) != request_key(_scope(b"a=1&b=2"))
+    assert [project["name"] for project in (await async_client.get("/projects/")).json()] == ["Proyecto", "Nuevo"]
+
+
+@pytest.mark.asyncio
+async def test_streams_and_writes_bypass(async_client: AsyncClient, flights):
+    """Los listados NDJSON y las escrituras no se agrupan."""
+    await _seed()
+
+    await async_client.get("/tasks/", params={"stream": True})
+    await async_client.get("/tasks/", headers={"Accept": "application/x-ndjson"})
+    await async_client.get("/health")
+
+    assert flights.stats.misses == 0
+    assert flights.stats.bypassed == 3
+    stats = (await async_client.get("/admin/coalescing")).json()
+    assert stats["enabled"] is True
+    assert stats["stats"]["bypassed"] == 4
+
+
+@pytest.mark.asyncio
+async def test_leader_errors_propagate_and_cancellation_falls_back():
+    """Un error de la líder llega a todas; si la líder se cancela, la siguiente ejecuta."""
+    flights = SingleFlight()
+    calls = []
+
+    async def failing():
+        calls.append("fail")
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(*(flights.run("k", failing) for _ in range(3)), return_exceptions=True)
+    assert [type(result) for result in results] == [ValueError] * 3
+    assert calls == ["fail"]
+
+    async def slow():
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    leader = asyncio.create_task(flights.run("k", slow))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flights.run("k", slow))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+
+    assert await follower == "ok"
+    assert flights.stats.leader_cancelled == 1
+    assert flights.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_data_versions_follow_commits(test_db):
+    """Las versiones cambian al confirmar escrituras ORM o DML, no al deshacerlas."""
+    versions = get_data_versions()
+    before = versions.version, versions.get("projects"), versions.get("tasks")
+
+    async with test_async_session_maker() as session:
+        session.add(Project(id=1, name="P", color="#000000"))
+        await session.flush()
+        await session.rollback()
+    assert (versions.version, versions.get("projects"), versions.get("tasks")) == before
+
+    async with test_async_session_maker() as session:
+        session.add(Project(id=1, name="P", color="#000000"))
+        await session.commit()
+        assert versions.get("projects") == before[1] + 1
+        assert versions.get("tasks") == before[2]
+
+        # Borrar un proyecto desvincula sus tareas (FK ON DELETE SET NULL)
+        await session.execute(delete(Project).where(Project.id == 1))
+        await session.commit()
+
+    assert versions.get("projects") == before[1] + 2
+    assert versions.get("tasks") == before[2] + 1
+    assert versions.version == before[0] + 2
@@ -0,0 +1,218 @@
+"""Tests para la codificación compacta de status y timestamps."""
+from datetime import datetime, timedelta, timezone, UTC
+import pytest
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import event, select, text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from src.main import app
+from src.api.database import Base, get_read_sessionmaker, get_write_sessionmaker
+from src.api.migrations import compact_encoding
+from src.api.migrations.runner import MIGRATIONS, migrate
+from src.api.models.project import Project
+from src.api.models.task import Task
+from src.api.models.subtask import Subtask
+from src.api.models.types import EpochMicros, StatusCode
+
+
+# Engine de test en memoria
+TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+test_engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+test_async_session_maker = async_sessionmaker(
+    test_engine, class_=AsyncSession, expire_on_commit=False
+)
+
+# Esquema anterior a la migración: timestamps y status como texto
+LEGACY_SCHEMA = [
+    "CREATE TABLE projects (id INTEGER NOT NULL, name VARCHAR(100) NOT NULL, "
+    "color VARCHAR(7) NOT NULL, created_at DATETIME NOT NULL, PRIMARY KEY (id))",
+    "CREATE TABLE tasks (id INTEGER NOT NULL, name VARCHAR(100) NOT NULL, "
+    "description VARCHAR(500), status VARCHAR(20) NOT NULL, completed BOOLEAN NOT NULL, "
+    "project_id INTEGER, created_at DATETIME NOT NULL, updated_at DATETIME, "
+    "completed_at DATETIME, deleted_at DATETIME, PRIMARY KEY (id), "
+    "FOREIGN KEY(project_id) REFERENCES projects (id) ON DELETE SET NULL)",
+    "CREATE TABLE subtasks (id INTEGER NOT NULL, task_id INTEGER NOT NULL, "
+    "name VARCHAR(200) NOT NULL, completed BOOLEAN NOT NULL, position INTEGER NOT NULL, "
+    "created_at DATETIME NOT NULL, completed_at DATETIME, deleted_at DATETIME, "
+    "PRIMARY KEY (id), FOREIGN KEY(task_id) REFERENCES tasks (id) ON DELETE CASCADE)",
+]
+
+
+@pytest.fixture
+async def test_db():
+    """Fixture para crear/destruir tablas en cada test."""
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield
+
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+def override_get_sessionmaker():
+    """Override de las session factories para tests."""
+    return test_async_session_maker
+
+
+@pytest.fixture
+async def async_client(test_db):
+    """Fixture para AsyncClient con BD de test."""
+    app.dependency_overrides[get_read_sessionmaker] = override_get_sessionmaker
+    app.dependency_overrides[get_write_sessionmaker] = override_get_sessionmaker
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test"
+    ) as client:
+        yield client
+
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+async def legacy_engine(tmp_path):
+    """Base de datos en fichero con el esquema de texto y migraciones 1-3 aplicadas."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'legacy.db'}", echo=False)
+    async with engine.begin() as conn:
+        for statement in LEGACY_SCHEMA:
+            await conn.execute(text(statement))
+        await conn.execute(text(
+            "INSERT INTO projects VALUES (1, 'Trabajo', '#3498db', '2024-01-01 09:00:00.000000')"
+        ))
+        await conn.execute(text(
+            "INSERT INTO tasks (id, name, status, completed, project_id, created_at, "
+            "updated_at, completed_at, deleted_at) VALUES "
+            "(:id, :name, :status, :completed, 1, :created_at, NULL, :completed_at, NULL)"
+        ), [
+            {"id": i, "name": f"T{i}", "status": status, "completed": status == "done",
+             "created_at": f"2024-01-02 10:00:00.{i:06d}",
+             "completed_at": "2024-01-03 11:30:00.123456" if status == "done" else None}
+            for i, status in enumerate(("backlog", "doing", "done") * 4, start=1)
+        ])
+        await conn.execute(text(
+            "INSERT INTO subtasks VALUES (1, 3, 'S', 1, 0, '2024-01-02 12:00:00.000001', "
+            "'2024-01-02 13:00:00.000002', NULL)"
+        ))
+
+    yield engine
+
+    await engine.dispose()
+
+
+def test_epoch_micros_roundtrip():
+    """Los datetimes se guardan como microsegundos UTC y vuelven naive en UTC."""
+    column_type = EpochMicros()
+    aware = datetime(2024, 5, 6, 7, 8, 9, 123456, tzinfo=timezone(timedelta(hours=2)))
+
+    stored = column_type.process_bind_param(aware, None)
+
+    assert isinstance(stored, int)
+    assert column_type.process_result_value(stored, None) == datetime(2024, 5, 6, 5, 8, 9, 123456)
+    assert column_type.process_bind_param(datetime(2024, 5, 6, 5, 8, 9, 123456), None) == stored
+    assert column_type.process_bind_param(None, None) is None
+
+
+def test_status_code_roundtrip():
+    """El status se guarda como código entero estable."""
+    column_type = StatusCode()
+
+    assert [column_type.process_bind_param(s, None) for s in ("backlog", "doing", "done")] == [0, 1, 2]
+    assert column_type.process_result_value(2, None) == "done"
+    with pytest.raises(ValueError, match="Unknown task status"):
+        column_type.process_bind_param("archived", None)
+
+
+@pytest.mark.asyncio
+async def test_columns_stored_as_integers(async_client: AsyncClient):
+    """La API no cambia, pero SQLite guarda enteros."""
+    response = await async_client.post("/tasks/", json={"name": "T", "status": "doing"})
+    assert response.status_code == 201
+    response = await async_client.get(f"/tasks/{response.json()['id']}")
+    data = response.json()
+    assert data["status"] == "doing"
+    created_at = datetime.fromisoformat(data["created_at"])
+    assert created_at.tzinfo is None
+    assert abs(created_at - datetime.now(UTC).replace(tzinfo=None)) < timedelta(minutes=1)
+
+    async with test_engine.connect() as conn:
+        row = (await conn.execute(text(
+            "SELECT typeof(status), status, typeof(created_at) FROM tasks WHERE id = :id"
+        ), {"id": data["id"]})).one()
+    assert tuple(row) == ("integer", 1, "integer")
+
+
+@pytest.mark.asyncio
+async def test_status_filters_use_codes(test_db):
+    """Las comparaciones con status en queries se traducen al código."""
+    async with test_async_session_maker() as session:
+        session.add_all([Task(name="A", status="backlog"), Task(name="B", status="done")])
+        await session.commit()
+
+        result = await session.execute(select(Task.name).where(Task.status == "done"))
+
+    assert result.scalars().all() == ["B"]
+
+
+@pytest.mark.asyncio
+async def test_migration_converts_legacy_database(legacy_engine):
+    """La migración reconstruye las tablas y conserva valores, índices y FKs."""
+    async with legacy_engine.begin() as conn:
+        await conn.execute(text(
+            "CREATE TABLE schema_version (version INTEGER PRIMARY KEY, name VARCHAR(100) NOT NULL, "
+            "applied_at VARCHAR(32) NOT NULL, fingerprint VARCHAR(64))"
+        ))
+        for migration in MIGRATIONS[:3]:
+            await conn.execute(text(
+                "INSERT INTO schema_version VALUES (:v, :n, '2024-01-01', NULL)"
+            ), {"v": migration.version, "n": migration.name})
+
+    result = await migrate(legacy_engine)
+
+    assert result.applied == [migration.name for migration in MIGRATIONS[3:]]
+    async with legacy_engine.connect() as conn:
+        types = {row[1]: row[2] for row in await conn.execute(text("PRAGMA table_info(tasks)"))}
+        indexes = (await conn.execute(text(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'tasks'"
+        ))).scalars().all()
+        leftovers = (await conn.execute(text(
+            "SELECT name FROM sqlite_master WHERE name LIKE '%__compact'"
+        ))).scalars().all()
+        foreign_keys = (await conn.execute(text("PRAGMA foreign_keys"))).scalar()
+    assert types["status"] == "SMALLINT"
+    assert types["created_at"] == "BIGINT"
+    assert set(indexes) == {index.name for index in Task.__table__.indexes}
+    assert leftovers == []
+    assert foreign_keys == 0
+
+    session_maker = async_sessionmaker(legacy_engine, expire_on_commit=False)
+    async with session_maker() as session:
+        tasks = (await session.execute(select(Task).order_by(Task.id))).scalars().all()
+        project = await session.get(Project, 1)
+        subtask = await session.get(Subtask, 1)
+    assert len(tasks) == 12
+    assert [t.status for t in tasks[:3]] == ["backlog", "doing", "done"]
+    assert tasks[0].created_at == datetime(2024, 1, 2, 10, 0, 0, 1)
+    assert tasks[2].completed_at == datetime(2024, 1, 3, 11, 30, 0, 123456)
+    assert project.created_at == datetime(2024, 1, 1, 9)
+    assert subtask.task_id == 3
+    assert subtask.completed_at == datetime(2024, 1, 2, 13, 0, 0, 2)
+
+
+@pytest.mark.asyncio
+async def test_migration_copies_in_batches_and_is_idempotent(legacy_engine):
+    """La copia se hace en lotes acotados y una segunda ejecución no reconstruye nada."""
+    statements = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO tasks__compact"):
+            statements.append(len(parameters))
+
+    event.listen(legacy_engine.sync_engine, "before_cursor_execute", _capture)
+    await compact_encoding.upgrade(legacy_engine, batch_size=5)
+    copied = list(statements)
+    statements.clear()
+    await compact_encoding.upgrade(legacy_engine, batch_size=5)
+    event.remove(legacy_engine.sync_engine, "before_cursor_execute", _capture)
+
+    assert copied == [5, 5, 2]
+    assert statements == []
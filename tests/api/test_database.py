@@ -0,0 +1,148 @@
+"""Tests para los engines de lectura y escritura."""
+import asyncio
+import pytest
+from sqlalchemy import event, select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from src.api.database import (
+    Base,
+    create_read_engine,
+    create_write_engine,
+    get_read_db,
+    is_memory_database,
+    read_only_url,
+)
+from src.api.sqlite_profiles import get_profile
+from src.api.models.project import Project
+
+
+@pytest.fixture
+async def engines(tmp_path):
+    """Escritor único y pool de lectores sobre un fichero temporal."""
+    url = f"sqlite+aiosqlite:///{tmp_path / 'test.db'}"
+    profile = get_profile("balanced")
+    write_engine = create_write_engine(url, profile)
+    async with write_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    read_engine = create_read_engine(url, profile, pool_size=2)
+
+    yield write_engine, read_engine
+
+    await read_engine.dispose()
+    await write_engine.dispose()
+
+
+def test_read_only_url():
+    """La URL de lectores usa el modo URI de solo lectura."""
+    url = read_only_url("sqlite+aiosqlite:///./app.db")
+
+    assert url.drivername == "sqlite+aiosqlite"
+    assert url.database == "file:./app.db"
+    assert url.query == {"mode": "ro", "uri": "true"}
+
+
+def test_is_memory_database():
+    """Detecta bases de datos en memoria."""
+    assert is_memory_database("sqlite+aiosqlite:///:memory:")
+    assert is_memory_database("sqlite+aiosqlite://")
+    assert not is_memory_database("sqlite+aiosqlite:///./app.db")
+
+
+@pytest.mark.asyncio
+async def test_read_engine_rejects_writes(engines):
+    """Las conexiones del pool de lectores no pueden escribir."""
+    _, read_engine = engines
+
+    with pytest.raises(OperationalError, match="readonly|read-only|query_only"):
+        async with read_engine.begin() as conn:
+            await conn.execute(text(
+                "INSERT INTO projects (name, color, created_at) "
+                "VALUES ('P', '#000000', '2024-01-01')"
+            ))
+
+
+@pytest.mark.asyncio
+async def test_readers_not_blocked_by_open_write_transaction(engines):
+    """Con WAL, un lector ve el último commit mientras el escritor tiene una transacción abierta."""
+    write_engine, read_engine = engines
+
+    async with write_engine.connect() as writer:
+        await writer.execute(text(
+            "INSERT INTO projects (name, color, created_at) VALUES ('P', '#000000', '2024-01-01')"
+        ))
+        # Transacción de escritura abierta (sin commit)
+        async with read_engine.connect() as reader:
+            count = (await reader.execute(text("SELECT COUNT(*) FROM projects"))).scalar()
+        assert count == 0
+        await writer.commit()
+
+    async with read_engine.connect() as reader:
+        count = (await reader.execute(text("SELECT COUNT(*) FROM projects"))).scalar()
+    assert count == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writers_are_serialized(engines):
+    """Los escritores concurrentes esperan su turno en el pool en lugar de fallar por lock."""
+    write_engine, _ = engines
+
+    async def write(i: int) -> None:
+        async with write_engine.begin() as conn:
+            await conn.execute(
+                text("INSERT INTO projects (name, color, created_at) VALUES (:n, '#000000', '2024-01-01')"),
+                {"n": f"P{i}"},
+            )
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(write(i) for i in range(10)))
+
+    async with write_engine.connect() as conn:
+        count = (await conn.execute(text("SELECT COUNT(*) FROM projects"))).scalar()
+    assert count == 10
+    assert write_engine.pool.size() == 1
+
+
+@pytest.mark.asyncio
+async def test_write_transactions_begin_immediate(engines):
+    """Las transacciones del escritor adquieren el lock de escritura al empezar."""
+    write_engine, _ = engines
+    statements = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(write_engine.sync_engine, "before_cursor_execute", _capture)
+    async with write_engine.begin() as conn:
+        await conn.execute(text("SELECT COUNT(*) FROM projects"))
+    event.remove(write_engine.sync_engine, "before_cursor_execute", _capture)
+
+    assert statements[0] == "BEGIN IMMEDIATE"
+
+
+@pytest.mark.asyncio
+async def test_read_session_has_no_transaction_statements(engines):
+    """Una sesión de lectura no envía BEGIN/COMMIT a SQLite ni hace commit."""
+    _, read_engine = engines
+    session_maker = async_sessionmaker(read_engine, expire_on_commit=False)
+    statements = []
+    commits = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.split()[0])
+
+    event.listen(read_engine.sync_engine, "before_cursor_execute", _capture)
+    event.listen(read_engine.sync_engine, "commit", lambda conn: commits.append(conn))
+
+    dependency = get_read_db(session_maker)
+    session = await anext(dependency)
+    await session.execute(select(Project))
+    connection = await session.connection()
+    raw = await connection.get_raw_connection()
+    in_transaction = raw.driver_connection.in_transaction
+    with pytest.raises(StopAsyncIteration):
+        await anext(dependency)
+
+    assert statements == ["SELECT"]
+    assert commits == []
+    assert in_transaction is False
+    assert read_engine.pool.checkedout() == 0
@@ -0,0 +1,246 @@
+"""Tests para ETag / If-None-Match a partir de las versiones de datos."""
+import pytest
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import event, insert, update
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from src.main import app
+from src.api.config import Settings
+from src.api.database import Base, get_read_sessionmaker, get_write_sessionmaker
+from src.api.etags import EPOCH, start_etags, stop_etags
+from src.api.models.project import Project
+from src.api.models.subtask import Subtask
+from src.api.models.task import Task
+from src.api.sqlite_profiles import get_profile, install_pragmas
+from src.api.versions import bump_tables, get_data_versions
+
+
+# Engine de test en memoria (con FKs, para que borrar un proyecto desvincule sus tareas)
+TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+test_engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+install_pragmas(test_engine, get_profile("balanced"))
+test_async_session_maker = async_sessionmaker(
+    test_engine, class_=AsyncSession, expire_on_commit=False
+)
+
+
+@pytest.fixture
+async def test_db():
+    """Fixture para crear/destruir tablas en cada test."""
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield
+
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+def override_get_sessionmaker():
+    """Override de las session factories para tests."""
+    return test_async_session_maker
+
+
+@pytest.fixture
+async def async_client(test_db):
+    """Fixture para AsyncClient con BD de test y ETags activos."""
+    app.dependency_overrides[get_read_sessionmaker] = override_get_sessionmaker
+    app.dependency_overrides[get_write_sessionmaker] = override_get_sessionmaker
+    start_etags()
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test"
+    ) as client:
+        yield client
+
+    stop_etags()
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def selects():
+    """SELECTs ejecutados durante el test."""
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", count)
+    yield statements
+    event.remove(test_engine.sync_engine, "before_cursor_execute", count)
+
+
+async def _seed() -> None:
+    """Un proyecto con dos tareas (1 y 2), y una subtask en cada una."""
+    async with test_engine.begin() as conn:
+        await conn.execute(insert(Project), [{"id": 1, "name": "Proyecto", "color": "#000000"}])
+        await conn.execute(insert(Task), [{"id": i, "name": f"Task {i}", "project_id": 1} for i in (1, 2)])
+        await conn.execute(insert(Subtask), [{"task_id": i, "name": "Sub", "position": 0} for i in (1, 2)])
+
+
+async def _etag(client: AsyncClient, url: str) -> str:
+    response = await client.get(url)
+    assert response.status_code == 200
+    return response.headers["etag"]
+
+
+@pytest.mark.asyncio
+async def test_if_none_match_returns_304_without_queries(async_client: AsyncClient, selects):
+    """Con el ETag actual la respuesta es 304, sin cuerpo y sin consultar SQLite."""
+    await _seed()
+    response = await async_client.get("/projects/")
+    etag = response.headers["etag"]
+    assert etag.startswith(f'"{EPOCH}-')
+
+    selects.clear()
+    for header in (etag, f"W/{etag}", f'"otro", {etag}'):
+        not_modified = await async_client.get("/projects/", headers={"If-None-Match": header})
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+        assert not_modified.headers["etag"] == etag
+    assert selects == []
+
+    star = await async_client.get("/projects/", headers={"If-None-Match": "*"})
+    assert star.status_code == 304
+    assert star.headers["etag"] == etag
+    assert selects == []
+
+    stale = await async_client.get("/projects/", headers={"If-None-Match": '"otro"'})
+    assert stale.status_code == 200
+    assert stale.json() == response.json()
+
+
+@pytest.mark.asyncio
+async def test_writes_change_the_etag(async_client: AsyncClient):
+    """Una escritura confirmada cambia el ETag de los listados que dependen de su tabla."""
+    await _seed()
+    projects, tasks, board = [await _etag(async_client, url) for url in ("/projects/", "/tasks/", "/board/")]
+
+    await async_client.patch("/tasks/1/subtasks/1/toggle")
+
+    assert await _etag(async_client, "/projects/") == projects
+    assert await _etag(async_client, "/tasks/") != tasks
+    assert await _etag(async_client, "/board/") != board
+    response = await async_client.get("/tasks/", headers={"If-None-Match": tasks})
+    assert response.status_code == 200
+
+    projects_before = await _etag(async_client, "/projects/1")
+    await async_client.put("/projects/1", json={"name": "Renombrado"})
+    assert await _etag(async_client, "/projects/1") != projects_before
+
+
+@pytest.mark.asyncio
+async def test_subtask_routes_are_keyed_per_task(async_client: AsyncClient):
+    """Escribir en una tarea cambia su ETag y no el de las demás."""
+    await _seed()
+    first, second = [await _etag(async_client, f"/tasks/{i}/subtasks/") for i in (1, 2)]
+    task = await _etag(async_client, "/tasks/1")
+    subtask = await _etag(async_client, "/tasks/1/subtasks/1")
+    assert task == first == subtask
+
+    await async_client.post("/tasks/1/subtasks/", json={"name": "Nueva"})
+
+    assert await _etag(async_client, "/tasks/1/subtasks/") != first
+    assert await _etag(async_client, "/tasks/2/subtasks/") == second
+    assert await _etag(async_client, "/tasks/1") != task
+    response = await async_client.get("/tasks/2/subtasks/", headers={"If-None-Match": second})
+    assert response.status_code == 304
+
+    # Borrar el proyecto desvincula sus tareas sin saber cuáles: cambian todas
+    await async_client.delete("/projects/1")
+    assert await _etag(async_client, "/tasks/2/subtasks/") != second
+
+
+@pytest.mark.asyncio
+async def test_if_none_match_star_on_single_resources(async_client: AsyncClient):
+    """`*` responde 304 si la tarea existe y deja el 404 si no."""
+    await _seed()
+    etag = await _etag(async_client, "/tasks/1")
+
+    for url in ("/tasks/1", "/tasks/1/subtasks/", "/tasks/1/subtasks/1"):
+        response = await async_client.get(url, headers={"If-None-Match": "*"})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    for url in ("/tasks/999", "/tasks/999/subtasks/", "/tasks/1/subtasks/999"):
+        response = await async_client.get(url, headers={"If-None-Match": "*"})
+        assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_fieldsets_have_their_own_etag(async_client: AsyncClient):
+    """Las variantes `fields=`/`include=` de una URL no comparten ETag."""
+    await _seed()
+    response = await async_client.get("/tasks/")
+    assert "accept" in response.headers["vary"].lower()
+    full = response.headers["etag"]
+    names = await _etag(async_client, "/tasks/?fields=id,name")
+    summary = await _etag(async_client, "/tasks/?include=subtask_summary")
+    assert len({full, names, summary}) == 3
+    assert await _etag(async_client, "/tasks/?fields=id,name&limit=5") == names
+
+    response = await async_client.get("/tasks/?fields=id,name", headers={"If-None-Match": full})
+    assert response.status_code == 200
+    response = await async_client.get("/tasks/1?fields=id,name", headers={"If-None-Match": names})
+    assert response.status_code == 200
+    response = await async_client.get("/tasks/?fields=id,name", headers={"If-None-Match": names})
+    assert response.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_streams_have_no_etag(async_client: AsyncClient):
+    """Los listados NDJSON no llevan ETag ni responden 304."""
+    await _seed()
+    etag = await _etag(async_client, "/tasks/")
+
+    for params, headers in (({"stream": True}, {}), ({}, {"Accept": "application/x-ndjson"})):
+        response = await async_client.get("/tasks/", params=params, headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 200
+        assert "etag" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_disabled_etags_are_ignored(async_client: AsyncClient):
+    """Con los ETags deshabilitados no hay cabecera y If-None-Match no se aplica."""
+    await _seed()
+    etag = await _etag(async_client, "/projects/")
+    stop_etags()
+
+    response = await async_client.get("/projects/", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_task_versions_follow_writes(test_db):
+    """Las escrituras ORM cambian la versión de sus tareas; el DML y los jobs, la generación."""
+    await _seed()
+    versions = get_data_versions()
+    first, second = versions.task(1), versions.task(2)
+
+    async with test_async_session_maker() as session:
+        subtask = await session.get(Subtask, 1)
+        subtask.task_id = 2
+        await session.commit()
+    assert versions.task(1) != first and versions.task(2) != second
+    assert versions.task_generation == first[0]
+
+    first = versions.task(1)
+    async with test_async_session_maker() as session:
+        await session.execute(update(Subtask).where(Subtask.task_id == 2).values(name="DML"))
+        await session.commit()
+    assert versions.task_generation == first[0] + 1
+    assert versions.task(1) == (first[0] + 1, 0)
+
+    bump_tables(["projects"])
+    assert versions.task_generation == first[0] + 1
+    bump_tables(["tasks_archive", "tasks"])
+    assert versions.task_generation == first[0] + 2
+
+
+def test_etags_are_opt_in():
+    """Las versiones son del proceso: los ETags solo se activan a propósito."""
+    assert Settings().etags_enabled is False
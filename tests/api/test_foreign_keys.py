@@ -0,0 +1,169 @@
+"""Tests para los foreign keys aplicados por SQLite y los borrados en cascada."""
+import pytest
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import event, insert, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from src.main import app
+from src.api.database import Base, get_read_sessionmaker, get_write_sessionmaker
+from src.api.models.task import Task
+from src.api.models.subtask import Subtask
+from src.api.sqlite_profiles import get_profile, install_pragmas
+
+
+# Engine de test en memoria con los PRAGMAs de la aplicación (foreign_keys=ON)
+TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+test_engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+install_pragmas(test_engine, get_profile("balanced"))
+test_async_session_maker = async_sessionmaker(
+    test_engine, class_=AsyncSession, expire_on_commit=False
+)
+
+
+@pytest.fixture
+async def test_db():
+    """Fixture para crear/destruir tablas en cada test."""
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield
+
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+def override_get_sessionmaker():
+    """Override de las session factories para tests."""
+    return test_async_session_maker
+
+
+@pytest.fixture
+async def async_client(test_db):
+    """Fixture para AsyncClient con BD de test."""
+    app.dependency_overrides[get_read_sessionmaker] = override_get_sessionmaker
+    app.dependency_overrides[get_write_sessionmaker] = override_get_sessionmaker
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test"
+    ) as client:
+        yield client
+
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def captured_statements():
+    """Captura las sentencias SQL ejecutadas sobre el engine de test."""
+    statements = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", _capture)
+    yield statements
+    event.remove(test_engine.sync_engine, "before_cursor_execute", _capture)
+
+
+@pytest.mark.asyncio
+async def test_foreign_keys_are_enforced(test_db):
+    """Una subtask no puede apuntar a una tarea inexistente."""
+    with pytest.raises(IntegrityError, match="FOREIGN KEY"):
+        async with test_engine.begin() as conn:
+            await conn.execute(text(
+                "INSERT INTO subtasks (task_id, name, completed, position, created_at) "
+                "VALUES (999, 'Huérfana', 0, 0, '2024-01-01')"
+            ))
+
+
+@pytest.mark.asyncio
+async def test_delete_project_unassigns_tasks(async_client: AsyncClient):
+    """Borrar un proyecto conserva sus tareas con project_id a NULL."""
+    project = (await async_client.post("/projects/", json={"name": "P", "color": "#000000"})).json()
+    task = (await async_client.post("/tasks/", json={"name": "T", "project_id": project["id"]})).json()
+
+    response = await async_client.delete(f"/projects/{project['id']}")
+    assert response.status_code == 204
+
+    response = await async_client.get(f"/tasks/{task['id']}")
+    assert response.status_code == 200
+    assert response.json()["project_id"] is None
+
+
+@pytest.mark.asyncio
+async def test_delete_project_is_single_statement(async_client: AsyncClient, captured_statements):
+    """El borrado de un proyecto no carga sus tareas: un solo DELETE."""
+    project = (await async_client.post("/projects/", json={"name": "P", "color": "#000000"})).json()
+    async with test_engine.begin() as conn:
+        await conn.execute(insert(Task), [
+            {"name": f"T{i}", "status": "backlog", "completed": False, "project_id": project["id"]}
+            for i in range(1000)
+        ])
+    captured_statements.clear()
+
+    response = await async_client.delete(f"/projects/{project['id']}")
+    assert response.status_code == 204
+
+    data_statements = [s for s in captured_statements if s.split()[0] in ("SELECT", "UPDATE", "DELETE")]
+    assert data_statements == ["DELETE FROM projects WHERE projects.id = ?"]
+
+    async with test_engine.connect() as conn:
+        unassigned = (await conn.execute(
+            text("SELECT COUNT(*) FROM tasks WHERE project_id IS NULL")
+        )).scalar()
+    assert unassigned == 1000
+
+
+@pytest.mark.asyncio
+async def test_delete_task_cascades_to_subtasks_in_database(test_db, captured_statements):
+    """El borrado físico de una tarea elimina sus subtasks sin cargarlas."""
+    async with test_async_session_maker() as session:
+        task = Task(name="T", subtasks=[Subtask(name=f"S{i}", position=i) for i in range(3)])
+        session.add(task)
+        await session.commit()
+        task_id = task.id
+
+    async with test_async_session_maker() as session:
+        task = await session.get(Task, task_id)
+        captured_statements.clear()
+        await session.delete(task)
+        await session.commit()
+
+    assert not any("FROM subtasks" in s for s in captured_statements)
+    async with test_engine.connect() as conn:
+        remaining = (await conn.execute(select(Subtask).where(Subtask.task_id == task_id))).all()
+    assert remaining == []
+
+
+@pytest.mark.asyncio
+async def test_delete_project_not_found(async_client: AsyncClient):
+    """DELETE de un proyecto inexistente sigue devolviendo 404."""
+    response = await async_client.delete("/projects/999")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_create_task_with_unknown_project(async_client: AsyncClient):
+    """POST /tasks con un project_id inexistente devuelve 404, no un IntegrityError."""
+    response = await async_client.post("/tasks/", json={"name": "x", "project_id": 999})
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Project not found"
+
+    response = await async_client.post("/tasks/", json={"name": "x", "project_id": None})
+    assert response.status_code == 201
+
+
+@pytest.mark.asyncio
+async def test_update_task_with_unknown_project(async_client: AsyncClient):
+    """PUT /tasks/{id} con un project_id inexistente devuelve 404 y no modifica la tarea."""
+    project = (await async_client.post("/projects/", json={"name": "P", "color": "#000000"})).json()
+    task = (await async_client.post("/tasks/", json={"name": "T", "project_id": project["id"]})).json()
+
+    response = await async_client.put(f"/tasks/{task['id']}", json={"project_id": 12345})
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Project not found"
+    assert (await async_client.get(f"/tasks/{task['id']}")).json()["project_id"] == project["id"]
+
+    response = await async_client.put(f"/tasks/{task['id']}", json={"project_id": None})
+    assert response.status_code == 200
+    assert response.json()["project_id"] is None
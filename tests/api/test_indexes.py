@@ -0,0 +1,204 @@
+"""Tests para los índices de tasks y subtasks y su migración."""
+import pytest
+from datetime import datetime
+from sqlalchemy import exists, false, func, select, text
+from sqlalchemy.dialects import sqlite as sqlite_dialect
+from sqlalchemy.ext.asyncio import create_async_engine
+from src.api.database import Base
+from src.api.models.task import Task
+from src.api.models.subtask import Subtask
+from src.api.migrations import add_indexes, enforce_foreign_keys, filter_indexes
+from src.api.migrations.add_indexes import create_missing_indexes
+from src.api.migrations.runner import MIGRATIONS
+
+
+EXPECTED_INDEXES = {
+    "ix_tasks_project_id",
+    "ix_tasks_active_status_created_at",
+    "ix_tasks_active_project_status_created_at",
+    "ix_tasks_active_created_at",
+    "ix_tasks_active_last_modified",
+    "ix_subtasks_task_id",
+    "ix_subtasks_active_task_position",
+    "ix_tasks_deleted_at",
+    "ix_subtasks_deleted_at",
+}
+
+
+@pytest.fixture
+async def test_engine():
+    """Engine en memoria con las tablas creadas desde los modelos."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield engine
+
+    await engine.dispose()
+
+
+async def _index_names(conn) -> set[str]:
+    result = await conn.execute(text(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'ix_%' "
+        "AND tbl_name IN ('tasks', 'subtasks')"
+    ))
+    return {row[0] for row in result}
+
+
+async def _query_plan(conn, statement) -> str:
+    sql = str(statement.compile(
+        dialect=sqlite_dialect.dialect(),
+        compile_kwargs={"literal_binds": True},
+    ))
+    result = await conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"))
+    return " / ".join(row[3] for row in result)
+
+
+@pytest.mark.asyncio
+async def test_indexes_declared_on_models(test_engine):
+    """create_all crea los índices declarados en los modelos."""
+    async with test_engine.connect() as conn:
+        assert await _index_names(conn) == EXPECTED_INDEXES
+
+
+@pytest.mark.asyncio
+async def test_partial_indexes_only_cover_active_rows(test_engine):
+    """Los índices de filas activas son parciales (WHERE deleted_at IS NULL)."""
+    async with test_engine.connect() as conn:
+        result = await conn.execute(
+            text("SELECT name, sql FROM sqlite_master WHERE type = 'index' AND name LIKE 'ix_%'")
+        )
+        definitions = dict(result.fetchall())
+
+    assert "WHERE deleted_at IS NULL" in definitions["ix_tasks_active_status_created_at"]
+    assert "WHERE deleted_at IS NULL" in definitions["ix_subtasks_active_task_position"]
+    assert "WHERE" not in definitions["ix_subtasks_task_id"]
+
+
+@pytest.mark.asyncio
+async def test_migration_creates_missing_indexes(test_engine):
+    """La migración crea los índices en una base de datos existente sin ellos."""
+    async with test_engine.begin() as conn:
+        for name in EXPECTED_INDEXES:
+            await conn.execute(text(f"DROP INDEX {name}"))
+
+    async with test_engine.begin() as conn:
+        created = await create_missing_indexes(conn)
+
+    assert set(created) == EXPECTED_INDEXES
+    async with test_engine.connect() as conn:
+        assert await _index_names(conn) == EXPECTED_INDEXES
+
+
+@pytest.mark.asyncio
+async def test_migration_is_idempotent(test_engine):
+    """Ejecutar la migración dos veces no falla ni recrea índices."""
+    async with test_engine.begin() as conn:
+        created = await create_missing_indexes(conn)
+
+    assert created == []
+
+
+@pytest.mark.asyncio
+async def test_board_queries_use_indexes(test_engine):
+    """Las consultas del tablero y de subtasks no hacen full scan."""
+    async with test_engine.connect() as conn:
+        by_project = await _query_plan(conn, select(Task).where(
+            Task.deleted_at.is_(None), Task.project_id == 1, Task.status == "doing"
+        ))
+        max_position = await _query_plan(conn, (
+            select(Subtask.position)
+            .where(Subtask.task_id == 1, Subtask.deleted_at.is_(None))
+            .order_by(Subtask.position.desc())
+            .limit(1)
+        ))
+
+    assert "ix_tasks_active_project_status_created_at" in by_project
+    assert "ix_subtasks_active_task_position" in max_position
+    assert "TEMP B-TREE" not in max_position
+
+
+@pytest.mark.asyncio
+async def test_task_filters_use_indexes(test_engine):
+    """Los filtros de GET /tasks se resuelven con sus índices."""
+    since = datetime(2024, 1, 1)
+    async with test_engine.connect() as conn:
+        column_page = await _query_plan(conn, (
+            select(Task)
+            .where(Task.deleted_at.is_(None), Task.status == "done")
+            .order_by(Task.created_at, Task.id)
+            .limit(50)
+        ))
+        project_column_page = await _query_plan(conn, (
+            select(Task)
+            .where(Task.deleted_at.is_(None), Task.project_id == 1, Task.status == "done")
+            .order_by(Task.created_at, Task.id)
+            .limit(50)
+        ))
+        updated_since = await _query_plan(conn, select(Task).where(
+            Task.deleted_at.is_(None), func.coalesce(Task.updated_at, Task.created_at) >= since
+        ))
+        open_subtasks = await _query_plan(conn, select(Task).where(
+            Task.deleted_at.is_(None),
+            exists().where(
+                Subtask.task_id == Task.id, Subtask.deleted_at.is_(None), Subtask.completed == false()
+            ),
+        ))
+
+    assert "ix_tasks_active_status_created_at" in column_page
+    assert "TEMP B-TREE" not in column_page
+    assert "ix_tasks_active_project_status_created_at" in project_column_page
+    assert "TEMP B-TREE" not in project_column_page
+    assert "ix_tasks_active_last_modified" in updated_since
+    assert "SEARCH subtasks USING INDEX" in open_subtasks
+
+
+@pytest.mark.asyncio
+async def test_filter_indexes_migration_drops_superseded_index(test_engine):
+    """Las migraciones 8 y 9 crean sus índices y eliminan los que sustituyen."""
+    async with test_engine.begin() as conn:
+        await conn.execute(text("DROP INDEX ix_tasks_active_status_created_at"))
+        await conn.execute(text("DROP INDEX ix_tasks_active_project_status_created_at"))
+        await conn.execute(text(
+            "CREATE INDEX ix_tasks_active_status ON tasks (status) WHERE deleted_at IS NULL"
+        ))
+        await conn.execute(text(
+            "CREATE INDEX ix_tasks_active_project_status ON tasks (project_id, status) WHERE deleted_at IS NULL"
+        ))
+
+    await filter_indexes.upgrade(test_engine)
+    async with test_engine.connect() as conn:
+        names = await _index_names(conn)
+    assert "ix_tasks_active_status" not in names
+    assert "ix_tasks_active_project_status" in names
+
+    await filter_indexes.upgrade_board_columns(test_engine)
+    async with test_engine.connect() as conn:
+        assert await _index_names(conn) == EXPECTED_INDEXES
+
+
+@pytest.mark.asyncio
+async def test_each_index_migration_creates_only_its_indexes(test_engine):
+    """Cada versión tiene su propio upgrade y solo crea sus índices."""
+    upgrades = [migration.upgrade for migration in MIGRATIONS]
+    assert len(set(upgrades)) == len(upgrades)
+
+    steps = [
+        (add_indexes.upgrade, add_indexes.INDEXES),
+        (enforce_foreign_keys.upgrade, enforce_foreign_keys.INDEXES),
+        (add_indexes.upgrade_tombstones, add_indexes.TOMBSTONE_INDEXES),
+        (add_indexes.upgrade_pagination, add_indexes.PAGINATION_INDEXES),
+        (filter_indexes.upgrade, filter_indexes.INDEXES),
+        (filter_indexes.upgrade_board_columns, filter_indexes.BOARD_INDEXES),
+    ]
+    assert {name for _, names in steps for name in names} == EXPECTED_INDEXES
+
+    async with test_engine.begin() as conn:
+        for name in EXPECTED_INDEXES:
+            await conn.execute(text(f"DROP INDEX {name}"))
+    expected = set()
+    for upgrade, names in steps:
+        await upgrade(test_engine)
+        expected |= set(names)
+        async with test_engine.connect() as conn:
+            assert await _index_names(conn) == expected
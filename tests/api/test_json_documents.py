@@ -0,0 +1,172 @@
+"""Tests para los documentos JSON construidos por SQLite (GET /tasks/board)."""
+from datetime import datetime
+from typing import List
+import pytest
+from httpx import AsyncClient, ASGITransport
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import selectinload
+from src.main import app
+from src.api.database import Base, get_read_sessionmaker, get_write_sessionmaker
+from src.api.models.project import Project
+from src.api.models.subtask import Subtask
+from src.api.models.task import Task
+from src.api.schemas.tasks import TaskResponse
+
+
+# Engine de test en memoria
+TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+test_engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+test_async_session_maker = async_sessionmaker(
+    test_engine, class_=AsyncSession, expire_on_commit=False
+)
+
+TASK_LIST = TypeAdapter(List[TaskResponse])
+
+
+@pytest.fixture
+async def test_db():
+    """Fixture para crear/destruir tablas en cada test."""
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield
+
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+def override_get_sessionmaker():
+    """Override de las session factories para tests."""
+    return test_async_session_maker
+
+
+@pytest.fixture
+async def async_client(test_db):
+    """Fixture para AsyncClient con BD de test."""
+    app.dependency_overrides[get_read_sessionmaker] = override_get_sessionmaker
+    app.dependency_overrides[get_write_sessionmaker] = override_get_sessionmaker
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test"
+    ) as client:
+        yield client
+
+    app.dependency_overrides.clear()
+
+
+async def _seed_board() -> None:
+    """Tareas con todos los casos de serialización: strings, NULLs, fechas y subtasks."""
+    async with test_async_session_maker() as session:
+        project = Project(name="Proyecto", color="#000000")
+        session.add(project)
+        await session.flush()
+        session.add_all([
+            Task(
+                name='Comillas " barra \\ y salto\nde línea',
+                description="Ünicode ✓ \t\x01   /<script>",
+                status="doing",
+                project_id=project.id,
+                created_at=datetime(2024, 1, 2, 3, 4, 5),
+                updated_at=datetime(2024, 1, 3, 0, 0, 0, 120000),
+                subtasks=[
+                    Subtask(name="Hecha", position=0, completed=True,
+                            created_at=datetime(2024, 1, 2, 3, 4, 6, 5),
+                            completed_at=datetime(2024, 1, 2, 5, 0, 0, 999999)),
+                    Subtask(name="Abierta", position=1, created_at=datetime(2024, 1, 2, 3, 4, 7)),
+                    Subtask(name="Eliminada", position=2, created_at=datetime(2024, 1, 2, 3, 4, 8),
+                            deleted_at=datetime(2024, 1, 4)),
+                ],
+            ),
+            Task(
+                name="Terminada",
+                description=None,
+                status="done",
+                completed=True,
+                created_at=datetime(2024, 1, 1, 23, 59, 59, 999999),
+                completed_at=datetime(2024, 2, 1, 12, 0, 0, 1),
+            ),
+            Task(name="Eliminada", status="backlog", created_at=datetime(2024, 1, 5),
+                 deleted_at=datetime(2024, 1, 6)),
+            Task(name="Backlog", status="backlog", created_at=datetime(2024, 1, 2, 3, 4, 5)),
+        ])
+        await session.commit()
+
+
+async def _orm_board_bytes() -> bytes:
+    """El mismo tablero por el camino ORM + Pydantic."""
+    async with test_async_session_maker() as session:
+        result = await session.execute(
+            select(Task)
+            .options(selectinload(Task.subtasks.and_(Subtask.deleted_at.is_(None))))
+            .where(Task.deleted_at.is_(None))
+            .order_by(Task.created_at, Task.id)
+        )
+        tasks = result.scalars().all()
+        for task in tasks:
+            task.subtasks.sort(key=lambda subtask: subtask.id)
+        return TASK_LIST.dump_json([TaskResponse.model_validate(task) for task in tasks])
+
+
+@pytest.mark.asyncio
+async def test_board_is_byte_compatible_with_task_response(async_client: AsyncClient):
+    """El documento de SQLite es byte a byte la serialización de List[TaskResponse]."""
+    await _seed_board()
+
+    response = await async_client.get("/tasks/board")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.content == await _orm_board_bytes()
+    assert [task["name"] for task in response.json()] == [
+        "Terminada", 'Comillas " barra \\ y salto\nde línea', "Backlog",
+    ]
+    assert [s["name"] for s in response.json()[1]["subtasks"]] == ["Hecha", "Abierta"]
+
+
+@pytest.mark.asyncio
+async def test_board_matches_task_listing(async_client: AsyncClient):
+    """Las tareas creadas por la API salen igual en /tasks/board que en /tasks."""
+    task = (await async_client.post("/tasks/", json={"name": "Tarea", "description": "Desc"})).json()
+    await async_client.post(f"/tasks/{task['id']}/subtasks/", json={"name": "Sub"})
+    await async_client.patch(f"/tasks/{task['id']}/status", params={"new_status": "done"})
+
+    board = (await async_client.get("/tasks/board")).json()
+    listing = (await async_client.get("/tasks/")).json()["items"]
+
+    assert board == listing
+
+
+@pytest.mark.asyncio
+async def test_board_accepts_task_filters(async_client: AsyncClient):
+    """Los filtros de GET /tasks se aplican en la consulta del documento."""
+    await _seed_board()
+
+    response = await async_client.get("/tasks/board", params={"status": "done"})
+    assert [task["name"] for task in response.json()] == ["Terminada"]
+
+    response = await async_client.get("/tasks/board", params={"has_open_subtasks": True})
+    assert len(response.json()) == 1
+
+    response = await async_client.get("/tasks/board", params={"project_id": 999})
+    assert response.content == b"[]"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("params", [
+    {"fields": "name,status,created_at"},
+    {"fields": "id,completed_at", "include": "subtask_summary"},
+    {"include": "subtasks,subtask_summary"},
+    {"fields": "description", "include": ""},
+])
+async def test_board_fieldsets_match_task_listing(async_client: AsyncClient, params: dict):
+    """Con fields=/include=, el documento de SQLite es el mismo que el de GET /tasks."""
+    await _seed_board()
+
+    board = await async_client.get("/tasks/board", params=params)
+    listing = await async_client.get("/tasks/", params={**params, "stream": True})
+
+    assert board.status_code == 200
+    assert board.content == b"[" + listing.content.rstrip(b"\n").replace(b"\n", b",") + b"]"
@@ -0,0 +1,217 @@
+"""Tests para el scheduler de mantenimiento de SQLite."""
+import asyncio
+import os
+import pytest
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import text
+from src.main import app
+from src.api.config import Settings
+from src.api.database import create_write_engine
+from src.api.maintenance import (
+    MaintenanceJob,
+    MaintenanceScheduler,
+    analyze_job,
+    default_jobs,
+    get_maintenance_scheduler,
+    incremental_vacuum_job,
+    wal_checkpoint_job,
+    wal_path,
+)
+from src.api.migrations.runner import migrate
+from src.api.routes.admin import require_admin
+from src.api.sqlite_profiles import get_profile
+
+
+@pytest.fixture
+async def test_engine(tmp_path):
+    """Escritor sobre una base de datos nueva creada por el runner de migraciones."""
+    engine = create_write_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}", get_profile("balanced"))
+    await migrate(engine)
+
+    yield engine
+
+    await engine.dispose()
+
+
+async def _fill_and_delete(engine, rows: int) -> None:
+    """Inserta y borra filas grandes para dejar páginas en la freelist."""
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE IF NOT EXISTS blobs (data BLOB)"))
+        await conn.execute(text(
+            "WITH RECURSIVE r(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM r WHERE i < :n) "
+            "INSERT INTO blobs SELECT randomblob(2000) FROM r"
+        ), {"n": rows})
+    async with engine.begin() as conn:
+        await conn.execute(text("DELETE FROM blobs"))
+
+
+async def _pragma(engine, name: str):
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        return (await conn.execute(text(f"PRAGMA {name}"))).scalar()
+
+
+@pytest.mark.asyncio
+async def test_new_database_uses_incremental_auto_vacuum(test_engine):
+    """Las bases de datos creadas por el runner permiten incremental_vacuum."""
+    assert await _pragma(test_engine, "auto_vacuum") == 2
+
+
+@pytest.mark.asyncio
+async def test_analyze_job_runs_one_step_per_table(test_engine):
+    """ANALYZE se ejecuta tabla a tabla y registra estadísticas del job."""
+    scheduler = MaintenanceScheduler(test_engine, [MaintenanceJob("analyze", 3600, analyze_job(100))], step_pause=0)
+
+    stats = await scheduler.run_job("analyze")
+
+    assert stats.runs == 1
+    assert stats.failures == 0
+    assert stats.last_steps == stats.last_result["tables"] + 1
+    assert stats.max_step_ms > 0
+    async with test_engine.connect() as conn:
+        analyzed = (await conn.execute(text("SELECT COUNT(*) FROM sqlite_stat1"))).scalar()
+    assert analyzed > 0
+
+
+@pytest.mark.asyncio
+async def test_incremental_vacuum_frees_pages_in_steps(test_engine):
+    """Las páginas libres se devuelven en pasos acotados."""
+    await _fill_and_delete(test_engine, 200)
+    freelist = await _pragma(test_engine, "freelist_count")
+    assert freelist >= 100
+
+    scheduler = MaintenanceScheduler(
+        test_engine,
+        [MaintenanceJob("incremental_vacuum", 600, incremental_vacuum_job(pages_per_step=50, max_steps=100))],
+        step_pause=0,
+    )
+    stats = await scheduler.run_job("incremental_vacuum")
+
+    assert stats.last_result["pages_freed"] == freelist
+    assert stats.last_steps == -(-freelist // 50)
+    assert await _pragma(test_engine, "freelist_count") == 0
+
+
+@pytest.mark.asyncio
+async def test_incremental_vacuum_skipped_without_auto_vacuum(tmp_path):
+    """Sin auto_vacuum=INCREMENTAL el job no hace nada."""
+    engine = create_write_engine(f"sqlite+aiosqlite:///{tmp_path / 'plain.db'}", get_profile("balanced"))
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE t (x)"))
+    scheduler = MaintenanceScheduler(
+        engine, [MaintenanceJob("incremental_vacuum", 600, incremental_vacuum_job(10, 10))], step_pause=0
+    )
+
+    stats = await scheduler.run_job("incremental_vacuum")
+    await engine.dispose()
+
+    assert stats.last_result["skipped"] is True
+    assert stats.last_steps == 0
+
+
+@pytest.mark.asyncio
+async def test_wal_checkpoint_truncates_over_threshold(test_engine):
+    """El WAL se vacía solo cuando supera el umbral."""
+    await _fill_and_delete(test_engine, 200)
+    wal_bytes = os.path.getsize(wal_path(test_engine))
+    assert wal_bytes > 0
+
+    below = MaintenanceScheduler(
+        test_engine, [MaintenanceJob("wal_checkpoint", 60, wal_checkpoint_job(wal_bytes + 1, 10))], step_pause=0
+    )
+    stats = await below.run_job("wal_checkpoint")
+    assert stats.last_result == {"skipped": True, "wal_bytes": wal_bytes}
+
+    above = MaintenanceScheduler(
+        test_engine, [MaintenanceJob("wal_checkpoint", 60, wal_checkpoint_job(1024, 10))], step_pause=0
+    )
+    stats = await above.run_job("wal_checkpoint")
+
+    assert stats.last_result["truncated"] is True
+    assert os.path.getsize(wal_path(test_engine)) == 0
+    assert await _pragma(test_engine, "busy_timeout") == get_profile("balanced").busy_timeout
+
+
+@pytest.mark.asyncio
+async def test_wal_checkpoint_does_not_use_the_writer_connection(test_engine):
+    """El checkpoint no espera a la única conexión del escritor (ocupada por la API)."""
+    await _fill_and_delete(test_engine, 200)
+    scheduler = MaintenanceScheduler(
+        test_engine, [MaintenanceJob("wal_checkpoint", 60, wal_checkpoint_job(1024, 10))], step_pause=0
+    )
+
+    async with test_engine.connect():
+        stats = await asyncio.wait_for(scheduler.run_job("wal_checkpoint"), timeout=5)
+
+    assert stats.last_error is None
+    assert stats.last_result["truncated"] is True
+
+
+@pytest.mark.asyncio
+async def test_manual_run_of_unscheduled_jobs(test_engine):
+    """Archive y retention no se programan por defecto, pero el CLI puede ejecutarlos."""
+    settings = Settings()
+    assert {"archive", "retention"}.isdisjoint(job.name for job in default_jobs(settings))
+
+    scheduler = MaintenanceScheduler(test_engine, default_jobs(settings, enabled_only=False), step_pause=0)
+    for name in ("archive", "retention"):
+        stats = await scheduler.run_job(name)
+        assert stats.last_error is None
+
+
+@pytest.mark.asyncio
+async def test_scheduler_runs_due_jobs_and_records_failures(test_engine):
+    """El scheduler ejecuta los jobs al vencer su intervalo y registra errores."""
+    calls = []
+
+    async def ok(ctx):
+        await ctx.step("SELECT 1")
+        calls.append("ok")
+        return {}
+
+    async def broken(ctx):
+        raise RuntimeError("boom")
+
+    scheduler = MaintenanceScheduler(
+        test_engine,
+        [MaintenanceJob("ok", 0.01, ok), MaintenanceJob("broken", 0.01, broken)],
+        step_pause=0,
+    )
+    scheduler.start()
+    await asyncio.sleep(0.1)
+    await scheduler.stop()
+
+    assert not scheduler.running
+    assert len(calls) >= 2
+    broken_stats = scheduler.jobs["broken"].stats
+    assert broken_stats.failures == broken_stats.runs > 0
+    assert broken_stats.last_error == "RuntimeError: boom"
+
+
+@pytest.mark.asyncio
+async def test_admin_maintenance_endpoints(test_engine):
+    """GET /admin/maintenance expone las estadísticas y POST ejecuta un job."""
+    scheduler = MaintenanceScheduler(test_engine, [MaintenanceJob("analyze", 3600, analyze_job(100))], step_pause=0)
+    app.dependency_overrides[require_admin] = lambda: None
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        try:
+            response = await client.get("/admin/maintenance")
+            assert response.json() == {"enabled": False}
+
+            app.dependency_overrides[get_maintenance_scheduler] = lambda: scheduler
+            response = await client.post("/admin/maintenance/analyze/run")
+            assert response.status_code == 200
+            assert response.json()["runs"] == 1
+
+            response = await client.post("/admin/maintenance/unknown/run")
+            assert response.status_code == 404
+
+            response = await client.get("/admin/maintenance")
+        finally:
+            app.dependency_overrides.clear()
+
+    data = response.json()
+    assert data["enabled"] is True
+    assert data["jobs"]["analyze"]["runs"] == 1
+    assert data["jobs"]["analyze"]["interval_s"] == 3600
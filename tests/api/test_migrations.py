@@ -0,0 +1,149 @@
+"""Tests para el runner de migraciones versionadas."""
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from src.api.migrations import enforce_foreign_keys
+from src.api.migrations.runner import (
+    HEAD_VERSION,
+    MIGRATIONS,
+    backfill_in_batches,
+    get_current_state,
+    migrate,
+    schema_fingerprint,
+)
+
+
+@pytest.fixture
+async def test_engine(tmp_path):
+    """Engine sobre un fichero SQLite temporal vacío."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}", echo=False)
+
+    yield engine
+
+    await engine.dispose()
+
+
+async def _columns(conn, table: str) -> set[str]:
+    result = await conn.execute(text(f"PRAGMA table_info({table})"))
+    return {row[1] for row in result}
+
+
+@pytest.mark.asyncio
+async def test_migrate_fresh_database_stamps_head(test_engine):
+    """Una base de datos nueva se crea con create_all y queda en la última versión."""
+    result = await migrate(test_engine)
+
+    assert result.created_schema is True
+    assert result.applied == []
+    assert result.version == HEAD_VERSION
+
+    async with test_engine.connect() as conn:
+        version, fingerprint = await get_current_state(conn)
+        applied = (await conn.execute(text("SELECT COUNT(*) FROM schema_version"))).scalar()
+
+    assert version == HEAD_VERSION
+    assert fingerprint == schema_fingerprint()
+    assert applied == len(MIGRATIONS)
+
+
+@pytest.mark.asyncio
+async def test_migrate_skips_when_fingerprint_matches(test_engine):
+    """Un segundo arranque no ejecuta create_all ni migraciones."""
+    await migrate(test_engine)
+
+    result = await migrate(test_engine)
+
+    assert result.skipped is True
+    assert result.version == HEAD_VERSION
+
+
+@pytest.mark.asyncio
+async def test_migrate_reruns_when_fingerprint_changes(test_engine):
+    """Si la huella guardada no coincide, se vuelve a sincronizar el esquema."""
+    await migrate(test_engine)
+    async with test_engine.begin() as conn:
+        await conn.execute(text("UPDATE schema_version SET fingerprint = 'stale'"))
+
+    result = await migrate(test_engine)
+
+    assert result.skipped is False
+    async with test_engine.connect() as conn:
+        _, fingerprint = await get_current_state(conn)
+    assert fingerprint == schema_fingerprint()
+
+
+@pytest.mark.asyncio
+async def test_migrate_legacy_database_applies_pending(test_engine):
+    """Una base de datos previa al registro recibe todas las migraciones."""
+    async with test_engine.begin() as conn:
+        await conn.execute(text(
+            "CREATE TABLE tasks (id INTEGER PRIMARY KEY, name VARCHAR(100) NOT NULL, "
+            "description VARCHAR(500), status VARCHAR(20) NOT NULL, completed BOOLEAN NOT NULL, "
+            "project_id INTEGER, created_at DATETIME NOT NULL, updated_at DATETIME, "
+            "completed_at DATETIME)"
+        ))
+
+    result = await migrate(test_engine)
+
+    assert result.created_schema is False
+    assert result.applied == [migration.name for migration in MIGRATIONS]
+    async with test_engine.connect() as conn:
+        assert "deleted_at" in await _columns(conn, "tasks")
+        assert "deleted_at" in await _columns(conn, "subtasks")
+        version, _ = await get_current_state(conn)
+    assert version == HEAD_VERSION
+
+
+@pytest.mark.asyncio
+async def test_backfill_in_batches_commits_per_batch(test_engine):
+    """El backfill procesa lotes acotados hasta agotar las filas pendientes."""
+    async with test_engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, value INTEGER)"))
+        await conn.execute(
+            text("INSERT INTO items (id, value) VALUES (:id, NULL)"),
+            [{"id": i} for i in range(1, 26)],
+        )
+
+    batch_sizes = []
+
+    def _track(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("UPDATE"):
+            batch_sizes.append(cursor.rowcount)
+
+    event.listen(test_engine.sync_engine, "after_cursor_execute", _track)
+
+    total = await backfill_in_batches(
+        test_engine,
+        "UPDATE items SET value = id * 2 WHERE rowid IN "
+        "(SELECT rowid FROM items WHERE value IS NULL LIMIT :batch_size)",
+        batch_size=10,
+    )
+
+    assert total == 25
+    assert batch_sizes == [10, 10, 5, 0]
+    async with test_engine.connect() as conn:
+        pending = (await conn.execute(text("SELECT COUNT(*) FROM items WHERE value IS NULL"))).scalar()
+    assert pending == 0
+
+
+@pytest.mark.asyncio
+async def test_enforce_foreign_keys_cleans_orphans(test_engine):
+    """Las filas que violan los FKs se corrigen con la semántica de cada FK."""
+    await migrate(test_engine)
+    async with test_engine.begin() as conn:
+        await conn.execute(text(
+            "INSERT INTO tasks (id, name, status, completed, project_id, created_at) "
+            "VALUES (1, 'Huérfana', 0, 0, 42, 1704067200000000)"
+        ))
+        await conn.execute(text(
+            "INSERT INTO subtasks (task_id, name, completed, position, created_at) "
+            "VALUES (1, 'Válida', 0, 0, 1704067200000000), (99, 'Huérfana', 0, 0, 1704067200000000)"
+        ))
+
+    await enforce_foreign_keys.upgrade(test_engine)
+
+    async with test_engine.connect() as conn:
+        project_id = (await conn.execute(text("SELECT project_id FROM tasks WHERE id = 1"))).scalar()
+        subtasks = (await conn.execute(text("SELECT name FROM subtasks"))).scalars().all()
+    assert project_id is None
+    assert subtasks == ["Válida"]
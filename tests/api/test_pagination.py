@@ -1,7 +1,55 @@
 """Tests para utilidades de paginación."""
+from datetime import datetime
 import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient, ASGITransport
 from pydantic import BaseModel, Field
-from src.api.pagination import PaginatedResponse
+from sqlalchemy import select, text, tuple_
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from src.main import app
+from src.api.database import Base, get_read_sessionmaker, get_write_sessionmaker
+from src.api.models.task import Task
+from src.api.pagination import PaginatedResponse, decode_cursor, encode_cursor
+
+
+# Engine de test en memoria
+TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+test_engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+test_async_session_maker = async_sessionmaker(
+    test_engine, class_=AsyncSession, expire_on_commit=False
+)
+
+
+@pytest.fixture
+async def test_db():
+    """Fixture para crear/destruir tablas en cada test."""
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield
+
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+def override_get_sessionmaker():
+    """Override de las session factories para tests."""
+    return test_async_session_maker
+
+
+@pytest.fixture
+async def async_client(test_db):
+    """Fixture para AsyncClient con BD de test."""
+    app.dependency_overrides[get_read_sessionmaker] = override_get_sessionmaker
+    app.dependency_overrides[get_write_sessionmaker] = override_get_sessionmaker
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test"
+    ) as client:
+        yield client
+
+    app.dependency_overrides.clear()
 
 
 class SampleItem(BaseModel):
@@ -104,3 +152,107 @@ def test_paginated_response_with_different_types():
     assert response.items[0].price == 9.99
     assert response.total == 100
     assert response.skip == 20
+
+
+def test_cursor_round_trip():
+    """El cursor es opaco y conserva los valores de la clave (datetimes incluidos)."""
+    created_at = datetime(2024, 5, 1, 12, 30, 0, 123456)
+
+    cursor = encode_cursor((created_at, 42))
+
+    assert "42" not in cursor
+    assert decode_cursor(cursor, (Task.created_at, Task.id)) == [created_at, 42]
+
+
+@pytest.mark.parametrize("cursor", ["no-es-base64!", "bnVsbA", encode_cursor((1,)), encode_cursor(("a", 1))])
+def test_invalid_cursor_is_rejected(cursor):
+    """Un cursor mal formado o de otra clave se rechaza con 400."""
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor, (Task.created_at, Task.id))
+
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_tasks_cursor_pagination_walks_all_pages(async_client: AsyncClient):
+    """Siguiendo next_cursor se recorren todas las tareas una vez, en orden de creación."""
+    ids = [(await async_client.post("/tasks/", json={"name": f"Task {i}"})).json()["id"] for i in range(7)]
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        params = {"limit": 3} | ({"cursor": cursor} if cursor else {})
+        data = (await async_client.get("/tasks/", params=params)).json()
+        assert data["total"] is None
+        assert data["skip"] is None
+        seen.extend(task["id"] for task in data["items"])
+        pages += 1
+        if pages == 1:
+            # Una tarea creada a mitad del recorrido no desplaza las páginas
+            ids.append((await async_client.post("/tasks/", json={"name": "Nueva"})).json()["id"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == ids
+    assert pages == 3
+
+
+@pytest.mark.asyncio
+async def test_tasks_offset_pagination_and_total(async_client: AsyncClient):
+    """skip sigue disponible y el total solo se calcula si se pide."""
+    ids = [(await async_client.post("/tasks/", json={"name": f"Task {i}"})).json()["id"] for i in range(5)]
+
+    data = (await async_client.get("/tasks/", params={"skip": 1, "limit": 2, "include_total": True})).json()
+
+    assert [task["id"] for task in data["items"]] == ids[1:3]
+    assert (data["total"], data["skip"], data["limit"]) == (5, 1, 2)
+    assert data["next_cursor"] is not None
+
+
+@pytest.mark.asyncio
+async def test_tasks_pagination_rejects_invalid_params(async_client: AsyncClient):
+    """Cursor inválido, cursor junto a skip o un limit por encima del máximo."""
+    response = await async_client.get("/tasks/", params={"cursor": "basura"})
+    assert response.status_code == 400
+
+    cursor = encode_cursor((datetime(2024, 1, 1), 1))
+    response = await async_client.get("/tasks/", params={"cursor": cursor, "skip": 0})
+    assert response.status_code == 400
+
+    response = await async_client.get("/tasks/", params={"limit": 1000})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_subtasks_cursor_pagination_by_position(async_client: AsyncClient):
+    """Las subtasks se paginan en el orden del checklist (position, id)."""
+    task_id = (await async_client.post("/tasks/", json={"name": "Task"})).json()["id"]
+    for name in ("A", "B", "C"):
+        await async_client.post(f"/tasks/{task_id}/subtasks/", json={"name": name})
+
+    first = (await async_client.get(f"/tasks/{task_id}/subtasks/", params={"limit": 2})).json()
+    second = (await async_client.get(
+        f"/tasks/{task_id}/subtasks/", params={"limit": 2, "cursor": first["next_cursor"]}
+    )).json()
+
+    assert [s["name"] for s in first["items"]] == ["A", "B"]
+    assert [s["name"] for s in second["items"]] == ["C"]
+    assert second["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_tasks_keyset_query_uses_index(test_db):
+    """La página keyset se resuelve con el índice de created_at, sin ordenar."""
+    query = (
+        select(Task.id)
+        .where(Task.deleted_at.is_(None), tuple_(Task.created_at, Task.id) > (datetime(2024, 1, 1), 1))
+        .order_by(Task.created_at, Task.id)
+        .limit(50)
+    )
+    compiled = query.compile(test_engine.sync_engine, compile_kwargs={"literal_binds": True})
+
+    async with test_engine.connect() as conn:
+        plan = " / ".join(row[3] for row in await conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}")))
+
+    assert "ix_tasks_active_created_at" in plan
+    assert "TEMP B-TREE" not in plan
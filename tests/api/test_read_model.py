@@ -0,0 +1,271 @@
+"""Tests para el modelo de lectura en memoria (write-through)."""
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from src.main import app
+from src.api import read_model as read_model_module
+from src.api.database import Base, get_read_sessionmaker, get_write_sessionmaker
+from src.api.models.project import Project
+from src.api.models.subtask import Subtask
+from src.api.models.task import Task
+from src.api.read_model import start_read_model, stop_read_model, track_task
+from src.api.routes.admin import require_admin
+from src.api.sqlite_profiles import get_profile, install_pragmas
+from src.api.write_pipeline import WritePipeline, get_write_pipeline
+
+
+# Engine de test en memoria con los PRAGMAs de la aplicación (foreign_keys=ON)
+TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+test_engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+install_pragmas(test_engine, get_profile("balanced"))
+test_async_session_maker = async_sessionmaker(
+    test_engine, class_=AsyncSession, expire_on_commit=False
+)
+
+
+@pytest.fixture
+async def test_db():
+    """Fixture para crear/destruir tablas en cada test."""
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield
+
+    stop_read_model()
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+def override_get_sessionmaker():
+    """Override de las session factories para tests."""
+    return test_async_session_maker
+
+
+@pytest.fixture
+async def async_client(test_db):
+    """Fixture para AsyncClient con BD de test."""
+    app.dependency_overrides[get_read_sessionmaker] = override_get_sessionmaker
+    app.dependency_overrides[get_write_sessionmaker] = override_get_sessionmaker
+    app.dependency_overrides[require_admin] = lambda: None
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test"
+    ) as client:
+        yield client
+
+    app.dependency_overrides.clear()
+
+
+async def _seed() -> None:
+    """12 tareas en 3 status y 2 proyectos (una eliminada), con subtasks (alguna eliminada)."""
+    start = datetime(2024, 1, 1)
+    statuses = ["backlog", "doing", "done"]
+    async with test_engine.begin() as conn:
+        await conn.execute(insert(Project), [{"id": i, "name": f"P{i}", "color": "#000000"} for i in (1, 2)])
+        ids = (await conn.execute(insert(Task).returning(Task.id), [
+            {"name": f"Task {i}", "status": statuses[i % 3], "completed": i % 3 == 2,
+             "project_id": (1, 2, None)[i % 3 if i % 2 else 2],
+             "created_at": start + timedelta(hours=i // 2),
+             "updated_at": start + timedelta(days=i) if i % 4 == 0 else None,
+             "deleted_at": start if i == 5 else None}
+            for i in range(12)
+        ])).scalars().all()
+        await conn.execute(insert(Subtask), [
+            {"task_id": task_id, "name": f"Sub {j}", "position": 2 - j, "completed": j == 0,
+             "created_at": start, "deleted_at": start if j == 2 else None}
+            for task_id in ids[::2]
+            for j in range(3)
+        ])
+
+
+@pytest.mark.asyncio
+async def test_hot_reads_do_not_touch_sqlite(async_client: AsyncClient):
+    """Listado, detalle y subtasks salen del modelo, idénticos a SQLite, sin consultas."""
+    await _seed()
+    urls = ["/tasks/", "/tasks/?status=done", "/tasks/1", "/tasks/1?fields=name&include=subtask_summary",
+            "/tasks/1/subtasks/", "/tasks/999"]
+    from_db = [(await async_client.get(url)) for url in urls]
+
+    model = await start_read_model(test_async_session_maker)
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        from_memory = [(await async_client.get(url)) for url in urls]
+    finally:
+        event.remove(test_engine.sync_engine, "before_cursor_execute", record)
+
+    assert statements == []
+    assert [(r.status_code, r.content) for r in from_memory] == [(r.status_code, r.content) for r in from_db]
+    assert model.stats.hits == {"tasks": 2, "task": 2, "subtasks": 1}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("params", [
+    {},
+    {"status": "backlog"},
+    {"project_id": 1},
+    {"status": "done", "project_id": 2},
+    {"completed": False, "has_open_subtasks": True},
+    {"has_open_subtasks": False},
+    {"created_after": "2024-01-01T02:00:00", "created_before": "2024-01-01T05:00:00+00:00"},
+    {"updated_since": "2024-01-04T00:00:00"},
+    {"include_total": True, "fields": "id,status", "include": ""},
+])
+async def test_pages_match_sqlite(async_client: AsyncClient, params: dict):
+    """Filtros, cursores, skip y totales dan las mismas páginas que SQLite."""
+    await _seed()
+    model = await start_read_model(test_async_session_maker, check_reads=True)
+
+    cursor = None
+    while True:
+        page_params = {**params, "limit": 2} | ({"cursor": cursor} if cursor else {})
+        cursor = (await async_client.get("/tasks/", params=page_params)).json()["next_cursor"]
+        if cursor is None:
+            break
+    await async_client.get("/tasks/", params={**params, "limit": 2, "skip": 3})
+    await async_client.get("/tasks/2/subtasks/", params={"limit": 1, "include_total": True})
+
+    assert model.stats.reads_checked >= 3
+    assert model.stats.mismatches == 0, list(model.stats.recent_mismatches)
+
+
+@pytest.mark.asyncio
+async def test_writes_are_applied_on_commit(async_client: AsyncClient):
+    """Cada ruta de escritura deja el modelo igual que la base de datos."""
+    await _seed()
+    model = await start_read_model(test_async_session_maker, check_reads=True)
+
+    task = (await async_client.post("/tasks/", json={"name": "Nueva", "project_id": 1})).json()
+    await async_client.put(f"/tasks/{task['id']}", json={"name": "Renombrada", "status": "doing"})
+    await async_client.patch("/tasks/2/toggle")
+    await async_client.patch("/tasks/3/status", params={"new_status": "done"})
+    sub = (await async_client.post(f"/tasks/{task['id']}/subtasks/", json={"name": "Sub"})).json()
+    await async_client.patch(f"/tasks/{task['id']}/subtasks/{sub['id']}/toggle")
+    await async_client.put("/tasks/1/subtasks/1", json={"name": "Editada"})
+    await async_client.delete("/tasks/1/subtasks/2")
+    await async_client.delete("/tasks/4")
+    await async_client.delete("/projects/2")
+    assert model.stats.writes_applied == 10
+
+    async with test_async_session_maker() as db:
+        report = await model.check(db)
+    assert report["consistent"], report
+    assert model.get_task(task["id"]).status == "done"
+    assert model.get_task(4) is None
+
+    await async_client.get("/tasks/")
+    await async_client.get(f"/tasks/{task['id']}")
+    await async_client.get("/tasks/4")
+    await async_client.get("/tasks/1/subtasks/")
+    assert model.stats.mismatches == 0, list(model.stats.recent_mismatches)
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_writes_are_discarded(test_db):
+    """Ni un rollback ni un savepoint deshecho llegan al modelo."""
+    await _seed()
+    model = await start_read_model(test_async_session_maker)
+    name = model.get_task(1).name
+
+    async with test_async_session_maker() as db:
+        (await db.get(Task, 1)).name = "Deshecha"
+        await track_task(db, 1)
+        await db.rollback()
+
+    async with test_async_session_maker() as db:
+        savepoint = await db.begin_nested()
+        (await db.get(Task, 1)).name = "Deshecha"
+        await track_task(db, 1)
+        await savepoint.rollback()
+        (await db.get(Task, 2)).name = "Confirmada"
+        await track_task(db, 2)
+        await db.commit()
+
+    assert model.get_task(1).name == name
+    assert model.get_task(2).name == "Confirmada"
+    assert model.stats.writes_discarded == 2
+    assert model.stats.writes_applied == 1
+
+
+@pytest.mark.asyncio
+async def test_pipeline_batches_apply_only_committed_requests(async_client: AsyncClient):
+    """Con group commit, cada request confirmada del lote llega al modelo."""
+    await _seed()
+    model = await start_read_model(test_async_session_maker)
+    pipeline = WritePipeline(test_async_session_maker, max_batch_size=16, max_wait=0.05)
+    pipeline.start()
+    app.dependency_overrides[get_write_pipeline] = lambda: pipeline
+    try:
+        responses = await asyncio.gather(
+            *(async_client.post("/tasks/", json={"name": f"Lote {i}"}) for i in range(4)),
+            async_client.post("/tasks/1/subtasks/", json={"name": "Sub"}),
+            async_client.put("/tasks/999", json={"name": "No existe"}),
+        )
+    finally:
+        await pipeline.stop()
+
+    assert [response.status_code for response in responses] == [201] * 5 + [404]
+    assert pipeline.stats.batches < 6
+    assert model.stats.writes_applied == 5
+    async with test_async_session_maker() as db:
+        report = await model.check(db)
+    assert report["consistent"], report
+
+
+@pytest.mark.asyncio
+async def test_check_mode_detects_divergence(async_client: AsyncClient):
+    """Con check_reads se responde con SQLite y la discrepancia queda registrada."""
+    await _seed()
+    model = await start_read_model(test_async_session_maker, check_reads=True)
+    model.get_task(1).name = "Desincronizada"
+
+    response = await async_client.get("/tasks/1")
+
+    assert response.json()["name"] == "Task 0"
+    assert model.stats.mismatches == 1
+    assert model.stats.recent_mismatches[-1].endswith("/tasks/1")
+    async with test_async_session_maker() as db:
+        assert (await model.check(db))["different"] == [1]
+
+
+@pytest.mark.asyncio
+async def test_admin_stats_and_reload(async_client: AsyncClient):
+    """Métricas con la memoria del modelo; recarga tras escrituras de fuera del proceso."""
+    assert (await async_client.get("/admin/read-model")).json() == {"enabled": False}
+    assert (await async_client.post("/admin/read-model/reload")).status_code == 409
+
+    await _seed()
+    await start_read_model(test_async_session_maker)
+    stats = (await async_client.get("/admin/read-model")).json()
+    assert stats["enabled"] is True
+    assert stats["memory"]["tasks"] == 11
+    assert stats["memory"]["subtasks"] == 12
+    assert stats["memory"]["total_bytes"] > stats["memory"]["index_bytes"] > 0
+
+    async with test_engine.begin() as conn:
+        await conn.execute(insert(Task), [{"name": "Externa", "status": "backlog", "created_at": datetime(2025, 1, 1)}])
+    assert (await async_client.post("/admin/read-model/check")).json()["missing"] == [13]
+    assert (await async_client.post("/admin/read-model/reload")).json()["memory"]["tasks"] == 12
+    assert (await async_client.post("/admin/read-model/check")).json()["consistent"] is True
+
+
+@pytest.mark.asyncio
+async def test_forget_archived_matches_archive_selection(test_db):
+    """El archivado quita del modelo exactamente las tareas que mueve."""
+    await _seed()
+    model = await start_read_model(test_async_session_maker)
+
+    model.forget_archived(datetime(2024, 1, 3))
+
+    assert all(task.status != "done" or (task.updated_at or task.created_at) >= datetime(2024, 1, 3)
+               for task in model._tasks.values())
+    assert len(model) == 11 - 2
+    assert read_model_module.get_read_model() is model
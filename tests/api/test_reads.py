@@ -0,0 +1,168 @@
+"""Tests para la capa de lectura Core (paridad con las respuestas ORM)."""
+from datetime import datetime
+from typing import List
+import pytest
+from httpx import AsyncClient, ASGITransport
+from pydantic import TypeAdapter
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import selectinload
+from src.main import app
+from src.api.database import Base, get_read_sessionmaker, get_write_sessionmaker
+from src.api.models.project import Project
+from src.api.models.subtask import Subtask
+from src.api.models.task import Task
+from src.api.reads import as_dicts, select_projects, select_subtasks, select_tasks, with_subtasks
+from src.api.schemas.projects import ProjectResponse
+from src.api.schemas.subtasks import SubtaskResponse
+from src.api.schemas.tasks import TaskResponse
+
+
+# Engine de test en memoria
+TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+test_engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+test_async_session_maker = async_sessionmaker(
+    test_engine, class_=AsyncSession, expire_on_commit=False
+)
+
+TASK_LIST = TypeAdapter(List[TaskResponse])
+SUBTASK_LIST = TypeAdapter(List[SubtaskResponse])
+PROJECT_LIST = TypeAdapter(List[ProjectResponse])
+
+
+@pytest.fixture
+async def test_db():
+    """Fixture para crear/destruir tablas en cada test."""
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield
+
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+def override_get_sessionmaker():
+    """Override de las session factories para tests."""
+    return test_async_session_maker
+
+
+@pytest.fixture
+async def async_client(test_db):
+    """Fixture para AsyncClient con BD de test."""
+    app.dependency_overrides[get_read_sessionmaker] = override_get_sessionmaker
+    app.dependency_overrides[get_write_sessionmaker] = override_get_sessionmaker
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test"
+    ) as client:
+        yield client
+
+    app.dependency_overrides.clear()
+
+
+async def _seed() -> None:
+    """Proyecto, tareas con NULLs y fechas, y subtasks activas y eliminadas."""
+    async with test_async_session_maker() as session:
+        project = Project(name="Proyecto", color="#123456")
+        session.add_all([project, Project(name="Vacío", color="#000000")])
+        await session.flush()
+        session.add_all([
+            Task(
+                name="Con subtasks",
+                description="Texto",
+                status="doing",
+                project_id=project.id,
+                created_at=datetime(2024, 1, 2, 3, 4, 5),
+                updated_at=datetime(2024, 1, 3, 0, 0, 0, 120000),
+                subtasks=[
+                    # Posiciones en orden inverso al id
+                    Subtask(name="Segunda", position=1, completed=True,
+                            created_at=datetime(2024, 1, 2, 3, 4, 6, 5),
+                            completed_at=datetime(2024, 1, 2, 5, 0, 0, 999999)),
+                    Subtask(name="Primera", position=0, created_at=datetime(2024, 1, 2, 3, 4, 7)),
+                    Subtask(name="Eliminada", position=2, created_at=datetime(2024, 1, 2, 3, 4, 8),
+                            deleted_at=datetime(2024, 1, 4)),
+                ],
+            ),
+            Task(name="Terminada", status="done", completed=True,
+                 created_at=datetime(2024, 1, 1), completed_at=datetime(2024, 2, 1, 12, 0, 0, 1)),
+            Task(name="Eliminada", created_at=datetime(2024, 1, 5), deleted_at=datetime(2024, 1, 6)),
+        ])
+        await session.commit()
+
+
+async def _orm_tasks(show_deleted: bool) -> list[TaskResponse]:
+    """Las tareas por el camino ORM (selectinload + model_validate)."""
+    async with test_async_session_maker() as session:
+        relationship = Task.subtasks if show_deleted else Task.subtasks.and_(Subtask.deleted_at.is_(None))
+        result = await session.execute(
+            select(Task).options(selectinload(relationship)).order_by(Task.created_at, Task.id)
+        )
+        tasks = result.scalars().all()
+        for task in tasks:
+            task.subtasks.sort(key=lambda subtask: subtask.id)
+        return [TaskResponse.model_validate(task) for task in tasks]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("show_deleted", [False, True])
+async def test_tasks_match_orm_responses(test_db, show_deleted: bool):
+    """Las tareas Core, con sus subtasks agrupadas, validan igual que las ORM."""
+    await _seed()
+
+    async with test_async_session_maker() as session:
+        rows = (await session.execute(select_tasks().order_by(Task.created_at, Task.id))).all()
+        documents = await with_subtasks(session, rows, show_deleted)
+
+    assert TASK_LIST.validate_python(documents) == await _orm_tasks(show_deleted)
+    assert [len(task["subtasks"]) for task in documents] == [0, 3 if show_deleted else 2, 0]
+
+
+@pytest.mark.asyncio
+async def test_subtasks_and_projects_match_orm_responses(test_db):
+    """Subtasks y proyectos Core validan igual que las instancias ORM."""
+    await _seed()
+
+    async with test_async_session_maker() as session:
+        subtasks = as_dicts(await session.execute(select_subtasks().order_by(Subtask.id)))
+        projects = as_dicts(await session.execute(select_projects().order_by(Project.id)))
+        orm_subtasks = (await session.execute(select(Subtask).order_by(Subtask.id))).scalars().all()
+        orm_projects = (await session.execute(select(Project).order_by(Project.id))).scalars().all()
+
+    assert SUBTASK_LIST.validate_python(subtasks) == [SubtaskResponse.model_validate(s) for s in orm_subtasks]
+    assert PROJECT_LIST.validate_python(projects) == [ProjectResponse.model_validate(p) for p in orm_projects]
+
+
+@pytest.mark.asyncio
+async def test_with_subtasks_without_tasks(test_db):
+    """Sin tareas no se lanza la consulta de subtasks."""
+    async with test_async_session_maker() as session:
+        assert await with_subtasks(session, []) == []
+
+
+@pytest.mark.asyncio
+async def test_listings_do_not_instantiate_orm_objects(async_client: AsyncClient):
+    """Los listados responden lo mismo que el camino ORM sin cargar instancias."""
+    await _seed()
+    loaded = []
+
+    def _count_loads(target, context):
+        loaded.append(target)
+
+    for model in (Task, Subtask, Project):
+        event.listen(model, "load", _count_loads)
+    try:
+        tasks = (await async_client.get("/tasks/", params={"show_deleted": True})).json()
+        subtasks = (await async_client.get("/tasks/1/subtasks/", params={"show_deleted": True})).json()
+        projects = (await async_client.get("/projects/")).json()
+        assert [project["name"] for project in projects] == ["Proyecto", "Vacío"]
+        assert loaded == []
+    finally:
+        for model in (Task, Subtask, Project):
+            event.remove(model, "load", _count_loads)
+
+    assert tasks["items"] == TASK_LIST.dump_python(await _orm_tasks(show_deleted=True), mode="json")
+    # Subtasks de la tarea 1, en el orden del checklist (position)
+    assert [subtask["name"] for subtask in subtasks["items"]] == ["Primera", "Segunda", "Eliminada"]
@@ -0,0 +1,129 @@
+"""Tests para la purga de filas eliminadas (política de retención)."""
+from datetime import datetime, timedelta, UTC
+import pytest
+from sqlalchemy import event, func, insert, select
+from src.api.database import create_write_engine
+from src.api.maintenance import MaintenanceJob, MaintenanceScheduler, retention_job
+from src.api.migrations.runner import migrate
+from src.api.models.task import Task
+from src.api.models.subtask import Subtask
+from src.api.retention import purge_batch, purge_deleted, retention_cutoff
+from src.api.sqlite_profiles import get_profile
+
+OLD = datetime.now(UTC) - timedelta(days=60)
+RECENT = datetime.now(UTC) - timedelta(days=2)
+
+
+@pytest.fixture
+async def test_engine(tmp_path):
+    """Escritor sobre una base de datos nueva creada por el runner de migraciones."""
+    engine = create_write_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}", get_profile("balanced"))
+    await migrate(engine)
+
+    yield engine
+
+    await engine.dispose()
+
+
+async def _add_tasks(engine, count: int, deleted_at, subtasks_deleted_at="same", description: str = "") -> None:
+    """Inserta `count` tareas con una subtask cada una."""
+    async with engine.begin() as conn:
+        ids = (await conn.execute(
+            insert(Task).returning(Task.id),
+            [
+                {"name": "Tarea", "description": description, "status": "backlog",
+                 "completed": False, "deleted_at": deleted_at}
+                for _ in range(count)
+            ],
+        )).scalars().all()
+        await conn.execute(insert(Subtask), [
+            {"task_id": task_id, "name": "Sub", "position": 0,
+             "deleted_at": deleted_at if subtasks_deleted_at == "same" else subtasks_deleted_at}
+            for task_id in ids
+        ])
+
+
+async def _count(engine, model) -> int:
+    async with engine.connect() as conn:
+        return (await conn.execute(select(func.count()).select_from(model))).scalar()
+
+
+@pytest.mark.asyncio
+async def test_purge_removes_only_expired_tombstones(test_engine):
+    """Solo se borran las filas eliminadas antes del periodo de retención."""
+    await _add_tasks(test_engine, 7, OLD)
+    await _add_tasks(test_engine, 2, RECENT)
+    await _add_tasks(test_engine, 3, None)
+    # Subtask eliminada hace tiempo en una tarea activa
+    await _add_tasks(test_engine, 1, None, subtasks_deleted_at=OLD)
+
+    result = await purge_deleted(test_engine, retention_days=30, batch_size=3, pause=0)
+
+    assert (result.subtasks, result.tasks) == (8, 7)
+    assert result.batches == 3 + 3  # 8 subtasks y 7 tareas en lotes de 3
+    assert await _count(test_engine, Task) == 2 + 3 + 1
+    assert await _count(test_engine, Subtask) == 2 + 3
+    async with test_engine.connect() as conn:
+        remaining = (await conn.execute(
+            select(func.count()).select_from(Task).where(Task.deleted_at < retention_cutoff(30))
+        )).scalar()
+    assert remaining == 0
+
+
+@pytest.mark.asyncio
+async def test_purging_task_cascades_to_active_subtasks(test_engine):
+    """Las subtasks que no estaban marcadas se borran con su tarea (FK CASCADE)."""
+    await _add_tasks(test_engine, 2, OLD, subtasks_deleted_at=None)
+
+    result = await purge_deleted(test_engine, retention_days=30, pause=0)
+
+    assert (result.subtasks, result.tasks) == (0, 2)
+    assert await _count(test_engine, Subtask) == 0
+
+
+@pytest.mark.asyncio
+async def test_purge_reports_freed_pages(test_engine):
+    """Las páginas de las filas purgadas pasan a la freelist."""
+    await _add_tasks(test_engine, 1000, OLD, description="x" * 400)
+
+    result = await purge_deleted(test_engine, retention_days=30, batch_size=500, pause=0)
+
+    assert result.tasks == 1000
+    assert result.pages_freed > 50
+
+
+@pytest.mark.asyncio
+async def test_purge_batch_uses_tombstone_index(test_engine):
+    """El lote se localiza con el índice parcial de filas eliminadas."""
+    captured = []
+
+    def _capture(sync_conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    async with test_engine.begin() as conn:
+        event.listen(conn.sync_connection, "before_cursor_execute", _capture)
+        await purge_batch(conn, Task, retention_cutoff(30), 10)
+        statement, parameters = captured[-1]
+        plan = " / ".join(
+            row[3] for row in await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        )
+
+    assert "ix_tasks_deleted_at" in plan
+
+
+@pytest.mark.asyncio
+async def test_retention_job_runs_one_batch_per_step(test_engine):
+    """El job de mantenimiento purga un lote por paso transaccional."""
+    await _add_tasks(test_engine, 5, OLD)
+    scheduler = MaintenanceScheduler(
+        test_engine, [MaintenanceJob("retention", 3600, retention_job(30, 2))], step_pause=0
+    )
+
+    stats = await scheduler.run_job("retention")
+
+    assert stats.last_error is None
+    assert stats.last_result["tasks"] == 5
+    assert stats.last_result["subtasks"] == 5
+    # 3 lotes por tabla + el lote vacío que termina cada tabla
+    assert stats.last_steps == 8
+    assert await _count(test_engine, Task) == 0
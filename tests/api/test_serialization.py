@@ -0,0 +1,116 @@
+"""Tests para la serialización de respuestas (TypeAdapters cacheados)."""
+from datetime import datetime
+from typing import List
+import pytest
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from src.main import app
+from src.api.database import Base, get_read_sessionmaker, get_write_sessionmaker
+from src.api.models.subtask import Subtask
+from src.api.models.task import Task
+from src.api.schemas.tasks import TaskResponse
+from src.api.serialization import dump_response, json_response, response_adapter
+
+
+# Engine de test en memoria
+TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+test_engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+test_async_session_maker = async_sessionmaker(
+    test_engine, class_=AsyncSession, expire_on_commit=False
+)
+
+
+@pytest.fixture
+async def test_db():
+    """Fixture para crear/destruir tablas en cada test."""
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield
+
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+def override_get_sessionmaker():
+    """Override de las session factories para tests."""
+    return test_async_session_maker
+
+
+@pytest.fixture
+async def async_client(test_db):
+    """Fixture para AsyncClient con BD de test."""
+    app.dependency_overrides[get_read_sessionmaker] = override_get_sessionmaker
+    app.dependency_overrides[get_write_sessionmaker] = override_get_sessionmaker
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test"
+    ) as client:
+        yield client
+
+    app.dependency_overrides.clear()
+
+
+def _task() -> Task:
+    """Tarea ORM transitoria con una subtask."""
+    return Task(
+        id=1, name="Tarea", description=None, status="doing", completed=False,
+        created_at=datetime(2024, 1, 2, 3, 4, 5, 6),
+        subtasks=[Subtask(id=1, task_id=1, name="Sub", position=0, completed=True,
+                          created_at=datetime(2024, 1, 2))],
+    )
+
+
+def test_adapters_are_cached_per_type():
+    """Cada tipo de respuesta construye su TypeAdapter una sola vez."""
+    assert response_adapter(List[TaskResponse]) is response_adapter(List[TaskResponse])
+    assert response_adapter(TaskResponse) is not response_adapter(List[TaskResponse])
+
+
+def test_orm_dict_and_model_serialize_identically():
+    """Instancias ORM, dicts y modelos validados dan los mismos bytes."""
+    task = _task()
+    model = TaskResponse.model_validate(task)
+
+    content = dump_response(TaskResponse, task)
+
+    assert content == model.model_dump_json().encode()
+    assert dump_response(TaskResponse, model.model_dump()) == content
+    assert dump_response(TaskResponse, model) == content
+    assert dump_response(List[TaskResponse], [task]) == b"[" + content + b"]"
+
+
+def test_json_response_sets_status_and_media_type():
+    """La Response lleva el cuerpo codificado, el código y application/json."""
+    response = json_response(TaskResponse, _task(), status_code=201)
+
+    assert response.status_code == 201
+    assert response.headers["content-type"] == "application/json"
+    assert response.body == dump_response(TaskResponse, _task())
+
+
+@pytest.mark.asyncio
+async def test_routes_keep_status_codes_and_openapi(async_client: AsyncClient):
+    """Las rutas mantienen sus códigos y el esquema OpenAPI de su response_model."""
+    response = await async_client.post("/tasks/", json={"name": "Tarea"})
+    assert response.status_code == 201
+    assert response.headers["content-type"] == "application/json"
+    task = response.json()
+
+    response = await async_client.post(f"/tasks/{task['id']}/subtasks/", json={"name": "Sub"})
+    assert response.status_code == 201
+    response = await async_client.post("/projects/", json={"name": "Proyecto", "color": "#000000"})
+    assert response.status_code == 201
+
+    response = await async_client.get(f"/tasks/{task['id']}")
+    assert response.status_code == 200
+    assert [subtask["name"] for subtask in response.json()["subtasks"]] == ["Sub"]
+
+    paths = app.openapi()["paths"]
+    assert paths["/tasks/"]["get"]["responses"]["200"]["content"]["application/json"]["schema"] == {
+        "$ref": "#/components/schemas/PaginatedResponse_TaskResponse_"
+    }
+    assert paths["/tasks/"]["post"]["responses"]["201"]["content"]["application/json"]["schema"] == {
+        "$ref": "#/components/schemas/TaskResponse"
+    }
@@ -0,0 +1,275 @@
+"""Tests para el modo de almacenamiento sharded (un fichero SQLite por proyecto)."""
+import asyncio
+import json
+import sqlite3
+import pytest
+from httpx import AsyncClient, ASGITransport
+from pydantic import ValidationError
+from sqlalchemy import event, insert, text
+from sqlalchemy.exc import OperationalError
+from src.main import app
+from src.api.config import Settings
+from src.api.database import create_write_engine
+from src.api.migrations.runner import migrate
+from src.api.models.task import Task
+from src.api.routes.admin import require_admin
+from src.api.sharding import (
+    SHARD_ID_BITS,
+    check_catalog_has_no_tasks,
+    shard_ddl,
+    shard_for_id,
+    start_sharding,
+    stop_sharding,
+)
+from src.api.sqlite_profiles import get_profile
+
+
+@pytest.fixture
+async def manager(tmp_path):
+    """Catálogo en fichero con el modo sharded activo."""
+    catalog = create_write_engine(f"sqlite+aiosqlite:///{tmp_path / 'app.db'}", get_profile("balanced"))
+    await migrate(catalog)
+    manager = start_sharding(catalog, catalog, str(tmp_path / "shards"), get_profile("balanced"))
+
+    yield manager
+
+    await stop_sharding()
+    await catalog.dispose()
+
+
+@pytest.fixture
+async def async_client(manager):
+    """AsyncClient sobre la aplicación en modo sharded."""
+    app.dependency_overrides[require_admin] = lambda: None
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+    app.dependency_overrides.clear()
+
+
+async def _create_project(client: AsyncClient, name: str) -> int:
+    response = await client.post("/projects/", json={"name": name, "color": "#000000"})
+    return response.json()["id"]
+
+
+def _shard_rows(manager, shard: int, table: str) -> list[tuple]:
+    with sqlite3.connect(manager.shard_path(shard)) as conn:
+        return conn.execute(f"SELECT id, name FROM {table} ORDER BY id").fetchall()
+
+
+def test_shard_schema_has_no_catalog_foreign_keys():
+    """Las tablas de un shard no referencian a projects (vive en el catálogo)."""
+    ddl = "\n".join(shard_ddl())
+
+    assert "REFERENCES projects" not in ddl
+    assert "REFERENCES tasks" in ddl
+    assert ddl.count("AUTOINCREMENT") == 2
+
+
+def test_sharded_mode_rejects_write_pipeline():
+    """El pipeline de escritura (una transacción por lote) no admite varios ficheros."""
+    with pytest.raises(ValidationError):
+        Settings(storage_mode="sharded", write_pipeline_enabled=True)
+
+
+@pytest.mark.asyncio
+async def test_sharded_mode_refuses_catalog_with_tasks(tmp_path):
+    """Con tareas en app.db el modo sharded no arranca (las ocultaría)."""
+    catalog = create_write_engine(f"sqlite+aiosqlite:///{tmp_path / 'app.db'}", get_profile("balanced"))
+    await migrate(catalog)
+    try:
+        await check_catalog_has_no_tasks(catalog)
+
+        async with catalog.begin() as conn:
+            await conn.execute(insert(Task), [{"name": "Existente"}])
+        with pytest.raises(RuntimeError, match="tasks"):
+            await check_catalog_has_no_tasks(catalog)
+    finally:
+        await catalog.dispose()
+
+
+@pytest.mark.asyncio
+async def test_tasks_are_stored_in_project_shard(async_client: AsyncClient, manager):
+    """Cada tarea y sus subtasks se guardan en el fichero de su proyecto, con ids del rango del shard."""
+    project_id = await _create_project(async_client, "Proyecto")
+
+    task = (await async_client.post("/tasks/", json={"name": "En proyecto", "project_id": project_id})).json()
+    loose = (await async_client.post("/tasks/", json={"name": "Sin proyecto"})).json()
+    subtask = (await async_client.post(f"/tasks/{task['id']}/subtasks/", json={"name": "Sub"})).json()
+
+    assert shard_for_id(task["id"]) == project_id
+    assert task["id"] == (project_id << SHARD_ID_BITS) + 1
+    assert shard_for_id(subtask["id"]) == project_id
+    assert shard_for_id(loose["id"]) == 0
+    assert _shard_rows(manager, project_id, "tasks") == [(task["id"], "En proyecto")]
+    assert _shard_rows(manager, project_id, "subtasks") == [(subtask["id"], "Sub")]
+    assert _shard_rows(manager, 0, "tasks") == [(loose["id"], "Sin proyecto")]
+    assert manager.shard_ids == [0, project_id]
+
+
+@pytest.mark.asyncio
+async def test_routes_work_across_shards(async_client: AsyncClient):
+    """Las rutas de tasks y subtasks enrutan por id y el listado consulta todos los shards."""
+    ids = []
+    for name in ("A", "B"):
+        project_id = await _create_project(async_client, name)
+        task = (await async_client.post("/tasks/", json={"name": name, "project_id": project_id})).json()
+        await async_client.post(f"/tasks/{task['id']}/subtasks/", json={"name": f"Sub {name}"})
+        ids.append(task["id"])
+
+    response = await async_client.get("/tasks/")
+    assert sorted(task["id"] for task in response.json()["items"]) == ids
+    assert all(len(task["subtasks"]) == 1 for task in response.json()["items"])
+
+    response = await async_client.put(f"/tasks/{ids[0]}", json={"name": "A2"})
+    assert response.json()["name"] == "A2"
+    response = await async_client.patch(f"/tasks/{ids[1]}/status", params={"new_status": "done"})
+    assert response.json()["completed"] is True
+    response = await async_client.delete(f"/tasks/{ids[1]}")
+    assert response.status_code == 204
+
+    response = await async_client.get(f"/tasks/{ids[0]}")
+    assert response.json()["name"] == "A2"
+    response = await async_client.get(f"/tasks/{ids[1]}")
+    assert response.status_code == 404
+    # Un id de un shard que no existe
+    response = await async_client.get(f"/tasks/{99 << SHARD_ID_BITS | 1}")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_task_cannot_move_between_projects(async_client: AsyncClient):
+    """Cambiar el proyecto de una tarea implicaría cambiar de fichero."""
+    project_id = await _create_project(async_client, "Proyecto")
+    task = (await async_client.post("/tasks/", json={"name": "Tarea", "project_id": project_id})).json()
+
+    response = await async_client.put(f"/tasks/{task['id']}", json={"project_id": None})
+
+    assert response.status_code == 400
+    response = await async_client.get(f"/tasks/{task['id']}")
+    assert response.json()["project_id"] == project_id
+
+
+@pytest.mark.asyncio
+async def test_deleting_project_unlinks_tasks_in_shard(async_client: AsyncClient):
+    """Sin FK entre ficheros, borrar un proyecto desvincula sus tareas en el shard."""
+    project_id = await _create_project(async_client, "Proyecto")
+    task = (await async_client.post("/tasks/", json={"name": "Tarea", "project_id": project_id})).json()
+
+    response = await async_client.delete(f"/projects/{project_id}")
+    assert response.status_code == 204
+
+    response = await async_client.get(f"/tasks/{task['id']}")
+    assert response.json()["project_id"] is None
+    response = await async_client.put(f"/tasks/{task['id']}", json={"name": "Sigue editable"})
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_failed_project_delete_leaves_no_orphans(async_client: AsyncClient, manager):
+    """El shard se confirma antes que el catálogo: un fallo no deja tareas huérfanas."""
+    project_id = await _create_project(async_client, "Proyecto")
+    task = (await async_client.post("/tasks/", json={"name": "Tarea", "project_id": project_id})).json()
+
+    def fail_catalog_delete(conn, cursor, statement, *args):
+        if statement.startswith("DELETE FROM projects"):
+            raise sqlite3.OperationalError("disk I/O error")
+
+    event.listen(manager.catalog_write.sync_engine, "before_cursor_execute", fail_catalog_delete)
+    try:
+        with pytest.raises(OperationalError):
+            await async_client.delete(f"/projects/{project_id}")
+    finally:
+        event.remove(manager.catalog_write.sync_engine, "before_cursor_execute", fail_catalog_delete)
+
+    assert (await async_client.get(f"/projects/{project_id}")).status_code == 200
+    assert (await async_client.get(f"/tasks/{task['id']}")).json()["project_id"] is None
+
+    response = await async_client.delete(f"/projects/{project_id}")
+    assert response.status_code == 204
+
+
+@pytest.mark.asyncio
+async def test_writes_to_different_shards_do_not_wait(async_client: AsyncClient, manager):
+    """Con el escritor de un proyecto ocupado, otro proyecto sigue escribiendo."""
+    busy_project = await _create_project(async_client, "Ocupado")
+    free_project = await _create_project(async_client, "Libre")
+    await async_client.post("/tasks/", json={"name": "Ocupada", "project_id": busy_project})
+
+    async with manager.write_engine(busy_project).begin() as conn:
+        await conn.execute(text("UPDATE tasks SET name = 'bloqueada'"))
+        response = await asyncio.wait_for(
+            async_client.post("/tasks/", json={"name": "Libre", "project_id": free_project}),
+            timeout=2,
+        )
+    assert response.status_code == 201
+
+
+@pytest.mark.asyncio
+async def test_admin_shards_endpoint(async_client: AsyncClient, manager):
+    """GET /admin/shards lista los ficheros de shard."""
+    project_id = await _create_project(async_client, "Proyecto")
+    await async_client.post("/tasks/", json={"name": "Tarea", "project_id": project_id})
+
+    response = await async_client.get("/admin/shards")
+
+    data = response.json()
+    assert data["enabled"] is True
+    assert [shard["shard"] for shard in data["shards"]] == [0, project_id]
+    assert all(shard["bytes"] > 0 for shard in data["shards"])
+
+
+@pytest.mark.asyncio
+async def test_backups_are_rejected(async_client: AsyncClient):
+    """Un backup de app.db no incluiría las tareas de los shards."""
+    assert (await async_client.post("/admin/backup")).status_code == 409
+    assert (await async_client.get("/admin/backup/download")).status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_board_document_spans_shards(async_client: AsyncClient):
+    """GET /tasks/board une los documentos JSON de cada shard."""
+    ids = []
+    for name in ("A", "B"):
+        project_id = await _create_project(async_client, name)
+        ids.append((await async_client.post("/tasks/", json={"name": name, "project_id": project_id})).json()["id"])
+
+    response = await async_client.get("/tasks/board")
+
+    assert sorted(task["id"] for task in response.json()) == ids
+    response = await async_client.get("/tasks/board", params={"project_id": shard_for_id(ids[0])})
+    assert [task["id"] for task in response.json()] == ids[:1]
+
+
+@pytest.mark.asyncio
+async def test_streamed_listing_spans_shards(async_client: AsyncClient):
+    """GET /tasks en NDJSON recorre todos los shards, con sus subtasks."""
+    ids = []
+    for name in ("A", "B"):
+        project_id = await _create_project(async_client, name)
+        ids.append((await async_client.post("/tasks/", json={"name": name, "project_id": project_id})).json()["id"])
+        await async_client.post(f"/tasks/{ids[-1]}/subtasks/", json={"name": f"Sub {name}"})
+
+    response = await async_client.get("/tasks/", params={"stream": True})
+
+    tasks = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(task["id"] for task in tasks) == ids
+    assert sorted(task["subtasks"][0]["name"] for task in tasks) == ["Sub A", "Sub B"]
+
+
+@pytest.mark.asyncio
+async def test_board_columns_span_shards(async_client: AsyncClient):
+    """GET /board une las columnas de cada shard y corta cada una al límite."""
+    ids = []
+    for name in ("A", "B"):
+        project_id = await _create_project(async_client, name)
+        for i in range(2):
+            task = (await async_client.post("/tasks/", json={"name": f"{name}{i}", "project_id": project_id})).json()
+            ids.append(task["id"])
+
+    board = (await async_client.get("/board/", params={"limit": 3})).json()
+    column = (await async_client.get(
+        "/board/backlog", params={"limit": 3, "cursor": board["backlog"]["next_cursor"]}
+    )).json()
+
+    assert [task["name"] for task in board["backlog"]["items"] + column["items"]] == ["A0", "A1", "B0", "B1"]
+    assert column["next_cursor"] is None
@@ -1,10 +1,12 @@
 """Tests para borrado lógico (soft delete) de tasks y subtasks."""
 import pytest
 from httpx import AsyncClient, ASGITransport
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from datetime import datetime
 from src.main import app
-from src.api.database import get_db, Base
+from src.api.database import Base, get_read_sessionmaker, get_write_sessionmaker
+from src.api.models.subtask import Subtask
 
 
 # Engine de test en memoria
@@ -27,21 +29,16 @@ async def test_db():
         await conn.run_sync(Base.metadata.drop_all)
 
 
-async def override_get_db():
-    """Override de get_db para tests."""
-    async with test_async_session_maker() as session:
-        try:
-            yield session
-            await session.commit()
-        except Exception:
-            await session.rollback()
-            raise
+def override_get_sessionmaker():
+    """Override de las session factories para tests."""
+    return test_async_session_maker
 
 
 @pytest.fixture
 async def async_client(test_db):
     """Fixture para AsyncClient con BD de test."""
-    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_sessionmaker] = override_get_sessionmaker
+    app.dependency_overrides[get_write_sessionmaker] = override_get_sessionmaker
 
     async with AsyncClient(
         transport=ASGITransport(app=app),
@@ -298,7 +295,7 @@ async def test_get_all_tasks_filters_deleted_by_default(async_client: AsyncClien
     # GET sin show_deleted debe retornar solo la activa
     response = await async_client.get("/tasks/")
     assert response.status_code == 200
-    tasks = response.json()
+    tasks = response.json()["items"]
     task_ids = [t["id"] for t in tasks]
     assert active_id in task_ids
     assert deleted_id not in task_ids
@@ -306,7 +303,7 @@ async def test_get_all_tasks_filters_deleted_by_default(async_client: AsyncClien
     # GET con show_deleted=true debe retornar ambas
     response = await async_client.get("/tasks/?show_deleted=true")
     assert response.status_code == 200
-    tasks = response.json()
+    tasks = response.json()["items"]
     task_ids = [t["id"] for t in tasks]
     assert active_id in task_ids
     assert deleted_id in task_ids
@@ -335,7 +332,7 @@ async def test_get_task_subtasks_filters_deleted_by_default(async_client: AsyncC
     # GET sin show_deleted debe retornar solo la activa
     response = await async_client.get(f"/tasks/{task_id}/subtasks/")
     assert response.status_code == 200
-    subtasks = response.json()
+    subtasks = response.json()["items"]
     subtask_ids = [s["id"] for s in subtasks]
     assert active_id in subtask_ids
     assert deleted_id not in subtask_ids
@@ -343,7 +340,55 @@ async def test_get_task_subtasks_filters_deleted_by_default(async_client: AsyncC
     # GET con show_deleted=true debe retornar ambas
     response = await async_client.get(f"/tasks/{task_id}/subtasks/?show_deleted=true")
     assert response.status_code == 200
-    subtasks = response.json()
+    subtasks = response.json()["items"]
     subtask_ids = [s["id"] for s in subtasks]
     assert active_id in subtask_ids
     assert deleted_id in subtask_ids
+
+
+@pytest.mark.asyncio
+async def test_deleted_subtasks_are_not_loaded(async_client: AsyncClient):
+    """Las subtasks eliminadas se filtran en la consulta: no se leen ni se instancian."""
+    response = await async_client.post("/tasks/", json={"name": "Task"})
+    task_id = response.json()["id"]
+    subtask_ids = []
+    for i in range(5):
+        response = await async_client.post(f"/tasks/{task_id}/subtasks/", json={"name": f"Sub {i}"})
+        subtask_ids.append(response.json()["id"])
+    for subtask_id in subtask_ids[:3]:
+        await async_client.delete(f"/tasks/{task_id}/subtasks/{subtask_id}")
+
+    loaded = []
+
+    def _count_loads(target, context):
+        loaded.append(target.id)
+
+    event.listen(Subtask, "load", _count_loads)
+    try:
+        routes = [
+            ("get", "/tasks/", {}),
+            ("get", f"/tasks/{task_id}", {}),
+            ("put", f"/tasks/{task_id}", {"json": {"name": "Renamed"}}),
+            ("patch", f"/tasks/{task_id}/status", {"params": {"new_status": "doing"}}),
+            ("patch", f"/tasks/{task_id}/toggle", {}),
+        ]
+        for method, url, kwargs in routes:
+            loaded.clear()
+            response = await getattr(async_client, method)(url, **kwargs)
+            assert response.status_code == 200
+            body = response.json()
+            task = body["items"][0] if "items" in body else body
+            assert sorted(s["id"] for s in task["subtasks"]) == subtask_ids[3:]
+            # Las lecturas van por la capa Core: no instancian subtasks ORM
+            expected = [] if method == "get" else subtask_ids[3:]
+            assert sorted(loaded) == expected, (method, url)
+
+        # show_deleted=true sí devuelve las eliminadas
+        response = await async_client.get(f"/tasks/{task_id}", params={"show_deleted": True})
+        assert sorted(s["id"] for s in response.json()["subtasks"]) == subtask_ids
+    finally:
+        event.remove(Subtask, "load", _count_loads)
+
+    # Las escrituras no tocan las subtasks eliminadas (sin delete-orphan)
+    response = await async_client.get(f"/tasks/{task_id}/subtasks/", params={"show_deleted": True})
+    assert len(response.json()["items"]) == 5
@@ -0,0 +1,77 @@
+"""Tests para los perfiles de PRAGMAs de SQLite y los settings."""
+import pytest
+from httpx import AsyncClient, ASGITransport
+from pydantic import ValidationError
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from src.main import app
+from src.api.config import Settings
+from src.api.sqlite_profiles import PROFILES, get_profile, install_pragmas
+
+
+async def _pragma(conn, name: str):
+    return (await conn.execute(text(f"PRAGMA {name}"))).scalar()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("profile_name, synchronous", [
+    ("durable", 2),     # FULL
+    ("balanced", 1),    # NORMAL
+    ("throughput", 0),  # OFF
+])
+async def test_profile_applied_on_every_connection(tmp_path, profile_name, synchronous):
+    """Cada conexión nueva recibe los PRAGMAs del perfil."""
+    profile = get_profile(profile_name)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    install_pragmas(engine, profile)
+
+    try:
+        async with engine.connect() as first, engine.connect() as second:
+            for conn in (first, second):
+                assert await _pragma(conn, "journal_mode") == "wal"
+                assert await _pragma(conn, "synchronous") == synchronous
+                assert await _pragma(conn, "cache_size") == profile.cache_size
+                assert await _pragma(conn, "busy_timeout") == profile.busy_timeout
+                assert await _pragma(conn, "temp_store") == 2  # MEMORY
+                assert await _pragma(conn, "foreign_keys") == 1
+    finally:
+        await engine.dispose()
+
+
+def test_get_profile_unknown_raises():
+    """Un perfil inexistente produce un error claro."""
+    with pytest.raises(ValueError, match="Unknown SQLite profile"):
+        get_profile("turbo")
+
+
+def test_settings_from_env(monkeypatch):
+    """Los settings se leen de variables de entorno APP_*."""
+    monkeypatch.setenv("APP_SQLITE_PROFILE", "throughput")
+    monkeypatch.setenv("APP_DATABASE_URL", "sqlite+aiosqlite:///./other.db")
+
+    settings = Settings.from_env()
+
+    assert settings.sqlite_profile == "throughput"
+    assert settings.database_url == "sqlite+aiosqlite:///./other.db"
+
+
+def test_settings_rejects_unknown_profile(monkeypatch):
+    """Un perfil no válido en el entorno falla la validación."""
+    monkeypatch.setenv("APP_SQLITE_PROFILE", "turbo")
+
+    with pytest.raises(ValidationError):
+        Settings.from_env()
+
+
+@pytest.mark.asyncio
+async def test_health_reports_active_profile():
+    """GET /health muestra el perfil de PRAGMAs activo."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/health")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "healthy"
+    profile = data["database"]["sqlite_profile"]
+    assert profile["name"] in PROFILES
+    assert profile["journal_mode"] == "WAL"
@@ -0,0 +1,147 @@
+"""Tests para los listados NDJSON en streaming."""
+import json
+from datetime import datetime, timedelta
+import pytest
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from src.main import app
+from src.api import streaming
+from src.api.database import Base, get_read_sessionmaker, get_write_sessionmaker
+from src.api.models.project import Project
+from src.api.models.subtask import Subtask
+from src.api.models.task import Task
+from src.api.reads import select_tasks
+
+
+# Engine de test en memoria
+TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+test_engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+test_async_session_maker = async_sessionmaker(
+    test_engine, class_=AsyncSession, expire_on_commit=False
+)
+
+
+@pytest.fixture
+async def test_db():
+    """Fixture para crear/destruir tablas en cada test."""
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield
+
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+def override_get_sessionmaker():
+    """Override de las session factories para tests."""
+    return test_async_session_maker
+
+
+@pytest.fixture
+async def async_client(test_db, monkeypatch):
+    """Fixture para AsyncClient con BD de test y lotes pequeños (varios por respuesta)."""
+    monkeypatch.setattr(streaming, "STREAM_BATCH_SIZE", 3)
+    app.dependency_overrides[get_read_sessionmaker] = override_get_sessionmaker
+    app.dependency_overrides[get_write_sessionmaker] = override_get_sessionmaker
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test"
+    ) as client:
+        yield client
+
+    app.dependency_overrides.clear()
+
+
+async def _seed(n_tasks: int = 10) -> None:
+    """Tareas (una eliminada, la mitad hechas) con 2 subtasks (una eliminada)."""
+    start = datetime(2024, 1, 1)
+    async with test_engine.begin() as conn:
+        await conn.execute(insert(Project), [{"name": f"Proyecto {i}", "color": "#000000"} for i in range(4)])
+        ids = (await conn.execute(insert(Task).returning(Task.id), [
+            {"name": f"Task {i}", "status": "done" if i % 2 else "backlog", "completed": bool(i % 2),
+             "created_at": start + timedelta(minutes=n_tasks - i),
+             "deleted_at": start if i == 0 else None}
+            for i in range(n_tasks)
+        ])).scalars().all()
+        await conn.execute(insert(Subtask), [
+            {"task_id": task_id, "name": f"Sub {j}", "position": 1 - j, "created_at": start,
+             "deleted_at": start if j == 1 else None}
+            for task_id in ids
+            for j in range(2)
+        ])
+
+
+def _lines(response) -> list[dict]:
+    """Objetos de una respuesta NDJSON."""
+    assert response.headers["content-type"] == streaming.NDJSON_MEDIA_TYPE
+    assert response.text.endswith("\n")
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+@pytest.mark.asyncio
+async def test_stream_batches_reads_in_partitions(test_db):
+    """La consulta se recorre en el servidor en lotes del tamaño pedido."""
+    await _seed(7)
+
+    async with test_async_session_maker() as session:
+        batches = [len(rows) async for rows in streaming.stream_batches(session, select_tasks(), batch_size=3)]
+
+    assert batches == [3, 3, 1]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("request_kwargs", [
+    {"params": {"stream": True}},
+    {"headers": {"Accept": "application/x-ndjson"}},
+])
+async def test_tasks_stream_matches_listing(async_client: AsyncClient, request_kwargs: dict):
+    """Flag o cabecera Accept: las mismas tareas que el listado, una por línea."""
+    await _seed()
+
+    streamed = _lines(await async_client.get("/tasks/", **request_kwargs))
+    listing = (await async_client.get("/tasks/", params={"limit": 200})).json()["items"]
+
+    assert streamed == listing
+    assert len(streamed) == 9
+    assert all(len(task["subtasks"]) == 1 for task in streamed)
+
+
+@pytest.mark.asyncio
+async def test_tasks_stream_applies_filters_and_show_deleted(async_client: AsyncClient):
+    """Los filtros y show_deleted se aplican también en streaming."""
+    await _seed()
+
+    streamed = _lines(await async_client.get("/tasks/", params={"stream": True, "status": "done"}))
+    assert {task["status"] for task in streamed} == {"done"}
+    assert len(streamed) == 5
+
+    streamed = _lines(await async_client.get("/tasks/", params={"stream": True, "show_deleted": True}))
+    assert len(streamed) == 10
+    assert all(len(task["subtasks"]) == 2 for task in streamed)
+
+
+@pytest.mark.asyncio
+async def test_subtasks_and_projects_stream(async_client: AsyncClient):
+    """Subtasks (en orden de position) y proyectos también se sirven en NDJSON."""
+    await _seed()
+
+    subtasks = _lines(await async_client.get("/tasks/2/subtasks/", params={"stream": True, "show_deleted": True}))
+    assert [subtask["name"] for subtask in subtasks] == ["Sub 1", "Sub 0"]
+
+    projects = _lines(await async_client.get("/projects/", headers={"Accept": "application/x-ndjson"}))
+    assert [project["name"] for project in projects] == [f"Proyecto {i}" for i in range(4)]
+
+    response = await async_client.get("/tasks/999/subtasks/", params={"stream": True})
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_default_listing_is_still_json(async_client: AsyncClient):
+    """Sin flag ni cabecera NDJSON los listados no cambian."""
+    response = await async_client.get("/projects/", headers={"Accept": "application/json"})
+
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == []
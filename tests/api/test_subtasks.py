@@ -3,7 +3,7 @@ import pytest
 from httpx import AsyncClient, ASGITransport
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from src.main import app
-from src.api.database import get_db, Base
+from src.api.database import Base, get_read_sessionmaker, get_write_sessionmaker
 
 
 # Engine de test en memoria
@@ -26,21 +26,16 @@ async def test_db():
         await conn.run_sync(Base.metadata.drop_all)
 
 
-async def override_get_db():
-    """Override de get_db para tests."""
-    async with test_async_session_maker() as session:
-        try:
-            yield session
-            await session.commit()
-        except Exception:
-            await session.rollback()
-            raise
+def override_get_sessionmaker():
+    """Override de las session factories para tests."""
+    return test_async_session_maker
 
 
 @pytest.fixture
 async def async_client(test_db):
     """Fixture para AsyncClient con BD de test."""
-    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_sessionmaker] = override_get_sessionmaker
+    app.dependency_overrides[get_write_sessionmaker] = override_get_sessionmaker
 
     async with AsyncClient(
         transport=ASGITransport(app=app),
@@ -101,7 +96,7 @@ class TestSubtasksEndpoints:
         response = await async_client.get(f"/tasks/{task_with_id}/subtasks/")
 
         assert response.status_code == 200
-        subtasks = response.json()
+        subtasks = response.json()["items"]
         assert len(subtasks) == 3
         # Verificar orden por position
         assert subtasks[0]["name"] == "First"
@@ -271,7 +266,7 @@ class TestSubtasksEndpoints:
 
         # Verificar que existen
         get_response = await async_client.get(f"/tasks/{task_with_id}/subtasks/")
-        assert len(get_response.json()) == 2
+        assert len(get_response.json()["items"]) == 2
 
         # Eliminar la tarea (soft delete)
         delete_task_response = await async_client.delete(f"/tasks/{task_with_id}")
@@ -1,9 +1,10 @@
 """Tests para los endpoints de tasks con SQLite."""
 import pytest
+from sqlalchemy import event
 from httpx import AsyncClient, ASGITransport
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from src.main import app
-from src.api.database import get_db, Base
+from src.api.database import Base, get_read_sessionmaker, get_write_sessionmaker
 
 
 # Engine de test en memoria
@@ -26,21 +27,16 @@ async def test_db():
         await conn.run_sync(Base.metadata.drop_all)
 
 
-async def override_get_db():
-    """Override de get_db para tests."""
-    async with test_async_session_maker() as session:
-        try:
-            yield session
-            await session.commit()
-        except Exception:
-            await session.rollback()
-            raise
+def override_get_sessionmaker():
+    """Override de las session factories para tests."""
+    return test_async_session_maker
 
 
 @pytest.fixture
 async def async_client(test_db):
     """Fixture para AsyncClient con BD de test."""
-    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_sessionmaker] = override_get_sessionmaker
+    app.dependency_overrides[get_write_sessionmaker] = override_get_sessionmaker
 
     async with AsyncClient(
         transport=ASGITransport(app=app),
@@ -59,7 +55,8 @@ class TestTasksEndpoints:
         """Test GET /tasks cuando está vacío."""
         response = await async_client.get("/tasks/")
         assert response.status_code == 200
-        assert response.json() == []
+        assert response.json()["items"] == []
+        assert response.json()["next_cursor"] is None
 
     @pytest.mark.asyncio
     async def test_create_task(self, async_client):
@@ -190,7 +187,8 @@ class TestTasksEndpoints:
 
     @pytest.mark.asyncio
     async def test_create_task_with_project_id(self, async_client):
-        """Test POST /tasks con project_id."""
+        """Test POST /tasks con project_id (el proyecto debe existir)."""
+        await async_client.post("/projects/", json={"name": "Proyecto", "color": "#000000"})
         data = {"name": "Tarea con proyecto", "project_id": 1}
         response = await async_client.post("/tasks/", json=data)
 
@@ -213,7 +211,9 @@ class TestTasksEndpoints:
         create_response = await async_client.post("/tasks/", json={"name": "Test"})
         task_id = create_response.json()["id"]
 
-        # Actualizar con project_id
+        # Actualizar con project_id (de un proyecto existente)
+        for name in ("Uno", "Dos"):
+            await async_client.post("/projects/", json={"name": name, "color": "#000000"})
         response = await async_client.put(f"/tasks/{task_id}", json={"project_id": 2})
         assert response.status_code == 200
         assert response.json()["project_id"] == 2
@@ -376,3 +376,149 @@ class TestTaskStatus:
         assert result["status"] == "backlog"
         assert result["completed"] is False
         assert result["completed_at"] is None
+
+
+class TestTaskListFilters:
+    """Tests para los filtros de GET /tasks."""
+
+    @staticmethod
+    async def _ids(async_client, **params) -> list[int]:
+        response = await async_client.get("/tasks/", params=params)
+        assert response.status_code == 200, response.text
+        return [task["id"] for task in response.json()["items"]]
+
+    @pytest.mark.asyncio
+    async def test_filter_by_status_project_and_completed(self, async_client):
+        """status, project_id y completed se combinan con AND."""
+        project = (await async_client.post("/projects/", json={"name": "P", "color": "#000000"})).json()
+        backlog = (await async_client.post("/tasks/", json={"name": "A"})).json()["id"]
+        doing = (await async_client.post("/tasks/", json={"name": "B", "status": "doing"})).json()["id"]
+        in_project = (await async_client.post(
+            "/tasks/", json={"name": "C", "status": "doing", "project_id": project["id"]}
+        )).json()["id"]
+        done = (await async_client.post("/tasks/", json={"name": "D"})).json()["id"]
+        await async_client.patch(f"/tasks/{done}/status", params={"new_status": "done"})
+
+        assert await self._ids(async_client, status="doing") == [doing, in_project]
+        assert await self._ids(async_client, status="doing", project_id=project["id"]) == [in_project]
+        assert await self._ids(async_client, completed=True) == [done]
+        assert await self._ids(async_client, completed=False) == [backlog, doing, in_project]
+
+    @pytest.mark.asyncio
+    async def test_filter_by_dates(self, async_client):
+        """created_after/before acotan la creación; updated_since incluye las editadas."""
+        old = (await async_client.post("/tasks/", json={"name": "Vieja"})).json()
+        new = (await async_client.post("/tasks/", json={"name": "Nueva"})).json()
+        boundary = new["created_at"]
+
+        assert await self._ids(async_client, created_after=boundary) == [new["id"]]
+        assert await self._ids(async_client, created_before=boundary) == [old["id"]]
+        assert await self._ids(async_client, updated_since=boundary) == [new["id"]]
+
+        await async_client.put(f"/tasks/{old['id']}", json={"name": "Editada"})
+        assert await self._ids(async_client, updated_since=boundary) == [old["id"], new["id"]]
+
+    @pytest.mark.asyncio
+    async def test_filter_by_open_subtasks(self, async_client):
+        """has_open_subtasks ignora las subtasks completadas y las eliminadas."""
+        ids = [(await async_client.post("/tasks/", json={"name": f"T{i}"})).json()["id"] for i in range(4)]
+        await async_client.post(f"/tasks/{ids[0]}/subtasks/", json={"name": "Abierta"})
+        done = (await async_client.post(f"/tasks/{ids[1]}/subtasks/", json={"name": "Hecha"})).json()
+        await async_client.patch(f"/tasks/{ids[1]}/subtasks/{done['id']}/toggle")
+        deleted = (await async_client.post(f"/tasks/{ids[2]}/subtasks/", json={"name": "Borrada"})).json()
+        await async_client.delete(f"/tasks/{ids[2]}/subtasks/{deleted['id']}")
+
+        assert await self._ids(async_client, has_open_subtasks=True) == [ids[0]]
+        assert await self._ids(async_client, has_open_subtasks=False) == ids[1:]
+
+    @pytest.mark.asyncio
+    async def test_invalid_filters_return_422(self, async_client):
+        """Los filtros se validan con el schema TaskListFilters."""
+        response = await async_client.get("/tasks/", params={"status": "archived"})
+        assert response.status_code == 422
+
+        response = await async_client.get(
+            "/tasks/", params={"created_after": "2024-02-01", "created_before": "2024-01-01"}
+        )
+        assert response.status_code == 422
+
+
+class TestTaskFieldsets:
+    """Tests para fields= e include= en las respuestas de tareas."""
+
+    @staticmethod
+    async def _task_with_subtasks(async_client) -> int:
+        """Tarea con una subtask abierta, una hecha y una eliminada."""
+        task_id = (await async_client.post("/tasks/", json={"name": "Tarea", "description": "Desc"})).json()["id"]
+        subtasks = [
+            (await async_client.post(f"/tasks/{task_id}/subtasks/", json={"name": f"S{i}"})).json()["id"]
+            for i in range(3)
+        ]
+        await async_client.patch(f"/tasks/{task_id}/subtasks/{subtasks[1]}/toggle")
+        await async_client.delete(f"/tasks/{task_id}/subtasks/{subtasks[2]}")
+        return task_id
+
+    @pytest.mark.asyncio
+    async def test_fields_select_only_requested_columns(self, async_client):
+        """fields= devuelve solo esos campos (más subtasks, el include por defecto)."""
+        task_id = await self._task_with_subtasks(async_client)
+        statements = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(test_engine.sync_engine, "before_cursor_execute", _record)
+        try:
+            response = await async_client.get("/tasks/", params={"fields": "status,name"})
+        finally:
+            event.remove(test_engine.sync_engine, "before_cursor_execute", _record)
+
+        assert response.status_code == 200
+        [task] = response.json()["items"]
+        assert list(task) == ["name", "status", "subtasks"]
+        assert [subtask["name"] for subtask in task["subtasks"]] == ["S0", "S1"]
+        tasks_query = next(statement for statement in statements if "FROM tasks" in statement)
+        assert "tasks.description" not in tasks_query
+
+        response = await async_client.get(f"/tasks/{task_id}", params={"fields": "id", "include": ""})
+        assert response.json() == {"id": task_id}
+
+    @pytest.mark.asyncio
+    async def test_subtask_summary_counts_without_rows(self, async_client):
+        """include=subtask_summary cuenta las subtasks activas con un agregado."""
+        task_id = await self._task_with_subtasks(async_client)
+        empty_id = (await async_client.post("/tasks/", json={"name": "Vacía"})).json()["id"]
+        params = {"fields": "id", "include": "subtask_summary"}
+
+        response = await async_client.get("/tasks/", params=params)
+        assert response.json()["items"] == [
+            {"id": task_id, "subtask_summary": {"total": 2, "completed": 1}},
+            {"id": empty_id, "subtask_summary": {"total": 0, "completed": 0}},
+        ]
+
+        response = await async_client.get(f"/tasks/{task_id}", params={**params, "show_deleted": True})
+        assert response.json()["subtask_summary"] == {"total": 3, "completed": 1}
+
+        response = await async_client.get("/tasks/", params={**params, "stream": True})
+        assert response.text.splitlines()[0] == f'{{"id":{task_id},"subtask_summary":{{"total":2,"completed":1}}}}'
+
+    @pytest.mark.asyncio
+    async def test_sparse_listing_keeps_cursor_pagination(self, async_client):
+        """La clave de paginación se lee aunque no esté entre los campos pedidos."""
+        for i in range(3):
+            await async_client.post("/tasks/", json={"name": f"T{i}"})
+
+        first = (await async_client.get("/tasks/", params={"fields": "name", "limit": 2})).json()
+        second = (await async_client.get(
+            "/tasks/", params={"fields": "name", "limit": 2, "cursor": first["next_cursor"]}
+        )).json()
+
+        assert [task["name"] for task in first["items"] + second["items"]] == ["T0", "T1", "T2"]
+        assert second["next_cursor"] is None
+
+    @pytest.mark.asyncio
+    async def test_invalid_fieldset_returns_422(self, async_client):
+        """Campos o relaciones desconocidos se rechazan."""
+        for params in ({"fields": "name,secret"}, {"fields": ","}, {"include": "projects"}):
+            response = await async_client.get("/tasks/", params=params)
+            assert response.status_code == 422, params
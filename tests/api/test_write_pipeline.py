@@ -0,0 +1,262 @@
+"""Tests para el pipeline de escritura con group commit."""
+import asyncio
+import pytest
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from src.main import app
+from src.api.database import (
+    Base,
+    get_read_sessionmaker,
+    get_write_sessionmaker,
+    install_transaction_control,
+)
+from src.api.models.project import Project
+from src.api.routes.admin import require_admin
+from src.api.write_pipeline import WritePipeline, get_write_pipeline
+
+
+# Engine de test en memoria
+TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+test_engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+install_transaction_control(test_engine)
+test_async_session_maker = async_sessionmaker(
+    test_engine, class_=AsyncSession, expire_on_commit=False
+)
+
+
+@pytest.fixture
+async def test_db():
+    """Fixture para crear/destruir tablas en cada test."""
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield
+
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+@pytest.fixture
+async def pipeline(test_db):
+    """Pipeline arrancado sobre la BD de test, con ventana amplia para agrupar."""
+    write_pipeline = WritePipeline(test_async_session_maker, max_batch_size=16, max_wait=0.05)
+    write_pipeline.start()
+
+    yield write_pipeline
+
+    await write_pipeline.stop()
+
+
+def override_get_sessionmaker():
+    """Override de las session factories para tests."""
+    return test_async_session_maker
+
+
+@pytest.fixture
+async def async_client(pipeline):
+    """Fixture para AsyncClient con BD de test y pipeline activo."""
+    app.dependency_overrides[get_read_sessionmaker] = override_get_sessionmaker
+    app.dependency_overrides[get_write_sessionmaker] = override_get_sessionmaker
+    app.dependency_overrides[get_write_pipeline] = lambda: pipeline
+    app.dependency_overrides[require_admin] = lambda: None
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test"
+    ) as client:
+        yield client
+
+    app.dependency_overrides.clear()
+
+
+async def _count_projects() -> int:
+    async with test_async_session_maker() as session:
+        return (await session.execute(select(func.count(Project.id)))).scalar()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_share_commits(pipeline):
+    """Escrituras concurrentes se confirman en menos commits que requests."""
+    async def create(i: int) -> None:
+        async with pipeline.transaction() as session:
+            session.add(Project(name=f"P{i}", color="#000000"))
+            await session.flush()
+
+    await asyncio.gather(*(create(i) for i in range(20)))
+
+    assert await _count_projects() == 20
+    stats = pipeline.stats.as_dict()
+    assert stats["committed"] == 20
+    assert stats["batches"] < 20
+    assert stats["max_batch_size"] > 1
+
+
+@pytest.mark.asyncio
+async def test_batch_is_a_single_transaction(tmp_path):
+    """Los savepoints no hacen commit: nada es visible fuera hasta el commit del lote."""
+    url = f"sqlite+aiosqlite:///{tmp_path / 'test.db'}"
+    engine = create_async_engine(url)
+    install_transaction_control(engine)
+    observer = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    write_pipeline = WritePipeline(
+        async_sessionmaker(engine, expire_on_commit=False), max_batch_size=2, max_wait=0.05
+    )
+    write_pipeline.start()
+    visible_during_batch = []
+
+    async def create(i: int) -> None:
+        async with write_pipeline.transaction() as session:
+            session.add(Project(name=f"P{i}", color="#000000"))
+            await session.flush()
+            async with observer.connect() as conn:
+                visible_during_batch.append(
+                    (await conn.execute(select(func.count(Project.id)))).scalar()
+                )
+
+    try:
+        await asyncio.gather(create(1), create(2))
+        async with observer.connect() as conn:
+            visible_after = (await conn.execute(select(func.count(Project.id)))).scalar()
+    finally:
+        await write_pipeline.stop()
+        await observer.dispose()
+        await engine.dispose()
+
+    assert write_pipeline.stats.batches == 1
+    assert visible_during_batch == [0, 0]
+    assert visible_after == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_request_only_rolls_back_its_savepoint(pipeline):
+    """Una request que falla no deshace las demás del mismo lote."""
+    async def create(i: int) -> None:
+        async with pipeline.transaction() as session:
+            session.add(Project(name=f"P{i}", color="#000000"))
+            await session.flush()
+            if i == 3:
+                raise ValueError("boom")
+
+    results = await asyncio.gather(*(create(i) for i in range(6)), return_exceptions=True)
+
+    assert isinstance(results[3], ValueError)
+    assert [r for i, r in enumerate(results) if i != 3] == [None] * 5
+    assert await _count_projects() == 5
+    assert pipeline.stats.rolled_back == 1
+
+
+class _FailingSession(AsyncSession):
+    """Sesión cuyo primer SAVEPOINT falla (error inesperado en el lote)."""
+    failures = 1
+
+    def begin_nested(self):
+        if _FailingSession.failures:
+            _FailingSession.failures -= 1
+            raise OSError("disk I/O error")
+        return super().begin_nested()
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_with_cancelled_request(test_db):
+    """Un lote que falla con una request cancelada en cola no detiene la tarea escritora."""
+    write_pipeline = WritePipeline(
+        async_sessionmaker(test_engine, class_=_FailingSession, expire_on_commit=False),
+        max_batch_size=16, max_wait=0.05,
+    )
+    write_pipeline.start()
+
+    async def create(name: str) -> None:
+        async with write_pipeline.transaction() as session:
+            session.add(Project(name=name, color="#000000"))
+
+    try:
+        # Cancelada mientras el lote espera más requests
+        cancelled = asyncio.create_task(create("cancelada"))
+        await asyncio.sleep(0.01)
+        cancelled.cancel()
+        with pytest.raises(OSError):
+            await create("fallida")
+
+        await create("siguiente")
+    finally:
+        await write_pipeline.stop()
+
+    assert cancelled.cancelled()
+    assert write_pipeline.stats.failed_batches == 1
+    assert await _count_projects() == 1
+
+
+@pytest.mark.asyncio
+async def test_stop_fails_in_flight_and_queued_requests(test_db):
+    """Detener el pipeline a mitad de lote falla las requests en curso y en cola."""
+    write_pipeline = WritePipeline(test_async_session_maker, max_batch_size=1, max_wait=0)
+    write_pipeline.start()
+    in_flight = asyncio.Event()
+    release = asyncio.Event()
+
+    async def create(name: str) -> None:
+        async with write_pipeline.transaction():
+            in_flight.set()
+            await release.wait()
+
+    first = asyncio.create_task(create("en curso"))
+    await in_flight.wait()
+    queued = asyncio.create_task(create("en cola"))
+    await asyncio.sleep(0.01)
+
+    await write_pipeline.stop()
+    release.set()
+
+    for task in (first, queued):
+        with pytest.raises(RuntimeError, match="stopped"):
+            await task
+
+
+@pytest.mark.asyncio
+async def test_write_routes_go_through_pipeline(async_client, pipeline):
+    """Las rutas de escritura usan el pipeline y responden tras el commit del lote."""
+    response = await async_client.post("/tasks/", json={"name": "Parent"})
+    task_id = response.json()["id"]
+
+    responses = await asyncio.gather(*(
+        async_client.post(f"/tasks/{task_id}/subtasks/", json={"name": f"S{i}"})
+        for i in range(8)
+    ), async_client.patch("/tasks/999/toggle"))
+
+    assert [r.status_code for r in responses[:-1]] == [201] * 8
+    assert responses[-1].status_code == 404
+
+    response = await async_client.get(f"/tasks/{task_id}/subtasks/")
+    assert len(response.json()["items"]) == 8
+    assert pipeline.stats.batches < pipeline.stats.requests
+
+
+@pytest.mark.asyncio
+async def test_admin_reports_pipeline_stats(async_client):
+    """GET /admin/write-pipeline expone métricas de lotes y commits."""
+    await async_client.post("/projects/", json={"name": "P", "color": "#000000"})
+
+    response = await async_client.get("/admin/write-pipeline")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["enabled"] is True
+    assert data["stats"]["committed"] == 1
+    assert set(data["stats"]["commit_latency_ms"]) == {"avg", "max", "last"}
+
+
+@pytest.mark.asyncio
+async def test_admin_reports_disabled_pipeline(test_db):
+    """Sin pipeline configurado, el endpoint lo indica."""
+    app.dependency_overrides[require_admin] = lambda: None
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get("/admin/write-pipeline")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.json() == {"enabled": False}